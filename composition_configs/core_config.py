@@ -23,12 +23,20 @@ class WorkFileConfig:
         root_file (str): The core file name used to generate unique file names.
         write_to_memory (bool): If True, files are written to memory, if False, written to disk.
         keep_files (bool): If True, work files are kept after execution; if False, they are deleted when done.
+        memory_budget_vertices (int, optional): If set, gdb paths built with an expected size
+            go to memory while the vertices held by live memory files stay within this budget,
+            and to disk otherwise. Paths without a size hint follow write_to_memory.
+        defer_deletion (bool): If True, deleting disk files only queues them; the queue is
+            deleted in batches once it is large enough or when drained at a safe point.
+            Only for managers whose file names are never reused before the queue drains.
 
     """
 
     root_file: str
     write_to_memory: bool = False
     keep_files: bool = False
+    memory_budget_vertices: Optional[int] = None
+    defer_deletion: bool = False
 
 
 class InputType(Enum):
@@ -225,6 +233,73 @@ class MethodEntriesConfig:
     entries: list[Union[FuncMethodEntryConfig, ClassMethodEntryConfig]]
 
 
+@dataclass
+class StageEntryConfig:
+    """
+    One stage of a fused partition run: the methods of one tool, and the context
+    radius that tool needs around the features it processes.
+    """
+
+    name: str
+    methods: MethodEntriesConfig
+    context_radius_meters: int
+
+
+@dataclass
+class FusedStagesConfig:
+    """
+    Stages that run back-to-back on the same partition selection, in order, in
+    place of one PartitionIterator run per stage.
+
+    Tags passed between stages that are not configured outputs stay in the memory
+    workspace; only configured outputs are extracted and appended. A stage's
+    context features are only correct if the earlier stages processed them with
+    their own context, so the selection radius is the sum of the stage radii.
+    """
+
+    stages: list[StageEntryConfig]
+
+    def method_entries(self) -> MethodEntriesConfig:
+        return MethodEntriesConfig(
+            entries=[entry for stage in self.stages for entry in stage.methods.entries]
+        )
+
+    @property
+    def context_radius_meters(self) -> int:
+        return sum(stage.context_radius_meters for stage in self.stages)
+
+
+@dataclass(frozen=True)
+class AdaptiveSplitConfig:
+    """
+    Splits partitions that are too heavy to process, instead of retrying them as-is.
+
+    A partition is split into up to four quadrants of its polygon, which are then
+    processed as child partitions. Children can be split again up to max_split_depth.
+
+    Attributes:
+        max_partition_load: Split a partition whose selected load (features or
+            vertices, following partition_method) exceeds this. None disables
+            load-based splitting.
+        split_on_resource_errors: Split instead of retrying when an injected method
+            fails with an error matching resource_error_markers.
+        resource_error_markers: Case-insensitive substrings of the exception type or
+            message that mark a resource failure.
+        max_split_depth: How many times a partition may be split recursively.
+    """
+
+    max_partition_load: Optional[int] = None
+    split_on_resource_errors: bool = True
+    resource_error_markers: tuple[str, ...] = (
+        "MemoryError",
+        "out of memory",
+        "insufficient memory",
+        "ERROR 000426",
+        "ERROR 999998",
+    )
+    max_split_depth: int = 3
+
+
 @dataclass
 class PartitionRunConfig:
     max_elements_per_partition: int
@@ -232,3 +307,8 @@ class PartitionRunConfig:
     run_partition_optimization: bool = require("SELECT_STUDY_AREA")
     partition_method: PartitionMethod = PartitionMethod.FEATURES
     object_id_column: str = "OBJECTID"
+    adaptive_split: Optional[AdaptiveSplitConfig] = None
+    # Extracted output rows are held in memory and written to the final outputs
+    # every output_flush_partitions partitions, or once a tag holds output_flush_rows rows.
+    output_flush_partitions: int = 20
+    output_flush_rows: int = 50_000
@@ -96,6 +96,7 @@ class LineToBufferSymbologyKwargs:
 
     buffer_distance_factor: Union[int, float] = 1
     buffer_distance_addition: Union[int, float] = 0
+    dissolve_same_class: bool = False
 
 
 @dataclass(frozen=True)
@@ -123,6 +124,9 @@ class ThinRoadNetworkKwargs:
     invisibility_field_name: str
     hierarchy_field_name: str
     special_selection_sql: str | None = None
+    max_rounds: int | None = None
+    rethin_changed_regions: bool = False
+    rethin_context_meters: int | None = None
 
 
 @dataclass(frozen=True)
@@ -157,8 +161,38 @@ class CollapseRoadDetailsKwargs:
     collapse_field_name: Optional[str] = None
 
 
+@dataclass(frozen=True)
+class RoadDisplacementSettings:
+    """
+    Settings for the native ResolveRoadConflicts backend (displacement_engine).
+
+    gap_meters: extra clearance required between two symbol edges.
+    max_iterations: relaxation rounds before giving up on remaining conflicts.
+    step: share of the measured overlap a vertex moves per round.
+    smoothing: weight of the neighbour average when spreading displacement along a line.
+    junction_factor: conflicts between connected lines are ignored within this many
+        required separations of their shared node.
+    tolerance_meters: overlap below which a conflict counts as resolved.
+    densify_meters: longest segment the lines are densified to before relaxation,
+        None for the smallest symbol width in the input.
+    """
+
+    gap_meters: float = 0.0
+    max_iterations: int = 100
+    step: float = 0.5
+    smoothing: float = 0.5
+    junction_factor: float = 2.0
+    tolerance_meters: float = 0.05
+    densify_meters: Optional[float] = None
+
+
 @dataclass(frozen=True)
 class RrcInitKwargs:
+    """
+    backend: "arcpy" for arcpy.cartography.ResolveRoadConflicts, "native" for the
+        in-process displacement_engine, tuned by displacement_settings.
+    """
+
     input_data_structure: List[SymbologyLayerSpec]
     work_file_manager_config: core_config.WorkFileConfig
 
@@ -169,6 +203,10 @@ class RrcInitKwargs:
 
     map_scale: str = "100000"
     hierarchy_field: str = "hierarchy"
+    backend: str = "arcpy"
+    displacement_settings: RoadDisplacementSettings = field(
+        default_factory=RoadDisplacementSettings
+    )
 
 
 @dataclass(frozen=True)
@@ -181,6 +219,8 @@ class DissolveInitKwargs:
     work_file_manager_config: WorkFileManager behavior (root_file, in-memory, keep_files)
     dissolve_fields: optional list of fields to dissolve on; if None -> dissolve all (single-part)
     sql_expressions: optional list of SQL where-clauses to split/segment, each produces its own FTL result
+    backend: "arcpy" for PairwiseDissolve + FeatureToLine, "native" for the in-process noding in line_noding
+    validate_backend: with the native backend, also run the arcpy path and print where the networks differ
     """
 
     input_line_feature: io_types.GdbIOArg
@@ -189,6 +229,8 @@ class DissolveInitKwargs:
 
     dissolve_fields: Optional[List[str]] = None
     sql_expressions: Optional[List[str]] = None
+    backend: str = "arcpy"
+    validate_backend: bool = False
 
 
 @dataclass(frozen=True)
@@ -355,6 +397,8 @@ class FillLineGapsAngleConfig:
         angle_block_threshold_degrees.
     angle_local_half_window_m: half-window in metres passed to local_line_angle_at_xy
         when computing the source angle at a dangle endpoint.
+    line_measure_cache_max_vertices: vertex budget of the per-line arrays local
+        angles are measured on. Least recently used lines are dropped beyond it.
     connect_to_features_angle_mode: optional per-dataset override controlling how angles
         are measured for external target features. Keys are the original
         connect_to_features path or its dataset_key. Values are AngleTargetMode members.
@@ -388,6 +432,7 @@ class FillLineGapsAngleConfig:
 
     # Passed to local_line_angle_at_xy(desired_half_window_m=...)
     angle_local_half_window_m: float = 2.0
+    line_measure_cache_max_vertices: int = 2_000_000
     connect_to_features_angle_mode: Optional[dict[str, AngleTargetMode]] = None
     lines_are_directed: bool = False
     connector_angle_diff_required_above_meters: Optional[float] = None
@@ -429,11 +474,15 @@ class FillLineGapsCrossingConfig:
         trimmed connector crosses one of these layers is rejected at Step 1a regardless
         of the reject_crossing_connectors setting. These layers are never used as snap
         targets. Requires crossing_check_spatial_reference.
+    validate_crossing_engine: when True, every in-process crossing check is repeated
+        with arcpy CROSSES cursors and differences are printed. Slow; meant for
+        validating the engine on new data, not for production runs.
     """
 
     reject_crossing_connectors: bool = False
     crossing_check_spatial_reference: "int | str | None" = None
     barrier_layers: "list[str] | None" = None
+    validate_crossing_engine: bool = False
 
     def __post_init__(self) -> None:
         if (
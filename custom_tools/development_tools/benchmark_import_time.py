@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import statistics
+import subprocess
+import sys
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+
+DEFAULT_MODULES = (
+    "main_on_prem",
+    "generalization.n100.road.data_preparation_2",
+)
+
+COLD_START_SNIPPET = """
+import importlib
+import sys
+import time
+
+start = time.perf_counter()
+for module_name in sys.argv[1:]:
+    importlib.import_module(module_name)
+print(time.perf_counter() - start)
+"""
+
+
+@dataclass(frozen=True)
+class ColdStartResult:
+    label: str
+    runs: list[float]
+
+    @property
+    def median(self) -> float:
+        return statistics.median(self.runs)
+
+    @property
+    def best(self) -> float:
+        return min(self.runs)
+
+
+def measure_cold_start(
+    root: Path, modules: list[str], repeats: int, label: str
+) -> ColdStartResult:
+    """Imports the dispatch modules in a fresh interpreter per run and times it."""
+    runs = []
+    for _ in range(repeats):
+        output = subprocess.check_output(
+            [sys.executable, "-c", COLD_START_SNIPPET, *modules],
+            cwd=root,
+            text=True,
+        )
+        runs.append(float(output.strip().splitlines()[-1]))
+    return ColdStartResult(label=label, runs=runs)
+
+
+def slowest_imports(root: Path, modules: list[str], top: int) -> list[tuple[int, str]]:
+    """Returns the (self microseconds, module) pairs from -X importtime, slowest first."""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", COLD_START_SNIPPET, *modules],
+        cwd=root,
+        text=True,
+        capture_output=True,
+        check=True,
+    )
+
+    timings = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _cumulative_us, name = line[len("import time:") :].split("|")
+        timings.append((int(self_us), name.strip()))
+
+    return sorted(timings, reverse=True)[:top]
+
+
+def export_git_ref(root: Path, ref: str, destination: Path) -> Path:
+    """Writes the tree of a git ref to destination, without touching the worktree."""
+    archive = subprocess.run(
+        ["git", "archive", ref], cwd=root, capture_output=True, check=True
+    )
+    subprocess.run(
+        ["tar", "-x", "-C", str(destination)], input=archive.stdout, check=True
+    )
+    return destination
+
+
+def print_result(result: ColdStartResult) -> None:
+    print(
+        f"{result.label:<12} median {result.median:.3f}s  "
+        f"best {result.best:.3f}s  runs {len(result.runs)}"
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Measure cold-start import time of the pipeline dispatch."
+    )
+    parser.add_argument("--root", default=".", help="Project root (default: .)")
+    parser.add_argument(
+        "--modules",
+        nargs="+",
+        default=list(DEFAULT_MODULES),
+        help="Modules imported by the dispatch under test",
+    )
+    parser.add_argument("--repeats", type=int, default=5, help="Runs per tree")
+    parser.add_argument(
+        "--compare-ref",
+        default=None,
+        help="Git ref to measure as the baseline, e.g. a commit before a change",
+    )
+    parser.add_argument(
+        "--top", type=int, default=15, help="Show the N slowest imports"
+    )
+    args = parser.parse_args()
+
+    root = Path(args.root).resolve()
+    results = []
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        if args.compare_ref:
+            baseline_root = export_git_ref(root, args.compare_ref, Path(tmp_dir))
+            results.append(
+                measure_cold_start(
+                    baseline_root, args.modules, args.repeats, args.compare_ref
+                )
+            )
+
+        results.append(measure_cold_start(root, args.modules, args.repeats, "worktree"))
+
+    for result in results:
+        print_result(result)
+
+    if len(results) == 2:
+        saved = results[0].median - results[1].median
+        print(f"\nMedian saving: {saved:.3f}s ({saved / results[0].median:.1%})")
+
+    print("\nSlowest imports (self time) in worktree:")
+    for self_us, name in slowest_imports(root, args.modules, args.top):
+        print(f"  {self_us / 1000:>9.1f} ms  {name}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
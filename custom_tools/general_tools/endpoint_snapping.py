@@ -0,0 +1,420 @@
+"""
+In-process endpoint snapping of lines onto a network.
+
+Lines are held in memory as NumPy vertex arrays. Dangling ends are found by
+hashing end coordinates and testing the remaining ends against the segments
+of the other lines. Each end is then moved to the nearest network end within
+one radius, else the nearest network vertex within a second, else the nearest
+point on a network line within a third, following the priority of
+successive arcpy Near passes. Only the ends that move are written back.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Iterable, Optional
+
+import arcpy
+import numpy as np
+
+from custom_tools.general_tools.segment_crossings import (
+    SegmentSet,
+    segments_from_parts,
+    segments_near_points,
+)
+
+# Distance in map units within which two points count as the same point,
+# matching the default XY tolerance of a projected feature class.
+DEFAULT_TOLERANCE = 0.001
+
+START = 0
+END = 1
+
+
+def _split_rings(part) -> list[list[tuple[float, float]]]:
+    """Splits a geometry part at the None separating polygon rings."""
+    rings: list[list[tuple[float, float]]] = [[]]
+    for point in part:
+        if point is None:
+            rings.append([])
+        else:
+            rings[-1].append((point.X, point.Y))
+    return [ring for ring in rings if ring]
+
+
+@dataclass
+class LineStore:
+    """
+    Polylines of a feature class kept in memory, keyed by OID. Polygons can be
+    read too, each ring becoming a part, to measure against their boundaries.
+
+    parts: (k, 2) vertex arrays of each part of each line.
+    changed: OIDs whose geometry has been edited since reading.
+    """
+
+    parts: dict[int, list[np.ndarray]]
+    spatial_reference: object = None
+    changed: set[int] = field(default_factory=set)
+
+    @classmethod
+    def read(cls, feature_class: str, where_clause: Optional[str] = None):
+        """Reads every polyline of feature_class in one cursor pass."""
+        parts: dict[int, list[np.ndarray]] = {}
+        with arcpy.da.SearchCursor(
+            feature_class, ["OID@", "SHAPE@"], where_clause=where_clause
+        ) as cursor:
+            for oid, shape in cursor:
+                if shape is None:
+                    continue
+                line_parts = [
+                    np.asarray(ring, dtype=np.float64)
+                    for part in shape
+                    for ring in _split_rings(part)
+                ]
+                if line_parts:
+                    parts[oid] = line_parts
+        return cls(
+            parts=parts,
+            spatial_reference=arcpy.Describe(feature_class).spatialReference,
+        )
+
+    def subset(self, oids: Iterable[int]) -> "LineStore":
+        """A store of the given lines sharing their vertex arrays with this one."""
+        return LineStore(
+            parts={oid: self.parts[oid] for oid in oids if oid in self.parts},
+            spatial_reference=self.spatial_reference,
+        )
+
+    def ends(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        (oids, which, xy) of the first and last vertex of every line, which
+        being START or END.
+        """
+        oids = np.repeat(np.fromiter(self.parts, dtype=np.int64), 2)
+        which = np.tile(np.array([START, END], dtype=np.int64), len(self.parts))
+        xy = np.asarray(
+            [
+                point
+                for line_parts in self.parts.values()
+                for point in (line_parts[0][0], line_parts[-1][-1])
+            ],
+            dtype=np.float64,
+        ).reshape(-1, 2)
+        return oids, which, xy
+
+    def vertices(self) -> np.ndarray:
+        if not self.parts:
+            return np.empty((0, 2), dtype=np.float64)
+        return np.concatenate(
+            [part for line_parts in self.parts.values() for part in line_parts]
+        )
+
+    def segments(self) -> SegmentSet:
+        return segments_from_parts(
+            (oid, [part.tolist() for part in line_parts])
+            for oid, line_parts in self.parts.items()
+        )
+
+    def move_end(self, oid: int, which: int, xy: tuple[float, float]) -> None:
+        line_parts = self.parts[oid]
+        if which == START:
+            line_parts[0] = line_parts[0].copy()
+            line_parts[0][0] = xy
+        else:
+            line_parts[-1] = line_parts[-1].copy()
+            line_parts[-1][-1] = xy
+        self.changed.add(oid)
+
+    def write_changed(self, feature_class: str) -> int:
+        """
+        Writes the edited lines to feature_class, matched by OID. Vertices keep
+        the Z and M of the stored geometry, so only their XY is replaced.
+        """
+        if not self.changed:
+            return 0
+
+        description = arcpy.Describe(feature_class)
+        has_z, has_m = bool(description.hasZ), bool(description.hasM)
+
+        def point(x: float, y: float, original) -> arcpy.Point:
+            if original is None:
+                return arcpy.Point(x, y)
+            return arcpy.Point(x, y, original.Z, original.M)
+
+        written = 0
+        with arcpy.da.UpdateCursor(feature_class, ["OID@", "SHAPE@"]) as cursor:
+            for oid, shape in cursor:
+                if oid not in self.changed:
+                    continue
+                original_parts = (
+                    [[p for p in part if p is not None] for part in shape]
+                    if shape is not None and (has_z or has_m)
+                    else []
+                )
+                parts = []
+                for index, part in enumerate(self.parts[oid]):
+                    original = (
+                        original_parts[index]
+                        if index < len(original_parts)
+                        and len(original_parts[index]) == len(part)
+                        else [None] * len(part)
+                    )
+                    parts.append(
+                        arcpy.Array(
+                            [
+                                point(x, y, source)
+                                for (x, y), source in zip(part.tolist(), original)
+                            ]
+                        )
+                    )
+                polyline = arcpy.Polyline(
+                    arcpy.Array(parts), self.spatial_reference, has_z, has_m
+                )
+                cursor.updateRow([oid, polyline])
+                written += 1
+        return written
+
+
+def point_keys(xy: np.ndarray, tolerance: float = DEFAULT_TOLERANCE) -> np.ndarray:
+    """
+    (n, 2) integer grid cell of each point. Points within tolerance mostly share
+    a cell; with the default tolerance a cell is (round(x, 3), round(y, 3)).
+    """
+    return np.round(xy / tolerance).astype(np.int64).reshape(-1, 2)
+
+
+def key_set(xy: np.ndarray, tolerance: float = DEFAULT_TOLERANCE) -> set:
+    return set(map(tuple, point_keys(xy, tolerance).tolist()))
+
+
+def coincident_counts(
+    xy: np.ndarray, tolerance: float = DEFAULT_TOLERANCE
+) -> np.ndarray:
+    """How many of the points share the grid cell of each point, itself included."""
+    if len(xy) == 0:
+        return np.zeros(0, dtype=np.int64)
+    _, inverse, counts = np.unique(
+        point_keys(xy, tolerance), axis=0, return_inverse=True, return_counts=True
+    )
+    return counts[inverse.reshape(-1)]
+
+
+def dangle_mask(lines: LineStore, tolerance: float = DEFAULT_TOLERANCE) -> np.ndarray:
+    """
+    Per end of lines.ends(), True where the end touches no other line, which is
+    what a Join_Count of 1 in an INTERSECT spatial join of the ends means.
+
+    Ends sharing a grid cell with an end of another line are settled by
+    hashing. Only the rest are measured against the segments of the other
+    lines, to catch ends resting on a line interior.
+    """
+    oids, _, xy = lines.ends()
+    dangles = np.ones(len(oids), dtype=bool)
+    if len(oids) == 0:
+        return dangles
+
+    _, cell = np.unique(point_keys(xy, tolerance), axis=0, return_inverse=True)
+    cell = cell.reshape(-1)
+    # Cells holding ends of more than one line are junctions.
+    cell_owner = np.unique(np.column_stack((cell, oids)), axis=0)
+    lines_per_cell = np.bincount(cell_owner[:, 0], minlength=cell.max() + 1)
+    dangles[lines_per_cell[cell] > 1] = False
+
+    remaining = np.flatnonzero(dangles)
+    owner = nearest_on_segments(
+        lines.segments(), xy[remaining], tolerance, exclude_owner=oids[remaining]
+    )[2]
+    dangles[remaining[owner >= 0]] = False
+    return dangles
+
+
+def points_within(
+    query: np.ndarray, targets: np.ndarray, radius: float
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    (query_index, target_index, distance) of every query and target point
+    within radius of each other, found by looking in the grid cell of the
+    query point and the eight around it.
+    """
+    empty = np.empty(0, np.int64)
+    if len(query) == 0 or len(targets) == 0:
+        return empty, empty, np.empty(0)
+
+    origin = targets.min(axis=0)
+    target_cells = np.floor((targets - origin) / radius).astype(np.int64)
+    # Query cells further out than one ring around the targets have no target
+    # in reach; clipping them only adds candidates the distance test drops.
+    query_cells = np.clip(
+        np.floor((query - origin) / radius), -1, target_cells.max(axis=0) + 1
+    ).astype(np.int64)
+    height = int(target_cells[:, 1].max()) + 5
+
+    target_keys = (target_cells[:, 0] + 2) * height + target_cells[:, 1] + 2
+    order = np.argsort(target_keys, kind="stable")
+    target_keys = target_keys[order]
+
+    query_index = []
+    target_index = []
+    for dx in (-1, 0, 1):
+        for dy in (-1, 0, 1):
+            keys = (query_cells[:, 0] + 2 + dx) * height + query_cells[:, 1] + 2 + dy
+            left = np.searchsorted(target_keys, keys, side="left")
+            hits = np.searchsorted(target_keys, keys, side="right") - left
+            rep = np.repeat(np.arange(len(query)), hits)
+            offset = np.arange(int(hits.sum())) - np.repeat(
+                np.cumsum(hits) - hits, hits
+            )
+            query_index.append(rep)
+            target_index.append(order[left[rep] + offset])
+
+    qi = np.concatenate(query_index)
+    ti = np.concatenate(target_index)
+    distance = np.hypot(*(targets[ti] - query[qi]).T)
+    within = distance <= radius
+    return qi[within], ti[within], distance[within]
+
+
+def nearest_points(query: np.ndarray, targets: np.ndarray, radius: float) -> np.ndarray:
+    """Nearest target point within radius of each query point, NaN where none."""
+    result = np.full((len(query), 2), np.nan)
+    qi, ti, distance = points_within(query, targets, radius)
+    if len(qi) == 0:
+        return result
+
+    best = np.lexsort((distance, qi))
+    qi, ti = qi[best], ti[best]
+    first = np.unique(qi, return_index=True)[1]
+    result[qi[first]] = targets[ti[first]]
+    return result
+
+
+def nearest_on_segments(
+    segments: SegmentSet,
+    query: np.ndarray,
+    radius: float,
+    exclude_owner: Optional[np.ndarray] = None,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    (xy, distance, owner) of the nearest point on any segment within radius of
+    each query point; NaN and owner -1 where none. Segments owned by
+    exclude_owner[i] are ignored for query point i.
+    """
+    result = np.full((len(query), 2), np.nan)
+    best_distance = np.full(len(query), np.nan)
+    best_owner = np.full(len(query), -1, dtype=np.int64)
+
+    si, qi = segments_near_points(segments, query, radius)
+    if exclude_owner is not None and len(si):
+        keep = segments.owner[si] != exclude_owner[qi]
+        si, qi = si[keep], qi[keep]
+    if len(si) == 0:
+        return result, best_distance, best_owner
+
+    start = segments.xy[si, :2]
+    delta = segments.xy[si, 2:] - start
+    t = np.clip(
+        np.einsum("ij,ij->i", query[qi] - start, delta)
+        / np.einsum("ij,ij->i", delta, delta),
+        0.0,
+        1.0,
+    )
+    nearest = start + t[:, None] * delta
+    distance = np.hypot(*(nearest - query[qi]).T)
+    within = distance <= radius
+    si, qi, nearest, distance = (
+        si[within],
+        qi[within],
+        nearest[within],
+        distance[within],
+    )
+
+    best = np.lexsort((distance, qi))
+    first = best[np.unique(qi[best], return_index=True)[1]]
+    result[qi[first]] = nearest[first]
+    best_distance[qi[first]] = distance[first]
+    best_owner[qi[first]] = segments.owner[si[first]]
+    return result, best_distance, best_owner
+
+
+class TieredSnapper:
+    """
+    What:
+        Finds where line ends snap to on a network, preferring network ends,
+        then network vertices, then any point on a network line.
+
+    How:
+        The network ends, vertices and segments are read once. snap_targets
+        answers all three tiers for a batch of points with grid lookups, so
+        one snapper serves every snapping step run against the same network.
+
+    Args:
+        network (LineStore): The lines to snap onto.
+        end_radius (float): Search radius for network ends.
+        vertex_radius (float): Search radius for network vertices.
+        edge_radius (float): Search radius for network lines.
+    """
+
+    def __init__(
+        self,
+        network: LineStore,
+        end_radius: float,
+        vertex_radius: float,
+        edge_radius: float,
+    ):
+        self.end_radius = end_radius
+        self.vertex_radius = vertex_radius
+        self.edge_radius = edge_radius
+
+        self.network_ends = network.ends()[2]
+        self.network_vertices = network.vertices()
+        self.network_segments = network.segments()
+
+    def snap_targets(self, xy: np.ndarray) -> np.ndarray:
+        """Where each point snaps to, NaN where nothing is within reach."""
+        targets = nearest_points(xy, self.network_ends, self.end_radius)
+
+        missing = np.flatnonzero(np.isnan(targets[:, 0]))
+        targets[missing] = nearest_points(
+            xy[missing], self.network_vertices, self.vertex_radius
+        )
+
+        missing = missing[np.isnan(targets[missing, 0])]
+        targets[missing] = nearest_on_segments(
+            self.network_segments, xy[missing], self.edge_radius
+        )[0]
+        return targets
+
+    def snap_dangling_ends(
+        self,
+        lines: LineStore,
+        approved_keys: Optional[set] = None,
+        tolerance: float = DEFAULT_TOLERANCE,
+    ) -> int:
+        """
+        Moves the dangling ends of lines to their snap targets, in place.
+
+        approved_keys limits snapping to ends whose grid cell, see key_set, is
+        in the set; None snaps every dangling end. Returns the number of lines
+        edited.
+        """
+        oids, which, xy = lines.ends()
+        candidates = dangle_mask(lines, tolerance)
+        if approved_keys is not None:
+            candidates &= np.fromiter(
+                (
+                    key in approved_keys
+                    for key in map(tuple, point_keys(xy, tolerance).tolist())
+                ),
+                dtype=bool,
+                count=len(xy),
+            )
+
+        index = np.flatnonzero(candidates)
+        targets = self.snap_targets(xy[index])
+        moved = ~np.isnan(targets[:, 0])
+
+        edited = set()
+        for i, target in zip(index[moved].tolist(), targets[moved].tolist()):
+            lines.move_end(int(oids[i]), int(which[i]), tuple(target))
+            edited.add(int(oids[i]))
+        return len(edited)
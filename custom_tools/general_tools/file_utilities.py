@@ -1,6 +1,6 @@
 import json
 import os
-from typing import Union
+from typing import Iterable, Union
 
 import arcpy
 
@@ -108,6 +108,30 @@ def create_feature_class(template_feature: str, new_feature: str) -> None:
     )
 
 
+_WRITTEN_GEOMETRY_OIDS: dict[str, set[int]] = {}
+
+
+def _geometry_registry_key(feature_class: str) -> str:
+    return os.path.normcase(os.path.normpath(str(feature_class)))
+
+
+def mark_geometries_written(feature_class: str, oids: Iterable[int]) -> None:
+    """
+    Records OIDs whose geometry was edited in place, so the next geometry
+    validation of feature_class re-checks them even if their coordinates are
+    unchanged.
+    """
+    written = _WRITTEN_GEOMETRY_OIDS.setdefault(
+        _geometry_registry_key(feature_class), set()
+    )
+    written.update(int(oid) for oid in oids)
+
+
+def pop_written_geometry_oids(feature_class: str) -> set[int]:
+    """Returns and clears the OIDs marked as written for feature_class."""
+    return _WRITTEN_GEOMETRY_OIDS.pop(_geometry_registry_key(feature_class), set())
+
+
 def delete_feature(input_feature):
     """Deletes a feature class if it exists."""
     if arcpy.Exists(input_feature):
@@ -1,12 +1,15 @@
 import arcpy
+import hashlib
 import numpy as np
 import os
+import time
 
+from collections import OrderedDict
 from dataclasses import dataclass
 from enum import Enum
 from math import atan2, ceil, degrees, floor
 from pathlib import Path
-from typing import Optional, Union, Dict
+from typing import Dict, Hashable, Optional, Union
 
 from composition_configs.logic_config import (
     AngleToolConfig,
@@ -22,6 +25,13 @@ from composition_configs.logic_config import (
 from composition_configs.type_defs import RasterFilePath
 
 from custom_tools.general_tools import custom_arcpy, file_utilities
+from custom_tools.general_tools.line_vertex_arrays import (
+    NO_ISSUE,
+    LineVertexArrays,
+    direction_angles,
+    points_along,
+    read_line_vertex_arrays,
+)
 from custom_tools.decorators.partition_io_decorator import partition_io_decorator
 from file_manager.n100.file_manager_rivers import River_N100
 
@@ -66,7 +76,165 @@ def remove_polygon_islands(output_feature_class):
     )
 
 
+# Coordinate fingerprints per OID of the last validation of each path, least
+# recently validated first. Paths are dropped once the rows held exceed
+# _MAX_FINGERPRINT_ROWS; a dropped path is fully validated again.
+_GEOMETRY_FINGERPRINTS: OrderedDict[str, dict[int, Optional[bytes]]] = OrderedDict()
+_MAX_FINGERPRINT_ROWS = 2_000_000
+_OID_WHERE_CHUNK_SIZE = 1000
+
+
+def _geometry_fingerprint(wkb) -> Optional[bytes]:
+    """Hash of the WKB of a geometry, covering every vertex coordinate and Z/M."""
+    if wkb is None:
+        return None
+    return hashlib.blake2b(bytes(wkb), digest_size=16).digest()
+
+
+def _store_fingerprints(path: str, fingerprints: dict[int, Optional[bytes]]) -> None:
+    _GEOMETRY_FINGERPRINTS.pop(path, None)
+    _GEOMETRY_FINGERPRINTS[path] = fingerprints
+    rows = sum(len(held) for held in _GEOMETRY_FINGERPRINTS.values())
+    while rows > _MAX_FINGERPRINT_ROWS and len(_GEOMETRY_FINGERPRINTS) > 1:
+        _, evicted = _GEOMETRY_FINGERPRINTS.popitem(last=False)
+        rows -= len(evicted)
+
+
+def _oid_where_clauses(feature_class: str, oids: set[int]) -> list[str]:
+    """Builds OID IN (...) where clauses, chunked to keep each query short."""
+    oid_field = arcpy.AddFieldDelimiters(
+        feature_class, arcpy.Describe(feature_class).OIDFieldName
+    )
+    ordered_oids = sorted(oids)
+    return [
+        f"{oid_field} IN ({', '.join(str(oid) for oid in ordered_oids[i:i + _OID_WHERE_CHUNK_SIZE])})"
+        for i in range(0, len(ordered_oids), _OID_WHERE_CHUNK_SIZE)
+    ]
+
+
+def _segments_properly_cross(a0, a1, b0, b1) -> bool:
+    """True when the segments cross at a single interior point of both."""
+
+    def _orientation(p, q, r) -> float:
+        return (q[0] - p[0]) * (r[1] - p[1]) - (q[1] - p[1]) * (r[0] - p[0])
+
+    d1 = _orientation(b0, b1, a0)
+    d2 = _orientation(b0, b1, a1)
+    d3 = _orientation(a0, a1, b0)
+    d4 = _orientation(a0, a1, b1)
+
+    return ((d1 > 0 > d2) or (d1 < 0 < d2)) and ((d3 > 0 > d4) or (d3 < 0 < d4))
+
+
+def _rings_have_proper_crossing(rings: list[list[tuple[float, float]]]) -> bool:
+    """
+    What:
+        Sweep-line test for proper crossings between the ring segments of one polygon.
+
+    How:
+        Segments are sorted by their minimum x and only tested against the
+        active segments whose x-range still overlaps. Segments that merely
+        touch at a shared vertex are not reported.
+    """
+    segments = []
+    for ring in rings:
+        for p0, p1 in zip(ring, ring[1:]):
+            if p0 == p1:
+                continue
+            segments.append(
+                (
+                    min(p0[0], p1[0]),
+                    max(p0[0], p1[0]),
+                    min(p0[1], p1[1]),
+                    max(p0[1], p1[1]),
+                    p0,
+                    p1,
+                )
+            )
+
+    segments.sort(key=lambda segment: segment[0])
+
+    active = []
+    for segment in segments:
+        active = [other for other in active if other[1] >= segment[0]]
+        for other in active:
+            if other[3] < segment[2] or segment[3] < other[2]:
+                continue
+            if _segments_properly_cross(segment[4], segment[5], other[4], other[5]):
+                return True
+        active.append(segment)
+
+    return False
+
+
+def _fast_geometry_issue(shape) -> Optional[str]:
+    """
+    In-process validity check covering null/empty geometries, ring closure and
+    polygon self-intersections. Returns the issue name, or None if valid.
+    """
+    if shape is None:
+        return "null_geometry"
+
+    if shape.partCount == 0 or shape.pointCount == 0:
+        return "empty_geometry"
+
+    if shape.type in ("point", "multipoint"):
+        return None
+
+    rings = []
+    for part in shape:
+        current = []
+        for point in part:
+            if point is None:
+                rings.append(current)
+                current = []
+                continue
+            current.append((point.X, point.Y))
+        rings.append(current)
+
+    rings = [ring for ring in rings if ring]
+    if not rings:
+        return "empty_geometry"
+
+    if shape.type != "polygon":
+        if any(len(ring) < 2 for ring in rings):
+            return "too_few_vertices"
+        return None
+
+    for ring in rings:
+        if len(ring) < 4:
+            return "degenerate_ring"
+        if ring[0] != ring[-1]:
+            return "unclosed_ring"
+
+    if _rings_have_proper_crossing(rings):
+        return "self_intersection"
+
+    return None
+
+
 class GeometryValidator:
+    """
+    What:
+        Checks and repairs feature geometries, re-validating only the rows
+        written since the feature class was last validated.
+
+    How:
+        Written rows are found by comparing a hash of the WKB of each row,
+        which covers every vertex coordinate, with the previous validation of
+        the same path, plus any OIDs marked through
+        file_utilities.mark_geometries_written. Reading WKB is much cheaper
+        than building geometry objects, so only the written rows are read as
+        geometries. Those rows are validated in process and
+        RepairGeometry only runs on the failing subset.
+
+    Why:
+        The validator runs after nearly every step in several pipelines, and
+        running CheckGeometry with an out table on whole feature classes each
+        time dominated its cost. output_table_path is kept for the existing
+        call sites; no validation tables are written.
+    """
+
     def __init__(
         self,
         input_features: Union[Dict[str, str], str] = None,
@@ -74,78 +242,123 @@ class GeometryValidator:
     ):
         self.input_features = input_features
         self.output_table_path = output_table_path
-        self.generated_out_table_path = None
         self.problematic_features = {}
+        self.problematic_oids: dict[str, set[int]] = {}
         self.non_problematic_features = {}
         self.iteration = 0
+        self.checked_count = 0
+        self.repaired_count = 0
+        self.issue_counts: dict[str, int] = {}
 
-    def check_geometry(self, logging: bool = True):
-        """Check the geometry of the input features."""
-        self.problematic_features.clear()
-
+    def _features_by_alias(self) -> dict[str, str]:
         if isinstance(self.input_features, dict):
-            for alias, path in self.input_features.items():
-                # Skip if this feature was previously validated as non-problematic
-                if alias in self.non_problematic_features:
-                    continue
+            return self.input_features
+        if isinstance(self.input_features, str):
+            return {self.input_features: self.input_features}
+        raise TypeError("input_features must be either a dictionary or a string.")
 
-                self.generated_out_table_path = (
-                    f"{self.output_table_path}_{alias}_validation_{self.iteration}"
-                )
-                result = arcpy.management.CheckGeometry(
-                    in_features=path, out_table=self.generated_out_table_path
-                )
-                problems_found = result[1] == "true"
-                if problems_found:
-                    self.problematic_features[alias] = path
-                    if logging:
-                        print(f"Geometry issues found in feature: {alias}")
-                else:
-                    self.non_problematic_features[alias] = path
-                    if logging:
-                        print(f"No geometry issues found in feature: {alias}")
-        elif isinstance(self.input_features, str):
-            if self.input_features in self.non_problematic_features:
+    def _written_oids(self, path: str) -> tuple[set[int], bool]:
+        """
+        Returns the OIDs written since the last validation of path, and whether
+        that is every row of the feature class.
+        """
+        previous = _GEOMETRY_FINGERPRINTS.get(path)
+        current: dict[int, Optional[bytes]] = {}
+
+        with arcpy.da.SearchCursor(path, ["OID@", "SHAPE@WKB"]) as cursor:
+            for oid, wkb in cursor:
+                current[oid] = _geometry_fingerprint(wkb)
+
+        _store_fingerprints(path, current)
+        marked = file_utilities.pop_written_geometry_oids(path)
+
+        if previous is None:
+            return set(current), True
+
+        written = {
+            oid
+            for oid, fingerprint in current.items()
+            if oid not in previous or previous[oid] != fingerprint
+        }
+        written.update(oid for oid in marked if oid in current)
+
+        return written, len(written) == len(current)
+
+    def _find_invalid_oids(
+        self, path: str, oids: set[int], full_scan: bool
+    ) -> set[int]:
+        invalid: set[int] = set()
+        if not oids:
+            return invalid
+
+        where_clauses = [None] if full_scan else _oid_where_clauses(path, oids)
+
+        for where_clause in where_clauses:
+            with arcpy.da.SearchCursor(
+                path, ["OID@", "SHAPE@"], where_clause=where_clause
+            ) as cursor:
+                for oid, shape in cursor:
+                    issue = _fast_geometry_issue(shape)
+                    if issue is None:
+                        continue
+                    invalid.add(oid)
+                    self.issue_counts[issue] = self.issue_counts.get(issue, 0) + 1
+
+        return invalid
+
+    def check_geometry(self, logging: bool = True):
+        """Check the geometry of the rows written since the last validation."""
+        self.problematic_features.clear()
+        self.problematic_oids.clear()
+
+        for alias, path in self._features_by_alias().items():
+            written_oids, full_scan = self._written_oids(path)
+            invalid_oids = self._find_invalid_oids(path, written_oids, full_scan)
+            self.checked_count += len(written_oids)
+
+            if invalid_oids:
+                # Keep failing rows marked so they are re-checked even if repair leaves them untouched.
+                file_utilities.mark_geometries_written(path, invalid_oids)
+                self.problematic_features[alias] = path
+                self.problematic_oids[alias] = invalid_oids
+                self.non_problematic_features.pop(alias, None)
                 if logging:
                     print(
-                        f"Feature {self.input_features} previously validated as non-problematic, skipping."
+                        f"Geometry issues found in {len(invalid_oids)} feature(s): {alias}"
                     )
-                return
-
-            self.generated_out_table_path = (
-                f"{self.output_table_path}_iter{self.iteration}"
-            )
-            result = arcpy.management.CheckGeometry(
-                in_features=self.input_features, out_table=self.generated_out_table_path
-            )
-            problems_found = result[1] == "true"
-            if problems_found:
-                self.problematic_features[self.input_features] = self.input_features
-                if logging:
-                    print(f"Geometry issues found in feature: {self.input_features}")
             else:
-                self.non_problematic_features[self.input_features] = self.input_features
+                self.non_problematic_features[alias] = path
                 if logging:
-                    print(f"No geometry issues found in feature: {self.input_features}")
-        else:
-            raise TypeError("input_features must be either a dictionary or a string.")
+                    print(
+                        f"No geometry issues found in {len(written_oids)} checked feature(s): {alias}"
+                    )
 
     def repair_geometry(
         self, delete_null="DELETE_NULL", validation_method="ESRI", logging: bool = True
     ):
-        """Repair the geometry of the features identified with issues."""
+        """Repair the geometry of the rows identified with issues."""
         if not self.problematic_features:
             print("No problematic features to repair.")
             return
 
         for alias, path in self.problematic_features.items():
-            arcpy.management.RepairGeometry(
-                in_features=path,
-                delete_null=delete_null,
-                validation_method=validation_method,
-            )
+            oids = self.problematic_oids[alias]
+
+            for where_clause in _oid_where_clauses(path, oids):
+                repair_layer = "geometry_validator_repair_layer"
+                arcpy.management.MakeFeatureLayer(
+                    in_features=path, out_layer=repair_layer, where_clause=where_clause
+                )
+                arcpy.management.RepairGeometry(
+                    in_features=repair_layer,
+                    delete_null=delete_null,
+                    validation_method=validation_method,
+                )
+                arcpy.management.Delete(repair_layer)
+
+            self.repaired_count += len(oids)
             if logging:
-                print(f"Repaired geometry for feature: {alias}")
+                print(f"Repaired geometry for {len(oids)} feature(s): {alias}")
 
     @partition_io_decorator(
         input_param_names=["input_features"],
@@ -153,7 +366,11 @@ class GeometryValidator:
     )
     def check_repair_sequence(self, input_fc: str = None, max_iterations=2):
         """Run the check-repair-check sequence until no issues remain or max iterations reached."""
+        start_time = time.perf_counter()
         self.iteration = 0
+        self.checked_count = 0
+        self.repaired_count = 0
+        self.issue_counts.clear()
 
         if input_fc:
             self.input_features = input_fc
@@ -174,12 +391,21 @@ class GeometryValidator:
                 Path(p).name for p in self.problematic_features.keys()
             )
 
+        elapsed_time = time.perf_counter() - start_time
+
         message = (
             f"\n{'====='*15}"
             f"\nCheck Repair Sequence: "
             f"status={status} | "
-            f"iterations={self.iteration}/{max_iterations}"
+            f"iterations={self.iteration}/{max_iterations} | "
+            f"checked={self.checked_count} | "
+            f"repaired={self.repaired_count} | "
+            f"time={elapsed_time:.2f}s"
         )
+        if self.issue_counts:
+            message += " | issues=" + ", ".join(
+                f"{issue}:{count}" for issue, count in sorted(self.issue_counts.items())
+            )
         if problematic_aliases:
             message += (
                 f" | remaining_issues={len(self.problematic_features)}"
@@ -190,6 +416,30 @@ class GeometryValidator:
         print(message)
 
 
+def _write_columns_by_oid(
+    lines_fc: str,
+    oids: np.ndarray,
+    values_by_field: dict[str, np.ndarray],
+) -> None:
+    """Writes one value per OID to each field, NaN as null, without reading geometry."""
+    field_names = list(values_by_field)
+    row_by_oid = {int(oid): index for index, oid in enumerate(oids)}
+
+    columns = []
+    for values in values_by_field.values():
+        column = values.astype(object)
+        column[np.isnan(values)] = None
+        columns.append(column)
+    rows = np.stack(columns, axis=1).tolist() if columns else []
+
+    with arcpy.da.UpdateCursor(lines_fc, ["OID@", *field_names]) as cursor:
+        for row in cursor:
+            index = row_by_oid.get(row[0])
+            if index is None:
+                continue
+            cursor.updateRow([row[0], *rows[index]])
+
+
 class _ConcreteLineAngleMode(str, Enum):
     WHOLE_LINE = "whole_line"
     START_SEGMENT = "start_segment"
@@ -205,6 +455,23 @@ class _RowAngleResult:
     is_supported: bool
 
 
+@dataclass(frozen=True)
+class LineAngleColumns:
+    """
+    Angles of every processed row, one array per requested mode.
+
+    oids: (r,) object id of each row.
+    angles_by_mode: (r,) angle per row, NaN where the angle is unavailable.
+    issues: (r,) issue of each row, "" for none.
+    is_supported: (r,) False where the row has an issue.
+    """
+
+    oids: np.ndarray
+    angles_by_mode: dict[LineAngleMode, np.ndarray]
+    issues: np.ndarray
+    is_supported: np.ndarray
+
+
 class LineAngleTool:
     """
     Calculate line-angle measurements for requested modes and optionally
@@ -289,6 +556,140 @@ class LineAngleTool:
 
         return None
 
+    def run_columnar(self) -> Optional[LineAngleColumns]:
+        """
+        Batch entrypoint with the same angles and issues as run().
+
+        All lines are read once into a flat vertex array and every requested
+        angle is computed for all rows with NumPy. Fields are written through
+        a cursor that never touches the geometry.
+
+        Returns:
+            LineAngleColumns for the dataset actually processed, or None when
+            return_results=False.
+        """
+        lines_fc = self._prepare_processing_feature_class()
+
+        if self.config.write_fields:
+            self._ensure_output_fields(lines_fc=lines_fc)
+
+        lines = read_line_vertex_arrays(lines_fc)
+        angles_by_mode, issues = self._calculate_angle_columns(lines=lines)
+        self._track_issue_column(issues)
+
+        if self.config.write_fields:
+            _write_columns_by_oid(
+                lines_fc=lines_fc,
+                oids=lines.oids,
+                values_by_field={
+                    self.field_name_by_mode[mode]: angles_by_mode[mode]
+                    for mode in self.resolved_modes
+                },
+            )
+
+        self._emit_summary_warnings()
+
+        if not self.config.return_results:
+            return None
+
+        public_mode_by_private_mode = {
+            _ConcreteLineAngleMode.WHOLE_LINE: LineAngleMode.WHOLE_LINE,
+            _ConcreteLineAngleMode.START_SEGMENT: LineAngleMode.START_SEGMENT,
+            _ConcreteLineAngleMode.END_SEGMENT: LineAngleMode.END_SEGMENT,
+            _ConcreteLineAngleMode.START_TO_MIDPOINT: LineAngleMode.START_TO_MIDPOINT,
+            _ConcreteLineAngleMode.END_TO_MIDPOINT: LineAngleMode.END_TO_MIDPOINT,
+        }
+
+        return LineAngleColumns(
+            oids=lines.oids,
+            angles_by_mode={
+                public_mode_by_private_mode[mode]: angles
+                for mode, angles in angles_by_mode.items()
+            },
+            issues=issues,
+            is_supported=issues == NO_ISSUE,
+        )
+
+    def _calculate_angle_columns(
+        self, lines: LineVertexArrays
+    ) -> tuple[dict[_ConcreteLineAngleMode, np.ndarray], np.ndarray]:
+        """Column version of _calculate_row_angles for every row of lines."""
+        counts = lines.vertex_counts
+        issues = lines.issues.copy()
+        issues[(issues == NO_ISSUE) & (counts < 2)] = "too_few_vertices"
+
+        valid = np.flatnonzero(issues == NO_ISSUE)
+        two_vertex = counts[valid] == 2
+        start = lines.start_index[valid]
+        end = lines.end_index[valid]
+
+        start_xy = lines.xy[start]
+        end_xy = lines.xy[end]
+
+        needs_midpoint = any(
+            mode
+            in (
+                _ConcreteLineAngleMode.START_TO_MIDPOINT,
+                _ConcreteLineAngleMode.END_TO_MIDPOINT,
+            )
+            for mode in self.resolved_modes
+        )
+        midpoint_xy = (
+            points_along(lines, fraction=0.5, rows=valid) if needs_midpoint else None
+        )
+
+        # Two-vertex lines take every angle from the single segment, reversed
+        # for the end modes, exactly as _calculate_two_vertex_result does.
+        base = direction_angles(start_xy, end_xy)
+        reversed_base = (base + 180.0) % 360.0
+
+        angles_by_mode = {}
+        for mode in self.resolved_modes:
+            if mode == _ConcreteLineAngleMode.WHOLE_LINE:
+                valid_angles = base
+            elif mode == _ConcreteLineAngleMode.START_SEGMENT:
+                valid_angles = direction_angles(start_xy, lines.xy[start + 1])
+            elif mode == _ConcreteLineAngleMode.END_SEGMENT:
+                valid_angles = direction_angles(end_xy, lines.xy[end - 1])
+            elif mode == _ConcreteLineAngleMode.START_TO_MIDPOINT:
+                valid_angles = direction_angles(start_xy, midpoint_xy)
+            else:
+                valid_angles = direction_angles(end_xy, midpoint_xy)
+
+            if mode in (
+                _ConcreteLineAngleMode.WHOLE_LINE,
+                _ConcreteLineAngleMode.START_SEGMENT,
+                _ConcreteLineAngleMode.START_TO_MIDPOINT,
+            ):
+                valid_angles = np.where(two_vertex, base, valid_angles)
+            else:
+                valid_angles = np.where(two_vertex, reversed_base, valid_angles)
+
+            angles = np.full(len(lines), np.nan)
+            angles[valid] = valid_angles
+            angles_by_mode[mode] = angles
+
+        if angles_by_mode:
+            all_missing = np.all(
+                np.isnan(np.stack(list(angles_by_mode.values()))), axis=0
+            )
+        else:
+            all_missing = np.zeros(len(lines), dtype=bool)
+
+        zero_length = np.zeros(len(lines), dtype=bool)
+        zero_length[valid] = two_vertex & np.isnan(base)
+        multivertex = np.zeros(len(lines), dtype=bool)
+        multivertex[valid] = ~two_vertex
+
+        issues[zero_length] = "zero_length_line"
+        issues[multivertex & all_missing] = "no_requested_angles_available"
+        return angles_by_mode, issues
+
+    def _track_issue_column(self, issues: np.ndarray) -> None:
+        found, counts = np.unique(issues[issues != NO_ISSUE], return_counts=True)
+        for issue, count in zip(found, counts):
+            self.issue_counts[issue] = self.issue_counts.get(issue, 0) + int(count)
+
     def _validate_config(self) -> None:
         if not self.config.angle_modes:
             raise ValueError(
@@ -630,6 +1031,23 @@ class _RowEndpointResult:
     is_supported: bool
 
 
+@dataclass(frozen=True)
+class LineEndpointColumns:
+    """
+    Endpoints of every processed row, one array per requested mode.
+
+    oids: (r,) object id of each row.
+    coordinates_by_mode: (r, 2) x and y per row, NaN where unavailable.
+    issues: (r,) issue of each row, "" for none.
+    is_supported: (r,) False where the row has an issue.
+    """
+
+    oids: np.ndarray
+    coordinates_by_mode: dict[LineEndpointMode, np.ndarray]
+    issues: np.ndarray
+    is_supported: np.ndarray
+
+
 class LineEndpointTool:
     """
     Materialize line endpoint coordinates for requested endpoint modes and
@@ -698,6 +1116,80 @@ class LineEndpointTool:
 
         return None
 
+    def run_columnar(self) -> Optional[LineEndpointColumns]:
+        """
+        Batch entrypoint with the same endpoints and issues as run(), read from
+        one flat vertex array instead of per-row geometries.
+
+        Returns:
+            LineEndpointColumns for the dataset actually processed, or None when
+            return_results=False.
+        """
+        lines_fc = self._prepare_processing_feature_class()
+
+        if self.config.write_fields:
+            self._ensure_output_fields(lines_fc=lines_fc)
+
+        lines = read_line_vertex_arrays(lines_fc)
+        issues = lines.issues.copy()
+        issues[(issues == NO_ISSUE) & (lines.vertex_counts < 2)] = "too_few_vertices"
+        valid = np.flatnonzero(issues == NO_ISSUE)
+        self._track_issue_column(issues)
+
+        coordinates_by_mode = {}
+        for mode in self.resolved_modes:
+            if mode == _ConcreteLineEndpointMode.START_POINT:
+                vertex_index = lines.start_index[valid]
+            else:
+                vertex_index = lines.end_index[valid]
+
+            coordinates = np.full((len(lines), 2), np.nan)
+            coordinates[valid] = lines.xy[vertex_index]
+            coordinates_by_mode[mode] = coordinates
+
+        if self.config.write_fields:
+            values_by_field = {}
+            for mode, coordinates in coordinates_by_mode.items():
+                x_field, y_field = self._field_names_for_mode(mode)
+                values_by_field[x_field] = coordinates[:, 0]
+                values_by_field[y_field] = coordinates[:, 1]
+
+            _write_columns_by_oid(
+                lines_fc=lines_fc,
+                oids=lines.oids,
+                values_by_field=values_by_field,
+            )
+
+        self._emit_summary_warnings()
+
+        if not self.config.return_results:
+            return None
+
+        public_mode_by_private_mode = {
+            _ConcreteLineEndpointMode.START_POINT: LineEndpointMode.START_POINT,
+            _ConcreteLineEndpointMode.END_POINT: LineEndpointMode.END_POINT,
+        }
+
+        return LineEndpointColumns(
+            oids=lines.oids,
+            coordinates_by_mode={
+                public_mode_by_private_mode[mode]: coordinates
+                for mode, coordinates in coordinates_by_mode.items()
+            },
+            issues=issues,
+            is_supported=issues == NO_ISSUE,
+        )
+
+    def _field_names_for_mode(self, mode: _ConcreteLineEndpointMode) -> tuple[str, str]:
+        if mode == _ConcreteLineEndpointMode.START_POINT:
+            return self.config.field_names.start_x, self.config.field_names.start_y
+        return self.config.field_names.end_x, self.config.field_names.end_y
+
+    def _track_issue_column(self, issues: np.ndarray) -> None:
+        found, counts = np.unique(issues[issues != NO_ISSUE], return_counts=True)
+        for issue, count in zip(found, counts):
+            self.issue_counts[issue] = self.issue_counts.get(issue, 0) + int(count)
+
     def _validate_config(self) -> None:
         if not self.config.endpoint_modes:
             raise ValueError(
@@ -1469,6 +1961,205 @@ def local_line_angle_at_xy(
     return angle
 
 
+@dataclass(frozen=True)
+class LineMeasureArrays:
+    """
+    Vertex arrays of one single-part polyline, for repeated measure lookups.
+
+    xy: (n, 2) vertices.
+    cumulative: (n,) planar distance along the line to each vertex.
+    bearings: (n - 1,) direction angle [0, 360) of each segment, NaN if zero length.
+    meters_per_unit: of the polyline spatial reference, 1.0 if unknown.
+    """
+
+    xy: np.ndarray
+    cumulative: np.ndarray
+    bearings: np.ndarray
+    meters_per_unit: float
+
+    @property
+    def length(self) -> float:
+        return float(self.cumulative[-1])
+
+    @property
+    def vertex_count(self) -> int:
+        return len(self.xy)
+
+    @classmethod
+    def from_polyline(cls, polyline) -> Optional["LineMeasureArrays"]:
+        """
+        None for geometries local_line_angle_at_xy does not support, and for
+        true curves, whose arcs the vertices alone do not describe.
+        """
+        if polyline is None or getattr(polyline, "isMultipart", False):
+            return None
+        if getattr(polyline, "hasCurves", False):
+            return None
+
+        xy = np.asarray(
+            [(point.X, point.Y) for point in polyline.getPart(0) if point is not None],
+            dtype=np.float64,
+        ).reshape(-1, 2)
+        if len(xy) < 2:
+            return None
+
+        delta = np.diff(xy, axis=0)
+        bearings = np.degrees(np.arctan2(delta[:, 1], delta[:, 0])) % 360.0
+        bearings[(delta[:, 0] == 0) & (delta[:, 1] == 0)] = np.nan
+
+        sr = getattr(polyline, "spatialReference", None)
+        meters_per_unit = getattr(sr, "metersPerUnit", None) if sr is not None else None
+
+        return cls(
+            xy=xy,
+            cumulative=np.concatenate(([0.0], np.cumsum(np.hypot(*delta.T)))),
+            bearings=bearings,
+            meters_per_unit=float(meters_per_unit) if meters_per_unit else 1.0,
+        )
+
+    def measure_at(self, x: float, y: float) -> float:
+        """Distance along the line to the point on it nearest (x, y)."""
+        start = self.xy[:-1]
+        delta = self.xy[1:] - start
+        squared_length = np.einsum("ij,ij->i", delta, delta)
+        t = np.divide(
+            np.einsum("ij,ij->i", np.array([x, y]) - start, delta),
+            squared_length,
+            out=np.zeros_like(squared_length),
+            where=squared_length > 0,
+        )
+        t = np.clip(t, 0.0, 1.0)
+        offset = start + t[:, None] * delta - (x, y)
+        nearest = int(np.argmin(np.einsum("ij,ij->i", offset, offset)))
+        return float(
+            self.cumulative[nearest]
+            + t[nearest] * (self.cumulative[nearest + 1] - self.cumulative[nearest])
+        )
+
+    def _segment_at(self, distance: float) -> int:
+        index = int(np.searchsorted(self.cumulative, distance, side="left"))
+        return min(max(index, 1), self.vertex_count - 1) - 1
+
+    def position_at(self, distance: float) -> tuple[float, float]:
+        """Point at distance along the line, clamped to its ends."""
+        segment = self._segment_at(distance)
+        d0, d1 = self.cumulative[segment], self.cumulative[segment + 1]
+        ratio = 0.0 if d1 <= d0 else min(max((distance - d0) / (d1 - d0), 0.0), 1.0)
+        x0, y0 = self.xy[segment]
+        x1, y1 = self.xy[segment + 1]
+        return x0 + ratio * (x1 - x0), y0 + ratio * (y1 - y0)
+
+    def chord_angle(self, start: float, end: float) -> Optional[float]:
+        """Direction angle from the point at start to the point at end."""
+        # A chord within one segment runs along it, so its bearing is known.
+        segment = self._segment_at(end)
+        if (
+            end > start
+            and segment == self._segment_at(start)
+            and not np.isnan(self.bearings[segment])
+        ):
+            return float(self.bearings[segment])
+
+        x0, y0 = self.position_at(start)
+        x1, y1 = self.position_at(end)
+        if x0 == x1 and y0 == y1:
+            return None
+        return degrees(atan2(y1 - y0, x1 - x0)) % 360.0
+
+    def local_angle(
+        self,
+        x: float,
+        y: float,
+        desired_half_window_m: float,
+        min_half_window_percent: float = 0.01,
+        max_half_window_percent: float = 0.25,
+    ) -> Optional[float]:
+        """Same result as local_line_angle_at_xy, from the arrays alone."""
+        length = self.length
+        length_m = length * self.meters_per_unit
+        if length <= 0.0 or length_m <= 0.0:
+            return None
+
+        m = self.measure_at(x, y) / length
+
+        half_p = float(desired_half_window_m) / float(length_m)
+        half_p = max(
+            float(min_half_window_percent),
+            min(float(max_half_window_percent), half_p),
+        )
+        start = max(0.0, m - half_p)
+        end = min(1.0, m + half_p)
+
+        angle = None
+        if (end - start) >= 1e-9:
+            angle = self.chord_angle(start * length, end * length)
+        if angle is None:
+            angle = self.chord_angle(0.0, length)
+        return angle
+
+
+class LineMeasureCache:
+    """
+    What:
+        LineMeasureArrays of many polylines, built once per line and reused for
+        every local angle asked of it.
+
+    How:
+        Lines are kept in least recently used order. When the vertices held
+        exceed max_vertices, the least recently used lines are dropped and
+        rebuilt from their polyline if asked for again. Polylines the arrays do
+        not support fall back to local_line_angle_at_xy.
+
+    Args:
+        max_vertices (int): Vertex budget of the cache.
+    """
+
+    def __init__(self, max_vertices: int = 2_000_000):
+        self.max_vertices = max_vertices
+        self._arrays: OrderedDict[Hashable, Optional[LineMeasureArrays]] = OrderedDict()
+        self._vertex_count = 0
+
+    def __len__(self) -> int:
+        return len(self._arrays)
+
+    def arrays(self, key: Hashable, polyline) -> Optional[LineMeasureArrays]:
+        if key in self._arrays:
+            self._arrays.move_to_end(key)
+            return self._arrays[key]
+
+        arrays = LineMeasureArrays.from_polyline(polyline)
+        self._arrays[key] = arrays
+        if arrays is not None:
+            self._vertex_count += arrays.vertex_count
+
+        while self._vertex_count > self.max_vertices and len(self._arrays) > 1:
+            _, evicted = self._arrays.popitem(last=False)
+            if evicted is not None:
+                self._vertex_count -= evicted.vertex_count
+        return arrays
+
+    def local_line_angle_at_xy(
+        self,
+        *,
+        key: Hashable,
+        polyline,
+        x: float,
+        y: float,
+        desired_half_window_m: float,
+    ) -> Optional[float]:
+        arrays = self.arrays(key, polyline)
+        if arrays is None:
+            return local_line_angle_at_xy(
+                polyline=polyline,
+                x=x,
+                y=y,
+                desired_half_window_m=desired_half_window_m,
+            )
+        return arrays.local_angle(
+            x=float(x), y=float(y), desired_half_window_m=desired_half_window_m
+        )
+
+
 def build_raster_handle(
     raster_path: str,
     clip_xmin: Optional[float] = None,
@@ -2325,3 +3016,5 @@ class LineZOrientTool:
 
                 row[1] = arcpy.Polyline(reversed_parts, polyline.spatialReference)
                 cursor.updateRow(row)
+
+        file_utilities.mark_geometries_written(self.config.input_lines, oids_to_flip)
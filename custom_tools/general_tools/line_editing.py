@@ -0,0 +1,410 @@
+"""
+Bulk edits of line geometries on flat coordinate arrays.
+
+Lines are read once into LineParts, one (n, 2) vertex array with offsets per
+part, and edited for all rows at once: vertices are moved through a remapping
+table looked up by rounded coordinates, and lines are cut into pieces of a
+fixed length. Z and M values of Z- or M-aware lines are carried along the
+vertices. Only writing the results back builds arcpy geometries.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Iterable, Mapping, Optional, Sequence
+
+import arcpy
+import numpy as np
+
+from custom_tools.general_tools import file_utilities
+
+# Moved vertices closer than this to the previous vertex of their part are dropped.
+DUPLICATE_TOLERANCE = 1e-9
+
+
+@dataclass(frozen=True)
+class LineParts:
+    """
+    Polyline parts as one flat vertex array.
+
+    oids: (r,) object id of every row.
+    attributes: (r,) tuple of field values read with every row.
+    xy: (n, 2) vertices of all parts, part after part.
+    offsets: (p + 1,) part i owns xy[offsets[i]:offsets[i + 1]].
+    part_row: (p,) row index of every part.
+    zm: (n, 2) Z and M of every vertex, NaN where unset, or None for lines
+        read without Z and M.
+    has_z / has_m: whether the lines were read from a Z- or M-aware class.
+    """
+
+    oids: np.ndarray
+    attributes: list
+    xy: np.ndarray
+    offsets: np.ndarray
+    part_row: np.ndarray
+    zm: Optional[np.ndarray] = None
+    has_z: bool = False
+    has_m: bool = False
+
+    def part_vertices(self, part: int) -> np.ndarray:
+        return self.xy[self.offsets[part] : self.offsets[part + 1]]
+
+    def part_zm(self, part: int) -> Optional[np.ndarray]:
+        if self.zm is None:
+            return None
+        return self.zm[self.offsets[part] : self.offsets[part + 1]]
+
+    def row_parts(self) -> dict[int, list[int]]:
+        """Part indexes of every row that has parts."""
+        parts: dict[int, list[int]] = {}
+        for part, row in enumerate(self.part_row.tolist()):
+            parts.setdefault(row, []).append(part)
+        return parts
+
+
+def read_line_parts(
+    feature_class: str,
+    fields: Sequence[str] = (),
+    oids: Optional[set[int]] = None,
+) -> LineParts:
+    """
+    Reads the parts and fields of every row of feature_class, or only of the
+    rows in oids, in one cursor pass. Rows without geometry are skipped. Z and
+    M are read too when feature_class is Z- or M-aware.
+    """
+    description = arcpy.Describe(feature_class)
+    has_z, has_m = bool(description.hasZ), bool(description.hasM)
+    row_oids: list[int] = []
+    attributes: list[tuple] = []
+    coords: list[tuple[float, float]] = []
+    zm: list[tuple[float, float]] = []
+    counts: list[int] = [0]
+    part_row: list[int] = []
+
+    with arcpy.da.SearchCursor(feature_class, ["OID@", "SHAPE@", *fields]) as cursor:
+        for oid, shape, *values in cursor:
+            if shape is None or (oids is not None and oid not in oids):
+                continue
+            row = len(row_oids)
+            row_oids.append(oid)
+            attributes.append(tuple(values))
+            for part in shape:
+                points = [point for point in part if point is not None]
+                coords.extend((point.X, point.Y) for point in points)
+                if has_z or has_m:
+                    zm.extend(
+                        (
+                            point.Z if has_z and point.Z is not None else np.nan,
+                            point.M if has_m and point.M is not None else np.nan,
+                        )
+                        for point in points
+                    )
+                counts.append(len(points))
+                part_row.append(row)
+
+    return LineParts(
+        oids=np.asarray(row_oids, dtype=np.int64),
+        attributes=attributes,
+        xy=np.asarray(coords, dtype=np.float64).reshape(-1, 2),
+        offsets=np.cumsum(counts, dtype=np.int64),
+        part_row=np.asarray(part_row, dtype=np.int64),
+        zm=(
+            np.asarray(zm, dtype=np.float64).reshape(-1, 2) if has_z or has_m else None
+        ),
+        has_z=has_z,
+        has_m=has_m,
+    )
+
+
+def _as_records(keys: np.ndarray) -> np.ndarray:
+    """(n, 2) int64 keys as (n,) records that sort and compare by x, then y."""
+    return np.ascontiguousarray(keys).view([("x", np.int64), ("y", np.int64)]).ravel()
+
+
+def rounded_keys(xy: np.ndarray, decimals: int = 6) -> np.ndarray:
+    """Coordinates rounded to decimals, as (n, 2) integers in units of 10**-decimals."""
+    return np.round(xy * 10.0**decimals).astype(np.int64)
+
+
+def lookup_vertices(
+    xy: np.ndarray, source_xy: np.ndarray, decimals: int = 6
+) -> np.ndarray:
+    """
+    Index into source_xy of the point every vertex of xy equals when both are
+    rounded to decimals, or -1 where there is none.
+    """
+    if len(source_xy) == 0 or len(xy) == 0:
+        return np.full(len(xy), -1, dtype=np.int64)
+
+    source = _as_records(rounded_keys(source_xy, decimals))
+    order = np.argsort(source, kind="stable")
+    source = source[order]
+    query = _as_records(rounded_keys(xy, decimals))
+
+    position = np.minimum(np.searchsorted(source, query), len(source) - 1)
+    found = source[position] == query
+    return np.where(found, order[position], -1)
+
+
+def remap_vertices(
+    lines: LineParts,
+    source_xy: np.ndarray,
+    target_xy: np.ndarray,
+    decimals: int = 6,
+    tolerance: float = DUPLICATE_TOLERANCE,
+) -> tuple[LineParts, np.ndarray]:
+    """
+    What:
+        Moves every vertex found in source_xy to the matching row of target_xy
+        and returns (edited lines, changed), where changed marks the rows that
+        had a vertex moved and still have a valid part.
+
+    How:
+        Vertices are matched on coordinates rounded to decimals. After moving,
+        a vertex within tolerance of the previous vertex in its part is
+        dropped, and parts left with fewer than two vertices are dropped.
+        Rows left with no parts are not changed and keep all their parts.
+        Vertices keep their own Z and M when moved.
+    """
+    match = lookup_vertices(lines.xy, source_xy, decimals)
+    moved = match >= 0
+    xy = lines.xy.copy()
+    xy[moved] = target_xy[match[moved]]
+
+    counts = np.diff(lines.offsets)
+    vertex_part = np.repeat(np.arange(len(counts)), counts)
+    keep = np.ones(len(xy), dtype=bool)
+    if len(xy) > 1:
+        step = np.abs(np.diff(xy, axis=0)).max(axis=1)
+        same_part = vertex_part[1:] == vertex_part[:-1]
+        keep[1:] = ~same_part | (step > tolerance)
+
+    kept_counts = np.bincount(vertex_part[keep], minlength=len(counts))
+    valid_part = kept_counts >= 2
+    row_count = len(lines.oids)
+    row_moved = np.zeros(row_count, dtype=bool)
+    row_moved[lines.part_row[vertex_part[moved]]] = True
+    row_valid = np.zeros(row_count, dtype=bool)
+    row_valid[lines.part_row[valid_part]] = True
+    changed = row_moved & row_valid
+
+    # Rows that are not changed keep their original parts.
+    part_changed = changed[lines.part_row]
+    keep_part = np.where(part_changed, valid_part, True)
+    vertex_changed = part_changed[vertex_part]
+    take = keep_part[vertex_part] & np.where(vertex_changed, keep, True)
+
+    new_xy = np.where(vertex_changed[:, None], xy, lines.xy)[take]
+    new_counts = np.bincount(vertex_part[take], minlength=len(counts))[keep_part]
+    edited = LineParts(
+        oids=lines.oids,
+        attributes=lines.attributes,
+        xy=new_xy,
+        offsets=np.concatenate(([0], np.cumsum(new_counts))).astype(np.int64),
+        part_row=lines.part_row[keep_part],
+        zm=None if lines.zm is None else lines.zm[take],
+        has_z=lines.has_z,
+        has_m=lines.has_m,
+    )
+    return edited, changed
+
+
+def remap_line_vertices(
+    feature_class: str,
+    mapping: Mapping[tuple[float, float], tuple[float, float]],
+    oids: Optional[set[int]] = None,
+    decimals: int = 6,
+) -> set[int]:
+    """
+    Moves the vertices of feature_class that are keys of mapping, rounded to
+    decimals, to their mapped coordinates, for the rows in oids or all rows.
+    Only rows with a moved vertex are written. Returns their OIDs.
+    """
+    if not mapping:
+        return set()
+
+    lines = read_line_parts(feature_class, oids=oids)
+    source_xy = np.asarray(list(mapping.keys()), dtype=np.float64).reshape(-1, 2)
+    target_xy = np.asarray(list(mapping.values()), dtype=np.float64).reshape(-1, 2)
+    edited, changed = remap_vertices(lines, source_xy, target_xy, decimals)
+
+    changed_rows = np.nonzero(changed)[0]
+    if len(changed_rows) == 0:
+        return set()
+
+    row_parts = edited.row_parts()
+    row_of_oid = {int(edited.oids[row]): int(row) for row in changed_rows}
+    spatial_reference = arcpy.Describe(feature_class).spatialReference
+
+    with arcpy.da.UpdateCursor(feature_class, ["OID@", "SHAPE@"]) as cursor:
+        for oid, _ in cursor:
+            row = row_of_oid.get(oid)
+            if row is None:
+                continue
+            cursor.updateRow(
+                [
+                    oid,
+                    polyline_from_parts(
+                        [edited.part_vertices(part) for part in row_parts[row]],
+                        spatial_reference,
+                        zm_parts=(
+                            None
+                            if edited.zm is None
+                            else [edited.part_zm(part) for part in row_parts[row]]
+                        ),
+                        has_z=edited.has_z,
+                        has_m=edited.has_m,
+                    ),
+                ]
+            )
+    return set(row_of_oid)
+
+
+def polyline_from_parts(
+    parts: Iterable[np.ndarray],
+    spatial_reference: Any,
+    zm_parts: Optional[Iterable[np.ndarray]] = None,
+    has_z: bool = False,
+    has_m: bool = False,
+) -> arcpy.Polyline:
+    """
+    Polyline of the (k, 2) vertex arrays in parts. zm_parts holds the matching
+    (k, 2) Z and M arrays for Z- or M-aware output, NaN where unset.
+    """
+    if zm_parts is None:
+        return arcpy.Polyline(
+            arcpy.Array(
+                [
+                    arcpy.Array([arcpy.Point(x, y) for x, y in vertices.tolist()])
+                    for vertices in parts
+                ]
+            ),
+            spatial_reference,
+        )
+
+    def point(x, y, z, m):
+        return arcpy.Point(
+            x,
+            y,
+            z if has_z and not np.isnan(z) else None,
+            m if has_m and not np.isnan(m) else None,
+        )
+
+    return arcpy.Polyline(
+        arcpy.Array(
+            [
+                arcpy.Array(
+                    [
+                        point(x, y, z, m)
+                        for (x, y), (z, m) in zip(vertices.tolist(), zm.tolist())
+                    ]
+                )
+                for vertices, zm in zip(parts, zm_parts)
+            ]
+        ),
+        spatial_reference,
+        has_z,
+        has_m,
+    )
+
+
+def split_parts_at_interval(
+    lines: LineParts, interval: float
+) -> list[tuple[int, np.ndarray, Optional[np.ndarray]]]:
+    """
+    What:
+        Cuts every part into pieces of interval length along the line, plus a
+        shorter last piece for the rest, and returns (row, vertices, Z and M)
+        per piece, Z and M being None for lines read without them. Parts no
+        longer than interval are returned whole.
+
+    How:
+        Cumulative lengths are computed for all vertices at once. For each part
+        the cut distances are looked up with one searchsorted, the cut points
+        are interpolated, and each piece is its two cut points with the
+        original vertices strictly between them. Z and M of the cut points
+        are interpolated the same way.
+    """
+    pieces: list[tuple[int, np.ndarray, Optional[np.ndarray]]] = []
+    if len(lines.xy) == 0:
+        return pieces
+
+    step = np.hypot(*np.diff(lines.xy, axis=0).T)
+    running = np.concatenate(([0.0], np.cumsum(step)))
+
+    for part, row in enumerate(lines.part_row.tolist()):
+        start, stop = int(lines.offsets[part]), int(lines.offsets[part + 1])
+        if stop - start < 2:
+            continue
+        xy = lines.xy[start:stop]
+        zm = lines.part_zm(part)
+        along = running[start:stop] - running[start]
+        length = float(along[-1])
+        if length <= interval:
+            pieces.append((row, xy, zm))
+            continue
+
+        cuts = np.arange(0.0, length, interval)
+        cuts = np.append(cuts, length)
+        after = np.clip(np.searchsorted(along, cuts, side="left"), 1, len(along) - 1)
+        before = after - 1
+        span = along[after] - along[before]
+        ratio = np.divide(
+            cuts - along[before], span, out=np.zeros_like(span), where=span > 0
+        )
+        points = xy[before] + ratio[:, None] * (xy[after] - xy[before])
+        if zm is not None:
+            zm_points = zm[before] + ratio[:, None] * (zm[after] - zm[before])
+
+        first_inside = np.searchsorted(along, cuts, side="right")
+        last_inside = np.searchsorted(along, cuts, side="left")
+        for i in range(len(cuts) - 1):
+            inner = slice(first_inside[i], last_inside[i + 1])
+            pieces.append(
+                (
+                    row,
+                    np.vstack((points[i], xy[inner], points[i + 1])),
+                    (
+                        None
+                        if zm is None
+                        else np.vstack((zm_points[i], zm[inner], zm_points[i + 1]))
+                    ),
+                )
+            )
+    return pieces
+
+
+def write_line_pieces(
+    pieces: Iterable[tuple[int, np.ndarray, Optional[np.ndarray]]],
+    lines: LineParts,
+    output_feature: str,
+    template_feature: str,
+    fields: Sequence[str],
+) -> None:
+    """
+    Creates output_feature from template_feature and inserts every piece as a
+    singlepart line carrying the attributes its row was read with. Pieces keep
+    their Z and M when output_feature is Z- or M-aware like the template.
+    """
+    file_utilities.create_feature_class(
+        template_feature=template_feature, new_feature=output_feature
+    )
+    description = arcpy.Describe(output_feature)
+    spatial_reference = description.spatialReference
+    has_z, has_m = bool(description.hasZ), bool(description.hasM)
+    with arcpy.da.InsertCursor(output_feature, ["SHAPE@", *fields]) as cursor:
+        for row, vertices, zm in pieces:
+            if (has_z or has_m) and zm is None:
+                zm = np.full((len(vertices), 2), np.nan)
+            cursor.insertRow(
+                [
+                    polyline_from_parts(
+                        [vertices],
+                        spatial_reference,
+                        zm_parts=[zm] if has_z or has_m else None,
+                        has_z=has_z,
+                        has_m=has_m,
+                    ),
+                    *lines.attributes[row],
+                ]
+            )
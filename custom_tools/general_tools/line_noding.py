@@ -0,0 +1,381 @@
+"""
+In-process planar noding and attribute-grouped dissolve of lines.
+
+Produces the same network as PairwiseDissolve (SINGLE_PART) followed by
+FeatureToLine: every line is split where it meets or crosses another line,
+lines are merged again through vertices where exactly two edges with the same
+attribute key meet and no line with another key ends, and each resulting
+singlepart edge keeps its key. Where lines with different keys overlap, the
+shared piece is kept once with the key of the first line, as FeatureToLine
+keeps the attributes of one of them.
+Segments are flattened into NumPy arrays, candidate pairs come from the grid
+in segment_crossings, and intersections are found with vectorized line
+equations. Only walking the merged chains is done edge by edge.
+"""
+
+from __future__ import annotations
+
+import os
+from collections import Counter, defaultdict
+from typing import Hashable, Iterable, Optional, Sequence
+
+import arcpy
+import numpy as np
+
+from custom_tools.general_tools.segment_crossings import (
+    SegmentSet,
+    segment_pairs_within,
+    segments_from_parts,
+)
+
+# Points closer than this in map units are the same node, the default XY
+# tolerance of the feature classes used here.
+NODE_TOLERANCE = 0.001
+
+# arcpy Field.type to the field_type expected by AddField.
+_FIELD_TYPES = {
+    "String": "TEXT",
+    "Integer": "LONG",
+    "SmallInteger": "SHORT",
+    "BigInteger": "BIGINTEGER",
+    "Double": "DOUBLE",
+    "Single": "FLOAT",
+    "Date": "DATE",
+    "GUID": "GUID",
+}
+
+Key = tuple[Hashable, ...]
+Edge = tuple[Key, list[tuple[float, float]]]
+
+
+def _cross(ax, ay, bx, by):
+    return ax * by - ay * bx
+
+
+def _split_points(
+    segments: SegmentSet, tolerance: float
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Returns (segment, x, y, foreign) for every point a segment must be split
+    at: its own end points and every point where another segment meets it.
+    foreign marks the points where a segment with another key meets it.
+    """
+    xy = segments.xy
+    seg = [np.arange(len(xy)), np.arange(len(xy))]
+    px = [xy[:, 0], xy[:, 2]]
+    py = [xy[:, 1], xy[:, 3]]
+    foreign = [np.zeros(len(xy), dtype=bool), np.zeros(len(xy), dtype=bool)]
+
+    ia, ib = segment_pairs_within(segments)
+    if len(ia) == 0:
+        return (
+            np.concatenate(seg),
+            np.concatenate(px),
+            np.concatenate(py),
+            np.concatenate(foreign),
+        )
+    other_key = segments.owner[ia] != segments.owner[ib]
+
+    p1x, p1y, p2x, p2y = xy[ia].T
+    q1x, q1y, q2x, q2y = xy[ib].T
+    rx, ry = p2x - p1x, p2y - p1y
+    sx, sy = q2x - q1x, q2y - q1y
+    r_len = np.hypot(rx, ry)
+    s_len = np.hypot(sx, sy)
+    wx, wy = q1x - p1x, q1y - p1y
+    denom = _cross(rx, ry, sx, sy)
+
+    parallel = np.abs(denom) <= 1e-12 * r_len * s_len
+    safe = np.where(parallel, 1.0, denom)
+    t = _cross(wx, wy, sx, sy) / safe
+    u = _cross(wx, wy, rx, ry) / safe
+    t_tol = tolerance / r_len
+    u_tol = tolerance / s_len
+    meets = (
+        ~parallel & (t >= -t_tol) & (t <= 1 + t_tol) & (u >= -u_tol) & (u <= 1 + u_tol)
+    )
+
+    # Where the meeting point is an end point of either segment, that vertex is
+    # used exactly so it falls on the same node as the lines ending there.
+    x = p1x + t * rx
+    y = p1y + t * ry
+    for near, ex, ey in (
+        (np.abs(t) <= t_tol, p1x, p1y),
+        (np.abs(t - 1) <= t_tol, p2x, p2y),
+        (np.abs(u) <= u_tol, q1x, q1y),
+        (np.abs(u - 1) <= u_tol, q2x, q2y),
+    ):
+        x = np.where(near, ex, x)
+        y = np.where(near, ey, y)
+    seg += [ia[meets], ib[meets]]
+    px += [x[meets], x[meets]]
+    py += [y[meets], y[meets]]
+    foreign += [other_key[meets], other_key[meets]]
+
+    # Collinear overlaps: each segment is split at the end points of the other
+    # that lie inside it.
+    collinear = parallel & (np.abs(_cross(wx, wy, rx, ry)) <= tolerance * r_len)
+    for own, ox, oy, dx, dy, length, ends in (
+        (ia, p1x, p1y, rx, ry, r_len, ((q1x, q1y), (q2x, q2y))),
+        (ib, q1x, q1y, sx, sy, s_len, ((p1x, p1y), (p2x, p2y))),
+    ):
+        for ex, ey in ends:
+            along = ((ex - ox) * dx + (ey - oy) * dy) / length
+            inside = collinear & (along > tolerance) & (along < length - tolerance)
+            seg.append(own[inside])
+            px.append(ex[inside])
+            py.append(ey[inside])
+            foreign.append(other_key[inside])
+
+    return (
+        np.concatenate(seg),
+        np.concatenate(px),
+        np.concatenate(py),
+        np.concatenate(foreign),
+    )
+
+
+def _noded_segments(
+    segments: SegmentSet, tolerance: float
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Splits every segment at its split points and returns (node_xy, from_node,
+    to_node, key, foreign_node) for the pieces. Pieces shared by overlapping
+    lines are kept once, with the key of the first line. foreign_node marks
+    the nodes where lines with different keys meet.
+    """
+    seg, x, y, foreign = _split_points(segments, tolerance)
+    start = segments.xy[seg, :2]
+    direction = segments.xy[seg, 2:] - start
+    along = (x - start[:, 0]) * direction[:, 0] + (y - start[:, 1]) * direction[:, 1]
+    order = np.lexsort((along, seg))
+    seg, x, y, foreign = seg[order], x[order], y[order], foreign[order]
+
+    cells = np.column_stack((np.round(x / tolerance), np.round(y / tolerance))).astype(
+        np.int64
+    )
+    _, first, node = np.unique(cells, axis=0, return_index=True, return_inverse=True)
+    node = node.ravel()
+    node_xy = np.column_stack((x[first], y[first]))
+    foreign_node = np.zeros(len(node_xy), dtype=bool)
+    foreign_node[node[foreign]] = True
+
+    same_segment = seg[:-1] == seg[1:]
+    from_node = node[:-1][same_segment]
+    to_node = node[1:][same_segment]
+    key = segments.owner[seg[:-1][same_segment]]
+
+    keep = from_node != to_node
+    from_node, to_node, key = from_node[keep], to_node[keep], key[keep]
+
+    pair = np.column_stack(
+        (np.minimum(from_node, to_node), np.maximum(from_node, to_node))
+    )
+    _, unique_index = np.unique(pair, axis=0, return_index=True)
+    unique_index.sort()
+    return (
+        node_xy,
+        from_node[unique_index],
+        to_node[unique_index],
+        key[unique_index],
+        foreign_node,
+    )
+
+
+def _merge_chains(
+    node_count: int,
+    from_node: np.ndarray,
+    to_node: np.ndarray,
+    key: np.ndarray,
+    stops: Optional[np.ndarray] = None,
+) -> list[tuple[int, list[int]]]:
+    """
+    Joins edges into (key, node path) chains through nodes where exactly two
+    edges with the same key meet, except at the nodes marked in stops. Closed
+    rings of such nodes become one chain that starts and ends on the same node.
+    """
+    ends = np.concatenate((from_node, to_node))
+    edge_of_end = np.concatenate((np.arange(len(key)), np.arange(len(key))))
+    order = np.argsort(ends, kind="stable")
+    incident = edge_of_end[order]
+    offsets = np.concatenate(([0], np.cumsum(np.bincount(ends, minlength=node_count))))
+
+    degree = np.diff(offsets)
+    through = np.zeros(node_count, dtype=bool)
+    two = np.nonzero(degree == 2)[0]
+    through[two] = key[incident[offsets[two]]] == key[incident[offsets[two] + 1]]
+    if stops is not None:
+        through &= ~stops
+
+    from_list = from_node.tolist()
+    to_list = to_node.tolist()
+    incident_list = incident.tolist()
+    offset_list = offsets.tolist()
+    through_list = through.tolist()
+    visited = [False] * len(key)
+    chains: list[tuple[int, list[int]]] = []
+
+    def walk(start: int, edge: int) -> list[int]:
+        path = [start]
+        node = start
+        while True:
+            visited[edge] = True
+            node = to_list[edge] if from_list[edge] == node else from_list[edge]
+            path.append(node)
+            if not through_list[node]:
+                return path
+            first = incident_list[offset_list[node]]
+            edge = first if first != edge else incident_list[offset_list[node] + 1]
+            if visited[edge]:
+                return path
+
+    for node in np.nonzero((degree > 0) & ~through)[0].tolist():
+        for i in range(offset_list[node], offset_list[node + 1]):
+            edge = incident_list[i]
+            if not visited[edge]:
+                chains.append((int(key[edge]), walk(node, edge)))
+
+    for edge in range(len(key)):
+        if not visited[edge]:
+            chains.append((int(key[edge]), walk(from_list[edge], edge)))
+    return chains
+
+
+def node_lines(
+    rows: Iterable[tuple[Key, Sequence[Sequence[tuple[float, float]]]]],
+    tolerance: float = NODE_TOLERANCE,
+) -> list[Edge]:
+    """
+    What:
+        Nodes and dissolves (key, parts) rows, returning singlepart (key,
+        vertices) edges.
+
+    How:
+        All parts are flattened into one SegmentSet whose owner is the index of
+        the row key. Segments are split at every point where they meet another
+        segment, the pieces get nodes by rounding to tolerance, duplicate
+        pieces from overlapping lines are dropped, and the pieces are merged
+        into chains through nodes joining exactly two pieces of the same key.
+        Nodes where a line with another key meets the line, such as the end
+        of a collinear overlap, are never merged through, as FeatureToLine
+        splits there.
+
+    Args:
+        rows: (key, parts) pairs, parts as sequences of (x, y) vertices.
+        tolerance: Distance below which points are the same node.
+    """
+    key_index: dict[Key, int] = {}
+    indexed_rows = []
+    for key, parts in rows:
+        indexed_rows.append((key_index.setdefault(key, len(key_index)), parts))
+    segments = segments_from_parts(indexed_rows)
+    if len(segments) == 0:
+        return []
+
+    keys = list(key_index)
+    node_xy, from_node, to_node, key, foreign_node = _noded_segments(
+        segments, tolerance
+    )
+    chains = _merge_chains(len(node_xy), from_node, to_node, key, foreign_node)
+    return [
+        (keys[key_id], [tuple(point) for point in node_xy[path].tolist()])
+        for key_id, path in chains
+    ]
+
+
+def write_edges(
+    edges: Iterable[Edge],
+    output_feature: str,
+    template_feature: str,
+    fields: Sequence[str],
+) -> None:
+    """
+    Creates output_feature as a polyline feature class with the spatial
+    reference of template_feature and its definitions of fields, and inserts
+    edges into it.
+    """
+    spatial_reference = arcpy.Describe(template_feature).spatialReference
+    out_path, out_name = os.path.split(output_feature)
+    arcpy.management.CreateFeatureclass(
+        out_path=out_path,
+        out_name=out_name,
+        geometry_type="POLYLINE",
+        spatial_reference=spatial_reference,
+    )
+
+    definitions = {
+        field.name.lower(): field for field in arcpy.ListFields(template_feature)
+    }
+    for name in fields:
+        field = definitions[name.lower()]
+        arcpy.management.AddField(
+            in_table=output_feature,
+            field_name=field.name,
+            field_type=_FIELD_TYPES.get(field.type, "TEXT"),
+            field_length=field.length if field.type == "String" else None,
+        )
+
+    with arcpy.da.InsertCursor(output_feature, ["SHAPE@", *fields]) as cursor:
+        for key, vertices in edges:
+            shape = arcpy.Polyline(
+                arcpy.Array([arcpy.Point(x, y) for x, y in vertices]),
+                spatial_reference,
+            )
+            cursor.insertRow([shape, *key])
+
+
+def _network_summary(
+    feature: str, fields: Sequence[str], tolerance: float
+) -> tuple[Counter, dict[Key, float]]:
+    """Node degrees by rounded position and total length per key."""
+    degrees: Counter = Counter()
+    lengths: dict[Key, float] = defaultdict(float)
+    with arcpy.da.SearchCursor(feature, ["SHAPE@", *fields]) as cursor:
+        for shape, *key in cursor:
+            if shape is None:
+                continue
+            lengths[tuple(key)] += shape.length
+            for part in shape:
+                points = [point for point in part if point is not None]
+                for point in (points[0], points[-1]):
+                    degrees[
+                        (round(point.X / tolerance), round(point.Y / tolerance))
+                    ] += 1
+    return degrees, lengths
+
+
+def compare_edge_networks(
+    reference_feature: str,
+    candidate_feature: str,
+    fields: Optional[Sequence[str]] = None,
+    tolerance: float = NODE_TOLERANCE,
+) -> list[str]:
+    """
+    Compares two noded networks and returns one message per difference, empty
+    when they are topologically equivalent: the same nodes with the same
+    degrees, and the same total length for every attribute key.
+    """
+    fields = list(fields or [])
+    ref_degrees, ref_lengths = _network_summary(reference_feature, fields, tolerance)
+    cand_degrees, cand_lengths = _network_summary(candidate_feature, fields, tolerance)
+
+    differences = []
+    node_mismatches = [
+        node
+        for node in set(ref_degrees) | set(cand_degrees)
+        if ref_degrees[node] != cand_degrees[node]
+    ]
+    if node_mismatches:
+        x, y = node_mismatches[0]
+        differences.append(
+            f"{len(node_mismatches)} nodes differ in degree, e.g. at "
+            f"({x * tolerance:.3f}, {y * tolerance:.3f})"
+        )
+    for key in set(ref_lengths) | set(cand_lengths):
+        ref_length = ref_lengths.get(key, 0.0)
+        cand_length = cand_lengths.get(key, 0.0)
+        if abs(ref_length - cand_length) > max(tolerance, ref_length * 1e-6):
+            differences.append(
+                f"Length of {key} differs: {ref_length:.3f} vs {cand_length:.3f}"
+            )
+    return differences
@@ -1,12 +1,37 @@
+from typing import Optional
+
 import arcpy
 
 from composition_configs import logic_config
 from custom_tools.general_tools import custom_arcpy, file_utilities
+from custom_tools.general_tools.sql_predicate import Predicate, compile_where_clause
 from env_setup import environment_setup
 from file_manager.work_file_manager import WorkFileManager
 
 
 class LineToBufferSymbology:
+    """
+    What:
+        Buffers lines by the symbol width of the query in sql_selection_query
+        they match, scaled by buffer_distance_factor and
+        extended by buffer_distance_addition.
+
+    How:
+        The queries are compiled to Python predicates so the lines are read and
+        classified in one cursor pass, writing the symbol width and buffer
+        distance of each line to fields. A single PairwiseBuffer then buffers
+        all lines by the distance field, optionally dissolving overlapping
+        buffers of the same symbol width. Each buffer keeps its symbol width in
+        SYMBOL_WIDTH_FIELD. A line matching several queries is buffered once by
+        the widest, which covers the narrower buffers it would otherwise get.
+
+        Queries that cannot be compiled fall back to one selection and buffer
+        per query, merged at the end.
+    """
+
+    SYMBOL_WIDTH_FIELD = "symbol_width"
+    BUFFER_DISTANCE_FIELD = "buffer_distance"
+
     def __init__(
         self,
         line_to_buffer_config: logic_config.LineToBufferSymbologyKwargs,
@@ -25,6 +50,8 @@ class LineToBufferSymbology:
 
         self.buffer_factor = line_to_buffer_config.buffer_distance_factor
         self.fixed_buffer_addition = line_to_buffer_config.buffer_distance_addition
+        self.dissolve_same_class = line_to_buffer_config.dissolve_same_class
+        self.query_fields: set[str] = set()
 
         self.wfm = WorkFileManager(
             config=line_to_buffer_config.work_file_manager_config
@@ -138,8 +165,85 @@ class LineToBufferSymbology:
 
         self.merge_buffers(buffer_output_names, self.output_road_buffer)
 
+    def compile_queries(self) -> Optional[list[tuple[Predicate, float]]]:
+        """
+        Returns (predicate, width) per query, or None if any query cannot be
+        compiled. Also collects the fields the predicates read.
+        """
+        compiled = []
+        try:
+            for sql_query, original_width in self.sql_selection_query.items():
+                predicate, fields = compile_where_clause(sql_query)
+                compiled.append((predicate, original_width))
+                self.query_fields |= fields
+        except ValueError as error:
+            print(f"Buffering one query at a time, could not compile query: {error}")
+            return None
+        return compiled
+
+    def classify_lines(
+        self, queries: list[tuple[Predicate, float]], classified_output: str
+    ):
+        """
+        Copies the input lines, keeping only lines some query selects, with the
+        symbol width and buffer distance of each written in one cursor pass.
+        """
+        arcpy.management.CopyFeatures(
+            in_features=self.input_road_lines,
+            out_feature_class=classified_output,
+        )
+        arcpy.management.AddFields(
+            in_table=classified_output,
+            field_description=[
+                [self.SYMBOL_WIDTH_FIELD, "DOUBLE"],
+                [self.BUFFER_DISTANCE_FIELD, "DOUBLE"],
+            ],
+        )
+
+        fields = sorted(self.query_fields)
+        with arcpy.da.UpdateCursor(
+            classified_output,
+            [*fields, self.SYMBOL_WIDTH_FIELD, self.BUFFER_DISTANCE_FIELD],
+        ) as cursor:
+            for row in cursor:
+                values = dict(zip(fields, row))
+                widths = [width for predicate, width in queries if predicate(values)]
+                if not widths:
+                    cursor.deleteRow()
+                    continue
+                width = max(widths)
+                row[-2] = width
+                row[-1] = (width * self.buffer_factor) + self.fixed_buffer_addition
+                cursor.updateRow(row)
+
+    def buffer_classified_lines(self, classified_lines: str):
+        """Buffers every classified line by its own distance in one operation."""
+        if self.dissolve_same_class:
+            arcpy.analysis.PairwiseBuffer(
+                in_features=classified_lines,
+                out_feature_class=self.output_road_buffer,
+                buffer_distance_or_field=self.BUFFER_DISTANCE_FIELD,
+                dissolve_option="LIST",
+                dissolve_field=[self.SYMBOL_WIDTH_FIELD],
+            )
+        else:
+            arcpy.analysis.PairwiseBuffer(
+                in_features=classified_lines,
+                out_feature_class=self.output_road_buffer,
+                buffer_distance_or_field=self.BUFFER_DISTANCE_FIELD,
+            )
+
     def run(self):
-        self.process_queries()
+        queries = self.compile_queries()
+        if queries is None:
+            self.process_queries()
+        else:
+            classified_lines = self.wfm.build_file_path(
+                file_name="classified_lines",
+                file_type="gdb",
+            )
+            self.classify_lines(queries=queries, classified_output=classified_lines)
+            self.buffer_classified_lines(classified_lines=classified_lines)
         self.wfm.delete_created_files()
 
 
@@ -14,7 +14,7 @@ from custom_tools.general_tools.line_segmenter import segment_line
 from file_manager import WorkFileManager
 from composition_configs import logic_config
 from composition_configs.logic_config import ConnectivityScope, LineConnectivityMode
-from custom_tools.general_tools import geometry_tools
+from custom_tools.general_tools import geometry_tools, segment_crossings
 
 OptionalKey = tuple[str, int]  # (dataset_key, oid)  -- oid is SOURCE oid
 ParentEntityKey = tuple[str, int]  # ("parent", parent_id)
@@ -1456,10 +1456,15 @@ class FillLineGaps:
 
         self.reject_crossing_connectors: bool = bool(cross.reject_crossing_connectors)
         self.crossing_check_spatial_reference = cross.crossing_check_spatial_reference
+        self.validate_crossing_engine: bool = bool(cross.validate_crossing_engine)
         self.barrier_layers: list[str] | None = cross.barrier_layers or None
 
         # Local angle cache (dataset_key, oid, rx, ry) -> Optional[float]
         self._local_angle_cache: dict[tuple[str, int, int, int], Optional[float]] = {}
+        # Per-line vertex arrays the local angles are measured on
+        self._line_measure_cache = geometry_tools.LineMeasureCache(
+            max_vertices=int(ang.line_measure_cache_max_vertices)
+        )
         self.write_work_files_to_memory = (
             line_gap_config.work_file_manager_config.write_to_memory
         )
@@ -2174,7 +2179,8 @@ class FillLineGaps:
         if key in self._local_angle_cache:
             return self._local_angle_cache[key]
 
-        angle = geometry_tools.local_line_angle_at_xy(
+        angle = self._line_measure_cache.local_line_angle_at_xy(
+            key=(str(dataset_key), int(oid)),
             polyline=polyline,
             x=float(x),
             y=float(y),
@@ -2661,16 +2667,72 @@ class FillLineGaps:
 
         return oid_to_key
 
-    @staticmethod
     def _find_crossing_pairs(
+        self,
         in_fc: str,
         against_fcs: list[str],
     ) -> dict[int, set[int]]:
         """Return {in_oid: {against_oid, ...}} for pairs where in_fc line crosses against_fcs line.
 
+        Reads in_fc and each against_fc once (the latter limited to the extent
+        of in_fc) into segment arrays and resolves every crossing in process
+        with segment_crossings.find_crossing_owner_pairs, following the arcpy
+        CROSSES relationship within the XY tolerance of in_fc.  Self-pairs are
+        excluded when against_fcs contains in_fc.  When validate_crossing_engine is set, the result is compared with
+        _find_crossing_pairs_arcpy and any difference is printed.
+        """
+        in_segments = segment_crossings.read_segments(in_fc)
+        if len(in_segments) == 0:
+            return {}
+
+        extent = arcpy.Describe(in_fc).extent
+        tolerance = segment_crossings.xy_tolerance(in_fc)
+        pairs: dict[int, set[int]] = {}
+        for _against_fc in against_fcs:
+            if _against_fc == in_fc:
+                against_segments = in_segments
+            else:
+                against_segments = segment_crossings.read_segments(
+                    _against_fc, spatial_filter=extent.polygon
+                )
+            for in_oid, against_oids in segment_crossings.find_crossing_owner_pairs(
+                in_segments,
+                against_segments,
+                exclude_same_owner=_against_fc == in_fc,
+                tolerance=tolerance,
+            ).items():
+                pairs.setdefault(in_oid, set()).update(against_oids)
+
+        if self.validate_crossing_engine:
+            expected = self._find_crossing_pairs_arcpy(in_fc, against_fcs)
+            if expected != pairs:
+                missing = {
+                    oid: expected[oid] - pairs.get(oid, set())
+                    for oid in expected
+                    if expected[oid] - pairs.get(oid, set())
+                }
+                extra = {
+                    oid: pairs[oid] - expected.get(oid, set())
+                    for oid in pairs
+                    if pairs[oid] - expected.get(oid, set())
+                }
+                print(
+                    f"[FillLineGaps] Crossing engine differs from arcpy CROSSES "
+                    f"for {in_fc}: missing={missing} extra={extra}"
+                )
+
+        return pairs
+
+    @staticmethod
+    def _find_crossing_pairs_arcpy(
+        in_fc: str,
+        against_fcs: list[str],
+    ) -> dict[int, set[int]]:
+        """Reference implementation of _find_crossing_pairs using arcpy cursors.
+
         Uses INTERSECT as a broad spatial pre-filter, then confirms each candidate
-        with spatial_relationship="CROSSES" — exact, no false positives from
-        XY-tolerance snapping.  Self-pairs are excluded when against_fcs contains in_fc.
+        with spatial_relationship="CROSSES".  Opens one cursor per candidate and
+        layer, so it is only used to validate the in-process engine.
         """
         pairs: dict[int, set[int]] = {}
         _in_lyr = arcpy.management.MakeFeatureLayer(in_fc, "__crossing_filter_lyr")[0]
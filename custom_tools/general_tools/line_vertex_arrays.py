@@ -0,0 +1,167 @@
+"""
+Polylines flattened into one NumPy vertex array.
+
+Every row of a line feature class is stored as a run of vertices in a single
+(n, 2) array, with an offsets array marking where each row starts. Per-row
+measurements such as endpoints, direction angles and midpoints are then taken
+for all rows at once with array indexing instead of walking arcpy geometries
+point by point.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Iterable, Optional, Sequence
+
+import arcpy
+import numpy as np
+
+# Issue recorded for a row that could be read, empty string for none.
+NO_ISSUE = ""
+
+
+@dataclass(frozen=True)
+class LineVertexArrays:
+    """
+    Single-part polylines as one flat vertex array.
+
+    oids: (r,) object id of every row.
+    xy: (n, 2) vertices of all rows, row after row.
+    offsets: (r + 1,) row i owns xy[offsets[i]:offsets[i + 1]].
+    issues: (r,) why a row has no vertices, "null_geometry" or
+        "multipart_not_supported", or NO_ISSUE.
+    """
+
+    oids: np.ndarray
+    xy: np.ndarray
+    offsets: np.ndarray
+    issues: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.oids)
+
+    @property
+    def vertex_counts(self) -> np.ndarray:
+        return np.diff(self.offsets)
+
+    @property
+    def start_index(self) -> np.ndarray:
+        return self.offsets[:-1]
+
+    @property
+    def end_index(self) -> np.ndarray:
+        return self.offsets[1:] - 1
+
+
+def vertex_arrays_from_rows(
+    rows: Iterable[tuple[int, Optional[Sequence[tuple[float, float]]], str]],
+) -> LineVertexArrays:
+    """
+    Builds LineVertexArrays from (oid, vertices, issue) rows. Rows with an issue
+    keep their place but own no vertices.
+    """
+    oids: list[int] = []
+    coords: list[tuple[float, float]] = []
+    counts: list[int] = [0]
+    issues: list[str] = []
+
+    for oid, vertices, issue in rows:
+        oids.append(int(oid))
+        issues.append(issue)
+        if issue != NO_ISSUE or vertices is None:
+            counts.append(0)
+            continue
+        coords.extend(vertices)
+        counts.append(len(vertices))
+
+    return LineVertexArrays(
+        oids=np.asarray(oids, dtype=np.int64),
+        xy=np.asarray(coords, dtype=np.float64).reshape(-1, 2),
+        offsets=np.cumsum(counts, dtype=np.int64),
+        issues=np.asarray(issues, dtype=object),
+    )
+
+
+def read_line_vertex_arrays(
+    feature_class: str, spatial_filter: Any = None
+) -> LineVertexArrays:
+    """Reads every polyline of feature_class, keyed by OID, in one cursor pass."""
+    rows = []
+    with arcpy.da.SearchCursor(
+        feature_class, ["OID@", "SHAPE@"], spatial_filter=spatial_filter
+    ) as cursor:
+        for oid, shape in cursor:
+            if shape is None:
+                rows.append((oid, None, "null_geometry"))
+            elif shape.isMultipart:
+                rows.append((oid, None, "multipart_not_supported"))
+            else:
+                vertices = [
+                    (point.X, point.Y)
+                    for point in shape.getPart(0)
+                    if point is not None
+                ]
+                rows.append((oid, vertices, NO_ISSUE))
+    return vertex_arrays_from_rows(rows)
+
+
+def direction_angles(from_xy: np.ndarray, to_xy: np.ndarray) -> np.ndarray:
+    """
+    Angle in degrees [0, 360) from each from point to its to point, counted
+    counterclockwise from east. NaN where the points coincide or are NaN.
+    """
+    dx = to_xy[:, 0] - from_xy[:, 0]
+    dy = to_xy[:, 1] - from_xy[:, 1]
+    angles = np.degrees(np.arctan2(dy, dx)) % 360.0
+    angles[(dx == 0) & (dy == 0)] = np.nan
+    return angles
+
+
+def _running_distance(lines: LineVertexArrays) -> np.ndarray:
+    """Planar distance to every vertex, running on across rows without a gap."""
+    if len(lines.xy) == 0:
+        return np.zeros(0, dtype=np.float64)
+
+    segment_lengths = np.hypot(*np.diff(lines.xy, axis=0).T)
+    # The step from the last vertex of one row to the first of the next is no segment.
+    row_starts = lines.start_index[lines.vertex_counts > 0]
+    segment_lengths[row_starts[row_starts > 0] - 1] = 0.0
+    return np.concatenate(([0.0], np.cumsum(segment_lengths)))
+
+
+def cumulative_lengths(lines: LineVertexArrays) -> np.ndarray:
+    """
+    Planar distance along its row to every vertex, restarting at 0 on the
+    first vertex of each row.
+    """
+    distance = _running_distance(lines)
+    row_of_vertex = np.repeat(np.arange(len(lines)), lines.vertex_counts)
+    return distance - distance[lines.start_index[row_of_vertex]]
+
+
+def points_along(
+    lines: LineVertexArrays, fraction: float, rows: np.ndarray
+) -> np.ndarray:
+    """
+    (len(rows), 2) points at fraction of the planar length of each of rows,
+    matching Polyline.positionAlongLine(fraction, use_percentage=True). Every
+    row in rows must have at least two vertices.
+    """
+    distance = _running_distance(lines)
+    start = lines.start_index[rows]
+    end = lines.end_index[rows]
+    target = distance[start] + (distance[end] - distance[start]) * fraction
+
+    # The running distance never decreases, so one search finds the first vertex
+    # at or beyond the target for every row; clipping keeps it inside the row.
+    after = np.clip(np.searchsorted(distance, target, side="left"), start + 1, end)
+    before = after - 1
+
+    span = distance[after] - distance[before]
+    ratio = np.divide(
+        target - distance[before],
+        span,
+        out=np.zeros_like(span),
+        where=span > 0,
+    )
+    return lines.xy[before] + ratio[:, None] * (lines.xy[after] - lines.xy[before])
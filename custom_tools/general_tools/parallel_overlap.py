@@ -0,0 +1,435 @@
+"""
+In-process detection and removal of lines running alongside other lines.
+
+Replaces buffering both layers, intersecting the buffers, dissolving them and
+erasing by the large overlap polygons. Segments of the lines to clean are
+paired with nearby segments of the reference lines through the segment grid,
+pairs that are not close to parallel are dropped, and for every remaining pair
+the stretch of the line that lies inside the flat-ended buffer of the
+reference segment is solved for directly. The stretches are merged along each
+line part, measured by the area the two buffers would share, and the large
+ones are cut out by measure along the line.
+"""
+
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from typing import Optional, Sequence
+
+import arcpy
+import numpy as np
+
+from custom_tools.general_tools.endpoint_snapping import (
+    DEFAULT_TOLERANCE,
+    point_keys,
+)
+from custom_tools.general_tools.line_editing import (
+    LineParts,
+    polyline_from_parts,
+    read_line_parts,
+)
+from custom_tools.general_tools.segment_crossings import (
+    SegmentSet,
+    segments_near_segments,
+)
+
+
+@dataclass(frozen=True)
+class OverlapStretches:
+    """
+    Merged overlapping stretches of the parts of a LineParts.
+
+    part: (k,) part index of every stretch.
+    start / end: (k,) measures of the stretch along all vertices of the
+        LineParts, see vertex_measures.
+    area: (k,) estimated area shared by the two buffers along the stretch.
+    """
+
+    part: np.ndarray
+    start: np.ndarray
+    end: np.ndarray
+    area: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.part)
+
+    def select(self, mask: np.ndarray) -> "OverlapStretches":
+        return OverlapStretches(
+            self.part[mask], self.start[mask], self.end[mask], self.area[mask]
+        )
+
+
+def max_crossing_angle(distance: float, area_limit: float) -> float:
+    """
+    Largest angle in degrees at which two crossing lines can still share more
+    than area_limit of their buffers of distance. Two long lines crossing at
+    angle v share a parallelogram of (2 * distance)**2 / sin(v), so pairs at
+    steeper angles never reach the limit and are left out.
+    """
+    return math.degrees(math.asin(min(1.0, (2 * distance) ** 2 / area_limit)))
+
+
+def vertex_measures(lines: LineParts) -> np.ndarray:
+    """
+    Length along the line of every vertex, counted over all parts one after
+    the other, so measures grow across parts and a gap between parts adds
+    nothing.
+    """
+    if len(lines.xy) == 0:
+        return np.empty(0, dtype=np.float64)
+    step = np.hypot(*np.diff(lines.xy, axis=0).T)
+    part_start = np.zeros(len(lines.xy), dtype=bool)
+    part_start[lines.offsets[:-1][np.diff(lines.offsets) > 0]] = True
+    step[part_start[1:]] = 0.0
+    return np.concatenate(([0.0], np.cumsum(step)))
+
+
+def part_segments(lines: LineParts) -> tuple[SegmentSet, np.ndarray]:
+    """
+    (segments, first vertex) of every segment of every part. Segment owners
+    are part indexes. Zero-length segments are kept so vertex indexes line up
+    with the measures.
+    """
+    counts = np.diff(lines.offsets)
+    vertex_part = np.repeat(np.arange(len(counts)), counts)
+    first = np.nonzero(vertex_part[1:] == vertex_part[:-1])[0]
+    xy = np.column_stack((lines.xy[first], lines.xy[first + 1]))
+    segments = SegmentSet(
+        owner=vertex_part[first],
+        xy=xy.reshape(-1, 4),
+        start_is_boundary=np.isin(first, lines.offsets[:-1]),
+        end_is_boundary=np.isin(first + 2, lines.offsets[1:]),
+    )
+    return segments, first
+
+
+def _clip(lo, hi, low, high):
+    return np.maximum(lo, low), np.minimum(hi, high)
+
+
+def _pair_intervals(
+    line_xy: np.ndarray,
+    reference: SegmentSet,
+    ri: np.ndarray,
+    distance: float,
+) -> tuple[np.ndarray, ...]:
+    """
+    (lo, hi, area, join_lo, join_hi): for every pair of a line segment (x1,
+    y1, x2, y2 in line_xy) and reference segment ri, the stretch of the line
+    segment, as lengths from its start, lying in the flat-ended strip of half
+    width distance around the reference segment, the area that strip shares
+    with the strip around the line segment along it, and the stretch lying in
+    the round join at the end vertex of the reference segment. Empty
+    stretches have lo >= hi.
+    """
+    start = line_xy[:, :2]
+    delta = line_xy[:, 2:] - start
+    length = np.hypot(*delta.T)
+    u = delta / np.where(length > 0, length, 1.0)[:, None]
+
+    b = reference.xy[ri, :2]
+    road = reference.xy[ri, 2:] - b
+    road_length = np.hypot(*road.T)
+    e = road / np.where(road_length > 0, road_length, 1.0)[:, None]
+    n = np.column_stack((-e[:, 1], e[:, 0]))
+
+    offset = start - b
+    a0 = np.einsum("ij,ij->i", offset, e)
+    h0 = np.einsum("ij,ij->i", offset, n)
+    along = np.einsum("ij,ij->i", u, e)
+    across = np.einsum("ij,ij->i", u, n)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        s1 = -a0 / along
+        s2 = (road_length - a0) / along
+        lo = np.where(along != 0, np.minimum(s1, s2), -np.inf)
+        hi = np.where(along != 0, np.maximum(s1, s2), np.inf)
+        inside_along = (a0 >= 0) & (a0 <= road_length)
+        lo = np.where((along == 0) & ~inside_along, np.inf, lo)
+
+        t1 = (-distance - h0) / across
+        t2 = (distance - h0) / across
+        h_lo = np.where(across != 0, np.minimum(t1, t2), -np.inf)
+        h_hi = np.where(across != 0, np.maximum(t1, t2), np.inf)
+        h_lo = np.where((across == 0) & (np.abs(h0) > distance), np.inf, h_lo)
+
+    lo, hi = _clip(lo, hi, h_lo, h_hi)
+    lo, hi = _clip(lo, hi, 0.0, length)
+
+    # Round join where the reference line continues past the end vertex.
+    to_vertex = reference.xy[ri, 2:] - start
+    p = np.einsum("ij,ij->i", u, to_vertex)
+    q = np.einsum("ij,ij->i", to_vertex, to_vertex) - distance**2
+    root = np.sqrt(np.maximum(p**2 - q, 0.0))
+    hits = (p**2 - q >= 0) & ~reference.end_is_boundary[ri]
+    join_lo = np.where(hits, p - root, np.inf)
+    join_hi = np.where(hits, p + root, -np.inf)
+    join_lo, join_hi = _clip(join_lo, join_hi, 0.0, length)
+
+    offset = np.abs(h0 + 0.5 * (lo + hi) * across)
+    area = np.where(hi > lo, hi - lo, 0.0) * np.maximum(2.0 * distance - offset, 0.0)
+    return lo, hi, area, join_lo, join_hi
+
+
+def _coincident_ids(segments: SegmentSet, tolerance: float) -> np.ndarray:
+    """
+    Id of every segment, shared by the segments with the same end points
+    within tolerance in either direction.
+    """
+    keys = point_keys(segments.xy, tolerance).reshape(-1, 2, 2)
+    first, second = keys[:, 0], keys[:, 1]
+    swap = (first[:, 0] > second[:, 0]) | (
+        (first[:, 0] == second[:, 0]) & (first[:, 1] > second[:, 1])
+    )
+    keys[swap] = keys[swap][:, ::-1]
+    return np.unique(keys.reshape(-1, 4), axis=0, return_inverse=True)[1].ravel()
+
+
+def _merge_stretches(
+    part: np.ndarray,
+    start: np.ndarray,
+    end: np.ndarray,
+    area: np.ndarray,
+    gap: float,
+    distance: float,
+) -> OverlapStretches:
+    """
+    Merges stretches of the same part that overlap or lie within gap. The
+    area of a merged stretch is capped at its length times 2 * distance, the
+    most a buffer of distance can share with another along it.
+    """
+    if len(part) == 0:
+        empty = np.empty(0, dtype=np.float64)
+        return OverlapStretches(np.empty(0, dtype=np.int64), empty, empty, empty)
+
+    order = np.lexsort((start, part))
+    part, start, end, area = part[order], start[order], end[order], area[order]
+    reach = np.maximum.accumulate(end)
+    new_group = np.ones(len(part), dtype=bool)
+    new_group[1:] = (part[1:] != part[:-1]) | (start[1:] > reach[:-1] + gap)
+    group = np.cumsum(new_group) - 1
+    first = np.nonzero(new_group)[0]
+
+    merged_end = np.maximum.reduceat(end, first)
+    return OverlapStretches(
+        part=part[first],
+        start=start[first],
+        end=merged_end,
+        area=np.minimum(
+            np.bincount(group, weights=area),
+            (merged_end - start[first]) * 2.0 * distance,
+        ),
+    )
+
+
+def parallel_overlaps(
+    lines: LineParts,
+    reference: LineParts,
+    distance: float,
+    max_angle: float,
+    line_keys: Optional[np.ndarray] = None,
+    reference_keys: Optional[np.ndarray] = None,
+    gap: float = DEFAULT_TOLERANCE,
+) -> OverlapStretches:
+    """
+    What:
+        Finds the stretches of lines lying within distance of reference, along
+        reference segments that differ less than max_angle degrees in
+        direction, and returns them merged per part with the area the buffers
+        of the two would share.
+
+    How:
+        Line segments are paired with reference segments through the segment
+        grid and only pairs with equal keys (e.g. medium) are kept when keys
+        are given per row. For every pair the stretch inside the strip around
+        the reference segment is solved from the line segment's position
+        along and across the reference segment, and stretches inside the round
+        joins at interior reference vertices are added so bends leave no gaps.
+        The shared area of a pair is its length times the overlap width
+        2 * distance - |offset| of two parallel strips, measured at its middle.
+        Coincident reference segments, such as duplicated features, are
+        paired only once with each line segment, as their buffers coincide.
+
+    Args:
+        lines: The lines to find overlapping stretches on.
+        reference: The lines they may run alongside.
+        distance: Buffer distance of both layers.
+        max_angle: Largest direction difference in degrees of a parallel pair.
+        line_keys / reference_keys: Optional key of every row; only rows with
+            equal keys are paired.
+        gap: Stretches closer than this along a part are merged.
+    """
+    segments, first_vertex = part_segments(lines)
+    reference_segments, _ = part_segments(reference)
+    ri, li = segments_near_segments(reference_segments, segments, distance)
+    if line_keys is not None and reference_keys is not None and len(li):
+        same = (
+            line_keys[lines.part_row[segments.owner[li]]]
+            == reference_keys[reference.part_row[reference_segments.owner[ri]]]
+        )
+        ri, li = ri[same], li[same]
+
+    line_xy = segments.xy[li]
+    delta = line_xy[:, 2:] - line_xy[:, :2]
+    road = reference_segments.xy[ri, 2:] - reference_segments.xy[ri, :2]
+    norms = np.hypot(*delta.T) * np.hypot(*road.T)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cosine = np.abs(np.einsum("ij,ij->i", delta, road)) / norms
+    parallel = (norms > 0) & (cosine >= math.cos(math.radians(max_angle)))
+    ri, li, line_xy = ri[parallel], li[parallel], line_xy[parallel]
+
+    coincident = _coincident_ids(reference_segments, gap)[ri]
+    once = np.sort(
+        np.unique(np.column_stack((li, coincident)), axis=0, return_index=True)[1]
+    )
+    ri, li, line_xy = ri[once], li[once], line_xy[once]
+
+    lo, hi, strip_area, join_lo, join_hi = _pair_intervals(
+        line_xy, reference_segments, ri, distance
+    )
+
+    measures = vertex_measures(lines)
+    base = measures[first_vertex[li]]
+    part = segments.owner[li]
+    strip = hi > lo
+    join = join_hi > join_lo
+    return _merge_stretches(
+        np.concatenate((part[strip], part[join])),
+        np.concatenate((base[strip] + lo[strip], base[join] + join_lo[join])),
+        np.concatenate((base[strip] + hi[strip], base[join] + join_hi[join])),
+        np.concatenate((strip_area[strip], np.zeros(int(join.sum())))),
+        gap,
+        distance,
+    )
+
+
+def _point_at(xy: np.ndarray, measures: np.ndarray, at: float) -> np.ndarray:
+    return np.array(
+        [np.interp(at, measures, xy[:, 0]), np.interp(at, measures, xy[:, 1])]
+    )
+
+
+def cut_stretches(
+    lines: LineParts,
+    stretches: OverlapStretches,
+    min_length: float = DEFAULT_TOLERANCE,
+) -> tuple[dict[int, list[np.ndarray]], np.ndarray]:
+    """
+    What:
+        Cuts the stretches out of their parts by measure and returns
+        (remaining parts of every cut row, cut points). Rows whose parts are
+        all cut away map to an empty list. Pieces no longer than min_length
+        are dropped.
+
+    How:
+        For every cut part, the kept measure ranges are the complement of its
+        stretches. Each kept range becomes its interpolated end points with
+        the original vertices strictly between them.
+    """
+    measures = vertex_measures(lines)
+    cut_parts = np.unique(stretches.part)
+    by_part = {
+        int(part): (
+            stretches.start[stretches.part == part],
+            stretches.end[stretches.part == part],
+        )
+        for part in cut_parts.tolist()
+    }
+
+    remaining: dict[int, list[np.ndarray]] = {}
+    cut_points: list[np.ndarray] = []
+    row_parts = lines.row_parts()
+    cut_rows = np.unique(lines.part_row[cut_parts]).tolist()
+
+    for row in cut_rows:
+        pieces: list[np.ndarray] = []
+        for part in row_parts[row]:
+            xy = lines.part_vertices(part)
+            along = measures[lines.offsets[part] : lines.offsets[part + 1]]
+            if part not in by_part:
+                pieces.append(xy)
+                continue
+
+            starts, ends = by_part[part]
+            keep_from = np.concatenate(([along[0]], ends))
+            keep_to = np.concatenate((starts, [along[-1]]))
+            for low, high in zip(keep_from.tolist(), keep_to.tolist()):
+                if high - low <= min_length:
+                    continue
+                inner = xy[(along > low) & (along < high)]
+                first, last = _point_at(xy, along, low), _point_at(xy, along, high)
+                pieces.append(np.vstack((first, inner, last)))
+                if low > along[0]:
+                    cut_points.append(first)
+                if high < along[-1]:
+                    cut_points.append(last)
+        remaining[int(lines.oids[row])] = pieces
+
+    return remaining, np.asarray(cut_points, dtype=np.float64).reshape(-1, 2)
+
+
+def _key_codes(values: list, codes: dict, missing: int) -> np.ndarray:
+    """Integer code of every value, missing where the value has none."""
+    return np.array([codes.get(value, missing) for value in values], dtype=np.int64)
+
+
+def erase_parallel_overlaps(
+    line_feature: str,
+    reference_feature: str,
+    output_feature: str,
+    distance: float,
+    area_limit: float,
+    max_angle: float,
+    key_field: Optional[str] = None,
+    keys: Optional[Sequence] = None,
+) -> np.ndarray:
+    """
+    What:
+        Copies line_feature to output_feature and removes the stretches that run
+        alongside reference_feature where the two layers' buffers of distance
+        would share more than area_limit. Returns the cut points, which are the
+        new line ends.
+
+    How:
+        Both layers are read once. Stretches are found by parallel_overlaps,
+        pairing only rows with the same key_field value when given, and only
+        rows whose value is in keys when keys are given. Rows are cut by
+        cut_stretches; cut rows are rewritten as multipart lines and rows cut
+        away entirely are deleted, as Erase would.
+    """
+    arcpy.management.CopyFeatures(line_feature, output_feature)
+    fields = [key_field] if key_field else []
+    lines = read_line_parts(output_feature, fields)
+    reference = read_line_parts(reference_feature, fields)
+
+    line_keys = reference_keys = None
+    if key_field:
+        line_values = [row[0] for row in lines.attributes]
+        reference_values = [row[0] for row in reference.attributes]
+        if keys is None:
+            keys = dict.fromkeys(line_values + reference_values)
+        codes = {key: code for code, key in enumerate(keys)}
+        # Rows outside keys get different codes in the two sets, so never pair.
+        line_keys = _key_codes(line_values, codes, missing=-1)
+        reference_keys = _key_codes(reference_values, codes, missing=-2)
+
+    stretches = parallel_overlaps(
+        lines, reference, distance, max_angle, line_keys, reference_keys
+    )
+    stretches = stretches.select(stretches.area > area_limit)
+    remaining, cut_points = cut_stretches(lines, stretches)
+    if not remaining:
+        return cut_points
+
+    spatial_reference = arcpy.Describe(output_feature).spatialReference
+    with arcpy.da.UpdateCursor(output_feature, ["OID@", "SHAPE@"]) as cursor:
+        for oid, _ in cursor:
+            pieces = remaining.get(oid)
+            if pieces is None:
+                continue
+            if pieces:
+                cursor.updateRow([oid, polyline_from_parts(pieces, spatial_reference)])
+            else:
+                cursor.deleteRow()
+    return cut_points
@@ -7,16 +7,21 @@ from dataclasses import asdict, dataclass, field, fields, is_dataclass, replace
 from datetime import datetime, timedelta
 from enum import Enum
 from pathlib import Path
-from typing import Any, Dict, Iterator, List, Optional
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple, Union
 
 import arcpy
 
 from composition_configs import core_config, type_defs
 from custom_tools.decorators.timing_decorator import timing_decorator
 from custom_tools.general_tools import custom_arcpy, file_utilities, param_utils
+from custom_tools.general_tools.partition_plan import InputFingerprint, PartitionPlan
+from custom_tools.general_tools.run_profiler import RunProfiler
 from env_setup import environment_setup
 from file_manager.work_file_manager import PartitionWorkFileManager
 
+# Exclusive upper (x, y) bounds of a split partition, None where it has none.
+UpperBounds = Tuple[Optional[float], Optional[float]]
+
 
 @dataclass
 class PreparedInput:
@@ -121,6 +126,22 @@ class OutputOverview:
     vertex_count_diff_percentage: Optional[float] = None
 
 
+@dataclass
+class OutputBuffer:
+    """
+    Rows extracted for one final output across partitions, written in one batch.
+
+    fields are the attribute fields of the final output, in cursor order after SHAPE@.
+    """
+
+    object_key: str
+    tag: str
+    final_output_path: str
+    fields: List[str] = field(default_factory=list)
+    rows: List[tuple] = field(default_factory=list)
+    output_exists: bool = False
+
+
 @dataclass
 class PercentageAccumulator:
     """
@@ -165,6 +186,8 @@ class RunConfigOverview:
     run_partition_optimization: bool
     final_partition_feature_count: Optional[int]
     custom_partition_feature_used: bool
+    adaptive_split: Optional[core_config.AdaptiveSplitConfig] = None
+    fused_stage_radii_meters: Optional[Dict[str, int]] = None
 
 
 @dataclass
@@ -177,6 +200,7 @@ class PartitionSummary:
     partition_id_highest_load: Optional[int] = None
     highest_load_value: int = 0
     average_load: Optional[float] = None
+    partitions_split: int = 0
 
 
 @dataclass
@@ -201,6 +225,16 @@ class ContextInputsSummary:
     total_processing_input_context_vertices: int = 0
 
 
+@dataclass
+class PartitionLineage:
+    """Where a partition sits in the adaptive split tree."""
+
+    parent_id: Optional[int] = None
+    depth: int = 0
+    split_reason: Optional[str] = None
+    children: List[int] = field(default_factory=list)
+
+
 @dataclass
 class OverviewCatalog:
     """The full run report, serialized to overview.json at the end of the run."""
@@ -212,6 +246,7 @@ class OverviewCatalog:
         default_factory=ContextInputsSummary
     )
     processing_inputs: Dict[str, ProcessingInputOverview] = field(default_factory=dict)
+    partition_lineage: Dict[int, PartitionLineage] = field(default_factory=dict)
 
 
 class PartitionIterator:
@@ -300,6 +335,24 @@ class PartitionIterator:
       - Context features are selected by distance to the same partition (using the
         configured radius).
 
+    # Fused stages
+    Passing a `core_config.FusedStagesConfig` instead of a `MethodEntriesConfig` runs the
+    methods of several stages (e.g. thin roads, then triangle removal, then dissolve)
+    back-to-back on each partition's selection, instead of one full iterator run per stage.
+    InjectIO tags that are neither "input" nor a configured output are intermediate: they
+    resolve to the memory workspace and are never appended to a final output. The
+    selection radius is raised to the sum of the stage radii, since a stage only sees
+    correct context if the earlier stages had their own context around it. Stages must
+    carry `PARTITION_FIELD` through to the outputs that use "selection" extraction.
+
+    # Adaptive splitting
+    With `PartitionRunConfig.adaptive_split` set, a partition whose selected load
+    exceeds `max_partition_load`, or whose injected methods fail with a resource error,
+    is split into up to four quadrants of its polygon. The quadrants are processed as
+    child partitions with ids after the last cartographic partition, and can be split
+    again up to `max_split_depth`. The split tree is reported under `partition_lineage`
+    in `overview.json`.
+
     # Logging (documentation directory)
     At the start of `run()`, the configured `documentation_directory` is cleared and
     recreated (with safety checks). The iterator writes:
@@ -326,7 +379,8 @@ class PartitionIterator:
     # Side effects
     - Creates and deletes intermediate feature classes and layers.
     - Writes JSON logs under `documentation_directory` (safe-guarded).
-    - Appends to final outputs as partitions complete.
+    - Appends to final outputs in batches as partitions complete (see `output_flush_partitions`
+      and `output_flush_rows` on `PartitionRunConfig`).
     - Adds then removes (via cleanup) the `PARTITION_FIELD` as needed.
 
     # Raises
@@ -353,9 +407,12 @@ class PartitionIterator:
     def __init__(
         self,
         partition_io_config: core_config.PartitionIOConfig,
-        partition_method_inject_config: core_config.MethodEntriesConfig,
+        partition_method_inject_config: Union[
+            core_config.MethodEntriesConfig, core_config.FusedStagesConfig
+        ],
         partition_iterator_run_config: core_config.PartitionRunConfig,
         work_file_manager_config: core_config.WorkFileConfig,
+        partition_plan: Optional[PartitionPlan] = None,
     ):
         """
         Args:
@@ -367,10 +424,13 @@ class PartitionIterator:
                 to partition-scoped paths at runtime. Without `InjectIO`, the iterator cannot pass
                 partition selections or allocate iteration outputs, making the class effectively useless.
                 See class docstring section *Injection & method execution* for details.
+                A `FusedStagesConfig` runs several tools' methods in one pass, see *Fused stages*.
             partition_iterator_run_config: Runtime settings (context radius in meters, max
                 elements per partition, partition method "FEATURES"/"VERTICES", object ID
                 field, whether to optimize partition size).
             work_file_manager_config: Controls generation of temp/iteration/persistent paths.
+            partition_plan: Partitions shared with other iterators over mostly the same
+                data. Reused when compatible, otherwise (re)recorded by this run.
         """
 
         self.input_catalog: Dict[str, PreparedInput] = {}
@@ -413,9 +473,23 @@ class PartitionIterator:
 
         self.documentation_directory = partition_io_config.documentation_directory
 
-        self.list_of_methods = partition_method_inject_config
-
         self.search_distance = partition_iterator_run_config.context_radius_meters
+        self.fused_stage_radii: Optional[Dict[str, int]] = None
+
+        if isinstance(partition_method_inject_config, core_config.FusedStagesConfig):
+            self.list_of_methods = partition_method_inject_config.method_entries()
+            self.search_distance = max(
+                self.search_distance,
+                partition_method_inject_config.context_radius_meters,
+            )
+            self.fused_stage_radii = {
+                stage.name: stage.context_radius_meters
+                for stage in partition_method_inject_config.stages
+            }
+            self.intermediate_tags = self._find_intermediate_tags(self.list_of_methods)
+        else:
+            self.list_of_methods = partition_method_inject_config
+            self.intermediate_tags: Set[Tuple[str, str]] = set()
         self.max_elements_per_partition = (
             partition_iterator_run_config.max_elements_per_partition
         )
@@ -427,6 +501,13 @@ class PartitionIterator:
         self.partition_method: core_config.PartitionMethod = (
             partition_iterator_run_config.partition_method
         )
+        self.output_flush_partitions = (
+            partition_iterator_run_config.output_flush_partitions
+        )
+        self.output_flush_rows = partition_iterator_run_config.output_flush_rows
+        self.adaptive_split: Optional[core_config.AdaptiveSplitConfig] = (
+            partition_iterator_run_config.adaptive_split
+        )
         self.custom_partition_feature = partition_io_config.custom_partition_feature
         self.use_custom_partition_feature = self.custom_partition_feature is not None
         if self.use_custom_partition_feature and self.run_partition_optimization:
@@ -434,8 +515,20 @@ class PartitionIterator:
                 "run_partition_optimization=True is incompatible with a custom "
                 "partition feature; optimization only exists to generate partitions."
             )
+        if self.use_custom_partition_feature and partition_plan is not None:
+            raise ValueError(
+                "A partition plan cannot be combined with a custom partition feature."
+            )
+        self.partition_plan = partition_plan
+        self._recording_partition_plan = False
+        self._reusing_partition_plan = False
+        self._input_fingerprints: Dict[str, InputFingerprint] = {}
+        self._input_fingerprints_hashed = False
 
         self.max_partition_count: int = 1
+        self._last_partition_id: int = 0
+        # Exclusive upper bounds of split partitions, see _split_partition_geometry
+        self._split_upper_bounds: Dict[int, UpperBounds] = {}
         self.final_partition_feature_count: Optional[int] = None
         self.error_log = {}
 
@@ -446,15 +539,21 @@ class PartitionIterator:
         iteration_config = replace(
             work_file_manager_config, write_to_memory=False, keep_files=False
         )
+        # Iteration selections are named per partition and never reused, so their
+        # deletion can wait for a batch; resolved files are recreated on retries.
+        selection_config = replace(iteration_config, defer_deletion=True)
         persistent_config = replace(work_file_manager_config, write_to_memory=False)
 
         self.work_file_manager_temp_files = PartitionWorkFileManager(config=temp_config)
         self.work_file_manager_iteration_files = PartitionWorkFileManager(
-            config=iteration_config
+            config=selection_config
         )
         self.work_file_manager_resolved_files = PartitionWorkFileManager(
             config=iteration_config
         )
+        self.work_file_manager_intermediate_files = PartitionWorkFileManager(
+            config=temp_config
+        )
         self.work_file_manager_persistent_files = PartitionWorkFileManager(
             config=persistent_config
         )
@@ -483,6 +582,9 @@ class PartitionIterator:
         self.iteration_start_time: float
         self._last_injected_log = None
 
+        self._output_buffers: Dict[str, OutputBuffer] = {}
+        self._partitions_since_flush = 0
+
         self._overview_partition_loads: List[float] = []
         self._overview_pct_accumulators: Dict[str, PercentageAccumulator] = {}
         # Built here so the catalog is never None; partition_iteration rebuilds it once
@@ -543,6 +645,74 @@ class PartitionIterator:
                 f"Custom partition feature must be a polygon, got '{shape_type}': {path}"
             )
 
+    def _processing_input_fingerprints(self) -> Dict[str, InputFingerprint]:
+        return {
+            prepared.source_path: InputFingerprint.of([prepared.active_path])
+            for prepared in self._processing_items()
+        }
+
+    def _add_content_hashes(self, recording: bool) -> None:
+        """
+        Add content hashes to the input fingerprints: all of them when recording a
+        plan, otherwise only those the partition plan's OID index could be used for.
+        Each takes a full read of its input, so this runs at most once per run.
+        """
+        if self._input_fingerprints_hashed:
+            return
+        self._input_fingerprints_hashed = True
+        for prepared in self._processing_items():
+            path = prepared.source_path
+            fingerprint = self._input_fingerprints.get(path)
+            if fingerprint is None:
+                continue
+            if recording or self.partition_plan.needs_content_hash(path, fingerprint):
+                self._input_fingerprints[path] = fingerprint.with_content_hash(
+                    [prepared.active_path]
+                )
+
+    def _reuse_partition_plan(self) -> bool:
+        """
+        Point partition_feature at the partition plan's polygons if the plan fits
+        this run's settings and processing inputs.
+        """
+        if self.partition_plan is None:
+            return False
+
+        self._input_fingerprints = self._processing_input_fingerprints()
+        self._input_fingerprints_hashed = False
+        fingerprint = InputFingerprint.union(self._input_fingerprints.values())
+        if not self.partition_plan.is_reusable_for(
+            partition_method=self.partition_method.value,
+            max_elements_per_partition=self.max_elements_per_partition,
+            run_partition_optimization=self.run_partition_optimization,
+            fingerprint=fingerprint,
+        ):
+            return False
+
+        self.partition_feature = self.partition_plan.partition_feature
+        self.final_partition_feature_count = (
+            self.partition_plan.final_partition_feature_count
+        )
+        self._reusing_partition_plan = True
+        return True
+
+    def _record_partition_plan(self) -> None:
+        """Store the partitions just created in the partition plan, if one is given."""
+        if self.partition_plan is None or not arcpy.Exists(self.partition_feature):
+            return
+
+        self._add_content_hashes(recording=True)
+        self.partition_plan.record_partitions(
+            source_partition_feature=self.partition_feature,
+            partition_method=self.partition_method.value,
+            max_elements_per_partition=self.max_elements_per_partition,
+            run_partition_optimization=self.run_partition_optimization,
+            final_partition_feature_count=self.final_partition_feature_count,
+            fingerprint=InputFingerprint.union(self._input_fingerprints.values()),
+            input_fingerprints=self._input_fingerprints,
+        )
+        self._recording_partition_plan = True
+
     def _create_cartographic_partitions(self, element_limit: int) -> None:
         """
         Creates cartographic partitions based on the given element_limit.
@@ -980,13 +1150,16 @@ class PartitionIterator:
         Select and prepare a single processing input for one partition.
 
         How:
-        - Selects features whose center lies within the partition.
+        - Selects features whose center lies within the partition. For a split
+          partition, features centred on its exclusive upper bounds are left to
+          the sibling partition that owns them.
         - Marks them with `PARTITION_FIELD = 1` and copies to an iteration-scoped dataset.
         - If `search_distance > 0`, also selects nearby features:
             * Includes features within the search radius but not center-in,
             * Marks them with `PARTITION_FIELD = 0`,
             * Appends them to the same iteration dataset.
-        - Updates `iteration_paths` and `iteration_stats` with path and feature count.
+        - Updates `iteration_paths` and `iteration_stats` with path, feature and vertex
+          counts and their processing/context split, measured in one read.
         - Creates a dummy feature if no features are found.
 
         Returns:
@@ -1011,8 +1184,25 @@ class PartitionIterator:
             output_name=selection_memory_path,
         )
 
+        on_upper_bounds = self._centres_on_upper_bounds(
+            selection_path=selection_memory_path, partition_id=partition_id
+        )
+        if on_upper_bounds:
+            arcpy.management.SelectLayerByAttribute(
+                in_layer_or_view=selection_memory_path,
+                selection_type="REMOVE_FROM_SELECTION",
+                where_clause=self._oid_where_clause(input_path, on_upper_bounds),
+            )
+
         center_count = file_utilities.count_objects(selection_memory_path)
 
+        if self._recording_partition_plan and center_count > 0:
+            with arcpy.da.SearchCursor(selection_memory_path, ["OID@"]) as cursor:
+                oids = [oid for (oid,) in cursor]
+            self.partition_plan.record_partition_oids(
+                input_path=input_path, partition_id=partition_id, oids=oids
+            )
+
         if center_count == 0:
             stats.count = center_count
             stats.vertex_count = 0
@@ -1065,6 +1255,13 @@ class PartitionIterator:
                 select_features=iteration_partition,
                 selection_type="REMOVE_FROM_SELECTION",
             )
+            if on_upper_bounds:
+                # Processed by a sibling partition, so context here.
+                arcpy.management.SelectLayerByAttribute(
+                    in_layer_or_view=nearby_selection,
+                    selection_type="ADD_TO_SELECTION",
+                    where_clause=self._oid_where_clause(input_path, on_upper_bounds),
+                )
 
             arcpy.CalculateField_management(
                 in_table=nearby_selection,
@@ -1077,16 +1274,76 @@ class PartitionIterator:
                 schema_type="NO_TEST",
             )
 
-        stats.count = (
-            file_utilities.count_objects(input_layer=output_path)
-            if self.search_distance > 0
-            else center_count
-        )
-        stats.vertex_count = file_utilities.count_vertices(output_path)
+        self._measure_processing_selection(stats=stats, selection_path=output_path)
         self.iteration_paths[object_key][self.INPUT_KEY] = output_path
         self.work_file_manager_temp_files.delete_created_files()
         return True
 
+    @staticmethod
+    def _oid_where_clause(feature_class: str, oids: Set[int]) -> str:
+        oid_field = arcpy.AddFieldDelimiters(
+            feature_class, arcpy.Describe(feature_class).OIDFieldName
+        )
+        return f"{oid_field} IN ({', '.join(str(oid) for oid in sorted(oids))})"
+
+    def _centres_on_upper_bounds(
+        self, selection_path: str, partition_id: int
+    ) -> Set[int]:
+        """
+        OIDs of selected features whose centre lies on an exclusive upper bound of a
+        split partition. HAVE_THEIR_CENTER_IN counts a centre on the boundary as inside,
+        so such features are also selected by the sibling on the other side.
+
+        The centre follows SelectLayerByLocation: the point itself, the midpoint of a
+        line, and the centroid of other geometries. A centre within the XY tolerance
+        below a bound counts as on it.
+        """
+        upper_x, upper_y = self._split_upper_bounds.get(partition_id, (None, None))
+        if upper_x is None and upper_y is None:
+            return set()
+
+        tolerance = arcpy.Describe(selection_path).spatialReference.XYTolerance or 0.0
+        on_bounds = set()
+        with arcpy.da.SearchCursor(selection_path, ["OID@", "SHAPE@"]) as cursor:
+            for oid, shape in cursor:
+                if shape is None:
+                    continue
+                if shape.type == "polyline":
+                    centre = shape.positionAlongLine(0.5, True).firstPoint
+                else:
+                    centre = shape.centroid
+                if (upper_x is not None and centre.X >= upper_x - tolerance) or (
+                    upper_y is not None and centre.Y >= upper_y - tolerance
+                ):
+                    on_bounds.add(oid)
+        return on_bounds
+
+    def _measure_processing_selection(
+        self, stats: PartitionStats, selection_path: str
+    ) -> None:
+        """
+        Fill the feature and vertex counts of stats, split by PARTITION_FIELD
+        (1 = processing, 0 = context), from a single cursor pass over the selection.
+        """
+        object_counts = {0: 0, 1: 0}
+        vertex_counts = {0: 0, 1: 0}
+
+        with arcpy.da.SearchCursor(
+            selection_path, ["SHAPE@", self.PARTITION_FIELD]
+        ) as cursor:
+            for shape, selection_flag in cursor:
+                key = 1 if selection_flag == 1 else 0
+                object_counts[key] += 1
+                if shape is not None:
+                    vertex_counts[key] += shape.pointCount
+
+        stats.processing_object_count = object_counts[1]
+        stats.context_object_count = object_counts[0]
+        stats.processing_vertex_count = vertex_counts[1]
+        stats.context_vertex_count = vertex_counts[0]
+        stats.count = object_counts[0] + object_counts[1]
+        stats.vertex_count = vertex_counts[0] + vertex_counts[1]
+
     def process_all_processing_inputs(
         self,
         iteration_partition: str,
@@ -1152,17 +1409,22 @@ class PartitionIterator:
             search_distance=self.search_distance,
         )
 
-        count = file_utilities.count_objects(output_path)
+        count = 0
+        vertex_count = 0
+        with arcpy.da.SearchCursor(output_path, ["SHAPE@"]) as cursor:
+            for (shape,) in cursor:
+                count += 1
+                if shape is not None:
+                    vertex_count += shape.pointCount
 
         if count > 0:
             self.iteration_paths[object_key][self.INPUT_KEY] = output_path
-            stats.vertex_count = file_utilities.count_vertices(output_path)
         else:
             self.update_empty_object_tag_with_dummy_file(
                 object_key=object_key, tag=self.INPUT_KEY
             )
-            stats.vertex_count = 0
         stats.count = count
+        stats.vertex_count = vertex_count
 
     def process_all_context_inputs(
         self,
@@ -1187,11 +1449,10 @@ class PartitionIterator:
         self, object_key: str, partition_id: int
     ) -> None:
         """
-        Compute and store processing/context split metadata for one processing input.
+        Compute the processing/context percentages for one processing input.
 
-        Uses PARTITION_FIELD (1 = processing, 0 = context) to make two attribute
-        selections on the iteration path, then counts objects and vertices for each.
-        Results are written into iteration_stats for the given object_key.
+        The object and vertex counts behind them are measured while the partition is
+        selected (see _measure_processing_selection), so nothing is read again here.
 
         A partition where the object had no features keeps the zeroed defaults.
         """
@@ -1200,48 +1461,22 @@ class PartitionIterator:
         if stats is None or stats.count == 0:
             return
 
-        iteration_path = self.iteration_paths[object_key][self.INPUT_KEY]
         total_count = stats.count
-
-        processing_layer = f"partition_{partition_id}_{object_key}_processing_lyr"
-        context_layer = f"partition_{partition_id}_{object_key}_context_lyr"
-
-        custom_arcpy.select_attribute_and_make_feature_layer(
-            input_layer=iteration_path,
-            expression=f"{self.PARTITION_FIELD} = 1",
-            output_name=processing_layer,
-        )
-        custom_arcpy.select_attribute_and_make_feature_layer(
-            input_layer=iteration_path,
-            expression=f"{self.PARTITION_FIELD} = 0",
-            output_name=context_layer,
-        )
-
-        processing_count = file_utilities.count_objects(processing_layer)
-        context_count = file_utilities.count_objects(context_layer)
-        processing_vertices = file_utilities.count_vertices(processing_layer)
-        context_vertices = file_utilities.count_vertices(context_layer)
-
-        arcpy.Delete_management(processing_layer)
-        arcpy.Delete_management(context_layer)
-
-        stats.processing_object_count = processing_count
-        stats.context_object_count = context_count
-        stats.processing_vertex_count = processing_vertices
-        stats.context_vertex_count = context_vertices
-        total_vertices = processing_vertices + context_vertices
+        total_vertices = stats.processing_vertex_count + stats.context_vertex_count
 
         stats.processing_object_percentage = round(
-            processing_count / total_count * 100, 2
+            stats.processing_object_count / total_count * 100, 2
+        )
+        stats.context_object_percentage = round(
+            stats.context_object_count / total_count * 100, 2
         )
-        stats.context_object_percentage = round(context_count / total_count * 100, 2)
         stats.processing_vertex_percentage = (
-            round(processing_vertices / total_vertices * 100, 2)
+            round(stats.processing_vertex_count / total_vertices * 100, 2)
             if total_vertices > 0
             else 0
         )
         stats.context_vertex_percentage = (
-            round(context_vertices / total_vertices * 100, 2)
+            round(stats.context_vertex_count / total_vertices * 100, 2)
             if total_vertices > 0
             else 0
         )
@@ -1287,6 +1522,8 @@ class PartitionIterator:
                 run_partition_optimization=self.run_partition_optimization,
                 final_partition_feature_count=self.final_partition_feature_count,
                 custom_partition_feature_used=self.use_custom_partition_feature,
+                adaptive_split=self.adaptive_split,
+                fused_stage_radii_meters=self.fused_stage_radii,
             ),
             partition_summary=PartitionSummary(
                 total_partitions=self.max_partition_count
@@ -1479,7 +1716,7 @@ class PartitionIterator:
         )
 
         total_runtime = time.time() - self.total_start_time
-        remaining_iterations = self.max_partition_count - object_id
+        remaining_iterations = max(self.max_partition_count - object_id, 0)
         estimate_remaining = remaining_iterations * avg_runtime
 
         now_str = datetime.now().strftime("%d-%m %H:%M:%S")
@@ -1585,17 +1822,69 @@ class PartitionIterator:
         else:
             return method_config
 
+    def _iter_inject_ios(self, value: Any) -> Iterator[core_config.InjectIO]:
+        """Yield every InjectIO in a nested structure, walked like resolve_param_injections."""
+        if isinstance(value, core_config.InjectIO):
+            yield value
+        elif is_dataclass(value) and not isinstance(value, type):
+            for f in fields(value):
+                yield from self._iter_inject_ios(getattr(value, f.name))
+        elif isinstance(value, dict):
+            for item in value.values():
+                yield from self._iter_inject_ios(item)
+        elif isinstance(value, (list, tuple, set)):
+            for item in value:
+                yield from self._iter_inject_ios(item)
+
+    def _find_intermediate_tags(
+        self, method_entries_config: core_config.MethodEntriesConfig
+    ) -> Set[Tuple[str, str]]:
+        """
+        Return the (object, tag) pairs the methods inject that are neither a partition
+        input nor a configured output; in a fused run these only pass data between stages.
+        """
+        intermediate = set()
+        for entry in method_entries_config.entries:
+            if isinstance(entry, core_config.FuncMethodEntryConfig):
+                params = [entry.params]
+            else:
+                params = [entry.init_params, entry.method_params]
+
+            for inject in self._iter_inject_ios(params):
+                if inject.tag == self.INPUT_KEY and inject.object in self.input_catalog:
+                    continue
+                if inject.tag in self.output_catalog.get(inject.object, {}):
+                    continue
+                intermediate.add((inject.object, inject.tag))
+
+        return intermediate
+
     def resolve_inject_entry(
         self, inject: core_config.InjectIO, partition_id: int
     ) -> str:
-        """Resolve a single `InjectIO` placeholder to a concrete path for this partition."""
+        """
+        Resolve a single `InjectIO` placeholder to a concrete path for this partition.
+        Intermediate tags of a fused run resolve to the memory workspace.
+        """
         if inject.tag == self.INPUT_KEY and inject.object in self.input_catalog:
             return self.iteration_paths[inject.object][inject.tag]
 
+        if (inject.object, inject.tag) in self.intermediate_tags:
+            path = self.work_file_manager_intermediate_files.generate_partition_path(
+                object_name=inject.object,
+                tag=inject.tag,
+                partition_id=partition_id,
+            )
+            self.iteration_paths.setdefault(inject.object, {})[inject.tag] = path
+            return path
+
         path = self.work_file_manager_resolved_files.generate_partition_path(
             object_name=inject.object,
             tag=inject.tag,
             partition_id=partition_id,
+            expected_size=sum(
+                stats.vertex_count for stats in self.iteration_stats.values()
+            ),
         )
         self.iteration_paths.setdefault(inject.object, {})[inject.tag] = path
 
@@ -1722,6 +2011,10 @@ class PartitionIterator:
                 else:
                     raise TypeError(f"Unsupported method entry type: {type(entry)}")
 
+                # Later placements should see what the entry actually wrote.
+                self.work_file_manager_resolved_files.report_written_sizes()
+                self.work_file_manager_intermediate_files.report_written_sizes()
+
             except Exception as e:
                 record["status"] = "error"
                 record["error"] = str(e)
@@ -1733,7 +2026,9 @@ class PartitionIterator:
         self._last_injected_log = self._jsonify(execution_log)
         return execution_log
 
-    def execute_injected_methods_with_retry(self, partition_id: int):
+    def execute_injected_methods_with_retry(
+        self, partition_id: int, allow_split: bool = False
+    ) -> Optional[str]:
         """
         Execute injected methods for a partition with retries and structured logging.
 
@@ -1745,9 +2040,15 @@ class PartitionIterator:
             - On success: write `method_logs/method_log_{partition_id}.json` and return.
             - On failure: write `error_logs/error_{partition_id}/attempt_{n}_error.json`,
             increment `self.error_log[partition_id]`, and retry until max_retries.
+            - If allow_split and the error is a resource error, stop retrying and
+            return the split reason instead.
 
         Args:
             partition_id: Current partition identifier.
+            allow_split: Whether the partition may be split on resource errors.
+
+        Returns:
+            Optional[str]: None on success, or the reason the partition should be split.
 
         Raises:
             Exception: Re-raises the last error after exhausting retries; also writes
@@ -1760,6 +2061,7 @@ class PartitionIterator:
 
             try:
                 self.work_file_manager_resolved_files.delete_created_files()
+                self.work_file_manager_intermediate_files.delete_created_files()
 
                 resolved = self.resolve_injected_io_for_methods(
                     method_entries_config=self.list_of_methods,
@@ -1776,7 +2078,7 @@ class PartitionIterator:
                     dict_data=execution_log,
                     sub_dir=os.path.join("method_logs"),
                 )
-                return
+                return None
 
             except Exception as e:
                 attempt_log = getattr(self, "_last_injected_log", None)
@@ -1807,6 +2109,10 @@ class PartitionIterator:
                 self.error_log[partition_id]["Number of retries"] += 1
                 self.error_log[partition_id]["Error Messages"][attempt] = error_message
 
+                if allow_split and self._is_resource_error(e):
+                    print("Resource error, splitting partition instead of retrying.")
+                    return f"resource_error: {type(e).__name__}"
+
                 if attempt == max_retries:
                     print("Max retries reached.")
                     self.write_documentation(name="error_log", dict_data=self.error_log)
@@ -1852,19 +2158,22 @@ class PartitionIterator:
         iteration_partition: str,
         partition_id: int,
         extraction_method: core_config.OutputExtractionMethod,
-    ) -> str:
+    ) -> Tuple[str, Optional[str]]:
         """
-        Produce the per-partition slice of an iteration output to append to the final output.
+        Locate the per-partition slice of an iteration output to append to the final output.
 
         The slice is built according to the output's own `extraction_method`:
-        - "selection": select whole features owned by this partition (PARTITION_FIELD = 1).
+        - "selection": whole features owned by this partition (PARTITION_FIELD = 1). No
+          feature class is written; the slice is the iteration output plus a where clause.
         - "clip": clip the iteration output by the partition polygon (PairwiseClip). The full
           iteration output is clipped; this does not depend on PARTITION_FIELD. Correctness
           relies on the partition polygons not overlapping: generated cartographic partitions
           satisfy this, a `custom_partition_feature` is only validated for geometry type.
 
-        Returns the path to a temporary (work-managed) feature holding the slice. The caller
-        is responsible for deleting temp files via the temp work file manager.
+        Returns:
+            Tuple[str, Optional[str]]: The feature class to read the slice from and the
+            where clause to read it with. A clipped slice is a temporary (work-managed)
+            feature; the caller deletes temp files via the temp work file manager.
         """
         if extraction_method is core_config.OutputExtractionMethod.CLIP:
             extracted_path = self.work_file_manager_temp_files.generate_partition_path(
@@ -1878,20 +2187,91 @@ class PartitionIterator:
                 clip_features=iteration_partition,
                 out_feature_class=extracted_path,
             )
-            return extracted_path
+            return extracted_path, None
 
-        extracted_path = self.work_file_manager_temp_files.generate_partition_path(
-            object_name=object_key,
+        return iteration_path, f"{self.PARTITION_FIELD} = 1"
+
+    @staticmethod
+    def _writable_fields(feature_class: str) -> List[str]:
+        return [
+            f.name
+            for f in arcpy.ListFields(feature_class)
+            if f.editable and f.type not in ("OID", "Geometry")
+        ]
+
+    def _output_buffer(
+        self, object_key: str, tag: str, final_output_path: str, template: str
+    ) -> OutputBuffer:
+        """
+        Return the buffer for a final output. Its fields follow the final output if it
+        already exists, otherwise template, which the final output is later created from.
+        """
+        buffer = self._output_buffers.get(final_output_path)
+        if buffer is not None:
+            return buffer
+
+        output_exists = bool(arcpy.Exists(final_output_path))
+        buffer = OutputBuffer(
+            object_key=object_key,
             tag=tag,
-            partition_id=partition_id,
-            suffix="partition_final_output_append_selection",
+            final_output_path=final_output_path,
+            fields=self._writable_fields(
+                final_output_path if output_exists else template
+            ),
+            output_exists=output_exists,
         )
-        custom_arcpy.select_attribute_and_make_feature_layer(
-            input_layer=iteration_path,
-            expression=f"{self.PARTITION_FIELD} = 1",
-            output_name=extracted_path,
+        self._output_buffers[final_output_path] = buffer
+        return buffer
+
+    @staticmethod
+    def _read_output_rows(
+        source: str, where_clause: Optional[str], fields: List[str]
+    ) -> List[tuple]:
+        """
+        Read (SHAPE@, *fields) rows from source. Fields the source lacks are read as
+        None, matching how Append with schema_type="NO_TEST" leaves them empty.
+        """
+        source_fields = {f.name.lower() for f in arcpy.ListFields(source)}
+        present = [name for name in fields if name.lower() in source_fields]
+        positions = [
+            present.index(name) if name in present else None for name in fields
+        ]
+
+        rows = []
+        with arcpy.da.SearchCursor(
+            source, ["SHAPE@", *present], where_clause=where_clause
+        ) as cursor:
+            for shape, *values in cursor:
+                rows.append(
+                    (
+                        shape,
+                        *(values[i] if i is not None else None for i in positions),
+                    )
+                )
+        return rows
+
+    def _flush_output_buffer(self, buffer: OutputBuffer) -> None:
+        """Write the rows held by buffer to its final output with one insert cursor."""
+        if not buffer.rows:
+            return
+
+        with arcpy.da.InsertCursor(
+            buffer.final_output_path, ["SHAPE@", *buffer.fields]
+        ) as cursor:
+            for row in buffer.rows:
+                cursor.insertRow(row)
+
+        print(
+            f"Appended {len(buffer.rows)} rows to final output for "
+            f"{buffer.object_key}:{buffer.tag}"
         )
-        return extracted_path
+        buffer.rows = []
+
+    def flush_output_buffers(self) -> None:
+        """Write every buffered output row to the final outputs."""
+        for buffer in self._output_buffers.values():
+            self._flush_output_buffer(buffer)
+        self._partitions_since_flush = 0
 
     def _extract_and_append_partition_output(
         self,
@@ -1905,8 +2285,12 @@ class PartitionIterator:
     ) -> None:
         """
         Checks whether the intermediate result for the given object and tag is valid,
-        extracts this partition's slice (selection or clip), and appends it to the final
-        output if so.
+        extracts this partition's slice (selection or clip), and buffers its rows for
+        the final output if so.
+
+        Object and vertex counts for the overview are taken from the buffered rows.
+        The buffer is written once it holds output_flush_rows rows; otherwise
+        append_iteration_outputs_to_final flushes every output_flush_partitions.
 
         Args:
             object_key (str): The object identifier (e.g. 'building_polygons').
@@ -1920,42 +2304,46 @@ class PartitionIterator:
         if not file_utilities.feature_has_rows(feature=iteration_path):
             return
 
-        extracted_path = self._extract_partition_output(
-            object_key=object_key,
-            tag=tag,
-            iteration_path=iteration_path,
-            iteration_partition=iteration_partition,
-            partition_id=partition_id,
-            extraction_method=extraction_method,
-        )
-
         try:
-            if not file_utilities.feature_has_rows(feature=extracted_path):
+            source, where_clause = self._extract_partition_output(
+                object_key=object_key,
+                tag=tag,
+                iteration_path=iteration_path,
+                iteration_partition=iteration_partition,
+                partition_id=partition_id,
+                extraction_method=extraction_method,
+            )
+
+            buffer = self._output_buffer(
+                object_key=object_key,
+                tag=tag,
+                final_output_path=final_output_path,
+                template=source,
+            )
+            rows = self._read_output_rows(
+                source=source, where_clause=where_clause, fields=buffer.fields
+            )
+            if not rows:
                 return
 
+            if not buffer.output_exists:
+                file_utilities.create_feature_class(
+                    template_feature=source, new_feature=final_output_path
+                )
+                buffer.output_exists = True
+                print(f"Created final output for {object_key}:{tag}")
+
             obj_overview = self.overview_catalog.processing_inputs.get(object_key)
             output_entry = obj_overview.outputs.get(tag) if obj_overview else None
             if output_entry is not None:
-                output_entry.output_object_count += file_utilities.count_objects(
-                    extracted_path
-                )
-                output_entry.output_vertex_count += file_utilities.count_vertices(
-                    extracted_path
+                output_entry.output_object_count += len(rows)
+                output_entry.output_vertex_count += sum(
+                    row[0].pointCount for row in rows if row[0] is not None
                 )
 
-            if not arcpy.Exists(final_output_path):
-                arcpy.management.CopyFeatures(
-                    in_features=extracted_path,
-                    out_feature_class=final_output_path,
-                )
-                print(f"Created final output for {object_key}:{tag}")
-            else:
-                arcpy.management.Append(
-                    inputs=extracted_path,
-                    target=final_output_path,
-                    schema_type="NO_TEST",
-                )
-                print(f"Appended to final output for {object_key}:{tag}")
+            buffer.rows.extend(rows)
+            if len(buffer.rows) >= self.output_flush_rows:
+                self._flush_output_buffer(buffer)
 
         finally:
             self.work_file_manager_temp_files.delete_created_files()
@@ -1964,7 +2352,8 @@ class PartitionIterator:
         self, partition_id: int, iteration_partition: str
     ) -> None:
         """
-        Appends all valid outputs for the current iteration to their final output paths.
+        Buffers all valid outputs for the current iteration for their final output paths,
+        flushing every output_flush_partitions partitions.
 
         Skips any objects marked as dummy and ensures only non-empty, valid inputs are appended.
         """
@@ -1983,6 +2372,10 @@ class PartitionIterator:
                 extraction_method=entry.extraction_method,
             )
 
+        self._partitions_since_flush += 1
+        if self._partitions_since_flush >= self.output_flush_partitions:
+            self.flush_output_buffers()
+
     def cleanup_helper_fields(self) -> None:
         """
         Delete the helper field `PARTITION_FIELD` from:
@@ -2006,6 +2399,98 @@ class PartitionIterator:
                 prepared.active_path, fields_to_delete
             )
 
+    def _can_split(self, depth: int) -> bool:
+        return (
+            self.adaptive_split is not None
+            and depth < self.adaptive_split.max_split_depth
+        )
+
+    def _load_split_reason(self, depth: int) -> Optional[str]:
+        """
+        Returns the split reason if the selected load of the current partition is
+        over the adaptive split budget, otherwise None.
+        """
+        if not self._can_split(depth):
+            return None
+        max_load = self.adaptive_split.max_partition_load
+        if max_load is None:
+            return None
+        load = self._total_partition_load()
+        if load <= max_load:
+            return None
+        print(f"Partition load {load} exceeds budget {max_load}, splitting.")
+        return f"load: {load} > {max_load}"
+
+    def _is_resource_error(self, exc: BaseException) -> bool:
+        """
+        Whether exc looks like the process ran out of memory or other resources,
+        judged by adaptive_split.resource_error_markers.
+        """
+        if (
+            self.adaptive_split is None
+            or not self.adaptive_split.split_on_resource_errors
+        ):
+            return False
+        if isinstance(exc, MemoryError):
+            return True
+        text = f"{type(exc).__name__}: {exc}".lower()
+        return any(
+            marker.lower() in text
+            for marker in self.adaptive_split.resource_error_markers
+        )
+
+    @staticmethod
+    def _read_partition_geometry(iteration_partition: str) -> arcpy.Geometry:
+        with arcpy.da.SearchCursor(iteration_partition, ["SHAPE@"]) as cursor:
+            for (geometry,) in cursor:
+                return geometry
+        raise ValueError(f"No partition geometry in {iteration_partition}")
+
+    @staticmethod
+    def _split_partition_geometry(
+        geometry: arcpy.Geometry,
+        upper_bounds: UpperBounds = (None, None),
+    ) -> List[Tuple[arcpy.Geometry, UpperBounds]]:
+        """
+        Splits a partition polygon into the non-empty parts of its extent quadrants.
+
+        Returns (quadrant part, exclusive upper (x, y) bounds) pairs. The quadrants are
+        half-open, [min, max), along the split lines, so a centre on a split line goes
+        to exactly one child. upper_bounds are the exclusive bounds of the parent, kept
+        by the children on the same side.
+        """
+        extent = geometry.extent
+        mid_x = (extent.XMin + extent.XMax) / 2
+        mid_y = (extent.YMin + extent.YMax) / 2
+        upper_x, upper_y = upper_bounds
+
+        quadrants = [
+            (extent.XMin, extent.YMin, mid_x, mid_y, mid_x, mid_y),
+            (mid_x, extent.YMin, extent.XMax, mid_y, upper_x, mid_y),
+            (extent.XMin, mid_y, mid_x, extent.YMax, mid_x, upper_y),
+            (mid_x, mid_y, extent.XMax, extent.YMax, upper_x, upper_y),
+        ]
+
+        children = []
+        for x_min, y_min, x_max, y_max, exclusive_x, exclusive_y in quadrants:
+            quadrant = arcpy.Polygon(
+                arcpy.Array(
+                    [
+                        arcpy.Point(x_min, y_min),
+                        arcpy.Point(x_min, y_max),
+                        arcpy.Point(x_max, y_max),
+                        arcpy.Point(x_max, y_min),
+                        arcpy.Point(x_min, y_min),
+                    ]
+                ),
+                geometry.spatialReference,
+            )
+            part = geometry.intersect(quadrant, 4)
+            if part is not None and part.area > 0:
+                children.append((part, (exclusive_x, exclusive_y)))
+
+        return children
+
     def _reset_iteration_state(self, partition_id: int) -> None:
         print(
             f"\nProcessing Partition: {partition_id} out of {self.max_partition_count}"
@@ -2013,6 +2498,166 @@ class PartitionIterator:
         self.iteration_start_time = time.time()
         self._reset_iteration_catalogs()
 
+    def _run_partition_pass(
+        self, partition_id: int, iteration_partition: str, depth: int
+    ) -> Optional[str]:
+        """
+        Select inputs, execute injected methods and append outputs for one partition.
+
+        Returns:
+            Optional[str]: None when the partition was processed (or had no inputs),
+            or the reason it should be split into child partitions instead.
+        """
+        inputs_present_in_partition = False
+        split_reason: Optional[str] = None
+
+        try:
+            if self._reusing_partition_plan:
+                self._add_content_hashes(recording=False)
+                if self.partition_plan.known_empty(
+                    partition_id, self._input_fingerprints
+                ):
+                    print("Partition plan shows no processing features, skipping.")
+                    return None
+
+            inputs_present_in_partition = self.process_all_processing_inputs(
+                iteration_partition=iteration_partition,
+                partition_id=partition_id,
+            )
+            RunProfiler.record_feature_count(
+                sum(
+                    stats.processing_object_count
+                    for stats in self.iteration_stats.values()
+                )
+            )
+            if not inputs_present_in_partition:
+                return None
+
+            self.process_all_context_inputs(
+                iteration_partition=iteration_partition, partition_id=partition_id
+            )
+            if self._recording_partition_plan:
+                self.partition_plan.partition_loads[partition_id] = (
+                    self._total_partition_load()
+                )
+
+            split_reason = self._load_split_reason(depth)
+            if split_reason is not None:
+                return split_reason
+
+            self._collect_processing_input_metadata(partition_id=partition_id)
+
+            split_reason = self.execute_injected_methods_with_retry(
+                partition_id=partition_id, allow_split=self._can_split(depth)
+            )
+            if split_reason is not None:
+                return split_reason
+
+            # Counted only once the partition is done, so a split parent does not
+            # report the same features as its children.
+            self._update_overview_from_partition(partition_id=partition_id)
+            self.write_documentation(
+                name=f"catalog_{partition_id}",
+                dict_data=self._iteration_catalog_snapshot(),
+                sub_dir="iteration_catalog",
+            )
+            self.append_iteration_outputs_to_final(
+                partition_id=partition_id,
+                iteration_partition=iteration_partition,
+            )
+            return None
+
+        finally:
+            if split_reason is None:
+                self._append_iteration_partition_to_output(
+                    iteration_partition=iteration_partition, partition_id=partition_id
+                )
+            self.work_file_manager_iteration_files.delete_created_files()
+            self.work_file_manager_resolved_files.delete_created_files()
+            self.work_file_manager_intermediate_files.delete_created_files()
+            if split_reason is None:
+                self.track_iteration_time(partition_id, inputs_present_in_partition)
+
+    def _process_partition(
+        self, partition_id: int, iteration_partition: str, depth: int = 0
+    ) -> None:
+        """
+        Process one partition, splitting it into child partitions when adaptive
+        splitting is configured and the partition is over budget or fails on resources.
+        """
+        parent_geometry = (
+            self._read_partition_geometry(iteration_partition)
+            if self._can_split(depth)
+            else None
+        )
+
+        with RunProfiler.span("partition_pass", os.path.basename(__file__)):
+            split_reason = self._run_partition_pass(
+                partition_id=partition_id,
+                iteration_partition=iteration_partition,
+                depth=depth,
+            )
+        if split_reason is None:
+            return
+
+        self._process_child_partitions(
+            parent_id=partition_id,
+            parent_geometry=parent_geometry,
+            depth=depth,
+            split_reason=split_reason,
+        )
+
+    def _process_child_partitions(
+        self,
+        parent_id: int,
+        parent_geometry: arcpy.Geometry,
+        depth: int,
+        split_reason: str,
+    ) -> None:
+        """
+        Split a partition into quadrants and process each as a new partition, with
+        ids continuing after the highest id used so far. Records the parent/child
+        relation in overview_catalog.partition_lineage.
+        """
+        child_geometries = self._split_partition_geometry(
+            parent_geometry,
+            self._split_upper_bounds.get(parent_id, (None, None)),
+        )
+
+        child_ids = []
+        for _ in child_geometries:
+            self._last_partition_id += 1
+            child_ids.append(self._last_partition_id)
+
+        lineage = self.overview_catalog.partition_lineage
+        parent_entry = lineage.setdefault(parent_id, PartitionLineage(depth=depth))
+        parent_entry.split_reason = split_reason
+        parent_entry.children = child_ids
+        self.overview_catalog.partition_summary.partitions_split += 1
+        print(f"Split partition {parent_id} into partitions {child_ids}")
+
+        for child_id, (child_geometry, upper_bounds) in zip(
+            child_ids, child_geometries
+        ):
+            lineage[child_id] = PartitionLineage(parent_id=parent_id, depth=depth + 1)
+            self._split_upper_bounds[child_id] = upper_bounds
+
+            self._reset_iteration_state(partition_id=child_id)
+            iteration_partition = (
+                self.work_file_manager_iteration_files.generate_partition_path(
+                    object_name="partition_feature_iteration_selection",
+                    partition_id=child_id,
+                )
+            )
+            arcpy.management.CopyFeatures(
+                in_features=[child_geometry], out_feature_class=iteration_partition
+            )
+            self._process_partition(
+                partition_id=child_id,
+                iteration_partition=iteration_partition,
+                depth=depth + 1,
+            )
+
     def partition_iteration(self):
         """
         Process every cartographic partition end-to-end.
@@ -2022,8 +2667,11 @@ class PartitionIterator:
         2) Select processing inputs (center-in; optionally add near-by features).
             - If no processing features are present, skip this partition.
         3) Select context inputs within the configured search radius.
+            - With adaptive splitting, a partition over the load budget is split here.
         4) Execute injected methods with retry and structured logging.
-        5) Persist the iteration catalog and append valid outputs to final outputs.
+            - With adaptive splitting, a resource error splits the partition instead.
+        5) Persist the iteration catalog and buffer valid outputs for the final outputs.
+            - Buffered rows are written in batches, and always before returning.
 
         Raises:
         - Propagates any unhandled exception from injected methods after retries are exhausted.
@@ -2034,55 +2682,31 @@ class PartitionIterator:
         self.work_file_manager_temp_files.delete_created_files()
         self._initialize_overview_catalog()
         file_utilities.delete_feature(self.partition_features_all)
+        self._last_partition_id = self.max_partition_count
+        self._split_upper_bounds = {}
+        self._output_buffers = {}
+        self._partitions_since_flush = 0
 
-        for partition_id in range(1, self.max_partition_count + 1):
-            self._reset_iteration_state(partition_id=partition_id)
-
-            iteration_partition = (
-                self.work_file_manager_iteration_files.generate_partition_path(
-                    object_name="partition_feature_iteration_selection",
-                    partition_id=partition_id,
-                )
-            )
-            self.select_partition_feature(
-                iteration_partition=iteration_partition, object_id=partition_id
-            )
-
-            inputs_present_in_partition = False
+        try:
+            for partition_id in range(1, self.max_partition_count + 1):
+                self._reset_iteration_state(partition_id=partition_id)
 
-            try:
-                self._append_iteration_partition_to_output(
-                    iteration_partition=iteration_partition, partition_id=partition_id
-                )
-                inputs_present_in_partition = self.process_all_processing_inputs(
-                    iteration_partition=iteration_partition,
-                    partition_id=partition_id,
+                iteration_partition = (
+                    self.work_file_manager_iteration_files.generate_partition_path(
+                        object_name="partition_feature_iteration_selection",
+                        partition_id=partition_id,
+                    )
                 )
-                if not inputs_present_in_partition:
-                    continue
-
-                self.process_all_context_inputs(
-                    iteration_partition=iteration_partition, partition_id=partition_id
+                self.select_partition_feature(
+                    iteration_partition=iteration_partition, object_id=partition_id
                 )
 
-                self._collect_processing_input_metadata(partition_id=partition_id)
-                self._update_overview_from_partition(partition_id=partition_id)
-
-                self.execute_injected_methods_with_retry(partition_id=partition_id)
-                self.write_documentation(
-                    name=f"catalog_{partition_id}",
-                    dict_data=self._iteration_catalog_snapshot(),
-                    sub_dir="iteration_catalog",
-                )
-                self.append_iteration_outputs_to_final(
-                    partition_id=partition_id,
-                    iteration_partition=iteration_partition,
+                self._process_partition(
+                    partition_id=partition_id, iteration_partition=iteration_partition
                 )
-
-            finally:
-                self.work_file_manager_iteration_files.delete_created_files()
-                self.work_file_manager_resolved_files.delete_created_files()
-                self.track_iteration_time(partition_id, inputs_present_in_partition)
+        finally:
+            self.flush_output_buffers()
+            PartitionWorkFileManager.drain_deferred_deletions()
 
     @timing_decorator
     def run(self):
@@ -2118,6 +2742,8 @@ class PartitionIterator:
 
         if self.use_custom_partition_feature:
             print("\nUsing custom partition feature; skipping partition creation...")
+        elif self._reuse_partition_plan():
+            print("\nReusing partition plan; skipping partition creation...")
         else:
             print("\nCreating Cartographic Partitions...")
             self.final_partition_feature_count = (
@@ -2128,10 +2754,19 @@ class PartitionIterator:
             self._create_cartographic_partitions(
                 element_limit=self.final_partition_feature_count
             )
+            self._record_partition_plan()
 
         print("\nStarting on Partition Iteration...")
         self.partition_iteration()
+        RunProfiler.record_feature_count(
+            sum(
+                obj_overview.input_object_count
+                for obj_overview in self.overview_catalog.processing_inputs.values()
+            )
+        )
         self._finalize_and_write_overview_catalog()
+        if self._recording_partition_plan:
+            self.partition_plan.save()
 
         self.cleanup_helper_fields()
         self.work_file_manager_persistent_files.delete_created_files()
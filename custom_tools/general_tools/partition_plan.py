@@ -0,0 +1,328 @@
+import hashlib
+import json
+import os
+from dataclasses import asdict, dataclass, field, replace
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import arcpy
+
+from custom_tools.general_tools import file_utilities
+
+
+@dataclass(frozen=True)
+class InputFingerprint:
+    """
+    Feature count and extent of a set of feature classes, and optionally a hash of
+    the OID and geometry of every feature in them. The hash takes a full read, so
+    it is only added by with_content_hash. Fingerprints joined by union have none.
+    """
+
+    feature_count: int
+    extent: Tuple[float, float, float, float]
+    content_hash: Optional[str] = None
+
+    @staticmethod
+    def _content_hash(paths: List[str]) -> str:
+        """
+        Sum of a hash of every feature's OID and geometry, so the result does
+        not depend on cursor order.
+        """
+        total = 0
+        for path in paths:
+            with arcpy.da.SearchCursor(path, ["OID@", "SHAPE@WKB"]) as cursor:
+                for oid, wkb in cursor:
+                    digest = hashlib.blake2b(
+                        oid.to_bytes(8, "little", signed=True), digest_size=16
+                    )
+                    digest.update(bytes(wkb) if wkb else b"")
+                    total += int.from_bytes(digest.digest(), "little")
+        return f"{total % (1 << 128):032x}"
+
+    @classmethod
+    def of(cls, paths: List[str]) -> "InputFingerprint":
+        count = 0
+        x_min = y_min = float("inf")
+        x_max = y_max = float("-inf")
+
+        for path in paths:
+            path_count = file_utilities.count_objects(path)
+            count += path_count
+            if path_count == 0:
+                continue
+            extent = arcpy.Describe(path).extent
+            x_min = min(x_min, extent.XMin)
+            y_min = min(y_min, extent.YMin)
+            x_max = max(x_max, extent.XMax)
+            y_max = max(y_max, extent.YMax)
+
+        if count == 0:
+            return cls(feature_count=0, extent=(0.0, 0.0, 0.0, 0.0))
+        return cls(feature_count=count, extent=(x_min, y_min, x_max, y_max))
+
+    def with_content_hash(self, paths: List[str]) -> "InputFingerprint":
+        """This fingerprint with the content hash of paths added."""
+        return replace(self, content_hash=self._content_hash(paths))
+
+    def without_content_hash(self) -> "InputFingerprint":
+        return replace(self, content_hash=None)
+
+    @classmethod
+    def union(cls, fingerprints: Iterable["InputFingerprint"]) -> "InputFingerprint":
+        """Fingerprint of several inputs taken together."""
+        non_empty = [fp for fp in fingerprints if fp.feature_count > 0]
+        if not non_empty:
+            return cls(feature_count=0, extent=(0.0, 0.0, 0.0, 0.0))
+        return cls(
+            feature_count=sum(fp.feature_count for fp in non_empty),
+            extent=(
+                min(fp.extent[0] for fp in non_empty),
+                min(fp.extent[1] for fp in non_empty),
+                max(fp.extent[2] for fp in non_empty),
+                max(fp.extent[3] for fp in non_empty),
+            ),
+        )
+
+    def count_drift(self, other: "InputFingerprint") -> float:
+        """Relative change in feature count from other to self."""
+        return abs(self.feature_count - other.feature_count) / max(
+            other.feature_count, 1
+        )
+
+    def extent_within(self, other: "InputFingerprint", tolerance: float) -> bool:
+        """Whether the extent of self lies inside the extent of other, grown by tolerance."""
+        if self.feature_count == 0:
+            return True
+        ax_min, ay_min, ax_max, ay_max = self.extent
+        bx_min, by_min, bx_max, by_max = other.extent
+        return (
+            ax_min >= bx_min - tolerance
+            and ay_min >= by_min - tolerance
+            and ax_max <= bx_max + tolerance
+            and ay_max <= by_max + tolerance
+        )
+
+    def extent_drift(self, other: "InputFingerprint") -> float:
+        """1 - intersection over union of the two extents; 0 when identical."""
+        ax_min, ay_min, ax_max, ay_max = self.extent
+        bx_min, by_min, bx_max, by_max = other.extent
+
+        overlap_w = max(0.0, min(ax_max, bx_max) - max(ax_min, bx_min))
+        overlap_h = max(0.0, min(ay_max, by_max) - max(ay_min, by_min))
+        intersection = overlap_w * overlap_h
+        union = (
+            (ax_max - ax_min) * (ay_max - ay_min)
+            + (bx_max - bx_min) * (by_max - by_min)
+            - intersection
+        )
+        if union <= 0:
+            return 0.0 if self.extent == other.extent else 1.0
+        return 1 - intersection / union
+
+
+@dataclass
+class PartitionPlan:
+    """
+    What:
+        Cartographic partitions computed by one PartitionIterator run, kept so later
+        runs over mostly the same data can reuse them instead of creating their own.
+
+    How:
+        The first iterator given the plan creates partitions as usual, copies them to
+        partition_feature and records the fingerprint of its processing inputs, the
+        load of each partition and the OIDs of the processing features centred in each.
+        metadata_file holds everything but the polygons, so a plan survives between
+        processes. A later iterator reuses the plan when it uses the same partition
+        method and element limit, its processing inputs lie inside the recorded
+        extent (features outside it would fall in no partition), and they have
+        drifted less than max_count_drift in feature count and max_extent_drift in
+        extent. Otherwise it creates partitions again and re-records the plan.
+
+        The OID index is only trusted for inputs whose content hash of OIDs and
+        geometry is unchanged: for those, partitions known to hold none of their
+        features are skipped without a spatial selection. Any edit to an input, also
+        one moving features between partitions, changes its hash. The hash is taken
+        when partitions are recorded, and on reuse only for inputs whose count and
+        extent still match the recorded ones.
+
+    Args:
+        partition_feature (str): Where the partition polygons are stored.
+        metadata_file (str): JSON file for fingerprints, loads and the OID index.
+        max_count_drift (float): Largest relative change in feature count to reuse at.
+        max_extent_drift (float): Largest extent change (1 - IoU) to reuse at.
+        extent_tolerance (float): Distance in map units the inputs may reach outside
+            the recorded extent and still reuse the plan.
+    """
+
+    partition_feature: str
+    metadata_file: str
+    max_count_drift: float = 0.05
+    max_extent_drift: float = 0.05
+    extent_tolerance: float = 0.001
+
+    partition_method: Optional[str] = None
+    max_elements_per_partition: Optional[int] = None
+    run_partition_optimization: Optional[bool] = None
+    final_partition_feature_count: Optional[int] = None
+    partition_count: int = 0
+    fingerprint: Optional[InputFingerprint] = None
+    input_fingerprints: Dict[str, InputFingerprint] = field(default_factory=dict)
+    partition_loads: Dict[int, int] = field(default_factory=dict)
+    oid_index: Dict[str, Dict[int, List[int]]] = field(default_factory=dict)
+
+    def load(self) -> bool:
+        """Read a saved plan, if both its metadata and polygons exist."""
+        if not os.path.exists(self.metadata_file) or not arcpy.Exists(
+            self.partition_feature
+        ):
+            return False
+
+        with open(self.metadata_file, "r", encoding="utf-8") as f:
+            data = json.load(f)
+
+        self.partition_method = data["partition_method"]
+        self.max_elements_per_partition = data["max_elements_per_partition"]
+        self.run_partition_optimization = data["run_partition_optimization"]
+        self.final_partition_feature_count = data["final_partition_feature_count"]
+        self.partition_count = data["partition_count"]
+        self.fingerprint = InputFingerprint(
+            feature_count=data["fingerprint"]["feature_count"],
+            extent=tuple(data["fingerprint"]["extent"]),
+        )
+        self.input_fingerprints = {
+            path: InputFingerprint(
+                feature_count=fp["feature_count"],
+                extent=tuple(fp["extent"]),
+                content_hash=fp.get("content_hash"),
+            )
+            for path, fp in data["input_fingerprints"].items()
+        }
+        self.partition_loads = {
+            int(pid): load for pid, load in data["partition_loads"].items()
+        }
+        self.oid_index = {
+            path: {int(pid): oids for pid, oids in index.items()}
+            for path, index in data["oid_index"].items()
+        }
+        return True
+
+    def save(self) -> None:
+        os.makedirs(os.path.dirname(self.metadata_file), exist_ok=True)
+        data = {
+            "partition_method": self.partition_method,
+            "max_elements_per_partition": self.max_elements_per_partition,
+            "run_partition_optimization": self.run_partition_optimization,
+            "final_partition_feature_count": self.final_partition_feature_count,
+            "partition_count": self.partition_count,
+            "fingerprint": asdict(self.fingerprint),
+            "input_fingerprints": {
+                path: asdict(fp) for path, fp in self.input_fingerprints.items()
+            },
+            "partition_loads": self.partition_loads,
+            "oid_index": self.oid_index,
+        }
+        with open(self.metadata_file, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+
+    def is_reusable_for(
+        self,
+        partition_method: str,
+        max_elements_per_partition: int,
+        run_partition_optimization: bool,
+        fingerprint: InputFingerprint,
+    ) -> bool:
+        """
+        Whether an iterator with these settings and processing inputs can reuse the
+        plan. Loads a saved plan first if none is held yet.
+        """
+        if self.fingerprint is None and not self.load():
+            return False
+
+        if (
+            partition_method != self.partition_method
+            or max_elements_per_partition != self.max_elements_per_partition
+            or run_partition_optimization != self.run_partition_optimization
+        ):
+            print("Partition plan was made with other partition settings.")
+            return False
+
+        if not fingerprint.extent_within(self.fingerprint, self.extent_tolerance):
+            print("Partition plan invalidated: inputs reach outside its extent.")
+            return False
+
+        count_drift = fingerprint.count_drift(self.fingerprint)
+        extent_drift = fingerprint.extent_drift(self.fingerprint)
+        if count_drift > self.max_count_drift or extent_drift > self.max_extent_drift:
+            print(
+                f"Partition plan invalidated: feature count drift {count_drift:.1%}, "
+                f"extent drift {extent_drift:.1%}."
+            )
+            return False
+
+        return True
+
+    def record_partitions(
+        self,
+        source_partition_feature: str,
+        partition_method: str,
+        max_elements_per_partition: int,
+        run_partition_optimization: bool,
+        final_partition_feature_count: Optional[int],
+        fingerprint: InputFingerprint,
+        input_fingerprints: Dict[str, InputFingerprint],
+    ) -> None:
+        """Store freshly created partitions, dropping any loads and index recorded before."""
+        file_utilities.delete_feature(self.partition_feature)
+        arcpy.management.CopyFeatures(
+            in_features=source_partition_feature,
+            out_feature_class=self.partition_feature,
+        )
+
+        self.partition_method = partition_method
+        self.max_elements_per_partition = max_elements_per_partition
+        self.run_partition_optimization = run_partition_optimization
+        self.final_partition_feature_count = final_partition_feature_count
+        self.partition_count = file_utilities.count_objects(self.partition_feature)
+        self.fingerprint = fingerprint
+        self.input_fingerprints = dict(input_fingerprints)
+        self.partition_loads = {}
+        self.oid_index = {path: {} for path in input_fingerprints}
+
+    def record_partition_oids(
+        self, input_path: str, partition_id: int, oids: List[int]
+    ) -> None:
+        if oids and partition_id <= self.partition_count:
+            self.oid_index.setdefault(input_path, {})[partition_id] = oids
+
+    def needs_content_hash(self, path: str, fingerprint: InputFingerprint) -> bool:
+        """
+        Whether the content hash of path could make the OID index usable for it,
+        that is whether its count and extent still match the recorded ones.
+        """
+        recorded = self.input_fingerprints.get(path)
+        return (
+            recorded is not None
+            and recorded.content_hash is not None
+            and recorded.without_content_hash() == fingerprint.without_content_hash()
+        )
+
+    def known_empty(
+        self, partition_id: int, input_fingerprints: Dict[str, InputFingerprint]
+    ) -> bool:
+        """
+        True if the OID index shows none of the inputs has features centred in the
+        partition. Only answers for inputs whose content hash matches the recorded one.
+        """
+        if partition_id > self.partition_count or not input_fingerprints:
+            return False
+
+        for path, fingerprint in input_fingerprints.items():
+            recorded = self.input_fingerprints.get(path)
+            if (
+                recorded is None
+                or fingerprint.content_hash is None
+                or recorded != fingerprint
+            ):
+                return False
+            if self.oid_index.get(path, {}).get(partition_id):
+                return False
+        return True
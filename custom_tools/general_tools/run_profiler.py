@@ -0,0 +1,350 @@
+import argparse
+import atexit
+import json
+import os
+import sys
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from functools import wraps
+from pathlib import Path
+from typing import Iterator, Optional
+
+PROFILING_DIRECTORY_NAME = "profiling"
+ARCPY_TOOLBOX_MODULES = (
+    "analysis",
+    "cartography",
+    "conversion",
+    "edit",
+    "management",
+)
+
+
+@dataclass
+class SpanRecord:
+    span_id: int
+    parent_id: Optional[int]
+    depth: int
+    name: str
+    file: str
+    thread_id: int
+    start_s: float
+    duration_s: float = 0.0
+    arcpy_tool_calls: dict[str, int] = field(default_factory=dict)
+    feature_count: Optional[int] = None
+
+
+class RunProfiler:
+    """
+    What:
+        Records nested span timings for one run, buffers them in memory and
+        writes them once per run as JSONL and Chrome trace files.
+
+    How:
+        Spans are timed with time.perf_counter_ns and kept on a per-thread
+        stack so nested calls get a parent. While a span is open, calls to the
+        arcpy toolbox modules are counted on the innermost span. Records are
+        flushed at interpreter exit, or explicitly through flush().
+
+    Why:
+        Per-call console and file logging rounded to whole seconds and wrote to
+        one building log whatever pipeline was running, so national runs could
+        not be compared or ranked by where time was actually spent.
+    """
+
+    _lock = threading.Lock()
+    _local = threading.local()
+    _records: list[SpanRecord] = []
+    _next_span_id = 0
+    _run_start_ns = time.perf_counter_ns()
+    _run_started_at = datetime.now()
+    _pipeline_name: Optional[str] = None
+    _output_directory: Optional[Path] = None
+    _arcpy_counter_installed = False
+    _flush_registered = False
+
+    @classmethod
+    def configure(
+        cls,
+        pipeline_name: Optional[str] = None,
+        output_directory: Optional[str] = None,
+    ) -> None:
+        """Sets the pipeline name and output directory used when flushing."""
+        if pipeline_name is not None:
+            cls._pipeline_name = pipeline_name
+        if output_directory is not None:
+            cls._output_directory = Path(output_directory)
+
+    @classmethod
+    def pipeline_name(cls) -> str:
+        if cls._pipeline_name:
+            return cls._pipeline_name
+
+        scale = os.getenv("SCALE")
+        obj = os.getenv("OBJECT")
+        if scale and obj:
+            return f"{scale}_{obj}"
+
+        return Path(sys.argv[0]).stem or "interactive"
+
+    @classmethod
+    def output_directory(cls) -> Path:
+        if cls._output_directory is not None:
+            return cls._output_directory / cls.pipeline_name()
+
+        from env_setup.project_layout import ProjectLayout
+        from paths import GIS_FILES_ROOT
+
+        layout = ProjectLayout(output_root=GIS_FILES_ROOT.parent)
+        return layout.main_dir / PROFILING_DIRECTORY_NAME / cls.pipeline_name()
+
+    @classmethod
+    def _stack(cls) -> list[SpanRecord]:
+        if not hasattr(cls._local, "stack"):
+            cls._local.stack = []
+        return cls._local.stack
+
+    @classmethod
+    @contextmanager
+    def span(cls, name: str, file: str = "") -> Iterator[SpanRecord]:
+        """Times the enclosed block as a span nested under the current one."""
+        cls._ensure_started()
+        stack = cls._stack()
+        parent = stack[-1] if stack else None
+
+        with cls._lock:
+            cls._next_span_id += 1
+            span_id = cls._next_span_id
+
+        start_ns = time.perf_counter_ns()
+        record = SpanRecord(
+            span_id=span_id,
+            parent_id=parent.span_id if parent else None,
+            depth=len(stack),
+            name=name,
+            file=file,
+            thread_id=threading.get_ident(),
+            start_s=(start_ns - cls._run_start_ns) / 1e9,
+        )
+        stack.append(record)
+
+        try:
+            yield record
+        finally:
+            record.duration_s = (time.perf_counter_ns() - start_ns) / 1e9
+            stack.pop()
+            with cls._lock:
+                cls._records.append(record)
+
+    @classmethod
+    def record_feature_count(cls, count: int) -> None:
+        """Adds a processed feature count to the innermost open span."""
+        stack = cls._stack()
+        if not stack:
+            return
+        current = stack[-1]
+        current.feature_count = (current.feature_count or 0) + int(count)
+
+    @classmethod
+    def _record_arcpy_tool_call(cls, tool_name: str) -> None:
+        stack = cls._stack()
+        if not stack:
+            return
+        calls = stack[-1].arcpy_tool_calls
+        calls[tool_name] = calls.get(tool_name, 0) + 1
+
+    @classmethod
+    def _ensure_started(cls) -> None:
+        if not cls._flush_registered:
+            atexit.register(cls.flush)
+            cls._flush_registered = True
+        if not cls._arcpy_counter_installed:
+            cls._install_arcpy_tool_counter()
+
+    @classmethod
+    def _install_arcpy_tool_counter(cls) -> None:
+        """Wraps the public tools of the arcpy toolbox modules with call counters."""
+        cls._arcpy_counter_installed = True
+        arcpy = sys.modules.get("arcpy")
+        if arcpy is None:
+            return
+
+        for module_name in ARCPY_TOOLBOX_MODULES:
+            toolbox = getattr(arcpy, module_name, None)
+            if toolbox is None:
+                continue
+
+            for tool_name in dir(toolbox):
+                if tool_name.startswith("_") or not tool_name[0].isupper():
+                    continue
+                tool = getattr(toolbox, tool_name)
+                if (
+                    not callable(tool)
+                    or isinstance(tool, type)
+                    or getattr(tool, "_run_profiler_counted", False)
+                ):
+                    continue
+                setattr(
+                    toolbox,
+                    tool_name,
+                    cls._counted_tool(tool, f"{module_name}.{tool_name}"),
+                )
+
+    @classmethod
+    def _counted_tool(cls, tool, qualified_name: str):
+        @wraps(tool)
+        def wrapper(*args, **kwargs):
+            cls._record_arcpy_tool_call(qualified_name)
+            return tool(*args, **kwargs)
+
+        wrapper._run_profiler_counted = True
+        return wrapper
+
+    @classmethod
+    def flush(cls) -> Optional[Path]:
+        """
+        Writes the buffered spans of this run to <run>.jsonl and
+        <run>.trace.json, clears the buffer and returns the JSONL path.
+        """
+        with cls._lock:
+            records = list(cls._records)
+            cls._records.clear()
+
+        if not records:
+            return None
+
+        try:
+            output_directory = cls.output_directory()
+            output_directory.mkdir(parents=True, exist_ok=True)
+        except (OSError, RuntimeError) as e:
+            print(f"Run profiler could not write profiling output: {e}")
+            return None
+
+        run_id = cls._run_started_at.strftime("%Y%m%d_%H%M%S")
+        pipeline = cls.pipeline_name()
+        jsonl_path = output_directory / f"{run_id}.jsonl"
+        trace_path = output_directory / f"{run_id}.trace.json"
+
+        with open(jsonl_path, "a", encoding="utf-8") as f:
+            for record in records:
+                row = {"run_id": run_id, "pipeline": pipeline, **asdict(record)}
+                f.write(json.dumps(row) + "\n")
+
+        # Rebuilt from the JSONL so an explicit flush followed by the exit flush
+        # still yields one trace covering the whole run.
+        with open(jsonl_path, encoding="utf-8") as f:
+            run_rows = [json.loads(line) for line in f if line.strip()]
+
+        trace_events = [
+            {
+                "name": row["name"],
+                "cat": row["file"],
+                "ph": "X",
+                "ts": row["start_s"] * 1e6,
+                "dur": row["duration_s"] * 1e6,
+                "pid": os.getpid(),
+                "tid": row["thread_id"],
+                "args": {
+                    "arcpy_tool_calls": row["arcpy_tool_calls"],
+                    "feature_count": row["feature_count"],
+                },
+            }
+            for row in run_rows
+        ]
+        with open(trace_path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": trace_events}, f)
+
+        print(f"Run profile written to: {jsonl_path}")
+        return jsonl_path
+
+
+def load_span_records(
+    profiling_root: Path, pipeline: Optional[str] = None
+) -> list[dict]:
+    """Reads every span row from the JSONL run files under profiling_root."""
+    pattern = f"{pipeline}/*.jsonl" if pipeline else "*/*.jsonl"
+    rows = []
+    for path in sorted(profiling_root.glob(pattern)):
+        with open(path, encoding="utf-8") as f:
+            rows.extend(json.loads(line) for line in f if line.strip())
+    return rows
+
+
+def summarize_hot_functions(rows: list[dict]) -> list[dict]:
+    """
+    What:
+        Aggregates span rows across runs per (file, function) and ranks them
+        by self time, meaning the span time not spent in child spans.
+    """
+    child_time: dict[tuple[str, int], float] = defaultdict(float)
+    for row in rows:
+        if row["parent_id"] is not None:
+            child_time[(row["run_id"], row["parent_id"])] += row["duration_s"]
+
+    summary: dict[tuple[str, str], dict] = {}
+    for row in rows:
+        key = (row["file"], row["name"])
+        entry = summary.setdefault(
+            key,
+            {
+                "file": row["file"],
+                "name": row["name"],
+                "calls": 0,
+                "runs": set(),
+                "total_s": 0.0,
+                "self_s": 0.0,
+                "max_s": 0.0,
+                "arcpy_tool_calls": 0,
+            },
+        )
+        self_time = row["duration_s"] - child_time[(row["run_id"], row["span_id"])]
+        entry["calls"] += 1
+        entry["runs"].add(row["run_id"])
+        entry["total_s"] += row["duration_s"]
+        entry["self_s"] += max(0.0, self_time)
+        entry["max_s"] = max(entry["max_s"], row["duration_s"])
+        entry["arcpy_tool_calls"] += sum(row["arcpy_tool_calls"].values())
+
+    ranked = sorted(summary.values(), key=lambda entry: entry["self_s"], reverse=True)
+    for entry in ranked:
+        entry["runs"] = len(entry["runs"])
+    return ranked
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Rank the hottest functions across profiled runs."
+    )
+    parser.add_argument(
+        "profiling_root",
+        type=Path,
+        help="Directory holding one sub-directory of run files per pipeline.",
+    )
+    parser.add_argument("--pipeline", default=None, help="Only include this pipeline.")
+    parser.add_argument("--top", type=int, default=25, help="Number of rows to show.")
+    args = parser.parse_args(argv)
+
+    ranked = summarize_hot_functions(
+        load_span_records(args.profiling_root, pipeline=args.pipeline)
+    )
+    if not ranked:
+        print(f"No profiling runs found under {args.profiling_root}")
+        return
+
+    print(
+        f"{'self s':>10} {'total s':>10} {'max s':>9} {'calls':>7} "
+        f"{'runs':>5} {'arcpy':>7}  function"
+    )
+    for entry in ranked[: args.top]:
+        print(
+            f"{entry['self_s']:>10.2f} {entry['total_s']:>10.2f} "
+            f"{entry['max_s']:>9.2f} {entry['calls']:>7} {entry['runs']:>5} "
+            f"{entry['arcpy_tool_calls']:>7}  {entry['file']}:{entry['name']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
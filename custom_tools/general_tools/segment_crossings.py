@@ -0,0 +1,408 @@
+"""
+In-process crossing detection between two sets of polylines.
+
+Polylines are flattened into NumPy segment arrays, candidate segment pairs are
+found through a uniform grid built over the first set, and every candidate
+pair is classified with vectorized orientation tests. The result follows the
+arcpy CROSSES relationship for polylines: two lines cross when their interiors
+share at least one point and never share a stretch of line.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Iterable, Sequence
+
+import arcpy
+import numpy as np
+
+# Distance in map units below which a vertex counts as lying on a segment.
+DEFAULT_TOLERANCE = 1e-9
+
+# Upper bound on grid cells along one axis, keeps the grid keys in int64.
+MAX_CELLS_PER_AXIS = 1 << 20
+
+# Upper bound on the mean number of grid cells a bounding box is entered in.
+# The cell size is doubled until both sets fit, so a few long segments or wide
+# query boxes cannot blow up the cell lists.
+MAX_MEAN_CELLS_PER_BOX = 8
+
+# Segments of the second set processed per vectorized batch.
+BATCH_SIZE = 200_000
+
+
+@dataclass(frozen=True)
+class SegmentSet:
+    """
+    Flattened polyline segments.
+
+    owner: id of the polyline each segment belongs to.
+    xy: (n, 4) array of x1, y1, x2, y2.
+    start_is_boundary / end_is_boundary: True where the segment start or end
+        is the first or last vertex of its part, i.e. on the line boundary.
+    """
+
+    owner: np.ndarray
+    xy: np.ndarray
+    start_is_boundary: np.ndarray
+    end_is_boundary: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.owner)
+
+
+def segments_from_parts(
+    rows: Iterable[tuple[int, Sequence[Sequence[tuple[float, float]]]]],
+) -> SegmentSet:
+    """
+    Builds a SegmentSet from (owner_id, parts) rows where each part is a
+    sequence of (x, y) vertices. Zero-length segments are dropped.
+    """
+    owners: list[int] = []
+    coords: list[tuple[float, float, float, float]] = []
+    starts: list[bool] = []
+    ends: list[bool] = []
+
+    for owner_id, parts in rows:
+        for part in parts:
+            last = len(part) - 2
+            for i in range(len(part) - 1):
+                (x1, y1), (x2, y2) = part[i], part[i + 1]
+                if x1 == x2 and y1 == y2:
+                    continue
+                owners.append(int(owner_id))
+                coords.append((x1, y1, x2, y2))
+                starts.append(i == 0)
+                ends.append(i == last)
+
+    return SegmentSet(
+        owner=np.asarray(owners, dtype=np.int64),
+        xy=np.asarray(coords, dtype=np.float64).reshape(-1, 4),
+        start_is_boundary=np.asarray(starts, dtype=bool),
+        end_is_boundary=np.asarray(ends, dtype=bool),
+    )
+
+
+def read_segments(feature_class: str, spatial_filter: Any = None) -> SegmentSet:
+    """Reads every polyline of feature_class, keyed by OID, in one cursor pass."""
+    rows = []
+    with arcpy.da.SearchCursor(
+        feature_class, ["OID@", "SHAPE@"], spatial_filter=spatial_filter
+    ) as cursor:
+        for oid, shape in cursor:
+            if shape is None:
+                continue
+            parts = [
+                [(point.X, point.Y) for point in part if point is not None]
+                for part in shape
+            ]
+            rows.append((oid, parts))
+    return segments_from_parts(rows)
+
+
+def xy_tolerance(feature_class: str) -> float:
+    """
+    XY tolerance of the spatial reference of feature_class in map units, the
+    distance arcpy uses to decide whether a vertex lies on a line.
+    """
+    tolerance = arcpy.Describe(feature_class).spatialReference.XYTolerance
+    if not tolerance or np.isnan(tolerance):
+        return DEFAULT_TOLERANCE
+    return float(tolerance)
+
+
+def _cell_ranges(
+    xy: np.ndarray, origin: tuple[float, float], cell_size: float
+) -> tuple[np.ndarray, ...]:
+    x0 = np.minimum(xy[:, 0], xy[:, 2])
+    x1 = np.maximum(xy[:, 0], xy[:, 2])
+    y0 = np.minimum(xy[:, 1], xy[:, 3])
+    y1 = np.maximum(xy[:, 1], xy[:, 3])
+    return (
+        np.floor((x0 - origin[0]) / cell_size).astype(np.int64),
+        np.floor((x1 - origin[0]) / cell_size).astype(np.int64),
+        np.floor((y0 - origin[1]) / cell_size).astype(np.int64),
+        np.floor((y1 - origin[1]) / cell_size).astype(np.int64),
+    )
+
+
+def _expand_cells(
+    cx0: np.ndarray,
+    cx1: np.ndarray,
+    cy0: np.ndarray,
+    cy1: np.ndarray,
+    grid_height: int,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Returns (cell_key, segment_index) for every cell each bbox covers."""
+    nx = cx1 - cx0 + 1
+    ny = cy1 - cy0 + 1
+    counts = nx * ny
+    seg_idx = np.repeat(np.arange(len(counts)), counts)
+    local = np.arange(int(counts.sum())) - np.repeat(np.cumsum(counts) - counts, counts)
+    cx = cx0[seg_idx] + local % nx[seg_idx]
+    cy = cy0[seg_idx] + local // nx[seg_idx]
+    return cx * grid_height + cy, seg_idx
+
+
+def _clip_ranges(
+    ranges: tuple[np.ndarray, ...], grid_width: int, grid_height: int
+) -> tuple[np.ndarray, tuple[np.ndarray, ...]]:
+    """Returns the indices of the boxes touching the grid and their clipped ranges."""
+    cx0, cx1, cy0, cy1 = ranges
+    index = np.nonzero(
+        (cx1 >= 0) & (cy1 >= 0) & (cx0 < grid_width) & (cy0 < grid_height)
+    )[0]
+    return index, (
+        np.clip(cx0[index], 0, grid_width - 1),
+        np.clip(cx1[index], 0, grid_width - 1),
+        np.clip(cy0[index], 0, grid_height - 1),
+        np.clip(cy1[index], 0, grid_height - 1),
+    )
+
+
+def _cell_total(ranges: tuple[np.ndarray, ...]) -> int:
+    cx0, cx1, cy0, cy1 = ranges
+    return int(((cx1 - cx0 + 1) * (cy1 - cy0 + 1)).sum())
+
+
+def _candidate_pairs(
+    a: SegmentSet, b_xy: np.ndarray, cell_size: float | None
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Segment index pairs (ia, ib) whose bounding boxes share a grid cell.
+
+    The cell size starts at cell_size, or the median segment extent of a, and
+    is doubled until the boxes of a and b cover at most MAX_MEAN_CELLS_PER_BOX
+    cells each on average.
+    """
+    a_xy = a.xy
+    min_x = float(min(a_xy[:, 0].min(), a_xy[:, 2].min()))
+    min_y = float(min(a_xy[:, 1].min(), a_xy[:, 3].min()))
+    max_x = float(max(a_xy[:, 0].max(), a_xy[:, 2].max()))
+    max_y = float(max(a_xy[:, 1].max(), a_xy[:, 3].max()))
+
+    if cell_size is None:
+        extents = np.maximum(
+            np.abs(a_xy[:, 2] - a_xy[:, 0]), np.abs(a_xy[:, 3] - a_xy[:, 1])
+        )
+        cell_size = float(np.median(extents))
+    span = max(max_x - min_x, max_y - min_y)
+    cell_size = max(cell_size, span / (MAX_CELLS_PER_AXIS - 1), DEFAULT_TOLERANCE)
+
+    origin = (min_x, min_y)
+    budget = MAX_MEAN_CELLS_PER_BOX * (len(a_xy) + len(b_xy))
+    while True:
+        grid_width = int((max_x - min_x) // cell_size) + 1
+        grid_height = int((max_y - min_y) // cell_size) + 1
+        a_ranges = _cell_ranges(a_xy, origin, cell_size)
+        b_index, b_ranges = _clip_ranges(
+            _cell_ranges(b_xy, origin, cell_size), grid_width, grid_height
+        )
+        # A grid of one cell always fits, so this ends.
+        if _cell_total(a_ranges) + _cell_total(b_ranges) <= budget:
+            break
+        cell_size *= 2.0
+
+    if len(b_index) == 0:
+        return np.empty(0, np.int64), np.empty(0, np.int64)
+
+    a_keys, a_idx = _expand_cells(*a_ranges, grid_height)
+    order = np.argsort(a_keys, kind="stable")
+    a_keys, a_idx = a_keys[order], a_idx[order]
+
+    b_keys, b_local = _expand_cells(*b_ranges, grid_height)
+    left = np.searchsorted(a_keys, b_keys, side="left")
+    right = np.searchsorted(a_keys, b_keys, side="right")
+    hits = right - left
+    has_hit = hits > 0
+    left, hits, b_local = left[has_hit], hits[has_hit], b_local[has_hit]
+
+    rep = np.repeat(np.arange(len(hits)), hits)
+    offset = np.arange(int(hits.sum())) - np.repeat(np.cumsum(hits) - hits, hits)
+    ia = a_idx[left[rep] + offset]
+    ib = b_index[b_local[rep]]
+
+    pair_keys = np.unique(ia * len(b_xy) + ib)
+    return pair_keys // len(b_xy), pair_keys % len(b_xy)
+
+
+def segments_near_points(
+    segments: SegmentSet, xy: np.ndarray, radius: float
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Candidate (segment_index, point_index) pairs where the segment bounding box
+    comes within radius of the point, found through the same grid as crossings.
+    Callers measure the true distance of each pair.
+    """
+    if len(segments) == 0 or len(xy) == 0:
+        return np.empty(0, np.int64), np.empty(0, np.int64)
+    boxes = np.column_stack(
+        (xy[:, 0] - radius, xy[:, 1] - radius, xy[:, 0] + radius, xy[:, 1] + radius)
+    )
+    return _candidate_pairs(segments, boxes, None)
+
+
+def segments_near_segments(
+    a: SegmentSet, b: SegmentSet, radius: float
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Candidate (ia, ib) segment index pairs where the bounding box of b[ib],
+    grown by radius, shares a grid cell with the bounding box of a[ia].
+    Callers measure the true distance of each pair.
+    """
+    if len(a) == 0 or len(b) == 0:
+        return np.empty(0, np.int64), np.empty(0, np.int64)
+    xy = b.xy
+    boxes = np.column_stack(
+        (
+            np.minimum(xy[:, 0], xy[:, 2]) - radius,
+            np.minimum(xy[:, 1], xy[:, 3]) - radius,
+            np.maximum(xy[:, 0], xy[:, 2]) + radius,
+            np.maximum(xy[:, 1], xy[:, 3]) + radius,
+        )
+    )
+    return _candidate_pairs(a, boxes, None)
+
+
+def segment_pairs_within(segments: SegmentSet) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Candidate (i, j) segment index pairs with i < j whose bounding boxes share
+    a grid cell, for finding intersections within one set.
+    """
+    if len(segments) == 0:
+        return np.empty(0, np.int64), np.empty(0, np.int64)
+    ia, ib = _candidate_pairs(segments, segments.xy, None)
+    keep = ia < ib
+    return ia[keep], ib[keep]
+
+
+def _side(
+    ax: np.ndarray,
+    ay: np.ndarray,
+    bx: np.ndarray,
+    by: np.ndarray,
+    px: np.ndarray,
+    py: np.ndarray,
+    tolerance: float,
+) -> np.ndarray:
+    """Side of point p relative to line a->b: -1, 0 (within tolerance) or 1."""
+    cross = (bx - ax) * (py - ay) - (by - ay) * (px - ax)
+    length = np.hypot(bx - ax, by - ay)
+    side = np.sign(cross)
+    side[np.abs(cross) <= tolerance * length] = 0
+    return side
+
+
+def _classify_pairs(
+    a: SegmentSet,
+    b: SegmentSet,
+    ia: np.ndarray,
+    ib: np.ndarray,
+    tolerance: float,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Returns (crossing, overlapping) masks over the candidate pairs: crossing
+    where the segments meet in a point interior to both lines, overlapping
+    where they share a stretch of positive length.
+    """
+    p = a.xy[ia]
+    q = b.xy[ib]
+    p1x, p1y, p2x, p2y = p[:, 0], p[:, 1], p[:, 2], p[:, 3]
+    q1x, q1y, q2x, q2y = q[:, 0], q[:, 1], q[:, 2], q[:, 3]
+
+    s1 = _side(q1x, q1y, q2x, q2y, p1x, p1y, tolerance)
+    s2 = _side(q1x, q1y, q2x, q2y, p2x, p2y, tolerance)
+    s3 = _side(p1x, p1y, p2x, p2y, q1x, q1y, tolerance)
+    s4 = _side(p1x, p1y, p2x, p2y, q2x, q2y, tolerance)
+
+    collinear = (s1 == 0) & (s2 == 0)
+
+    # Overlap of collinear segments, measured along q.
+    qdx, qdy = q2x - q1x, q2y - q1y
+    q_len = np.hypot(qdx, qdy)
+    t1 = ((p1x - q1x) * qdx + (p1y - q1y) * qdy) / q_len
+    t2 = ((p2x - q1x) * qdx + (p2y - q1y) * qdy) / q_len
+    overlap = np.minimum(np.maximum(t1, t2), q_len) - np.maximum(
+        np.minimum(t1, t2), 0.0
+    )
+    overlapping = collinear & (overlap > tolerance)
+
+    intersects = ~collinear & (s1 * s2 <= 0) & (s3 * s4 <= 0)
+    on_a_boundary = ((s1 == 0) & a.start_is_boundary[ia]) | (
+        (s2 == 0) & a.end_is_boundary[ia]
+    )
+    on_b_boundary = ((s3 == 0) & b.start_is_boundary[ib]) | (
+        (s4 == 0) & b.end_is_boundary[ib]
+    )
+    crossing = intersects & ~on_a_boundary & ~on_b_boundary
+
+    return crossing, overlapping
+
+
+def find_crossing_owner_pairs(
+    a: SegmentSet,
+    b: SegmentSet,
+    *,
+    exclude_same_owner: bool = False,
+    cell_size: float | None = None,
+    tolerance: float = DEFAULT_TOLERANCE,
+) -> dict[int, set[int]]:
+    """
+    What:
+        Returns {a_owner: {b_owner, ...}} for every pair of lines from a and b
+        that cross.
+
+    How:
+        Segments of a are bucketed in a uniform grid, by default with the
+        median segment extent of a as cell size, grown where long segments
+        would be entered in too many cells. Segments of b are matched to
+        the cells their bounding box covers, in batches, and the resulting
+        segment pairs are classified with orientation tests. A line pair
+        crosses when some segment pair meets in a point that is not on the
+        boundary of either line, and no segment pair overlaps collinearly.
+
+    Args:
+        a: The lines to find crossings for, typically the smaller set.
+        b: The lines to check against.
+        exclude_same_owner: Skip pairs with the same owner id, used when a
+            and b hold the same lines.
+        cell_size: Grid cell size in map units, derived from a when None.
+        tolerance: Distance below which a vertex counts as lying on a segment,
+            the XY tolerance of the data for results that match arcpy.
+    """
+    if len(a) == 0 or len(b) == 0:
+        return {}
+
+    crossing_pairs: set[tuple[int, int]] = set()
+    overlapping_pairs: set[tuple[int, int]] = set()
+
+    for start in range(0, len(b), BATCH_SIZE):
+        stop = min(start + BATCH_SIZE, len(b))
+        batch = SegmentSet(
+            owner=b.owner[start:stop],
+            xy=b.xy[start:stop],
+            start_is_boundary=b.start_is_boundary[start:stop],
+            end_is_boundary=b.end_is_boundary[start:stop],
+        )
+        ia, ib = _candidate_pairs(a, batch.xy, cell_size)
+        if len(ia) == 0:
+            continue
+
+        a_owner = a.owner[ia]
+        b_owner = batch.owner[ib]
+        if exclude_same_owner:
+            keep = a_owner != b_owner
+            ia, ib, a_owner, b_owner = ia[keep], ib[keep], a_owner[keep], b_owner[keep]
+
+        crossing, overlapping = _classify_pairs(a, batch, ia, ib, tolerance)
+        crossing_pairs.update(
+            zip(a_owner[crossing].tolist(), b_owner[crossing].tolist())
+        )
+        overlapping_pairs.update(
+            zip(a_owner[overlapping].tolist(), b_owner[overlapping].tolist())
+        )
+
+    result: dict[int, set[int]] = {}
+    for a_owner, b_owner in crossing_pairs - overlapping_pairs:
+        result.setdefault(a_owner, set()).add(b_owner)
+    return result
@@ -0,0 +1,208 @@
+"""
+Compiles simple SQL where clauses into Python predicates over attribute rows.
+
+Covers the subset used for attribute selections in this repo: field
+comparisons with =, <>, !=, <, <=, > and >=, IN and NOT IN lists, IS [NOT]
+NULL, AND, OR, NOT and parentheses, with string and number literals. NULL
+follows SQL three-valued logic, so a row is selected only where the clause is
+true. Anything else raises ValueError and callers fall back to letting arcpy
+run the clause.
+"""
+
+from __future__ import annotations
+
+import operator
+import re
+from typing import Any, Callable, Mapping, Optional
+
+Row = Mapping[str, Any]
+Predicate = Callable[[Row], Optional[bool]]
+
+
+_TOKEN = re.compile(
+    r"""
+    \s*(?:
+        (?P<number>-?\d+(?:\.\d+)?)
+      | '(?P<string>(?:[^']|'')*)'
+      | (?P<op><>|!=|<=|>=|=|<|>)
+      | (?P<punct>[(),])
+      | (?P<word>[A-Za-z_][A-Za-z0-9_æøåÆØÅ]*)
+    )
+    """,
+    re.VERBOSE,
+)
+
+_COMPARISONS = {
+    "=": operator.eq,
+    "<>": operator.ne,
+    "!=": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+}
+
+
+def _tokenize(clause: str) -> list[tuple[str, Any]]:
+    tokens = []
+    position = 0
+    clause = clause.strip()
+    while position < len(clause):
+        match = _TOKEN.match(clause, position)
+        if match is None or match.end() == position:
+            raise ValueError(f"Cannot read {clause[position:]!r}")
+        position = match.end()
+        kind = match.lastgroup
+        value = match.group(kind)
+        if kind == "number":
+            tokens.append(("literal", float(value) if "." in value else int(value)))
+        elif kind == "string":
+            tokens.append(("literal", value.replace("''", "'")))
+        elif kind == "word":
+            upper = value.upper()
+            if upper in ("AND", "OR", "NOT", "IN", "IS", "NULL"):
+                tokens.append((upper, upper))
+            else:
+                tokens.append(("field", value.lower()))
+        else:
+            tokens.append((value, value))
+        while position < len(clause) and clause[position].isspace():
+            position += 1
+    return tokens
+
+
+class _Parser:
+    def __init__(self, tokens: list[tuple[str, Any]]):
+        self.tokens = tokens
+        self.index = 0
+        self.fields: set[str] = set()
+
+    def _peek(self) -> Optional[str]:
+        return self.tokens[self.index][0] if self.index < len(self.tokens) else None
+
+    def _take(self, kind: Optional[str] = None) -> tuple[str, Any]:
+        if self.index >= len(self.tokens):
+            raise ValueError("Unexpected end of clause")
+        token = self.tokens[self.index]
+        if kind is not None and token[0] != kind:
+            raise ValueError(f"Expected {kind}, found {token[1]!r}")
+        self.index += 1
+        return token
+
+    def parse(self) -> Predicate:
+        predicate = self._or()
+        if self.index != len(self.tokens):
+            raise ValueError(f"Unexpected {self.tokens[self.index][1]!r}")
+        return predicate
+
+    def _or(self) -> Predicate:
+        terms = [self._and()]
+        while self._peek() == "OR":
+            self._take()
+            terms.append(self._and())
+        if len(terms) == 1:
+            return terms[0]
+
+        def _any(row: Row) -> Optional[bool]:
+            unknown = False
+            for term in terms:
+                value = term(row)
+                if value:
+                    return True
+                unknown |= value is None
+            return None if unknown else False
+
+        return _any
+
+    def _and(self) -> Predicate:
+        terms = [self._not()]
+        while self._peek() == "AND":
+            self._take()
+            terms.append(self._not())
+        if len(terms) == 1:
+            return terms[0]
+
+        def _all(row: Row) -> Optional[bool]:
+            unknown = False
+            for term in terms:
+                value = term(row)
+                if value is False:
+                    return False
+                unknown |= value is None
+            return None if unknown else True
+
+        return _all
+
+    def _not(self) -> Predicate:
+        if self._peek() == "NOT":
+            self._take()
+            inner = self._not()
+            return lambda row: None if (value := inner(row)) is None else not value
+        return self._primary()
+
+    def _primary(self) -> Predicate:
+        if self._peek() == "(":
+            self._take()
+            inner = self._or()
+            self._take(")")
+            return inner
+
+        field = self._take("field")[1]
+        self.fields.add(field)
+        kind = self._peek()
+
+        if kind == "IS":
+            self._take()
+            negate = self._peek() == "NOT"
+            if negate:
+                self._take()
+            self._take("NULL")
+            if negate:
+                return lambda row: row[field] is not None
+            return lambda row: row[field] is None
+
+        if kind in ("IN", "NOT"):
+            negate = kind == "NOT"
+            self._take()
+            if negate:
+                self._take("IN")
+            self._take("(")
+            values = [self._take("literal")[1]]
+            while self._peek() == ",":
+                self._take()
+                values.append(self._take("literal")[1])
+            self._take(")")
+            members = frozenset(values)
+
+            def _in(row: Row) -> Optional[bool]:
+                value = row[field]
+                if value is None:
+                    return None
+                return (value in members) != negate
+
+            return _in
+
+        compare = _COMPARISONS.get(kind)
+        if compare is None:
+            raise ValueError(f"Unsupported operator after {field}")
+        self._take()
+        literal = self._take("literal")[1]
+
+        def _compare(row: Row) -> Optional[bool]:
+            value = row[field]
+            if value is None:
+                return None
+            return compare(value, literal)
+
+        return _compare
+
+
+def compile_where_clause(clause: str) -> tuple[Predicate, set[str]]:
+    """
+    Returns (predicate, field names) for clause. The predicate takes a mapping
+    of field name to value and returns True, False or None (unknown). Field
+    names are case-insensitive in SQL, so they are returned and looked up in
+    lower case.
+    """
+    parser = _Parser(_tokenize(clause))
+    return parser.parse(), parser.fields
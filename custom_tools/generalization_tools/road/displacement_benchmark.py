@@ -0,0 +1,112 @@
+"""
+Benchmarks for displacement_engine on synthetic dense junctions.
+
+Builds a grid of junctions where every junction joins a main road, a minor
+road and a branch, with a second minor road running close alongside the main
+road so its symbol overlaps. Reports runtime, rounds and remaining conflicts
+for growing grids. Needs NumPy only:
+
+    python -m custom_tools.generalization_tools.road.displacement_benchmark --sizes 5 10 20
+"""
+
+import argparse
+import time
+from typing import Sequence
+
+import numpy as np
+
+from composition_configs import logic_config
+from custom_tools.generalization_tools.road.displacement_engine import (
+    DisplacementLines,
+    relax_displacement,
+)
+
+JUNCTION_SPACING = 1000.0  # [m]
+PARALLEL_OFFSET = 25.0  # [m]
+MAIN_HALF_WIDTH = 30.0  # [m]
+MINOR_HALF_WIDTH = 18.0  # [m]
+
+
+def synthetic_dense_junctions(size: int, seed: int = 0) -> DisplacementLines:
+    """
+    size x size junctions. Main roads (hierarchy 1) run east through every row,
+    minor roads (hierarchy 2) run north through every column, and a branch
+    (hierarchy 3) leaves every junction diagonally. Every main road segment has
+    a minor road PARALLEL_OFFSET to the north of it, close enough to conflict.
+    """
+    rng = np.random.default_rng(seed)
+    lines, half_widths, hierarchies = [], [], []
+
+    def add(points, half_width, hierarchy, vertices=8):
+        points = np.asarray(points, dtype=np.float64)
+        steps = np.linspace(0.0, 1.0, vertices)[:, None]
+        line = points[0] + steps * (points[1] - points[0])
+        line[1:-1] += rng.normal(0.0, 2.0, line[1:-1].shape)
+        lines.append(line)
+        half_widths.append(half_width)
+        hierarchies.append(hierarchy)
+
+    for row in range(size):
+        for col in range(size):
+            x, y = col * JUNCTION_SPACING, row * JUNCTION_SPACING
+            if col + 1 < size:
+                add([(x, y), (x + JUNCTION_SPACING, y)], MAIN_HALF_WIDTH, 1)
+                add(
+                    [
+                        (x + 0.2 * JUNCTION_SPACING, y + PARALLEL_OFFSET),
+                        (x + 0.8 * JUNCTION_SPACING, y + PARALLEL_OFFSET),
+                    ],
+                    MINOR_HALF_WIDTH,
+                    2,
+                )
+            if row + 1 < size:
+                add([(x, y), (x, y + JUNCTION_SPACING)], MINOR_HALF_WIDTH, 2)
+            add(
+                [(x, y), (x + 0.3 * JUNCTION_SPACING, y + 0.3 * JUNCTION_SPACING)],
+                MINOR_HALF_WIDTH,
+                3,
+            )
+
+    return DisplacementLines.from_lines(lines, half_widths, hierarchies)
+
+
+def run_benchmark(
+    sizes: Sequence[int],
+    settings: logic_config.RoadDisplacementSettings = None,
+    repeats: int = 3,
+) -> list[dict]:
+    """Runs relax_displacement on every grid size and returns one result row each."""
+    rows = []
+    for size in sizes:
+        lines = synthetic_dense_junctions(size)
+        durations = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            result = relax_displacement(lines, settings)
+            durations.append(time.perf_counter() - start)
+        rows.append(
+            {
+                "junctions": size * size,
+                "lines": len(lines),
+                "vertices": len(result.lines.xy),
+                "seconds": min(durations),
+                "iterations": result.iterations,
+                "remaining_conflicts": result.remaining_conflicts,
+                "max_overlap_m": round(result.max_overlap, 3),
+            }
+        )
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[5, 10, 20])
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    for row in run_benchmark(args.sizes, repeats=args.repeats):
+        print(", ".join(f"{key}={value}" for key, value in row.items()))
+
+
+if __name__ == "__main__":
+    main()
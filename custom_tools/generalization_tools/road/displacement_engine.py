@@ -0,0 +1,519 @@
+"""
+Open displacement engine for road symbol conflicts.
+
+Lines are displaced until their symbols, drawn at the reference scale, no
+longer overlap. Every line has a half symbol width and a hierarchy: a vertex
+is pushed out of the symbol of every line with a lower hierarchy value, lines
+with the same value share the push, and lines with hierarchy 0 or below are
+locked. Each round of moves is spread along the lines with a snake-style
+smoothing. Line ends at junctions, and the vertices of the lines they end on,
+are held in place so the network stays connected.
+
+Everything runs on flat NumPy vertex arrays and lyrx files are read as JSON,
+so the engine runs, and can be profiled and tested, without arcpy.
+"""
+
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from typing import Any, Optional, Sequence
+
+import numpy as np
+
+from composition_configs import logic_config
+
+# Printer's points to meters on paper.
+POINT_IN_METERS = 0.0254 / 72
+
+# End points closer than this are the same junction.
+NODE_TOLERANCE = 0.001
+
+# Null values are written like this in the fieldValues of lyrx unique value classes.
+LYRX_NULL = "<Null>"
+
+
+@dataclass(frozen=True)
+class LayerSymbolWidths:
+    """
+    Line symbol widths in points of one layer, read from its renderer.
+
+    fields: renderer fields, empty for a single symbol.
+    widths: width per tuple of field values as written in the lyrx.
+    default_width: width of features matching no class, None if they are not drawn.
+    """
+
+    fields: tuple[str, ...]
+    widths: dict[tuple[str, ...], float]
+    default_width: Optional[float]
+
+    def width_for(self, values: Sequence[Any]) -> Optional[float]:
+        if not self.fields:
+            return self.default_width
+        key = tuple(LYRX_NULL if value is None else str(value) for value in values)
+        return self.widths.get(key, self.default_width)
+
+
+def _symbol_width(symbol_reference: Optional[dict]) -> Optional[float]:
+    """Widest enabled stroke of a CIMSymbolReference, None if it has none."""
+    symbol = (symbol_reference or {}).get("symbol") or {}
+    widths = [
+        float(layer["width"])
+        for layer in symbol.get("symbolLayers", [])
+        if layer.get("enable", True) and "width" in layer
+    ]
+    return max(widths) if widths else None
+
+
+def read_lyrx_symbol_widths(
+    lyrx_path: str, target_layer_name: Optional[str] = None
+) -> LayerSymbolWidths:
+    """
+    Reads the line symbol widths of the first feature layer in lyrx_path, or of
+    the one named target_layer_name in a grouped lyrx. Simple and unique value
+    renderers are supported.
+    """
+    with open(lyrx_path, "r", encoding="utf-8") as f:
+        document = json.load(f)
+
+    layers = [
+        layer
+        for layer in document.get("layerDefinitions", [])
+        if layer.get("type") == "CIMFeatureLayer"
+        and (target_layer_name is None or layer.get("name") == target_layer_name)
+    ]
+    if not layers:
+        raise ValueError(
+            f"No feature layer {target_layer_name or ''!r} found in {lyrx_path}"
+        )
+
+    renderer = layers[0].get("renderer") or {}
+    kind = renderer.get("type")
+    if kind == "CIMSimpleRenderer":
+        return LayerSymbolWidths(
+            fields=(), widths={}, default_width=_symbol_width(renderer.get("symbol"))
+        )
+    if kind == "CIMUniqueValueRenderer":
+        widths: dict[tuple[str, ...], float] = {}
+        for group in renderer.get("groups", []):
+            for symbol_class in group.get("classes", []):
+                width = _symbol_width(symbol_class.get("symbol"))
+                if width is None:
+                    continue
+                for value in symbol_class.get("values", []):
+                    widths[tuple(value.get("fieldValues", []))] = width
+        default_width = (
+            _symbol_width(renderer.get("defaultSymbol"))
+            if renderer.get("useDefaultSymbol")
+            else None
+        )
+        return LayerSymbolWidths(
+            fields=tuple(renderer.get("fields", [])),
+            widths=widths,
+            default_width=default_width,
+        )
+    raise ValueError(f"Unsupported renderer {kind!r} in {lyrx_path}")
+
+
+def symbol_width_meters(width_points: float, map_scale: float) -> float:
+    """Ground width of a symbol width_points wide at map_scale."""
+    return width_points * POINT_IN_METERS * map_scale
+
+
+@dataclass(frozen=True)
+class DisplacementLines:
+    """
+    Single-part lines as one flat vertex array.
+
+    xy: (n, 2) vertices of all lines, line after line.
+    offsets: (l + 1,) line i owns xy[offsets[i]:offsets[i + 1]].
+    half_width: (l,) half symbol width of every line in meters.
+    hierarchy: (l,) lower values win conflicts, 0 or below is locked.
+    position: (n,) after densify, where each vertex lies on the lines it was
+        made from, as an index into their vertices: whole for an original
+        vertex, fractional between two of them. None for undensified lines.
+    """
+
+    xy: np.ndarray
+    offsets: np.ndarray
+    half_width: np.ndarray
+    hierarchy: np.ndarray
+    position: Optional[np.ndarray] = None
+
+    @classmethod
+    def from_lines(
+        cls,
+        lines: Sequence[np.ndarray],
+        half_widths: Sequence[float],
+        hierarchies: Sequence[int],
+    ) -> "DisplacementLines":
+        counts = [len(line) for line in lines]
+        return cls(
+            xy=(
+                np.vstack(lines).astype(np.float64)
+                if lines
+                else np.zeros((0, 2), dtype=np.float64)
+            ),
+            offsets=np.concatenate(([0], np.cumsum(counts))).astype(np.int64),
+            half_width=np.asarray(half_widths, dtype=np.float64),
+            hierarchy=np.asarray(hierarchies, dtype=np.int64),
+        )
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    @property
+    def vertex_line(self) -> np.ndarray:
+        return np.repeat(np.arange(len(self)), np.diff(self.offsets))
+
+    def line_xy(self, line: int, xy: Optional[np.ndarray] = None) -> np.ndarray:
+        source = self.xy if xy is None else xy
+        return source[self.offsets[line] : self.offsets[line + 1]]
+
+
+@dataclass(frozen=True)
+class DisplacementResult:
+    """
+    lines: the densified input lines, holding the original vertex positions.
+    xy: (n, 2) displaced positions of the vertices in lines.xy.
+    iterations: relaxation rounds run.
+    remaining_conflicts: vertex conflicts still above tolerance.
+    max_overlap: largest remaining symbol overlap in meters.
+    """
+
+    lines: DisplacementLines
+    xy: np.ndarray
+    iterations: int
+    remaining_conflicts: int
+    max_overlap: float
+
+    def moved_lines(self, tolerance: float) -> np.ndarray:
+        """Indexes of the lines with a vertex moved further than tolerance."""
+        moved = np.hypot(*(self.xy - self.lines.xy).T) > tolerance
+        return np.unique(self.lines.vertex_line[moved])
+
+    def line_output(
+        self, line: int, tolerance: float, zm: Optional[np.ndarray] = None
+    ) -> tuple[np.ndarray, Optional[np.ndarray]]:
+        """
+        Displaced vertices of line to write back: the original vertices and the
+        densified ones that moved further than tolerance. zm holds the (n, 2) Z
+        and M of every vertex of the lines given to relax_displacement, NaN
+        where unset; the values of the kept vertices are returned with them,
+        interpolated along the original segment for densified ones.
+        """
+        start, end = self.lines.offsets[line], self.lines.offsets[line + 1]
+        xy = self.xy[start:end]
+        position = (
+            self.lines.position[start:end]
+            if self.lines.position is not None
+            else np.arange(start, end, dtype=np.float64)
+        )
+        lower = np.floor(position).astype(np.int64)
+        fraction = position - lower
+        moved = np.hypot(*(xy - self.lines.xy[start:end]).T) > tolerance
+        keep = (fraction == 0) | moved
+        if zm is None:
+            return xy[keep], None
+
+        lower, fraction = lower[keep], fraction[keep]
+        upper = np.minimum(lower + 1, len(zm) - 1)
+        # Original vertices copy their values, so a NaN next to them stays put.
+        line_zm = np.where(
+            fraction[:, None] > 0,
+            zm[lower] + fraction[:, None] * (zm[upper] - zm[lower]),
+            zm[lower],
+        )
+        return xy[keep], line_zm
+
+
+def densify(lines: DisplacementLines, max_segment: float) -> DisplacementLines:
+    """Adds evenly spaced vertices so no segment is longer than max_segment."""
+    xy = lines.xy
+    if len(xy) == 0 or max_segment <= 0:
+        return lines
+
+    last = np.zeros(len(xy), dtype=bool)
+    last[lines.offsets[1:] - 1] = True
+    following = np.minimum(np.arange(len(xy)) + 1, len(xy) - 1)
+    length = np.hypot(*(xy[following] - xy).T)
+    pieces = np.where(
+        last, 1, np.maximum(1, np.ceil(length / max_segment)).astype(np.int64)
+    )
+
+    source = np.repeat(np.arange(len(xy)), pieces)
+    local = np.arange(int(pieces.sum())) - np.repeat(np.cumsum(pieces) - pieces, pieces)
+    fraction = local / pieces[source]
+    new_xy = xy[source] + fraction[:, None] * (xy[following[source]] - xy[source])
+    position = (
+        lines.position
+        if lines.position is not None
+        else np.arange(len(xy), dtype=np.float64)
+    )
+    new_position = position[source] + fraction * (
+        position[following[source]] - position[source]
+    )
+
+    line_counts = np.add.reduceat(pieces, lines.offsets[:-1]) if len(lines) else []
+    return DisplacementLines(
+        xy=new_xy,
+        offsets=np.concatenate(([0], np.cumsum(line_counts))).astype(np.int64),
+        half_width=lines.half_width,
+        hierarchy=lines.hierarchy,
+        position=new_position,
+    )
+
+
+def _vertex_segment_pairs(
+    vertex_xy: np.ndarray, segment_xy: np.ndarray, radius: float
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Candidate (vertex, segment) pairs where the vertex lies within radius of the
+    segment bounding box, found by bucketing the vertices in a grid of cells at
+    least radius and the median segment extent wide.
+    """
+    if len(vertex_xy) == 0 or len(segment_xy) == 0:
+        return np.empty(0, np.int64), np.empty(0, np.int64)
+
+    extent = np.abs(segment_xy[:, 2:] - segment_xy[:, :2]).max(axis=1)
+    cell = max(radius, float(np.median(extent)), 1e-6)
+    origin = vertex_xy.min(axis=0) - cell
+    vertex_cells = np.floor((vertex_xy - origin) / cell).astype(np.int64)
+    height = int(vertex_cells[:, 1].max()) + 3
+    width = int(vertex_cells[:, 0].max()) + 3
+    vertex_keys = vertex_cells[:, 0] * height + vertex_cells[:, 1]
+    order = np.argsort(vertex_keys, kind="stable")
+    vertex_keys = vertex_keys[order]
+
+    lo = np.minimum(segment_xy[:, :2], segment_xy[:, 2:]) - radius
+    hi = np.maximum(segment_xy[:, :2], segment_xy[:, 2:]) + radius
+    c0 = np.clip(np.floor((lo - origin) / cell).astype(np.int64), 0, None)
+    c1 = np.minimum(
+        np.floor((hi - origin) / cell).astype(np.int64), [width - 1, height - 1]
+    )
+    nx = np.maximum(c1[:, 0] - c0[:, 0] + 1, 0)
+    ny = np.maximum(c1[:, 1] - c0[:, 1] + 1, 0)
+    counts = nx * ny
+    segment = np.repeat(np.arange(len(segment_xy)), counts)
+    local = np.arange(int(counts.sum())) - np.repeat(np.cumsum(counts) - counts, counts)
+    keys = (c0[segment, 0] + local % nx[segment]) * height + (
+        c0[segment, 1] + local // nx[segment]
+    )
+
+    left = np.searchsorted(vertex_keys, keys, side="left")
+    hits = np.searchsorted(vertex_keys, keys, side="right") - left
+    rep = np.repeat(np.arange(len(keys)), hits)
+    offset = np.arange(int(hits.sum())) - np.repeat(np.cumsum(hits) - hits, hits)
+    return order[left[rep] + offset], segment[rep]
+
+
+def _away_from_segments(
+    p: np.ndarray, segment_xy: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    """Vector from the closest point on each segment to each point, and its length."""
+    a = segment_xy[:, :2]
+    ab = segment_xy[:, 2:] - a
+    ab_len2 = np.maximum(np.einsum("ij,ij->i", ab, ab), 1e-18)
+    t = np.clip(np.einsum("ij,ij->i", p - a, ab) / ab_len2, 0.0, 1.0)
+    away = p - (a + t[:, None] * ab)
+    return away, np.hypot(away[:, 0], away[:, 1])
+
+
+class _Relaxation:
+    """Conflict measurement and vertex pushes for one set of densified lines."""
+
+    def __init__(
+        self, lines: DisplacementLines, settings: logic_config.RoadDisplacementSettings
+    ):
+        self.lines = lines
+        self.settings = settings
+        self.vertex_line = lines.vertex_line
+        self.first = lines.offsets[:-1]
+        self.last = lines.offsets[1:] - 1
+        self.locked = lines.hierarchy <= 0
+
+        self.segment_start = np.setdiff1d(np.arange(len(lines.xy)), self.last)
+        self.segment_line = self.vertex_line[self.segment_start]
+        self.max_required = 2 * float(lines.half_width.max()) + settings.gap_meters
+
+        # Line ends touching another line, at its end or inside it, are
+        # junctions: they stay put, as do both vertices of every segment they
+        # touch so a through road keeps running through the junction, and
+        # conflicts around them are ignored. Free ends move with their line
+        # but are not smoothed.
+        ends = np.concatenate((self.first, self.last))
+        local, segment = _vertex_segment_pairs(
+            lines.xy[ends], self._segment_xy(lines.xy), NODE_TOLERANCE
+        )
+        end_vertex = ends[local]
+        touched_line = self.segment_line[segment]
+        _, distance = _away_from_segments(
+            lines.xy[end_vertex], self._segment_xy(lines.xy)[segment]
+        )
+        touches = (touched_line != self.vertex_line[end_vertex]) & (
+            distance <= NODE_TOLERANCE
+        )
+        self.touch_keys = np.unique(
+            end_vertex[touches] * len(lines) + touched_line[touches]
+        )
+
+        is_end = np.zeros(len(lines.xy), dtype=bool)
+        is_end[ends] = True
+        junction = np.zeros(len(lines.xy), dtype=bool)
+        junction[end_vertex[touches]] = True
+        junction[self.segment_start[segment[touches]]] = True
+        junction[self.segment_start[segment[touches]] + 1] = True
+
+        movable = ~junction & ~self.locked[self.vertex_line]
+        self.movable = np.nonzero(movable)[0]
+        self.interior = np.nonzero(movable & ~is_end)[0]
+
+    def _segment_xy(self, xy: np.ndarray) -> np.ndarray:
+        return np.hstack((xy[self.segment_start], xy[self.segment_start + 1]))
+
+    def conflicts(self, xy: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Returns (vertex, push, overlap) for the strongest conflict of every
+        movable vertex with every other line, push being the weighted move out
+        of that line's symbol.
+        """
+        empty = (np.empty(0, np.int64), np.zeros((0, 2)), np.zeros(0))
+        segment_xy = self._segment_xy(xy)
+        local, segment = _vertex_segment_pairs(
+            xy[self.movable], segment_xy, self.max_required
+        )
+        vertex = self.movable[local]
+        own_line = self.vertex_line[vertex]
+        other_line = self.segment_line[segment]
+
+        own_rank = self.lines.hierarchy[own_line]
+        other_rank = self.lines.hierarchy[other_line]
+        weight = np.where(
+            self.locked[other_line] | (other_rank < own_rank),
+            1.0,
+            np.where(other_rank == own_rank, 0.5, 0.0),
+        )
+        keep = (own_line != other_line) & (weight > 0)
+        vertex, segment, own_line, other_line, weight = (
+            vertex[keep],
+            segment[keep],
+            own_line[keep],
+            other_line[keep],
+            weight[keep],
+        )
+        if len(vertex) == 0:
+            return empty
+
+        p = xy[vertex]
+        away, distance = _away_from_segments(p, segment_xy[segment])
+        required = (
+            self.lines.half_width[own_line]
+            + self.lines.half_width[other_line]
+            + self.settings.gap_meters
+        )
+        overlap = required - distance
+
+        # Connected lines always overlap around their junction, so conflicts
+        # near an end of either line touching the other are left alone.
+        original = self.lines.xy
+        junction_distance = np.full(len(vertex), np.inf)
+        for end, touched in (
+            (self.first[own_line], other_line),
+            (self.last[own_line], other_line),
+            (self.first[other_line], own_line),
+            (self.last[other_line], own_line),
+        ):
+            at_junction = np.isin(end * len(self.lines) + touched, self.touch_keys)
+            junction_distance = np.where(
+                at_junction,
+                np.minimum(junction_distance, np.hypot(*(p - original[end]).T)),
+                junction_distance,
+            )
+
+        keep = (overlap > self.settings.tolerance_meters) & (
+            junction_distance >= self.settings.junction_factor * required
+        )
+        if not keep.any():
+            return empty
+        vertex, other_line, weight = vertex[keep], other_line[keep], weight[keep]
+        away, distance, overlap = away[keep], distance[keep], overlap[keep]
+
+        ab = segment_xy[segment[keep], 2:] - segment_xy[segment[keep], :2]
+        normal = ab[:, ::-1] * [-1.0, 1.0]
+        normal /= np.maximum(np.hypot(normal[:, 0], normal[:, 1]), 1e-18)[:, None]
+        direction = np.where(
+            (distance > 1e-9)[:, None],
+            away / np.maximum(distance, 1e-9)[:, None],
+            normal,
+        )
+
+        # One push per vertex and other line, from its deepest segment.
+        order = np.lexsort((-overlap, other_line, vertex))
+        pair = np.column_stack((vertex[order], other_line[order]))
+        first = np.ones(len(order), dtype=bool)
+        first[1:] = np.any(pair[1:] != pair[:-1], axis=1)
+        order = order[first]
+
+        push = (weight[order] * overlap[order])[:, None] * direction[order]
+        return vertex[order], push, overlap[order]
+
+    def smooth(self, moves: np.ndarray) -> np.ndarray:
+        """Blends the move of every movable interior vertex with its neighbours' moves."""
+        alpha = self.settings.smoothing
+        m = self.interior
+        smoothed = moves.copy()
+        smoothed[m] = (1 - alpha) * moves[m] + alpha * 0.5 * (
+            moves[m - 1] + moves[m + 1]
+        )
+        return smoothed
+
+
+def relax_displacement(
+    lines: DisplacementLines,
+    settings: Optional[logic_config.RoadDisplacementSettings] = None,
+) -> DisplacementResult:
+    """
+    What:
+        Displaces lines until no symbol overlaps another by more than
+        settings.tolerance_meters, or settings.max_iterations is reached.
+
+    How:
+        Lines are densified to settings.densify_meters, by default the smallest
+        symbol width. Each round every movable vertex is pushed straight out of
+        each conflicting symbol by settings.step times its overlap, weighted by
+        hierarchy. The moves are smoothed along each line before they are
+        applied, so a push bends the line like a snake instead of kinking
+        single vertices.
+
+    Args:
+        lines: Lines with half widths and hierarchies.
+        settings: Clearance, iteration and smoothing settings, defaults if None.
+    """
+    settings = settings or logic_config.RoadDisplacementSettings()
+    if len(lines) == 0:
+        return DisplacementResult(lines, lines.xy.copy(), 0, 0, 0.0)
+
+    positive = lines.half_width[lines.half_width > 0]
+    max_segment = settings.densify_meters or (
+        2 * float(positive.min()) if len(positive) else 0.0
+    )
+    lines = densify(lines, max_segment)
+    relaxation = _Relaxation(lines, settings)
+
+    xy = lines.xy.copy()
+    iterations = 0
+    vertex, push, overlap = relaxation.conflicts(xy)
+    while len(vertex) and iterations < settings.max_iterations:
+        moves = np.zeros_like(xy)
+        np.add.at(moves, vertex, push)
+        xy = xy + settings.step * relaxation.smooth(moves)
+        iterations += 1
+        vertex, push, overlap = relaxation.conflicts(xy)
+
+    return DisplacementResult(
+        lines=lines,
+        xy=xy,
+        iterations=iterations,
+        remaining_conflicts=len(vertex),
+        max_overlap=float(overlap.max()) if len(overlap) else 0.0,
+    )
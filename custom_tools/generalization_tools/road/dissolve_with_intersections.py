@@ -3,7 +3,8 @@ from typing import List
 import arcpy
 
 from composition_configs import logic_config
-from custom_tools.general_tools import custom_arcpy
+from custom_tools.general_tools import custom_arcpy, line_noding
+from custom_tools.general_tools.sql_predicate import compile_where_clause
 from env_setup import environment_setup
 from file_manager import WorkFileManager
 
@@ -19,6 +20,13 @@ class DissolveWithIntersections:
         - Uses WorkFileManager to create work paths (in-memory or on-disk) and clean up afterward.
         - Selection step writes a feature layer if in-memory, otherwise a permanent feature class.
         - The per-SQL FeatureToLine outputs are accumulated and merged (same as the original design).
+        - With backend "native" the input is read once, each SQL group is noded and dissolved in
+          process by line_noding.node_lines, and all edges are written to the output in one insert.
+          SQL expressions are evaluated by sql_predicate, falling back to a cursor where clause.
+          They are evaluated on the input rows, before the dissolve: the arcpy path selects
+          from dissolved lines that only carry the dissolve fields, so an expression can only
+          depend on the dissolve key, and every row of a key is selected together either way.
+          Expressions using other fields fail on the arcpy path and raise ValueError here.
 
     Args (via cfg):
         - input_line_feature (GDB path or InjectIO)
@@ -26,10 +34,18 @@ class DissolveWithIntersections:
         - work_file_manager_config (root_file, write_to_memory, keep_files)
         - dissolve_fields: Optional[List[str]]
         - sql_expressions: Optional[List[str]]
+        - backend: "arcpy" or "native"
+        - validate_backend: compare the native result with the arcpy path
     """
 
+    BACKENDS = ("arcpy", "native")
+
     def __init__(self, dissolve_intersections_config: logic_config.DissolveInitKwargs):
         self.cfg = dissolve_intersections_config
+        if self.cfg.backend not in self.BACKENDS:
+            raise ValueError(
+                f"Unknown backend {self.cfg.backend!r}, expected one of {self.BACKENDS}"
+            )
         self.wfm = WorkFileManager(
             config=dissolve_intersections_config.work_file_manager_config
         )
@@ -57,6 +73,8 @@ class DissolveWithIntersections:
             ]
             self.feature_to_line = [self.wfm.build_file_path("feature_to_line", "gdb")]
 
+        self.arcpy_reference = self.wfm.build_file_path("arcpy_reference", "gdb")
+
     def _dissolve_feature(self) -> None:
         if not self.cfg.dissolve_fields:
             arcpy.analysis.PairwiseDissolve(
@@ -110,7 +128,7 @@ class DissolveWithIntersections:
 
         self.list_of_output_files.append(feature_to_line_path)
 
-    def _process_selected_feature(self) -> None:
+    def _process_selected_feature(self, output: str) -> None:
         if self.cfg.sql_expressions:
             for idx, sql_expression in enumerate(self.cfg.sql_expressions):
                 selection_path = self.line_sql_selection[idx]
@@ -126,19 +144,115 @@ class DissolveWithIntersections:
 
             arcpy.management.CopyFeatures(
                 in_features=self.feature_to_line[0],
-                out_feature_class=self.cfg.output_processed_feature,
+                out_feature_class=output,
             )
 
-    def run(self) -> None:
+    def _run_arcpy(self, output: str) -> None:
         self._dissolve_feature()
-        self._process_selected_feature()
+        self._process_selected_feature(output)
 
         if self.cfg.sql_expressions:
             arcpy.management.Merge(
                 inputs=self.list_of_output_files,
-                output=self.cfg.output_processed_feature,
+                output=output,
+            )
+
+    @staticmethod
+    def _parts(shape) -> List[List[tuple]]:
+        return [
+            [(point.X, point.Y) for point in part if point is not None]
+            for part in shape
+        ]
+
+    def _native_groups(self) -> List[list]:
+        """
+        Reads the input once and returns the (key, parts) rows of every SQL
+        group, or of all lines when there are no SQL expressions.
+        """
+        fields = list(self.cfg.dissolve_fields or [])
+        expressions = self.cfg.sql_expressions or []
+
+        predicates = {}
+        for idx, expression in enumerate(expressions):
+            try:
+                predicates[idx] = compile_where_clause(expression)
+            except ValueError:
+                pass
+        key_fields = [name.lower() for name in fields]
+        other_fields = sorted(
+            {name for _, names in predicates.values() for name in names}
+            - set(key_fields)
+        )
+        if other_fields:
+            raise ValueError(
+                f"SQL expressions use fields {other_fields} that are not "
+                f"dissolve fields, so they cannot be evaluated after the dissolve."
             )
 
+        groups: List[list] = [[] for _ in expressions or [None]]
+        with arcpy.da.SearchCursor(
+            self.cfg.input_line_feature, ["SHAPE@", *fields]
+        ) as cursor:
+            for shape, *values in cursor:
+                if shape is None:
+                    continue
+                key = tuple(values)
+                parts = self._parts(shape)
+                if not expressions:
+                    groups[0].append((key, parts))
+                    continue
+                row = dict(zip(key_fields, values))
+                for idx, (predicate, _) in predicates.items():
+                    if predicate(row):
+                        groups[idx].append((key, parts))
+
+        for idx, expression in enumerate(expressions):
+            if idx in predicates:
+                continue
+            with arcpy.da.SearchCursor(
+                self.cfg.input_line_feature,
+                ["SHAPE@", *fields],
+                where_clause=expression,
+            ) as cursor:
+                for shape, *key in cursor:
+                    if shape is not None:
+                        groups[idx].append((tuple(key), self._parts(shape)))
+        return groups
+
+    def _run_native(self, output: str) -> None:
+        edges = []
+        for rows in self._native_groups():
+            edges.extend(line_noding.node_lines(rows))
+
+        line_noding.write_edges(
+            edges=edges,
+            output_feature=output,
+            template_feature=self.cfg.input_line_feature,
+            fields=list(self.cfg.dissolve_fields or []),
+        )
+
+    def _validate_native(self) -> None:
+        self._run_arcpy(self.arcpy_reference)
+        differences = line_noding.compare_edge_networks(
+            reference_feature=self.arcpy_reference,
+            candidate_feature=self.cfg.output_processed_feature,
+            fields=self.cfg.dissolve_fields,
+        )
+        if differences:
+            print("Native noding differs from the arcpy path:")
+            for difference in differences:
+                print(f"  {difference}")
+        else:
+            print("Native noding matches the arcpy path.")
+
+    def run(self) -> None:
+        if self.cfg.backend == "native":
+            self._run_native(self.cfg.output_processed_feature)
+            if self.cfg.validate_backend:
+                self._validate_native()
+        else:
+            self._run_arcpy(self.cfg.output_processed_feature)
+
         self.wfm.delete_created_files()
 
 
@@ -0,0 +1,282 @@
+"""
+Classifies grade-separated crossings with major roads (E and R).
+
+The roads are read once and all segment pairs within the buffer radius are
+found in one grid lookup. Each rule in CROSSING_RULES then picks the pairs
+whose roads have its vertical levels (medium) and categories, testing them
+against the flat-ended rectangle the former 1 m flat buffer shrunk by 50 cm
+covered. Roads whose midpoint lies in the rectangle of a kept crossing road
+get er_kryssningspunkt = 1, written in one cursor pass. Used for both N100
+and N250.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import arcpy
+import numpy as np
+
+from custom_tools.decorators.timing_decorator import timing_decorator
+from custom_tools.general_tools.line_editing import LineParts, read_line_parts
+from custom_tools.general_tools.parallel_overlap import (
+    part_segments,
+    vertex_measures,
+)
+from custom_tools.general_tools.segment_crossings import (
+    SegmentSet,
+    segments_near_points,
+    segments_near_segments,
+)
+from file_manager.n100.file_manager_roads import Road_N100
+from file_manager.n250.file_manager_roads import Road_N250
+
+CROSSING_FIELD = "er_kryssningspunkt"
+
+MAJOR_CATEGORIES = ("E", "R")
+KEEP_CATEGORIES = ("E", "R", "F", "K", "P")
+
+# A 1 m flat-ended buffer shrunk by 50 cm: 0.5 m around the line, without
+# the last 0.5 m at each end.
+BUFFER_RADIUS = 0.5  # [m]
+END_TRIM = 0.5  # [m]
+
+
+@dataclass(frozen=True)
+class CrossingRule:
+    """
+    A crossing category: a road on road_medium near a major road on
+    major_medium. buffered is the side ("road" or "major") whose trimmed
+    buffer the other must touch. Roads kept in marking categories set the
+    crossing field.
+    """
+
+    name: str
+    road_medium: str
+    major_medium: str
+    buffered: str
+    marking: bool
+
+
+CROSSING_RULES = (
+    # Bridges from all categories that cross over ER
+    CrossingRule("bridge_cross_ER", "L", "T", buffered="road", marking=True),
+    # Tunnels under ER
+    CrossingRule("underpass_cross_ER", "U", "T", buffered="road", marking=True),
+    # Roads on surface having ER bridges over them
+    CrossingRule("surface_under_ER", "T", "L", buffered="major", marking=False),
+)
+
+
+@dataclass(frozen=True)
+class _TrimmedSegments:
+    """Segments of every part with END_TRIM cut off both part ends."""
+
+    row: np.ndarray
+    xy: np.ndarray
+    valid: np.ndarray
+
+
+def _trimmed_segments(
+    lines: LineParts, segments: SegmentSet, first_vertex: np.ndarray, trim: float
+) -> _TrimmedSegments:
+    measures = vertex_measures(lines)
+    part_start = measures[lines.offsets[:-1]]
+    part_end = measures[np.maximum(lines.offsets[1:] - 1, 0)]
+    part = segments.owner
+
+    low = measures[first_vertex]
+    high = measures[first_vertex + 1]
+    clip_low = np.maximum(low, part_start[part] + trim)
+    clip_high = np.minimum(high, part_end[part] - trim)
+    span = high - low
+    valid = (clip_high > clip_low) & (span > 0)
+
+    safe_span = np.where(span > 0, span, 1.0)
+    start, delta = segments.xy[:, :2], segments.xy[:, 2:] - segments.xy[:, :2]
+    first = start + ((clip_low - low) / safe_span)[:, None] * delta
+    last = start + ((clip_high - low) / safe_span)[:, None] * delta
+    return _TrimmedSegments(
+        row=lines.part_row[part],
+        xy=np.column_stack((first, last)),
+        valid=valid,
+    )
+
+
+def _in_rectangles(
+    rectangle_xy: np.ndarray, xy: np.ndarray, radius: float
+) -> np.ndarray:
+    """
+    True where segment xy[i] enters the flat-ended rectangle reaching radius to
+    either side of segment rectangle_xy[i], each x1, y1, x2, y2. Points are
+    segments with both ends equal. Like the shrunk buffer the rectangle has no
+    round caps: xy is clipped to the span of the rectangle segment, and must
+    then come strictly closer than radius to its line.
+    """
+    start = rectangle_xy[:, :2]
+    delta = rectangle_xy[:, 2:] - start
+    length = np.hypot(delta[:, 0], delta[:, 1])
+    along = delta / np.where(length > 0, length, 1.0)[:, None]
+    across = along[:, ::-1] * [-1.0, 1.0]
+
+    first, last = xy[:, :2] - start, xy[:, 2:] - start
+    u1, u2 = np.einsum("ij,ij->i", first, along), np.einsum("ij,ij->i", last, along)
+    v1, v2 = np.einsum("ij,ij->i", first, across), np.einsum("ij,ij->i", last, across)
+
+    # Part of xy, as fractions s0..s1 of it, with 0 <= u <= length.
+    du = u2 - u1
+    moving = du != 0
+    safe_du = np.where(moving, du, 1.0)
+    enter = np.where(moving, np.minimum(-u1, length - u1) / safe_du, -np.inf)
+    leave = np.where(moving, np.maximum(-u1, length - u1) / safe_du, np.inf)
+    s0 = np.maximum(enter, 0.0)
+    s1 = np.minimum(leave, 1.0)
+    inside = np.where(moving, s0 <= s1, (u1 >= 0) & (u1 <= length))
+    s0 = np.where(moving, s0, 0.0)
+    s1 = np.where(moving, s1, 1.0)
+
+    w0 = v1 + s0 * (v2 - v1)
+    w1 = v1 + s1 * (v2 - v1)
+    closest = np.where(w0 * w1 <= 0, 0.0, np.minimum(np.abs(w0), np.abs(w1)))
+    return inside & (length > 0) & (closest < radius)
+
+
+def _row_midpoints(lines: LineParts) -> np.ndarray:
+    """The point halfway along every row, as arcpy uses for line centres."""
+    measures = vertex_measures(lines)
+    rows = lines.part_row
+    first_part = np.unique(rows, return_index=True)[1]
+    last_part = len(rows) - 1 - np.unique(rows[::-1], return_index=True)[1]
+    first = lines.offsets[first_part]
+    last = lines.offsets[last_part + 1] - 1
+    middle = 0.5 * (measures[first] + measures[last])
+
+    after = np.clip(np.searchsorted(measures, middle, side="right"), first + 1, last)
+    before = after - 1
+    span = measures[after] - measures[before]
+    ratio = np.divide(
+        middle - measures[before], span, out=np.zeros_like(span), where=span > 0
+    )
+    return lines.xy[before] + ratio[:, None] * (lines.xy[after] - lines.xy[before])
+
+
+def classify_crossings(
+    lines: LineParts,
+    rules: tuple[CrossingRule, ...] = CROSSING_RULES,
+    radius: float = BUFFER_RADIUS,
+    trim: float = END_TRIM,
+) -> tuple[dict[str, np.ndarray], np.ndarray]:
+    """
+    What:
+        Returns ({rule name: (r,) True for the roads in its category}, crossing
+        flag of every road). lines must be read with the fields medium and
+        vegkategori.
+
+    How:
+        Segment pairs within radius are found once for all roads. For every
+        rule, the pairs between its road and major road levels are tested
+        against the flat-ended rectangle of the trimmed buffered side, and the
+        roads (not the major roads) of pairs entering it form the category.
+        Roads of marking categories with a category in KEEP_CATEGORIES are the
+        kept crossings, and every road whose midpoint lies in the rectangle of
+        a kept one is flagged.
+    """
+    medium = np.array([values[0] for values in lines.attributes], dtype=object)
+    category = np.array([values[1] for values in lines.attributes], dtype=object)
+    major = np.isin(category, MAJOR_CATEGORIES)
+
+    segments, first_vertex = part_segments(lines)
+    trimmed = _trimmed_segments(lines, segments, first_vertex, trim)
+    near, other = segments_near_segments(segments, segments, radius)
+    near_row = trimmed.row[near]
+    other_row = trimmed.row[other]
+    keep = (near_row != other_row) & trimmed.valid[near]
+    near, other, near_row, other_row = (
+        near[keep],
+        other[keep],
+        near_row[keep],
+        other_row[keep],
+    )
+
+    categories: dict[str, np.ndarray] = {}
+    for rule in rules:
+        road_rows = medium == rule.road_medium
+        major_rows = major & (medium == rule.major_medium)
+        if rule.buffered == "road":
+            buffered_rows, touching_rows = road_rows, major_rows
+        elif rule.buffered == "major":
+            buffered_rows, touching_rows = major_rows, road_rows
+        else:
+            raise ValueError(f"Unsupported buffered side: {rule.buffered}")
+
+        pair = buffered_rows[near_row] & touching_rows[other_row]
+        close = _in_rectangles(trimmed.xy[near[pair]], segments.xy[other[pair]], radius)
+        road_of_pair = (near_row if rule.buffered == "road" else other_row)[pair]
+        in_category = np.zeros(len(lines.oids), dtype=bool)
+        in_category[road_of_pair[close]] = True
+        categories[rule.name] = in_category
+
+    kept = np.zeros(len(lines.oids), dtype=bool)
+    for rule in rules:
+        if rule.marking:
+            kept |= categories[rule.name]
+    kept &= np.isin(category, KEEP_CATEGORIES)
+
+    kept_segments = trimmed.valid & kept[trimmed.row]
+    buffers = SegmentSet(
+        owner=trimmed.row[kept_segments],
+        xy=trimmed.xy[kept_segments],
+        start_is_boundary=segments.start_is_boundary[kept_segments],
+        end_is_boundary=segments.end_is_boundary[kept_segments],
+    )
+    midpoints = _row_midpoints(lines)
+    segment, point = segments_near_points(buffers, midpoints, radius)
+    inside = _in_rectangles(buffers.xy[segment], np.tile(midpoints[point], 2), radius)
+    flagged = np.zeros(len(lines.oids), dtype=bool)
+    flagged[point[inside]] = True
+    return categories, flagged
+
+
+def write_crossing_flags(
+    input_road: str, output_road: str, field: str = CROSSING_FIELD
+) -> np.ndarray:
+    """
+    Copies input_road to output_road with field set to 1 for crossing roads
+    and 0 for the rest, in one update. Returns the flags by row.
+    """
+    arcpy.management.CopyFeatures(in_features=input_road, out_feature_class=output_road)
+    arcpy.management.AddField(
+        in_table=output_road, field_name=field, field_type="SHORT"
+    )
+
+    lines = read_line_parts(output_road, ["medium", "vegkategori"])
+    _, flagged = classify_crossings(lines)
+    flagged_oids = set(lines.oids[flagged].tolist())
+
+    with arcpy.da.UpdateCursor(output_road, ["OID@", field]) as cursor:
+        for oid, _ in cursor:
+            cursor.updateRow([oid, 1 if oid in flagged_oids else 0])
+    return flagged
+
+
+@timing_decorator
+def categories_major_road_crossings(scale: str) -> None:
+    """
+    Updates the attribute 'er_kryssningspunkt' in a copy of the input roads for
+    all roads that cross major roads (E and R) on another level.
+
+    Args:
+        scale (str): String describing which scale to use (N100, N250)
+    """
+    if scale.lower() == "n100":
+        input_road = Road_N100.data_selection___nvdb_roads___n100_road.value
+        output_road = Road_N100.major_road_crossing__output__n100_road.value
+    elif scale.lower() == "n250":
+        input_road = Road_N250.data_selection___nvdb_roads___n250_road.value
+        output_road = Road_N250.major_road_crossing__output__n250_road.value
+    else:
+        raise ValueError(f"Unsupported scale: {scale}")
+
+    print(f"\nUpdating '{CROSSING_FIELD}' for intersecting features...")
+    flagged = write_crossing_flags(input_road, output_road)
+    print(f"Updated '{CROSSING_FIELD}' for {int(flagged.sum())} features.\n")
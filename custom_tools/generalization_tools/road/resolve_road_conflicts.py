@@ -1,15 +1,20 @@
-import arcpy
-from typing import List
+import os
 from dataclasses import dataclass
-from typing import List
+from typing import Dict, List
 
 import arcpy
+import numpy as np
 
 from composition_configs import logic_config
 from custom_tools.general_tools import custom_arcpy
+from custom_tools.general_tools.line_editing import polyline_from_parts
+from custom_tools.generalization_tools.road import displacement_engine
 from composition_configs import logic_config
 from file_manager import WorkFileManager
 
+# Half width of the displacement polygons drawn by the native backend.
+DISPLACEMENT_LINK_HALF_WIDTH = 0.5  # [m]
+
 
 @dataclass
 class _RrcRecord:
@@ -19,8 +24,36 @@ class _RrcRecord:
 
 
 class ResolveRoadConflicts:
+    """
+    What:
+        Displaces lines so their symbols at the reference scale do not overlap,
+        and outputs the primary road layer with the displacement features that
+        touch it.
+
+    How:
+        With backend "arcpy", every layer gets its lyrx symbology and is run
+        through arcpy.cartography.ResolveRoadConflicts. With backend "native",
+        symbol widths are read straight from the same lyrx files, hierarchies
+        from hierarchy_field (layers without it are locked), and
+        displacement_engine relaxes all layers together on vertex arrays. Moved
+        lines are written back to the layer copies, and every moved vertex gets
+        a thin displacement polygon from its old to its new position. Like the
+        displacement features of the arcpy tool, these carry no attributes of
+        their own: distance and direction are the polygon's length and
+        orientation, its ring starting at the old position.
+
+    Args:
+        resolve_road_config (logic_config.RrcInitKwargs): Layers, outputs and backend.
+    """
+
+    BACKENDS = ("arcpy", "native")
+
     def __init__(self, resolve_road_config: logic_config.RrcInitKwargs):
         self.cfg = resolve_road_config
+        if self.cfg.backend not in self.BACKENDS:
+            raise ValueError(
+                f"Unknown backend {self.cfg.backend!r}, expected one of {self.BACKENDS}"
+            )
         self.wfm = WorkFileManager(config=resolve_road_config.work_file_manager_config)
 
         self.specs: List[logic_config.SymbologyLayerSpec] = (
@@ -109,6 +142,167 @@ class ResolveRoadConflicts:
             out_feature_class=self.output_road_feature,
         )
 
+    def _read_native_lines(
+        self,
+    ) -> tuple[displacement_engine.DisplacementLines, List[tuple], np.ndarray]:
+        """
+        Reads every drawn line part of every layer copy with its half symbol
+        width and hierarchy. Returns the lines, (unique_name, oid, part) per
+        line and the (n, 2) Z and M of their vertices, NaN where unset.
+        """
+        map_scale = float(self.cfg.map_scale)
+        parts, zm_parts, half_widths, hierarchies, owners = [], [], [], [], []
+
+        for r in self.records:
+            symbol_widths = displacement_engine.read_lyrx_symbol_widths(
+                r.spec.input_lyrx,
+                r.spec.target_layer_name if r.spec.grouped_lyrx else None,
+            )
+            field_names = {f.name.lower() for f in arcpy.ListFields(r.line_copy)}
+            hierarchy_fields = (
+                [self.cfg.hierarchy_field]
+                if self.cfg.hierarchy_field.lower() in field_names
+                else []
+            )
+
+            with arcpy.da.SearchCursor(
+                r.line_copy,
+                ["OID@", "SHAPE@", *hierarchy_fields, *symbol_widths.fields],
+            ) as cursor:
+                for oid, shape, *values in cursor:
+                    if shape is None:
+                        continue
+                    width = symbol_widths.width_for(values[len(hierarchy_fields) :])
+                    if width is None:
+                        continue
+                    hierarchy = (values[0] if hierarchy_fields else 0) or 0
+                    for part_index, part in enumerate(shape):
+                        points = [p for p in part if p is not None]
+                        if len(points) < 2:
+                            continue
+                        parts.append(
+                            np.asarray([(p.X, p.Y) for p in points], dtype=np.float64)
+                        )
+                        zm_parts.append(
+                            np.asarray(
+                                [(p.Z, p.M) for p in points], dtype=np.float64
+                            ).reshape(-1, 2)
+                        )
+                        half_widths.append(
+                            displacement_engine.symbol_width_meters(width, map_scale)
+                            / 2
+                        )
+                        hierarchies.append(int(hierarchy))
+                        owners.append((r.spec.unique_name, oid, part_index))
+
+        lines = displacement_engine.DisplacementLines.from_lines(
+            parts, half_widths, hierarchies
+        )
+        zm = np.vstack(zm_parts) if zm_parts else np.zeros((0, 2), dtype=np.float64)
+        return lines, owners, zm
+
+    def _write_native_lines(
+        self,
+        result: displacement_engine.DisplacementResult,
+        owners: List[tuple],
+        zm: np.ndarray,
+    ) -> None:
+        """
+        Replaces the geometry of every feature with a moved part in its layer
+        copy. Only the original vertices and the moved densified ones are
+        written, keeping their Z and M.
+        """
+        tolerance = self.cfg.displacement_settings.tolerance_meters
+        moved = {owners[line][:2] for line in result.moved_lines(tolerance).tolist()}
+
+        new_parts: Dict[str, Dict[int, List[tuple]]] = {}
+        for line, (name, oid, _) in enumerate(owners):
+            if (name, oid) in moved:
+                new_parts.setdefault(name, {}).setdefault(oid, []).append(
+                    result.line_output(line, tolerance, zm)
+                )
+
+        for name, parts_by_oid in new_parts.items():
+            line_copy = self._by_name(name).line_copy
+            description = arcpy.Describe(line_copy)
+            has_z, has_m = bool(description.hasZ), bool(description.hasM)
+            with arcpy.da.UpdateCursor(line_copy, ["OID@", "SHAPE@"]) as cursor:
+                for oid, _ in cursor:
+                    if oid in parts_by_oid:
+                        xy_parts, zm_parts = zip(*parts_by_oid[oid])
+                        cursor.updateRow(
+                            [
+                                oid,
+                                polyline_from_parts(
+                                    xy_parts,
+                                    description.spatialReference,
+                                    zm_parts if has_z or has_m else None,
+                                    has_z,
+                                    has_m,
+                                ),
+                            ]
+                        )
+
+    def _write_native_displacement(
+        self, result: displacement_engine.DisplacementResult
+    ) -> None:
+        """Writes a thin polygon from the old to the new position of every moved vertex."""
+        spatial_reference = arcpy.Describe(
+            self._by_name(self.cfg.primary_road_unique_name).line_copy
+        ).spatialReference
+        out_path, out_name = os.path.split(self.displacement_feature)
+        arcpy.management.CreateFeatureclass(
+            out_path=out_path,
+            out_name=out_name,
+            geometry_type="POLYGON",
+            spatial_reference=spatial_reference,
+        )
+
+        start = result.lines.xy
+        shift = result.xy - start
+        distance = np.hypot(shift[:, 0], shift[:, 1])
+        moved = np.nonzero(distance > self.cfg.displacement_settings.tolerance_meters)[
+            0
+        ]
+        side = (
+            shift[moved][:, ::-1]
+            * [-1.0, 1.0]
+            / distance[moved][:, None]
+            * DISPLACEMENT_LINK_HALF_WIDTH
+        )
+
+        with arcpy.da.InsertCursor(self.displacement_feature, ["SHAPE@"]) as cursor:
+            for i, vertex in enumerate(moved.tolist()):
+                a, b = start[vertex], result.xy[vertex]
+                corners = [a - side[i], b - side[i], b + side[i], a + side[i]]
+                cursor.insertRow(
+                    [
+                        arcpy.Polygon(
+                            arcpy.Array([arcpy.Point(x, y) for x, y in corners]),
+                            spatial_reference,
+                        )
+                    ]
+                )
+
+    def resolve_road_conflicts_native(self) -> None:
+        lines, owners, zm = self._read_native_lines()
+        result = displacement_engine.relax_displacement(
+            lines, self.cfg.displacement_settings
+        )
+        print(
+            f"Native road displacement: {result.iterations} rounds, "
+            f"{result.remaining_conflicts} conflicts left "
+            f"(max overlap {result.max_overlap:.2f} m)."
+        )
+        self._write_native_lines(result, owners, zm)
+        self._write_native_displacement(result)
+
+        main = self._by_name(self.cfg.primary_road_unique_name)
+        arcpy.management.CopyFeatures(
+            in_features=main.line_copy,
+            out_feature_class=self.output_road_feature,
+        )
+
     def displacement_feature_processing(self) -> None:
         # Select displacement features intersecting the final road output
         custom_arcpy.select_location_and_make_permanent_feature(
@@ -137,8 +331,11 @@ class ResolveRoadConflicts:
         arcpy.env.referenceScale = self.cfg.map_scale
 
         self.copy_input_layers()
-        self.apply_symbology()
-        self.resolve_road_conflicts()
+        if self.cfg.backend == "native":
+            self.resolve_road_conflicts_native()
+        else:
+            self.apply_symbology()
+            self.resolve_road_conflicts()
         self.displacement_feature_processing()
 
         self.wfm.delete_created_files()
@@ -0,0 +1,371 @@
+"""
+Collapses roundabouts in a road network to single junction points.
+
+The road network is read once and turned into a node graph by joining line
+ends within a tolerance of each other. Roundabouts are the connected rings of
+roads tagged as roundabouts with the same road number. Every ring is replaced
+by a centre node: its own roads are deleted, the roads ending on it, at a
+ring node or anywhere along it, are moved to end at the centre, and roads
+left with both ends at the centre are deleted. All edits are written in one
+cursor pass. Used for both N100 and N250.
+"""
+
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+
+import arcpy
+import numpy as np
+
+from custom_tools.decorators.timing_decorator import timing_decorator
+from custom_tools.general_tools.endpoint_snapping import (
+    nearest_on_segments,
+    points_within,
+)
+from custom_tools.general_tools.line_editing import (
+    LineParts,
+    polyline_from_parts,
+    read_line_parts,
+)
+from custom_tools.general_tools.parallel_overlap import part_segments
+from custom_tools.general_tools.segment_crossings import SegmentSet
+from file_manager.n100.file_manager_roads import Road_N100
+from file_manager.n250.file_manager_roads import Road_N250
+
+ROUNDABOUT_TYPE = "rundkjøring"
+CENTRE_LINE_TYPE = "VegSenterlinje"
+TUNNEL_MEDIUM = "U"
+
+# Road ends closer than this are the same node.
+NODE_TOLERANCE = 0.1  # [m]
+
+ROAD_FIELDS = ["typeveg", "medium", "vegnummer", "objtype"]
+
+
+@dataclass(frozen=True)
+class RoadGraph:
+    """
+    Roads as edges between end nodes.
+
+    lines: The roads, read with ROAD_FIELDS.
+    start / end: (r,) node index of the first and last vertex of every road.
+    start_xy / end_xy: (r, 2) first and last vertex of every road.
+    node_count: Number of distinct nodes.
+    road_type / medium / number / object_type: (r,) attributes of every road.
+    """
+
+    lines: LineParts
+    start: np.ndarray
+    end: np.ndarray
+    start_xy: np.ndarray
+    end_xy: np.ndarray
+    node_count: int
+    road_type: np.ndarray
+    medium: np.ndarray
+    number: np.ndarray
+    object_type: np.ndarray
+
+
+@dataclass(frozen=True)
+class RoundaboutEdits:
+    """
+    centres: (k, 2) centre point of every collapsed roundabout.
+    new_start / new_end: (r,) row of centres each road end moves to, or -1.
+    deleted: (r,) True for roads to delete.
+    """
+
+    centres: np.ndarray
+    new_start: np.ndarray
+    new_end: np.ndarray
+    deleted: np.ndarray
+
+    @property
+    def changed(self) -> np.ndarray:
+        return self.deleted | (self.new_start >= 0) | (self.new_end >= 0)
+
+
+def _end_nodes(xy: np.ndarray, tolerance: float) -> np.ndarray:
+    """
+    Node index of every point, joining points within tolerance of each other
+    and, through them, every chain of such points.
+    """
+    a, b, _ = points_within(xy, xy, tolerance)
+
+    # Every point takes the lowest label among its close points until stable.
+    labels = np.arange(len(xy))
+    while True:
+        joined = labels.copy()
+        np.minimum.at(joined, a, labels[b])
+        np.minimum.at(joined, b, labels[a])
+        joined = joined[joined]
+        if np.array_equal(joined, labels):
+            break
+        labels = joined
+    return np.unique(labels, return_inverse=True)[1].ravel()
+
+
+def build_road_graph(lines: LineParts, tolerance: float = NODE_TOLERANCE) -> RoadGraph:
+    """Joins the ends of every road in lines within tolerance to nodes."""
+    rows = lines.part_row
+    first_part = np.unique(rows, return_index=True)[1]
+    last_part = len(rows) - 1 - np.unique(rows[::-1], return_index=True)[1]
+    ends = np.concatenate(
+        (
+            lines.xy[lines.offsets[first_part]],
+            lines.xy[lines.offsets[last_part + 1] - 1],
+        )
+    )
+    node = _end_nodes(ends, tolerance)
+
+    def column(index: int) -> np.ndarray:
+        return np.array([values[index] for values in lines.attributes], dtype=object)
+
+    return RoadGraph(
+        lines=lines,
+        start=node[: len(first_part)],
+        end=node[len(first_part) :],
+        start_xy=ends[: len(first_part)],
+        end_xy=ends[len(first_part) :],
+        node_count=int(node.max()) + 1 if len(node) else 0,
+        road_type=column(0),
+        medium=column(1),
+        number=column(2),
+        object_type=column(3),
+    )
+
+
+def _ring_components(graph: RoadGraph, ring: np.ndarray) -> np.ndarray:
+    """
+    Component label of every roundabout road, joining roundabout roads that
+    share a node and a road number. -1 for other roads.
+    """
+    parent = list(range(len(ring)))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    seen: dict[tuple, int] = {}
+    for road in np.nonzero(ring)[0].tolist():
+        for node in (graph.start[road], graph.end[road]):
+            key = (int(node), graph.number[road])
+            other = seen.setdefault(key, road)
+            parent[find(road)] = find(other)
+
+    labels = np.full(len(ring), -1, dtype=np.int64)
+    roots = [find(road) for road in np.nonzero(ring)[0].tolist()]
+    labels[ring] = np.unique(roots, return_inverse=True)[1].ravel()
+    return labels
+
+
+def collapse_roundabouts(
+    graph: RoadGraph, tolerance: float = NODE_TOLERANCE
+) -> RoundaboutEdits:
+    """
+    What:
+        Finds every roundabout ring in graph and returns the edits collapsing
+        each to its centre.
+
+    How:
+        Roundabout roads are grouped into components by shared nodes and road
+        number, and components forming at least one cycle are rings. A ring of
+        only tunnel roads collapses for the tunnel roads meeting it, a ring
+        with no tunnel roads for every road meeting it, and mixed rings are
+        left as they are. The centre is the mean of all ring vertices. A road
+        meets a ring when an end lies within tolerance of the ring geometry,
+        which also catches roads ending on an interior vertex of a ring drawn
+        as one closed line. Roads with the same road number sharing an end on
+        the ring keep their geometry. All other roads meeting the ring are
+        moved to its centre, and deleted when both their ends end up there.
+    """
+    road_count = len(graph.start)
+    ring_road = graph.road_type == ROUNDABOUT_TYPE
+    component = _ring_components(graph, ring_road)
+    component_count = int(component.max()) + 1 if road_count else 0
+    if component_count == 0:
+        return RoundaboutEdits(
+            centres=np.empty((0, 2), dtype=np.float64),
+            new_start=np.full(road_count, -1, dtype=np.int64),
+            new_end=np.full(road_count, -1, dtype=np.int64),
+            deleted=np.zeros(road_count, dtype=bool),
+        )
+
+    ring_roads = np.nonzero(component >= 0)[0]
+    ring_component = component[ring_roads]
+    road_counts = np.bincount(ring_component, minlength=component_count)
+    ring_nodes = np.unique(
+        np.concatenate(
+            (
+                np.column_stack((ring_component, graph.start[ring_roads])),
+                np.column_stack((ring_component, graph.end[ring_roads])),
+            )
+        ),
+        axis=0,
+    )
+    node_counts = np.bincount(ring_nodes[:, 0], minlength=component_count)
+    is_ring = road_counts >= node_counts
+
+    tunnel = graph.medium[ring_roads] == TUNNEL_MEDIUM
+    tunnel_counts = np.bincount(
+        ring_component, weights=tunnel, minlength=component_count
+    )
+    all_tunnel = tunnel_counts == road_counts
+    no_tunnel = tunnel_counts == 0
+    collapse = is_ring & (all_tunnel | no_tunnel)
+
+    # Centre of every ring: the mean of all vertices of its roads.
+    lines = graph.lines
+    counts = np.diff(lines.offsets)
+    vertex_row = np.repeat(lines.part_row, counts)
+    vertex_component = component[vertex_row]
+    on_ring = vertex_component >= 0
+    vertex_totals = np.bincount(vertex_component[on_ring], minlength=component_count)
+    centres = np.column_stack(
+        [
+            np.bincount(
+                vertex_component[on_ring],
+                weights=lines.xy[on_ring, axis],
+                minlength=component_count,
+            )
+            / np.maximum(vertex_totals, 1)
+            for axis in range(2)
+        ]
+    )
+
+    deleted = (component >= 0) & collapse[np.maximum(component, 0)]
+    meeting = ~ring_road & (graph.object_type == CENTRE_LINE_TYPE)
+
+    # Road ends are matched against the geometry of the collapsing rings.
+    segments, _ = part_segments(lines)
+    segment_row = lines.part_row[segments.owner]
+    on_collapsing = deleted[segment_row]
+    ring_segments = SegmentSet(
+        owner=component[segment_row[on_collapsing]],
+        xy=segments.xy[on_collapsing],
+        start_is_boundary=segments.start_is_boundary[on_collapsing],
+        end_is_boundary=segments.end_is_boundary[on_collapsing],
+    )
+
+    def moved_to(end_xy: np.ndarray) -> np.ndarray:
+        ring = nearest_on_segments(ring_segments, end_xy, tolerance)[2]
+        allowed = meeting & (ring >= 0)
+        allowed &= ~all_tunnel[np.maximum(ring, 0)] | (graph.medium == TUNNEL_MEDIUM)
+        return np.where(allowed, ring, -1)
+
+    new_start = moved_to(graph.start_xy)
+    new_end = moved_to(graph.end_xy)
+
+    # Roads with the same number sharing an end on a ring are left unchanged.
+    ends = [
+        (road, int(node), graph.number[road])
+        for moved, nodes in ((new_start, graph.start), (new_end, graph.end))
+        for road, node in zip(np.nonzero(moved >= 0)[0].tolist(), nodes[moved >= 0])
+    ]
+    shared: dict[tuple, list[int]] = {}
+    for road, node, number in ends:
+        shared.setdefault((node, number), []).append(road)
+    kept = [road for roads in shared.values() if len(set(roads)) > 1 for road in roads]
+    new_start[kept] = -1
+    new_end[kept] = -1
+
+    deleted |= (new_start >= 0) & (new_start == new_end)
+
+    used = np.zeros(component_count, dtype=bool)
+    used[np.nonzero(collapse)[0]] = True
+    index = np.cumsum(used) - 1
+    return RoundaboutEdits(
+        centres=centres[used],
+        new_start=np.where(new_start >= 0, index[np.maximum(new_start, 0)], -1),
+        new_end=np.where(new_end >= 0, index[np.maximum(new_end, 0)], -1),
+        deleted=deleted,
+    )
+
+
+def write_roundabout_edits(
+    feature_class: str, graph: RoadGraph, edits: RoundaboutEdits
+) -> None:
+    """Applies edits to feature_class, which must be the class graph was read from."""
+    lines = graph.lines
+    changed = np.nonzero(edits.changed)[0]
+    if len(changed) == 0:
+        return
+
+    row_parts = lines.row_parts()
+    row_of_oid = {int(lines.oids[row]): int(row) for row in changed}
+    spatial_reference = arcpy.Describe(feature_class).spatialReference
+
+    with arcpy.da.UpdateCursor(feature_class, ["OID@", "SHAPE@"]) as cursor:
+        for oid, _ in cursor:
+            row = row_of_oid.get(oid)
+            if row is None:
+                continue
+            if edits.deleted[row]:
+                cursor.deleteRow()
+                continue
+            parts = [lines.part_vertices(part).copy() for part in row_parts[row]]
+            if edits.new_start[row] >= 0:
+                parts[0][0] = edits.centres[edits.new_start[row]]
+            if edits.new_end[row] >= 0:
+                parts[-1][-1] = edits.centres[edits.new_end[row]]
+            cursor.updateRow([oid, polyline_from_parts(parts, spatial_reference)])
+
+
+def write_centres(centres: np.ndarray, output_feature: str, spatial_reference) -> None:
+    """Writes the roundabout centres as points, as a visual control of the junctions."""
+    path, name = os.path.split(output_feature)
+    arcpy.management.CreateFeatureclass(
+        path, name, "POINT", spatial_reference=spatial_reference
+    )
+    with arcpy.da.InsertCursor(output_feature, ["SHAPE@XY"]) as cursor:
+        for x, y in centres.tolist():
+            cursor.insertRow([(x, y)])
+
+
+def collapse_roundabouts_in(
+    input_road: str, output_road: str, output_centres: str
+) -> None:
+    """
+    Copies input_road to output_road and collapses its roundabouts there,
+    writing the centres to output_centres.
+    """
+    arcpy.management.CopyFeatures(input_road, output_road)
+    graph = build_road_graph(read_line_parts(output_road, ROAD_FIELDS))
+    edits = collapse_roundabouts(graph)
+    write_roundabout_edits(output_road, graph, edits)
+    write_centres(
+        edits.centres,
+        output_centres,
+        arcpy.Describe(output_road).spatialReference,
+    )
+    print(
+        f"Collapsed {len(edits.centres)} roundabouts, "
+        f"moved {int(((edits.new_start >= 0) | (edits.new_end >= 0)).sum())} roads "
+        f"and deleted {int(edits.deleted.sum())}."
+    )
+
+
+@timing_decorator
+def generalize_roundabouts(scale: str) -> None:
+    """
+    Fjerner alle rundkjøringer og flytter tilhørende veisegmenter inn i et felles punkt.
+
+    Args:
+        scale (str): String describing which scale to use (N100, N250)
+    """
+    if scale.lower() == "n100":
+        input_road = Road_N100.major_road_crossing__output__n100_road.value
+        output_road = Road_N100.roundabout__cleaned_road__n100_road.value
+        output_centres = Road_N100.roundabout__centroids__n100_road.value
+    elif scale.lower() == "n250":
+        input_road = Road_N250.major_road_crossing__output__n250_road.value
+        output_road = Road_N250.roundabout__cleaned_road__n250_road.value
+        output_centres = Road_N250.roundabout__centroids__n250_road.value
+    else:
+        raise ValueError(f"Unsupported scale: {scale}")
+
+    print("\nCreate intersections of roundabouts...")
+    collapse_roundabouts_in(input_road, output_road, output_centres)
+    print("Successfully created intersections of roundabouts!\n")
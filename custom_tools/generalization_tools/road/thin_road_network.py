@@ -1,3 +1,6 @@
+import time
+from dataclasses import dataclass
+
 import arcpy
 
 from composition_configs import core_config, logic_config
@@ -11,7 +14,43 @@ from env_setup import environment_setup
 from file_manager import WorkFileManager
 
 
+@dataclass(frozen=True)
+class ThinRoundReport:
+    """
+    What one round of the thin roads cycle did. changed_roads counts the roads
+    removed or added by geometry and attributes when rethin_changed_regions is
+    set, and is the drop in road count otherwise.
+    """
+
+    round: int
+    region_only: bool
+    input_count: int
+    output_count: int
+    changed_roads: int
+    rethinned_roads: int
+    seconds: float
+
+
 class ThinRoadNetwork:
+    """
+    What:
+        Thins a road network with ThinRoadNetwork, keeps the visible roads and
+        dissolves them, repeating until a round no longer reduces the road count.
+
+    How:
+        The first round runs over the whole network. When
+        rethin_changed_regions is set, each round compares the roads going in
+        and coming out by a hash of geometry and attributes, and later rounds
+        only thin and dissolve the roads within rethin_context_meters (default
+        minimum_length) of the roads the previous round changed, splice the
+        result back into the untouched rest and dissolve again across the
+        region boundary. Thinning a region alone loses the network beyond its
+        edge, so this is off by default until its output is shown to match
+        full rounds, and default runs skip the hashing. max_rounds
+        caps the cycle, and the per-round counts are kept in
+        convergence_report as evidence for choosing that cap.
+    """
+
     def __init__(
         self,
         thin_road_network_config: logic_config.ThinRoadNetworkKwargs,
@@ -27,6 +66,15 @@ class ThinRoadNetwork:
         self.partition_field_name = PartitionIterator.PARTITION_FIELD
         self.special_selection_sql = thin_road_network_config.special_selection_sql
 
+        self.max_rounds = thin_road_network_config.max_rounds
+        self.rethin_changed_regions = thin_road_network_config.rethin_changed_regions
+        self.rethin_context = (
+            f"{thin_road_network_config.rethin_context_meters or self.int_minimum_length}"
+            " Meters"
+        )
+        self.hash_fields = FieldNames.road_all_fields()
+        self.convergence_report: list[ThinRoundReport] = []
+
         self.write_work_files_to_memory = (
             thin_road_network_config.work_file_manager_config.write_to_memory
         )
@@ -116,8 +164,11 @@ class ThinRoadNetwork:
                 output_name=selection_output,
             )
 
+        self._dissolve(selection_output, dissolved_output, root_file)
+
+    def _dissolve(self, input, dissolved_output, root_file):
         cfg = logic_config.DissolveInitKwargs(
-            input_line_feature=selection_output,
+            input_line_feature=input,
             output_processed_feature=dissolved_output,
             work_file_manager_config=core_config.WorkFileConfig(
                 root_file=root_file,
@@ -133,6 +184,123 @@ class ThinRoadNetwork:
 
         DissolveWithIntersections(cfg).run()
 
+    def _road_hashes(self, roads: str) -> dict[int, int]:
+        """OID -> hash of geometry and road attributes, in one cursor pass."""
+        fields = ["OID@", "SHAPE@WKB", *self.hash_fields]
+        with arcpy.da.SearchCursor(roads, fields) as cursor:
+            return {
+                row[0]: hash((bytes(row[1]) if row[1] else None, *row[2:]))
+                for row in cursor
+            }
+
+    @staticmethod
+    def _changed_oids(
+        before: dict[int, int], after: dict[int, int]
+    ) -> tuple[list[int], list[int]]:
+        """(OIDs of before no longer present, OIDs of after that are new)."""
+        before_values = set(before.values())
+        after_values = set(after.values())
+        removed = [oid for oid, h in before.items() if h not in after_values]
+        added = [oid for oid, h in after.items() if h not in before_values]
+        return removed, added
+
+    def _select_changed_region(
+        self,
+        roads: str,
+        changes: list[tuple[str, list[int]]],
+        region_output: str,
+        rest_output: str,
+    ) -> bool:
+        """
+        Splits roads into those within rethin_context of the changed roads and
+        the rest. changes holds (feature class, OIDs) of the changed roads.
+        Returns False, writing nothing, if no road is near the changes.
+        """
+        roads_layer = "thin_roads_lyr"
+        arcpy.management.MakeFeatureLayer(roads, roads_layer)
+
+        selection_type = "NEW_SELECTION"
+        for index, (changed_fc, oids) in enumerate(changes):
+            if not oids:
+                continue
+            oid_field = arcpy.Describe(changed_fc).OIDFieldName
+            changed_layer = f"thin_changed_lyr_{index}"
+            arcpy.management.MakeFeatureLayer(
+                changed_fc,
+                changed_layer,
+                f"{oid_field} IN ({','.join(map(str, oids))})",
+            )
+            arcpy.management.SelectLayerByLocation(
+                in_layer=roads_layer,
+                overlap_type="WITHIN_A_DISTANCE",
+                select_features=changed_layer,
+                search_distance=self.rethin_context,
+                selection_type=selection_type,
+            )
+            arcpy.management.Delete(changed_layer)
+            selection_type = "ADD_TO_SELECTION"
+
+        # Without a selection CopyFeatures would copy every road.
+        if not arcpy.Describe(roads_layer).FIDSet:
+            arcpy.management.Delete(roads_layer)
+            return False
+
+        arcpy.management.CopyFeatures(roads_layer, region_output)
+        arcpy.management.SelectLayerByAttribute(roads_layer, "SWITCH_SELECTION")
+        arcpy.management.CopyFeatures(roads_layer, rest_output)
+        arcpy.management.Delete(roads_layer)
+        return True
+
+    def _merge_across_boundary(
+        self, rest: str, region_result: str, output: str, iteration_number: int
+    ) -> None:
+        """
+        Merges the thinned region back into the rest. Roads of the rest
+        touching the region result are dissolved together with it, so roads
+        split at the region boundary are joined again as a full round would.
+        """
+        boundary, far, merged_boundary, boundary_root, boundary_result = (
+            self.work_file_manager.generate_output(
+                instance=self, name=name, iteration_index=iteration_number
+            )
+            for name in (
+                "thin_boundary",
+                "thin_far",
+                "thin_boundary_merged",
+                "boundary_dissolve_root",
+                "dissolved_boundary",
+            )
+        )
+
+        rest_layer = "thin_rest_lyr"
+        arcpy.management.MakeFeatureLayer(rest, rest_layer)
+        arcpy.management.SelectLayerByLocation(
+            in_layer=rest_layer,
+            overlap_type="INTERSECT",
+            select_features=region_result,
+            selection_type="NEW_SELECTION",
+        )
+        # Without a selection CopyFeatures would copy every road.
+        touching = bool(arcpy.Describe(rest_layer).FIDSet)
+        has_far = True
+        if touching:
+            arcpy.management.CopyFeatures(rest_layer, boundary)
+            arcpy.management.SelectLayerByAttribute(rest_layer, "SWITCH_SELECTION")
+            has_far = bool(arcpy.Describe(rest_layer).FIDSet)
+        if has_far:
+            arcpy.management.CopyFeatures(rest_layer, far)
+        arcpy.management.Delete(rest_layer)
+
+        if touching:
+            arcpy.management.Merge(
+                inputs=[boundary, region_result], output=merged_boundary
+            )
+            self._dissolve(merged_boundary, boundary_result, boundary_root)
+            region_result = boundary_result
+        arcpy.management.Merge(
+            inputs=[far, region_result] if has_far else [region_result], output=output
+        )
+
     def thin_road_cycle(self):
         input_count = file_utilities.count_objects(input_layer=self.road_network_input)
 
@@ -143,10 +311,19 @@ class ThinRoadNetwork:
         iteration_number = 0
 
         current_input = self.road_network_input
+        # Hashing reads every road, so it is only done when regions use it.
+        input_hashes = (
+            self._road_hashes(current_input) if self.rethin_changed_regions else {}
+        )
+        changes: list[tuple[str, list[int]]] = []
+        changed_roads = 0
 
         while start_count > end_count:
             iteration_number = iteration_number + 1
             print(f"Starting iteration: {iteration_number}")
+            round_start = time.perf_counter()
+            if iteration_number > 1:
+                start_count = end_count
 
             thin_selection = self.work_file_manager.generate_output(
                 instance=self,
@@ -164,21 +341,105 @@ class ThinRoadNetwork:
                 iteration_index=iteration_number,
             )
 
-            self.thin_road_network_output_selection(
-                input=current_input,
-                selection_output=thin_selection,
-                root_file=root,
-                dissolved_output=current_output,
-            )
+            region_only = iteration_number > 1 and self.rethin_changed_regions
+            if region_only:
+                region = self.work_file_manager.generate_output(
+                    instance=self,
+                    name="thin_region",
+                    iteration_index=iteration_number,
+                )
+                rest = self.work_file_manager.generate_output(
+                    instance=self,
+                    name="thin_rest",
+                    iteration_index=iteration_number,
+                )
+                region_result = self.work_file_manager.generate_output(
+                    instance=self,
+                    name="dissolved_region",
+                    iteration_index=iteration_number,
+                )
+                if not self._select_changed_region(
+                    roads=current_input,
+                    changes=changes,
+                    region_output=region,
+                    rest_output=rest,
+                ):
+                    print("No roads near the last changes, stopping.")
+                    current_output = current_input
+                    break
+                rethinned_count = file_utilities.count_objects(input_layer=region)
+                self.thin_road_network_output_selection(
+                    input=region,
+                    selection_output=thin_selection,
+                    root_file=root,
+                    dissolved_output=region_result,
+                )
+                self._merge_across_boundary(
+                    rest=rest,
+                    region_result=region_result,
+                    output=current_output,
+                    iteration_number=iteration_number,
+                )
+                end_count = file_utilities.count_objects(input_layer=current_output)
+            else:
+                rethinned_count = start_count
+                self.thin_road_network_output_selection(
+                    input=current_input,
+                    selection_output=thin_selection,
+                    root_file=root,
+                    dissolved_output=current_output,
+                )
+                end_count = file_utilities.count_objects(input_layer=current_output)
+
+            if self.rethin_changed_regions:
+                output_hashes = self._road_hashes(current_output)
+                removed, added = self._changed_oids(input_hashes, output_hashes)
+                # Removed roads are located in this round's input, added ones in
+                # its output, which is the next round's input.
+                changes = [(current_input, removed), (current_output, added)]
+                changed_roads = len(removed) + len(added)
+                input_hashes = output_hashes
+            else:
+                changed_roads = start_count - end_count
 
-            end_count = file_utilities.count_objects(input_layer=current_output)
-            start_count = file_utilities.count_objects(input_layer=current_input)
-            print(f"start count: {start_count}\nend count {end_count}\n")
+            self.convergence_report.append(
+                ThinRoundReport(
+                    round=iteration_number,
+                    region_only=region_only,
+                    input_count=start_count,
+                    output_count=end_count,
+                    changed_roads=changed_roads,
+                    rethinned_roads=rethinned_count,
+                    seconds=time.perf_counter() - round_start,
+                )
+            )
+            print(
+                f"start count: {start_count}\nend count {end_count}\n"
+                f"changed roads: {changed_roads}\n"
+            )
             current_input = current_output
 
+            if self.rethin_changed_regions and changed_roads == 0:
+                break
+            if self.max_rounds is not None and iteration_number >= self.max_rounds:
+                print(f"Stopping at max_rounds={self.max_rounds}")
+                break
+
+        self.print_convergence_report()
+
         print(f"Copying: {current_output}")
         arcpy.management.Copy(in_data=current_output, out_data=self.road_network_output)
 
+    def print_convergence_report(self):
+        print("Thin roads convergence:")
+        print("round  region  input  output  changed  rethinned  seconds")
+        for r in self.convergence_report:
+            print(
+                f"{r.round:>5}  {'yes' if r.region_only else 'no':>6}  "
+                f"{r.input_count:>5}  {r.output_count:>6}  {r.changed_roads:>7}  "
+                f"{r.rethinned_roads:>9}  {r.seconds:>7.1f}"
+            )
+
     def run(self):
         environment_setup.main()
         self.thin_road_network()
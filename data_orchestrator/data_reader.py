@@ -54,3 +54,19 @@ class DataReader:
             datasets[dataset_name] = DatasetNamespace(data)
 
         return datasets
+
+    def fetch_required_gdbs(self) -> set[Path]:
+        """
+        Returns the paths of the gdbs holding the feature classes declared for
+        the specific pipeline and scale, without checking that they exist.
+        """
+        relevant_datasets: dict[str, list] = PIPELINE_INPUT[self.map_scale][
+            self.pipeline
+        ]
+        folder_spec: FolderSpec = create_folder_spec(
+            path=self.path,
+            map_scale=dn.raw_data,
+            structure=relevant_datasets,
+        )
+
+        return {Path(p).parent for p in folder_spec.all_files()}
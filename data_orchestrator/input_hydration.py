@@ -0,0 +1,190 @@
+# Libraries
+
+import arcpy
+
+from pathlib import Path
+from typing import Callable, Optional
+
+from data_orchestrator.data_lookup import PIPELINE_INPUT
+from data_orchestrator.data_names import DataNames as dn
+from data_orchestrator.data_reader import DataReader
+from data_orchestrator.features.input_symbology import get_symbology_paths
+from object_store import mark_locally_modified
+from paths import GIS_FILES_ROOT
+
+# ========================
+# Constants
+# ========================
+
+STUDY_AREA_SEARCH_DISTANCE = "5000 Meters"
+MIN_FEATURES_TO_PRECLIP = 100_000
+
+# ========================
+# Input resolution
+# ========================
+
+
+def declares_pipeline_input(map_scale: str, pipeline: str) -> bool:
+    """
+    Returns True if data_lookup.PIPELINE_INPUT declares the datasets
+    the pipeline reads for the given scale.
+    """
+    structure = PIPELINE_INPUT.get(map_scale.lower(), {}).get(pipeline.lower())
+    return isinstance(structure, dict) and bool(structure)
+
+
+def pipeline_input_paths(map_scale: str, pipeline: str) -> list[str]:
+    """
+    What:
+        Returns the gdbs and symbology files a pipeline reads, as POSIX paths
+        relative to GIS_FILES_ROOT, e.g. "raw_data/road.gdb".
+
+    How:
+        The gdbs are resolved through DataReader from data_lookup.PIPELINE_INPUT
+        and the symbology files through get_symbology_paths. Nothing is read
+        from disk, so this can run before any data is downloaded.
+
+    Why:
+        Lets the dispatchers hydrate only the inputs a single pipeline declares
+        instead of the whole GIS_Files tree.
+    """
+    reader = DataReader(map_scale=map_scale, pipeline=pipeline)
+    paths = set(reader.fetch_required_gdbs())
+    paths.update(get_symbology_paths(map_scale).values())
+
+    return sorted(Path(p).relative_to(GIS_FILES_ROOT).as_posix() for p in paths)
+
+
+def is_pipeline_input(relative_path: str, input_paths: list[str]) -> bool:
+    """
+    Returns True if relative_path is one of input_paths or lies inside one of them.
+    """
+    return any(
+        relative_path == p or relative_path.startswith(f"{p}/") for p in input_paths
+    )
+
+
+def pipeline_input_filter(
+    map_scale: str, pipeline: str
+) -> Optional[Callable[[str], bool]]:
+    """
+    Returns a predicate selecting the declared inputs of a pipeline by their
+    path relative to GIS_FILES_ROOT, or None if the pipeline declares none and
+    everything should be hydrated.
+    """
+    if not declares_pipeline_input(map_scale, pipeline):
+        return None
+
+    input_paths = pipeline_input_paths(map_scale, pipeline)
+    return lambda relative_path: is_pipeline_input(relative_path, input_paths)
+
+
+# ========================
+# Study area pre-clip
+# ========================
+
+
+def preclip_to_study_area(
+    map_scale: str,
+    pipeline: str,
+    selecting_sql_expression: str,
+    search_distance: str = STUDY_AREA_SEARCH_DISTANCE,
+    min_feature_count: int = MIN_FEATURES_TO_PRECLIP,
+) -> None:
+    """
+    What:
+        Deletes the features of large declared inputs that lie further than
+        search_distance from the study area, in the hydrated copy of the data.
+
+    How:
+        The study area is selected from AdminFlate_N50 with
+        selecting_sql_expression. Feature classes with at least
+        min_feature_count features are trimmed in place, keeping every feature
+        within search_distance so the pipeline's own study area selection
+        sees the same neighbourhood as before. Every trimmed gdb is marked as
+        locally modified, so the next download fetches it whole again.
+
+    Args:
+        map_scale (str): The map scale of the pipeline, e.g. "n100"
+        pipeline (str): The pipeline whose inputs should be trimmed
+        selecting_sql_expression (str): Selects the study area, e.g. "navn IN ('Bergen')"
+        search_distance (str): Distance around the study area to keep
+        min_feature_count (int): Feature classes smaller than this are left untouched
+    """
+    datasets = DataReader(
+        map_scale=map_scale, pipeline=pipeline
+    ).fetch_relevant_datasets()
+
+    area = datasets.get(dn.area)
+    selecting_file = getattr(area, dn.AdminFlate_N50, None)
+    if selecting_file is None:
+        print(
+            f"No {dn.AdminFlate_N50} declared for {map_scale} {pipeline}, skipping pre-clip."
+        )
+        return
+
+    study_area_layer = "preclip_study_area"
+    arcpy.management.MakeFeatureLayer(
+        selecting_file, study_area_layer, selecting_sql_expression
+    )
+
+    try:
+        for dataset in datasets.values():
+            for feature_class in vars(dataset).values():
+                if feature_class == selecting_file:
+                    continue
+                _trim_outside_study_area(
+                    feature_class=feature_class,
+                    study_area_layer=study_area_layer,
+                    search_distance=search_distance,
+                    min_feature_count=min_feature_count,
+                )
+    finally:
+        arcpy.management.Delete(study_area_layer)
+
+
+def _trim_outside_study_area(
+    feature_class: str,
+    study_area_layer: str,
+    search_distance: str,
+    min_feature_count: int,
+) -> None:
+    if not arcpy.Exists(feature_class):
+        return
+    if int(arcpy.management.GetCount(feature_class).getOutput(0)) < min_feature_count:
+        return
+
+    layer = "preclip_input"
+    arcpy.management.MakeFeatureLayer(feature_class, layer)
+    try:
+        arcpy.management.SelectLayerByLocation(
+            layer,
+            "WITHIN_A_DISTANCE",
+            study_area_layer,
+            search_distance,
+            "NEW_SELECTION",
+            "INVERT",
+        )
+        removed = int(arcpy.management.GetCount(layer).getOutput(0))
+        if removed:
+            # Marked first, so a failed delete does not leave a half-trimmed gdb
+            # that a later download would trust.
+            _mark_gdb_modified(feature_class)
+            arcpy.management.DeleteFeatures(layer)
+        print(f"Pre-clipped {feature_class}: removed {removed} features.")
+    finally:
+        arcpy.management.Delete(layer)
+
+
+def _mark_gdb_modified(feature_class: str) -> None:
+    path = Path(feature_class)
+    gdb = next(
+        (parent for parent in path.parents if parent.suffix.lower() == ".gdb"), None
+    )
+    if gdb is None:
+        return
+    try:
+        relative_gdb = gdb.relative_to(GIS_FILES_ROOT)
+    except ValueError:
+        return
+    mark_locally_modified(str(GIS_FILES_ROOT), relative_gdb.as_posix())
@@ -1,4 +1,7 @@
 import re
+from dataclasses import dataclass
+from enum import Enum
+from functools import cached_property
 
 from composition_configs import type_defs
 from env_setup.project_layout import ProjectLayout
@@ -199,3 +202,106 @@ class BaseFileManager:
         full_path = self._general_dir / dir_name
         full_path.mkdir(parents=True, exist_ok=True)
         return type_defs.SubdirectoryPath(str(full_path))
+
+
+@dataclass(frozen=True)
+class LazyFilePath:
+    """A deferred BaseFileManager path call, resolved on first access."""
+
+    manager: "LazyFileManager"
+    method_name: str
+    arguments: tuple[tuple[str, str], ...]
+
+    def resolve(self) -> str:
+        return self.manager.resolve(self)
+
+
+class LazyFileManager:
+    """
+    What:
+        Mirrors the BaseFileManager path methods, but returns LazyFilePath
+        specs that are only turned into paths the first time they are read.
+
+    Why:
+        The file-manager registries declare hundreds of paths each, and
+        building them all at import made every pipeline and test pay for
+        registries it never reads.
+    """
+
+    def __init__(self, scale: str, object_name: str):
+        self.scale = scale
+        self.object = object_name
+        self._resolved: dict[LazyFilePath, str] = {}
+
+    @cached_property
+    def base(self) -> BaseFileManager:
+        return BaseFileManager(scale=self.scale, object_name=self.object)
+
+    def resolve(self, spec: LazyFilePath) -> str:
+        path = self._resolved.get(spec)
+        if path is None:
+            path = getattr(self.base, spec.method_name)(**dict(spec.arguments))
+            self._resolved[spec] = path
+        return path
+
+    def _defer(self, method_name: str, **kwargs: str) -> LazyFilePath:
+        return LazyFilePath(
+            manager=self,
+            method_name=method_name,
+            arguments=tuple(kwargs.items()),
+        )
+
+    def generate_file_name_gdb(
+        self, script_source_name: str, description: str
+    ) -> LazyFilePath:
+        return self._defer(
+            "generate_file_name_gdb",
+            script_source_name=script_source_name,
+            description=description,
+        )
+
+    def generate_file_name_general_files(
+        self, script_source_name: str, description: str, file_type: str
+    ) -> LazyFilePath:
+        return self._defer(
+            "generate_file_name_general_files",
+            script_source_name=script_source_name,
+            description=description,
+            file_type=file_type,
+        )
+
+    def generate_file_name_lyrx(
+        self, script_source_name: str, description: str
+    ) -> LazyFilePath:
+        return self._defer(
+            "generate_file_name_lyrx",
+            script_source_name=script_source_name,
+            description=description,
+        )
+
+    def generate_file_lyrx_directory_deprecated(
+        self, script_source_name: str, description: str
+    ) -> LazyFilePath:
+        return self._defer(
+            "generate_file_lyrx_directory_deprecated",
+            script_source_name=script_source_name,
+            description=description,
+        )
+
+    def generate_final_outputs(self, file_name: str) -> LazyFilePath:
+        return self._defer("generate_final_outputs", file_name=file_name)
+
+    def generate_general_subdirectory(self, description: str) -> LazyFilePath:
+        return self._defer("generate_general_subdirectory", description=description)
+
+
+class LazyPathRegistry(Enum):
+    """
+    Enum base for file-manager registries whose members hold LazyFilePath
+    specs. Reading `.value` resolves the member's path once and caches it,
+    so `Road_N100.x.value` keeps returning the path string.
+    """
+
+    @property
+    def value(self) -> str:
+        return self._value_.resolve()
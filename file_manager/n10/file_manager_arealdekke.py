@@ -1,13 +1,11 @@
 # Imports
-from enum import Enum
-
 from env_setup import global_config
-from file_manager.base_file_manager import BaseFileManager
+from file_manager.base_file_manager import LazyFileManager, LazyPathRegistry
 
-# Initialize BaseFileManager
+# Initialize LazyFileManager
 scale = global_config.scale_n10
 object_name = global_config.object_arealdekke_flate
-file_manager = BaseFileManager(scale=scale, object_name=object_name)
+file_manager = LazyFileManager(scale=scale, object_name=object_name)
 
 
 # All scripts
@@ -36,7 +34,7 @@ snap_lines = "snap_lines"
 replace_uncategorized = "replace_uncategorized"
 
 
-class Arealdekke_N10(Enum):
+class Arealdekke_N10(LazyPathRegistry):
     # ========================================
     #                     arealdekke dissolver
     # ========================================
@@ -1,13 +1,11 @@
 # Imports
-from enum import Enum
-
 from env_setup import global_config
-from file_manager.base_file_manager import BaseFileManager
+from file_manager.base_file_manager import LazyFileManager, LazyPathRegistry
 
-# Initialize BaseFileManager
+# Initialize LazyFileManager
 scale = global_config.scale_n10
 object_name = global_config.object_bygg_og_anlegg
-file_manager = BaseFileManager(scale=scale, object_name=object_name)
+file_manager = LazyFileManager(scale=scale, object_name=object_name)
 
 
 # All scripts
@@ -16,7 +14,7 @@ railway_file = "railway"
 train_station_file = "train_station"
 
 
-class Facility_N10(Enum):
+class Facility_N10(LazyPathRegistry):
     # ========================================
     #                                  LEDNING
     # ========================================
@@ -1,20 +1,18 @@
 # Imports
-from enum import Enum
-
 from env_setup import global_config
-from file_manager.base_file_manager import BaseFileManager
+from file_manager.base_file_manager import LazyFileManager, LazyPathRegistry
 
-# Initialize BaseFileManager
+# Initialize LazyFileManager
 scale = global_config.scale_n10
 object_name = global_config.object_hoydepunkt
-file_manager = BaseFileManager(scale=scale, object_name=object_name)
+file_manager = LazyFileManager(scale=scale, object_name=object_name)
 
 
 # All scripts
 hoydepunkt = "hoydepunkt"
 
 
-class Hoydepunkt_N10(Enum):
+class Hoydepunkt_N10(LazyPathRegistry):
     # ========================================
     #                               Hoydepunkt
     # ========================================
@@ -1,14 +1,12 @@
 # Imports
-from enum import Enum
-
 from env_setup import global_config
 from file_manager import WorkFileManager
-from file_manager.base_file_manager import BaseFileManager
+from file_manager.base_file_manager import LazyFileManager, LazyPathRegistry
 
-# Initialize BaseFileManager
+# Initialize LazyFileManager
 scale = global_config.scale_n100
 object_name = global_config.object_bygning
-file_manager = BaseFileManager(scale=scale, object_name=object_name)
+file_manager = LazyFileManager(scale=scale, object_name=object_name)
 
 
 # All scripts
@@ -42,7 +40,7 @@ iteration = "iteration"
 begrensingskurve_land_water = "begrensingskurve_land_water"
 
 
-class Building_N100(Enum):
+class Building_N100(LazyPathRegistry):
     """
     An enumeration for building-related geospatial data file paths within the N100 scale and building object context.
 
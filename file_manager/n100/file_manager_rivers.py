@@ -1,13 +1,11 @@
 # Imports
-from enum import Enum
-
 from env_setup import global_config
-from file_manager.base_file_manager import BaseFileManager
+from file_manager.base_file_manager import LazyFileManager, LazyPathRegistry
 
-# Initialize BaseFileManager
+# Initialize LazyFileManager
 scale = global_config.scale_n100
 object_name = global_config.object_elv_bekk
-file_manager = BaseFileManager(scale=scale, object_name=object_name)
+file_manager = LazyFileManager(scale=scale, object_name=object_name)
 
 
 ##############################################################################################################################################
@@ -31,7 +29,7 @@ river_strahler = "river_strahler"
 ##############################################################################################################################################
 
 
-class River_N100(Enum):
+class River_N100(LazyPathRegistry):
     """
     An enumeration for river-related geospatial data file paths within the N100 scale and elv_bekk object context.
 
@@ -1,13 +1,11 @@
 # Imports
-from enum import Enum
-
 from env_setup import global_config
-from file_manager.base_file_manager import BaseFileManager
+from file_manager.base_file_manager import LazyFileManager, LazyPathRegistry
 
-# Initialize BaseFileManager
+# Initialize LazyFileManager
 scale = global_config.scale_n100
 object_name = global_config.object_veg_sti
-file_manager = BaseFileManager(scale=scale, object_name=object_name)
+file_manager = LazyFileManager(scale=scale, object_name=object_name)
 
 
 # All scripts
@@ -66,7 +64,7 @@ test3 = "test3"
 """
 
 
-class Road_N100(Enum):
+class Road_N100(LazyPathRegistry):
     # ========================================
     #                           DATA SELECTION
     # ========================================
@@ -476,6 +474,19 @@ class Road_N100(Enum):
         description="collapse_root",
     )
 
+    data_preparation___partition_plan___n100_road = file_manager.generate_file_name_gdb(
+        script_source_name=data_preparation,
+        description="partition_plan",
+    )
+
+    data_preparation___partition_plan_json___n100_road = (
+        file_manager.generate_file_name_general_files(
+            script_source_name=data_preparation,
+            description="partition_plan",
+            file_type="json",
+        )
+    )
+
     data_preparation___thin_road_partition_root_2___n100_road = (
         file_manager.generate_file_name_gdb(
             script_source_name=data_preparation,
@@ -582,11 +593,6 @@ class Road_N100(Enum):
         )
     )
 
-    data_preparation___road_split_xm__n100_road = file_manager.generate_file_name_gdb(
-        script_source_name=data_preparation,
-        description="road_split_xm",
-    )
-
     data_preparation___road_split_single_part___n100_road = (
         file_manager.generate_file_name_gdb(
             script_source_name=data_preparation,
@@ -601,13 +607,6 @@ class Road_N100(Enum):
         )
     )
 
-    data_preparation__water_feature_outline_split_xm__n100_road = (
-        file_manager.generate_file_name_gdb(
-            script_source_name=data_preparation,
-            description="water_feature_outline_split_xm",
-        )
-    )
-
     data_preparation___water_feature_outline_single_part___n100_road = (
         file_manager.generate_file_name_gdb(
             script_source_name=data_preparation,
@@ -716,10 +715,6 @@ class Road_N100(Enum):
     #                               ROUNDABOUT
     # ========================================
 
-    roundabout__roundabout__n100_road = file_manager.generate_file_name_gdb(
-        script_source_name=roundabout_file, description="roundabout"
-    )
-
     roundabout__centroids__n100_road = file_manager.generate_file_name_gdb(
         script_source_name=roundabout_file, description="centroids"
     )
@@ -832,104 +827,6 @@ class Road_N100(Enum):
     #                     MAJOR ROAD CROSSINGS
     # ========================================
 
-    major_road_crossing__road_u__n100_road = file_manager.generate_file_name_gdb(
-        script_source_name=major_road_crossings, description="road_u"
-    )
-
-    major_road_crossing__road_u_buffer__n100_road = file_manager.generate_file_name_gdb(
-        script_source_name=major_road_crossings, description="road_u_buffer"
-    )
-
-    major_road_crossing__road_u_buffer_shrunked__n100_road = (
-        file_manager.generate_file_name_gdb(
-            script_source_name=major_road_crossings,
-            description="road_u_buffer_shrunked",
-        )
-    )
-
-    major_road_crossing__road_l__n100_road = file_manager.generate_file_name_gdb(
-        script_source_name=major_road_crossings, description="road_l"
-    )
-
-    major_road_crossing__road_l_buffer__n100_road = file_manager.generate_file_name_gdb(
-        script_source_name=major_road_crossings, description="road_l_buffer"
-    )
-
-    major_road_crossing__road_l_buffer_shrunked__n100_road = (
-        file_manager.generate_file_name_gdb(
-            script_source_name=major_road_crossings,
-            description="road_l_buffer_shrunked",
-        )
-    )
-
-    major_road_crossing__ER__n100_road = file_manager.generate_file_name_gdb(
-        script_source_name=major_road_crossings, description="ER"
-    )
-
-    major_road_crossing__ER_bridge__n100_road = file_manager.generate_file_name_gdb(
-        script_source_name=major_road_crossings, description="ER_bridge"
-    )
-
-    major_road_crossing__ER_bridge_buffer__n100_road = (
-        file_manager.generate_file_name_gdb(
-            script_source_name=major_road_crossings, description="ER_bridge_buffer"
-        )
-    )
-
-    major_road_crossing__ER_bridge_shrunked__n100_road = (
-        file_manager.generate_file_name_gdb(
-            script_source_name=major_road_crossings, description="ER_bridge_shrunked"
-        )
-    )
-
-    major_road_crossing__road_t__n100_road = file_manager.generate_file_name_gdb(
-        script_source_name=major_road_crossings, description="road_t"
-    )
-
-    major_road_crossing__ER_t__n100_road = file_manager.generate_file_name_gdb(
-        script_source_name=major_road_crossings, description="ER_t"
-    )
-
-    major_road_crossing__bridge_cross_ER__n100_road = (
-        file_manager.generate_file_name_gdb(
-            script_source_name=major_road_crossings, description="bridge_cross_ER"
-        )
-    )
-
-    major_road_crossing__underpass_cross_ER__n100_road = (
-        file_manager.generate_file_name_gdb(
-            script_source_name=major_road_crossings, description="underpass_cross_ER"
-        )
-    )
-
-    major_road_crossing__surface_under_ER__n100_road = (
-        file_manager.generate_file_name_gdb(
-            script_source_name=major_road_crossings, description="surface_under_ER"
-        )
-    )
-
-    major_road_crossing__keep_bru_ERFKP__n100_road = (
-        file_manager.generate_file_name_gdb(
-            script_source_name=major_road_crossings, description="keep_bru_ERFKP"
-        )
-    )
-
-    major_road_crossing__keep_underpass_ERFKP__n100_road = (
-        file_manager.generate_file_name_gdb(
-            script_source_name=major_road_crossings, description="keep_underpass_ERFKP"
-        )
-    )
-
-    major_road_crossing__keep_surface_ERFKP__n100_road = (
-        file_manager.generate_file_name_gdb(
-            script_source_name=major_road_crossings, description="keep_surface_FKP"
-        )
-    )
-
-    major_road_crossing__merged_keep__n100_road = file_manager.generate_file_name_gdb(
-        script_source_name=major_road_crossings, description="merged_keep"
-    )
-
     major_road_crossing__output__n100_road = file_manager.generate_file_name_gdb(
         script_source_name=major_road_crossings, description="output"
     )
@@ -1625,10 +1522,6 @@ class Road_N100(Enum):
     #                               ROUNDABOUT
     # ========================================
 
-    roundabout__roundabout__n100_road = file_manager.generate_file_name_gdb(
-        script_source_name=roundabout_file, description="roundabout"
-    )
-
     roundabout__centroids__n100_road = file_manager.generate_file_name_gdb(
         script_source_name=roundabout_file, description="centroids"
     )
@@ -1753,104 +1646,6 @@ class Road_N100(Enum):
     #                     MAJOR ROAD CROSSINGS
     # ========================================
 
-    major_road_crossing__road_u__n100_road = file_manager.generate_file_name_gdb(
-        script_source_name=major_road_crossings, description="road_u"
-    )
-
-    major_road_crossing__road_u_buffer__n100_road = file_manager.generate_file_name_gdb(
-        script_source_name=major_road_crossings, description="road_u_buffer"
-    )
-
-    major_road_crossing__road_u_buffer_shrunked__n100_road = (
-        file_manager.generate_file_name_gdb(
-            script_source_name=major_road_crossings,
-            description="road_u_buffer_shrunked",
-        )
-    )
-
-    major_road_crossing__road_l__n100_road = file_manager.generate_file_name_gdb(
-        script_source_name=major_road_crossings, description="road_l"
-    )
-
-    major_road_crossing__road_l_buffer__n100_road = file_manager.generate_file_name_gdb(
-        script_source_name=major_road_crossings, description="road_l_buffer"
-    )
-
-    major_road_crossing__road_l_buffer_shrunked__n100_road = (
-        file_manager.generate_file_name_gdb(
-            script_source_name=major_road_crossings,
-            description="road_l_buffer_shrunked",
-        )
-    )
-
-    major_road_crossing__ER__n100_road = file_manager.generate_file_name_gdb(
-        script_source_name=major_road_crossings, description="ER"
-    )
-
-    major_road_crossing__ER_bridge__n100_road = file_manager.generate_file_name_gdb(
-        script_source_name=major_road_crossings, description="ER_bridge"
-    )
-
-    major_road_crossing__ER_bridge_buffer__n100_road = (
-        file_manager.generate_file_name_gdb(
-            script_source_name=major_road_crossings, description="ER_bridge_buffer"
-        )
-    )
-
-    major_road_crossing__ER_bridge_shrunked__n100_road = (
-        file_manager.generate_file_name_gdb(
-            script_source_name=major_road_crossings, description="ER_bridge_shrunked"
-        )
-    )
-
-    major_road_crossing__road_t__n100_road = file_manager.generate_file_name_gdb(
-        script_source_name=major_road_crossings, description="road_t"
-    )
-
-    major_road_crossing__ER_t__n100_road = file_manager.generate_file_name_gdb(
-        script_source_name=major_road_crossings, description="ER_t"
-    )
-
-    major_road_crossing__bridge_cross_ER__n100_road = (
-        file_manager.generate_file_name_gdb(
-            script_source_name=major_road_crossings, description="bridge_cross_ER"
-        )
-    )
-
-    major_road_crossing__underpass_cross_ER__n100_road = (
-        file_manager.generate_file_name_gdb(
-            script_source_name=major_road_crossings, description="underpass_cross_ER"
-        )
-    )
-
-    major_road_crossing__surface_under_ER__n100_road = (
-        file_manager.generate_file_name_gdb(
-            script_source_name=major_road_crossings, description="surface_under_ER"
-        )
-    )
-
-    major_road_crossing__keep_bru_ERFKP__n100_road = (
-        file_manager.generate_file_name_gdb(
-            script_source_name=major_road_crossings, description="keep_bru_ERFKP"
-        )
-    )
-
-    major_road_crossing__keep_underpass_ERFKP__n100_road = (
-        file_manager.generate_file_name_gdb(
-            script_source_name=major_road_crossings, description="keep_underpass_ERFKP"
-        )
-    )
-
-    major_road_crossing__keep_surface_ERFKP__n100_road = (
-        file_manager.generate_file_name_gdb(
-            script_source_name=major_road_crossings, description="keep_surface_FKP"
-        )
-    )
-
-    major_road_crossing__merged_keep__n100_road = file_manager.generate_file_name_gdb(
-        script_source_name=major_road_crossings, description="merged_keep"
-    )
-
     major_road_crossing__output__n100_road = file_manager.generate_file_name_gdb(
         script_source_name=major_road_crossings, description="output"
     )
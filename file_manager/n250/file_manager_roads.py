@@ -1,13 +1,11 @@
 # Imports
-from enum import Enum
-
 from env_setup import global_config
-from file_manager.base_file_manager import BaseFileManager
+from file_manager.base_file_manager import LazyFileManager, LazyPathRegistry
 
-# Initialize BaseFileManager
+# Initialize LazyFileManager
 scale = global_config.scale_n250
 object_name = global_config.object_veg_sti
-file_manager = BaseFileManager(scale=scale, object_name=object_name)
+file_manager = LazyFileManager(scale=scale, object_name=object_name)
 
 
 # All scripts
@@ -57,7 +55,7 @@ ramps_file = "ramps"
 """
 
 
-class Road_N250(Enum):
+class Road_N250(LazyPathRegistry):
     # ========================================
     #                           DATA SELECTION
     # ========================================
@@ -610,10 +608,6 @@ class Road_N250(Enum):
     #                               ROUNDABOUT
     # ========================================
 
-    roundabout__roundabout__n250_road = file_manager.generate_file_name_gdb(
-        script_source_name=roundabout_file, description="roundabout"
-    )
-
     roundabout__centroids__n250_road = file_manager.generate_file_name_gdb(
         script_source_name=roundabout_file, description="centroids"
     )
@@ -726,104 +720,6 @@ class Road_N250(Enum):
     #                     MAJOR ROAD CROSSINGS
     # ========================================
 
-    major_road_crossing__road_u__n250_road = file_manager.generate_file_name_gdb(
-        script_source_name=major_road_crossings, description="road_u"
-    )
-
-    major_road_crossing__road_u_buffer__n250_road = file_manager.generate_file_name_gdb(
-        script_source_name=major_road_crossings, description="road_u_buffer"
-    )
-
-    major_road_crossing__road_u_buffer_shrunked__n250_road = (
-        file_manager.generate_file_name_gdb(
-            script_source_name=major_road_crossings,
-            description="road_u_buffer_shrunked",
-        )
-    )
-
-    major_road_crossing__road_l__n250_road = file_manager.generate_file_name_gdb(
-        script_source_name=major_road_crossings, description="road_l"
-    )
-
-    major_road_crossing__road_l_buffer__n250_road = file_manager.generate_file_name_gdb(
-        script_source_name=major_road_crossings, description="road_l_buffer"
-    )
-
-    major_road_crossing__road_l_buffer_shrunked__n250_road = (
-        file_manager.generate_file_name_gdb(
-            script_source_name=major_road_crossings,
-            description="road_l_buffer_shrunked",
-        )
-    )
-
-    major_road_crossing__ER__n250_road = file_manager.generate_file_name_gdb(
-        script_source_name=major_road_crossings, description="ER"
-    )
-
-    major_road_crossing__ER_bridge__n250_road = file_manager.generate_file_name_gdb(
-        script_source_name=major_road_crossings, description="ER_bridge"
-    )
-
-    major_road_crossing__ER_bridge_buffer__n250_road = (
-        file_manager.generate_file_name_gdb(
-            script_source_name=major_road_crossings, description="ER_bridge_buffer"
-        )
-    )
-
-    major_road_crossing__ER_bridge_shrunked__n250_road = (
-        file_manager.generate_file_name_gdb(
-            script_source_name=major_road_crossings, description="ER_bridge_shrunked"
-        )
-    )
-
-    major_road_crossing__road_t__n250_road = file_manager.generate_file_name_gdb(
-        script_source_name=major_road_crossings, description="road_t"
-    )
-
-    major_road_crossing__ER_t__n250_road = file_manager.generate_file_name_gdb(
-        script_source_name=major_road_crossings, description="ER_t"
-    )
-
-    major_road_crossing__bridge_cross_ER__n250_road = (
-        file_manager.generate_file_name_gdb(
-            script_source_name=major_road_crossings, description="bridge_cross_ER"
-        )
-    )
-
-    major_road_crossing__underpass_cross_ER__n250_road = (
-        file_manager.generate_file_name_gdb(
-            script_source_name=major_road_crossings, description="underpass_cross_ER"
-        )
-    )
-
-    major_road_crossing__surface_under_ER__n250_road = (
-        file_manager.generate_file_name_gdb(
-            script_source_name=major_road_crossings, description="surface_under_ER"
-        )
-    )
-
-    major_road_crossing__keep_bru_ERFKP__n250_road = (
-        file_manager.generate_file_name_gdb(
-            script_source_name=major_road_crossings, description="keep_bru_ERFKP"
-        )
-    )
-
-    major_road_crossing__keep_underpass_ERFKP__n250_road = (
-        file_manager.generate_file_name_gdb(
-            script_source_name=major_road_crossings, description="keep_underpass_ERFKP"
-        )
-    )
-
-    major_road_crossing__keep_surface_ERFKP__n250_road = (
-        file_manager.generate_file_name_gdb(
-            script_source_name=major_road_crossings, description="keep_surface_FKP"
-        )
-    )
-
-    major_road_crossing__merged_keep__n250_road = file_manager.generate_file_name_gdb(
-        script_source_name=major_road_crossings, description="merged_keep"
-    )
-
     major_road_crossing__output__n250_road = file_manager.generate_file_name_gdb(
         script_source_name=major_road_crossings, description="output"
     )
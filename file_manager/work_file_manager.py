@@ -8,6 +8,7 @@ import arcpy
 
 import env_setup.global_config
 from composition_configs import core_config, io_types, type_defs
+from custom_tools.general_tools import file_utilities
 
 
 class WorkFileManager:
@@ -25,6 +26,13 @@ class WorkFileManager:
         stage the deletion of the files you can simply call the delete_created_files method without
         any parameters.
 
+        With config.memory_budget_vertices set, placement is decided per file: a gdb path
+        built with an expected_size goes to memory if it fits in what is left of the budget,
+        otherwise to disk. Memory use is tracked across all managers, since they share
+        the one memory workspace. The estimate is replaced by the measured size once the
+        file is written (report_written_sizes), and the peak is available from
+        memory_workspace_report.
+
     Args:
         config (WorkFileConfig): Configuration object containing work file options.
     """
@@ -37,6 +45,14 @@ class WorkFileManager:
     # mmdd_HHMM makes session prefix sortable: newer instances appear lower when sorted
     _session_prefix = datetime.now().strftime("%m%d_%H%M")
 
+    # Vertices held by live memory-workspace files, per path, across all managers
+    _memory_usage: dict[str, int] = {}
+    _memory_peak = 0
+
+    # Disk files queued by managers with defer_deletion, deleted in batches
+    _deferred_deletions: list[str] = []
+    deferred_deletion_batch_size = 500
+
     def __init__(
         self,
         config: core_config.WorkFileConfig,
@@ -55,6 +71,8 @@ class WorkFileManager:
         self.root_file = config.root_file
         self.write_to_memory = config.write_to_memory
         self.keep_files = config.keep_files
+        self.memory_budget_vertices = config.memory_budget_vertices
+        self.defer_deletion = config.defer_deletion
 
         self.created_paths: set[str] = set()
 
@@ -72,6 +90,56 @@ class WorkFileManager:
             f"memory{os.sep}" if self.write_to_memory else f"{self.root_file}_"
         )
 
+    def _gdb_location(self, expected_size: Optional[int]) -> str:
+        """
+        Where a gdb file goes: the configured location, unless a memory budget is set
+        and the expected size (in vertices) says otherwise.
+        """
+        if self.memory_budget_vertices is None or expected_size is None:
+            return self.file_location
+
+        in_use = sum(WorkFileManager._memory_usage.values())
+        if in_use + expected_size <= self.memory_budget_vertices:
+            return f"memory{os.sep}"
+        if self.root_file:
+            return f"{self.root_file}_"
+        return self.file_location
+
+    def report_size(self, path: io_types.PathArg | str, vertex_count: int) -> None:
+        """
+        Record the measured size of a memory-workspace file, so later placements see
+        the budget actually in use. Disk files are not tracked.
+        """
+        key = str(path)
+        if not key.startswith(f"memory{os.sep}"):
+            return
+        WorkFileManager._memory_usage[key] = vertex_count
+        WorkFileManager._memory_peak = max(
+            WorkFileManager._memory_peak, sum(WorkFileManager._memory_usage.values())
+        )
+
+    def report_written_sizes(self) -> None:
+        """
+        Measure the memory-workspace feature classes of this manager that have been
+        written, replacing any size estimated when their path was built.
+        """
+        memory_prefix = f"memory{os.sep}"
+        for path in self.created_paths:
+            if not path.startswith(memory_prefix) or not arcpy.Exists(path):
+                continue
+            if arcpy.Describe(path).dataType != "FeatureClass":
+                continue
+            self.report_size(path, file_utilities.count_vertices(path))
+
+    @classmethod
+    def memory_workspace_report(cls) -> dict[str, int]:
+        """Vertices currently held by tracked memory files, and the peak this run."""
+        return {
+            "live_files": len(cls._memory_usage),
+            "live_vertices": sum(cls._memory_usage.values()),
+            "peak_vertices": cls._memory_peak,
+        }
+
     def _modify_path(self) -> tuple[Path, str]:
         """
         What:
@@ -111,14 +179,23 @@ class WorkFileManager:
         file_name: str,
         file_type: Literal["gdb"] = "gdb",
         index: Optional[int] = ...,
+        expected_size: Optional[int] = ...,
     ) -> type_defs.GdbFilePath: ...
     @overload
     def build_file_path(
-        self, file_name: str, file_type: Literal["lyrx"], index: Optional[int] = ...
+        self,
+        file_name: str,
+        file_type: Literal["lyrx"],
+        index: Optional[int] = ...,
+        expected_size: Optional[int] = ...,
     ) -> type_defs.LyrxFilePath: ...
     @overload
     def build_file_path(
-        self, file_name: str, file_type: str, index: Optional[int] = ...
+        self,
+        file_name: str,
+        file_type: str,
+        index: Optional[int] = ...,
+        expected_size: Optional[int] = ...,
     ) -> type_defs.GeneralFilePath: ...
 
     def build_file_path(
@@ -126,6 +203,7 @@ class WorkFileManager:
         file_name: str,
         file_type: str = "gdb",
         index: Optional[int] = None,
+        expected_size: Optional[int] = None,
     ) -> Union[
         type_defs.GdbFilePath, type_defs.LyrxFilePath, type_defs.GeneralFilePath
     ]:
@@ -136,6 +214,8 @@ class WorkFileManager:
             file_name (str): The name of the file.
             file_type (str): The type of file to generate the path for.
             index (int, optional): An optional index to append for uniqueness.
+            expected_size (int, optional): Expected vertex count of a gdb file, used to
+                place it in memory or on disk when a memory budget is configured.
 
         Returns:
             str: A string representing the file path.
@@ -144,12 +224,15 @@ class WorkFileManager:
         suffix = f"_iter{index}" if index is not None else ""
 
         if file_type == "gdb":
-            s = f"{self.file_location}{self.unique_id}_{file_name}{suffix}"
+            location = self._gdb_location(expected_size)
+            s = f"{location}{self.unique_id}_{file_name}{suffix}"
             path = type_defs.GdbFilePath(s)
             key = str(path)
             if key in self.created_paths:
                 raise ValueError(f"Duplicate path detected: {path}")
             self.created_paths.add(key)
+            if expected_size is not None:
+                self.report_size(path, expected_size)
             return path
 
         scale_path, origin_file_name = self._modify_path()
@@ -296,6 +379,10 @@ class WorkFileManager:
         """
         Deletes created paths. If delete_targets is None, deletes all tracked paths.
         'exceptions' (if any) are excluded. If delete_files is None, uses not self.keep_files.
+
+        Paths are deleted with one Delete call. With defer_deletion, disk paths are queued
+        instead and deleted once the queue reaches deferred_deletion_batch_size, or when
+        drain_deferred_deletions is called; memory paths are always deleted right away.
         """
         if delete_files is None:
             delete_files = not self.keep_files
@@ -314,8 +401,30 @@ class WorkFileManager:
             to_delete -= {e for e in exceptions if e is not None}
 
         for path in to_delete:
-            self._delete_file(path)
             self.created_paths.discard(str(path))
+            WorkFileManager._memory_usage.pop(str(path), None)
+
+        paths = [str(path) for path in to_delete]
+        if not self.defer_deletion:
+            self._delete_files(paths)
+            return
+
+        memory_prefix = f"memory{os.sep}"
+        self._delete_files([p for p in paths if p.startswith(memory_prefix)])
+        WorkFileManager._deferred_deletions.extend(
+            p for p in paths if not p.startswith(memory_prefix)
+        )
+        if (
+            len(WorkFileManager._deferred_deletions)
+            >= WorkFileManager.deferred_deletion_batch_size
+        ):
+            WorkFileManager.drain_deferred_deletions()
+
+    @classmethod
+    def drain_deferred_deletions(cls) -> None:
+        """Delete every queued disk file. Call at points where none of them is in use."""
+        queued, cls._deferred_deletions = cls._deferred_deletions, []
+        cls._delete_files(queued)
 
     @staticmethod
     def list_contents(data: Any, title: str = "Contents"):
@@ -335,6 +444,21 @@ class WorkFileManager:
             print(data)
         print(f"{f' End of: {title} ':=^120}\n")
 
+    @staticmethod
+    def _delete_files(file_paths: list[str]) -> None:
+        """
+        Delete the existing paths among file_paths with a single Delete call, falling
+        back to one call per path if the batch fails.
+        """
+        existing = [path for path in file_paths if arcpy.Exists(path)]
+        if not existing:
+            return
+        try:
+            arcpy.management.Delete(existing)
+        except arcpy.ExecuteError:
+            for path in existing:
+                WorkFileManager._delete_file(path)
+
     @staticmethod
     def _delete_file(file_path: io_types.PathArg | str) -> None:
         try:
@@ -460,6 +584,7 @@ class PartitionWorkFileManager(WorkFileManager):
         partition_id: Optional[int] = None,
         suffix: str = "",
         extension: str = "gdb",
+        expected_size: Optional[int] = None,
     ) -> str:
         """
         Constructs a consistent file path for work files. If a partition_id is provided,
@@ -471,6 +596,7 @@ class PartitionWorkFileManager(WorkFileManager):
             partition_id (int | None, optional): Partition number. Defaults to None.
             suffix (str, optional): Extra string to differentiate logic. Defaults to "".
             extension (str): File type or extension. Defaults to 'gdb'.
+            expected_size (int, optional): Expected vertex count, see build_file_path.
 
         Returns:
             str: Constructed file path.
@@ -483,4 +609,6 @@ class PartitionWorkFileManager(WorkFileManager):
         else:
             file_name = f"{object_name}{tag_string}{extra}"
 
-        return self.build_file_path(file_name=file_name, file_type=extension)
+        return self.build_file_path(
+            file_name=file_name, file_type=extension, expected_size=expected_size
+        )
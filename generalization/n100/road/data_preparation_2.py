@@ -15,17 +15,24 @@ from custom_tools.decorators.timing_decorator import timing_decorator
 from custom_tools.general_tools import custom_arcpy, file_utilities
 from custom_tools.general_tools.geometry_tools import GeometryValidator
 from custom_tools.general_tools.partition_iterator import PartitionIterator
+from custom_tools.general_tools.partition_plan import PartitionPlan
 from custom_tools.general_tools.study_area_selector import StudyAreaSelector
 from custom_tools.general_tools.geometry_tools import GeometryValidator
 from custom_tools.general_tools import custom_arcpy, file_utilities
 from custom_tools.generalization_tools.road.thin_road_network import ThinRoadNetwork
 from custom_tools.generalization_tools.road.collapse_road import collapse_road
+from custom_tools.generalization_tools.road.major_road_crossings import (
+    categories_major_road_crossings,
+)
 from custom_tools.generalization_tools.road.remove_road_triangles import (
     generalize_road_triangles,
 )
 from custom_tools.generalization_tools.road.resolve_road_conflicts import (
     ResolveRoadConflicts,
 )
+from custom_tools.generalization_tools.road.roundabout_collapse import (
+    generalize_roundabouts,
+)
 from custom_tools.generalization_tools.road.thin_road_network import ThinRoadNetwork
 from env_setup import environment_setup
 from file_manager import WorkFileManager
@@ -40,10 +47,6 @@ from constants.n100_constants import (
     MediumAlias,
 )
 from generalization.n100.road.dam import generalize_dam
-from generalization.n100.road.major_road_crossings import (
-    categories_major_road_crossings,
-)
-from generalization.n100.road.roundabouts import generalize_roundabouts
 from generalization.n100.road.vegsperring import remove_roadblock
 from generalization.n100.road.ramps import main as ramps
 from generalization.n100.road.ramps import main_part_2 as ramps_part_2
@@ -53,7 +56,6 @@ from generalization.n100.road.resolve_road_conflict_preparation import (
     run_dissolve_with_intersections,
     split_polyline_featureclass,
 )
-from generalization.n100.road.roundabouts import generalize_roundabouts
 from generalization.n100.road.vegsperring import remove_roadblock
 from data_orchestrator.data_names import DataNames as dn
 
@@ -71,6 +73,19 @@ SCALE = "n100"
 
 SEARCH_DISTANCE = 5000
 OBJECT_LIMIT = 100_000
+# Vertices the partition work files may hold in the memory workspace at once.
+MEMORY_BUDGET_VERTICES = 5_000_000
+
+
+def road_partition_plan() -> PartitionPlan:
+    """
+    Partitions shared by the OBJECT_LIMIT road iterators; each run reuses them
+    while the road network has not drifted too far from the one they were made for.
+    """
+    return PartitionPlan(
+        partition_feature=Road_N100.data_preparation___partition_plan___n100_road.value,
+        metadata_file=Road_N100.data_preparation___partition_plan_json___n100_road.value,
+    )
 
 
 @timing_decorator
@@ -86,8 +101,8 @@ def main():
     data_selection_and_validation(area_selection=AREA_SELECTOR, data_orc=data_orc)
 
     reclassify_medium()
-    categories_major_road_crossings()
-    generalize_roundabouts()
+    categories_major_road_crossings(scale=SCALE)
+    generalize_roundabouts(scale=SCALE)
     remove_roadblock(data=area_data)
     trim_road_details()
     ramp_partition()
@@ -112,7 +127,9 @@ def main():
     with open(Building_N100.total_workfile_manager_files__n100.value, "w") as f:
         f.write(
             f"Total amount of work files created: "
-            f"{WorkFileManager._build_file_counter}"
+            f"{WorkFileManager._build_file_counter}\n"
+            f"Peak memory workspace use (vertices): "
+            f"{WorkFileManager.memory_workspace_report()['peak_vertices']}"
         )
 
 
@@ -173,6 +190,7 @@ def run_thin_roads(
     min_length_m: int,
     feature_count,
     special_selection_sql=None,
+    partition_plan: PartitionPlan | None = None,
 ):
     road = "road"
     processed_road = "processed_road"
@@ -240,8 +258,10 @@ def run_thin_roads(
         partition_method_inject_config=thin_road_method_config,
         partition_iterator_run_config=partition_thin_run_config,
         work_file_manager_config=core_config.WorkFileConfig(
-            root_file=partition_root_file
+            root_file=partition_root_file,
+            memory_budget_vertices=MEMORY_BUDGET_VERTICES,
         ),
+        partition_plan=partition_plan,
     )
     partition_thin_roads.run()
 
@@ -501,6 +521,7 @@ def collapse_road_detail():
         work_file_manager_config=core_config.WorkFileConfig(
             root_file=Road_N100.data_preparation___collapse_root___n100_road.value
         ),
+        partition_plan=road_partition_plan(),
     )
     partition_collapse_road_detail.run()
 
@@ -588,6 +609,7 @@ def thin_roads():
         docu_path=Road_N100.thin_road_docu___n100_road.value,
         min_length_m=1400,
         feature_count=OBJECT_LIMIT,
+        partition_plan=road_partition_plan(),
     )
 
 
@@ -638,6 +660,7 @@ def thin_sti_and_forest_roads():
         docu_path=Road_N100.thin_sti_docu___n100_road.value,
         min_length_m=1800,
         feature_count=OBJECT_LIMIT,
+        partition_plan=road_partition_plan(),
     )
 
 
@@ -719,7 +742,6 @@ def pre_resolve_road_conflicts(area_selection: str, area_data: DatasetNamespace)
     split_polyline_featureclass(
         input_fc=Road_N100.road_cleaning_output__n100_road.value,
         dissolve_fc=Road_N100.data_preparation___road_split_dissolved___n100_road.value,
-        split_fc=Road_N100.data_preparation___road_split_xm__n100_road.value,
         output_fc=Road_N100.data_preparation___road_split_single_part___n100_road.value,
         interval=100,
         type_fields=FieldNames.road_all_fields(),
@@ -734,7 +756,6 @@ def pre_resolve_road_conflicts(area_selection: str, area_data: DatasetNamespace)
     split_polyline_featureclass(
         input_fc=Road_N100.data_preparation___water_feature_outline___n100_road.value,
         dissolve_fc=Road_N100.data_preparation__water_feature_outline_dissolved__n100_road.value,
-        split_fc=Road_N100.data_preparation__water_feature_outline_split_xm__n100_road.value,
         output_fc=Road_N100.data_preparation___water_feature_outline_single_part___n100_road.value,
         interval=100,
     )
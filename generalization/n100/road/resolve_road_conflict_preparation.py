@@ -4,7 +4,6 @@ import os
 
 import arcpy
 import numpy as np
-from tqdm import tqdm
 
 arcpy.env.overwriteOutput = True
 
@@ -13,7 +12,13 @@ from data_orchestrator.datasets import DatasetNamespace
 
 from composition_configs import core_config, logic_config
 from constants.n100_constants import FieldNames, MediumAlias
-from custom_tools.general_tools import custom_arcpy
+from custom_tools.general_tools import custom_arcpy, file_utilities, line_editing
+from custom_tools.general_tools.segment_crossings import (
+    BATCH_SIZE,
+    SegmentSet,
+    read_segments,
+    segments_near_points,
+)
 from custom_tools.generalization_tools.road.dissolve_with_intersections import (
     DissolveWithIntersections,
 )
@@ -32,7 +37,6 @@ LENGTH_TOLERANCE = 10  # [m]
 def split_polyline_featureclass(
     input_fc: str,
     dissolve_fc: str,
-    split_fc: str,
     output_fc: str,
     interval: float = 500.0,
     type_fields: list = [],
@@ -40,146 +44,51 @@ def split_polyline_featureclass(
     """
     Divides all the polylines in input_fc into pieces of x meters equal intervall,
     and stores the new geometries in an own output folder.
-    Lines with different values in type_fields parameter will be kept seperate
-
+    Lines with different values in type_fields parameter will be kept seperate.
+    The other attributes are carried through the dissolve as the first value of
+    the dissolved lines, and written with every piece. The pieces keep the Z
+    and M values of a Z- or M-aware input.
 
     Args:
         input_fc (str): The input polylines
         dissolve_fc (str): Layer for dissolved features
-        split_fc (str): Layer for the divided geometries
         output_fc (str): Where to store the final single part output geometries
         intervall (float, optional): The split intervall, default: 500 m
         type_fields (list, optional): the fields which determine line types
     """
-    # Fetch fields
-    oid_fields = arcpy.Describe(input_fc).OIDFieldName
-    join_fields = [
-        f.name for f in arcpy.ListFields(input_fc) if f.type not in ("OID", "Geometry")
+    type_names = {name.lower() for name in type_fields}
+    carried_fields = [
+        f.name
+        for f in arcpy.ListFields(input_fc)
+        if f.editable
+        and f.type not in ("OID", "Geometry", "GlobalID")
+        and f.name.lower() not in type_names
     ]
 
-    attr_dict = {}
-    read_fields = [oid_fields] + join_fields
-    with arcpy.da.SearchCursor(input_fc, read_fields) as cursor:
-        for row in cursor:
-            oid = row[0]
-            values = row[1:]
-            attr_dict[oid] = dict(zip(join_fields, values))
-
     # Dissolve input features
     arcpy.management.Dissolve(
         in_features=input_fc,
         out_feature_class=dissolve_fc,
         dissolve_field=type_fields,
+        statistics_fields=[[field, "FIRST"] for field in carried_fields] or None,
         multi_part="SINGLE_PART",
     )
 
-    # Ensure singlepart layers only
-    single_in = r"in_memory/input_singlepart"
-    if arcpy.Exists(single_in):
-        arcpy.management.Delete(single_in)
-    arcpy.management.MultipartToSinglepart(
-        in_features=dissolve_fc, out_feature_class=single_in
-    )
-
-    # Create the divide layer
-    split_gdb = os.path.dirname(split_fc)
-    split_name = os.path.basename(split_fc)
-    if arcpy.Exists(split_fc):
-        arcpy.management.Delete(split_fc)
-    desc = arcpy.Describe(single_in)
-    spatial_ref = desc.spatialReference
-    has_z = "ENABLED" if desc.hasZ else "DISABLED"
-    has_m = "ENABLED" if desc.hasM else "DISABLED"
-    arcpy.management.CreateFeatureclass(
-        out_path=split_gdb,
-        out_name=split_name,
-        geometry_type="POLYLINE",
-        template="",
-        has_m=has_m,
-        has_z=has_z,
-        spatial_reference=spatial_ref,
-    )
-    for fld in arcpy.ListFields(input_fc):
-        if fld.name in type_fields:
-            arcpy.management.AddField(
-                in_table=split_fc, field_name=fld.name, field_type=fld.type
-            )
-
     # Divide the geometries
-    with arcpy.da.SearchCursor(
-        single_in, ["SHAPE@"] + type_fields
-    ) as s_cursor, arcpy.da.InsertCursor(
-        split_fc, ["SHAPE@"] + type_fields
-    ) as i_cursor:
-        for s_row in s_cursor:
-            geom = s_row[0]
-            new_row = list(s_row)
-            if geom is None:
-                # Needs a valid geometry
-                continue
-            total_len = geom.length
-            if total_len <= interval:
-                # If the geometry is shorter than the limit, just keep it
-                i_cursor.insertRow(s_row)
-            else:
-                # Otherwise -> Split it
-                n_full = int(total_len // interval)
-                pos = 0.0
-                for _ in range(n_full):
-                    seg = geom.segmentAlongLine(pos, pos + interval, False)
-                    new_row[0] = seg
-                    i_cursor.insertRow(new_row)
-                    pos += interval
-                # The rest of the geometry
-                if pos < total_len:
-                    seg = geom.segmentAlongLine(pos, total_len, False)
-                    new_row[0] = seg
-                    i_cursor.insertRow(new_row)
-
-    # Clean up
-    if arcpy.Exists(single_in):
-        arcpy.management.Delete(single_in)
-
-    # Spatial join to keep attributes
-    fm = arcpy.FieldMappings()
-    fm.addTable(split_fc)
-
-    # Fill mapping with attributes
-    for fld in join_fields:
-        fmap = arcpy.FieldMap()
-        fmap.addInputField(input_fc, fld)
-
-        out_field = fmap.outputField
-        out_field.name = fld
-        out_field.aliasName = fld
-        fmap.outputField = out_field
-        fm.addFieldMap(fmap)
-
-    # Performe spatial join
-    joined_temp = r"in_memory/split_joined"
-    if arcpy.Exists(joined_temp):
-        arcpy.management.Delete(joined_temp)
-
-    match_fields = []
-    for field in type_fields:
-        match_fields.append([field, field])
-    arcpy.analysis.SpatialJoin(
-        target_features=split_fc,
-        join_features=input_fc,
-        out_feature_class=joined_temp,
-        join_operation="JOIN_ONE_TO_ONE",
-        join_type="KEEP_ALL",
-        match_option="INTERSECT",
-        field_mapping=fm,
-        match_fields=match_fields,
-    )
-
-    # Perform multipart to singlepart for final layer
+    lines = line_editing.read_line_parts(
+        dissolve_fc,
+        fields=list(type_fields) + [f"FIRST_{field}" for field in carried_fields],
+    )
+    pieces = line_editing.split_parts_at_interval(lines, interval)
+
     if arcpy.Exists(output_fc):
         arcpy.management.Delete(output_fc)
-    arcpy.management.MultipartToSinglepart(
-        in_features=joined_temp,
-        out_feature_class=output_fc,
+    line_editing.write_line_pieces(
+        pieces=pieces,
+        lines=lines,
+        output_feature=output_fc,
+        template_feature=input_fc,
+        fields=list(type_fields) + carried_fields,
     )
 
 
@@ -213,6 +122,12 @@ def creafte_wfm_gdbs(wfm: WorkFileManager) -> dict:
         file_name="water_outline_fc", file_type="gdb"
     )
     smooth_fc = wfm.build_file_path(file_name="smooth_roads", file_type="gdb")
+    # Only kept work files can be inspected, so the probes are skipped otherwise.
+    narrow_probe_fc = (
+        wfm.build_file_path(file_name="narrow_probes", file_type="gdb")
+        if wfm.keep_files
+        else None
+    )
 
     return {
         "dissolved_fc": dissolved_fc,
@@ -228,6 +143,7 @@ def creafte_wfm_gdbs(wfm: WorkFileManager) -> dict:
         "point_water_fc": point_water_fc,
         "water_outline_fc": water_outline_fc,
         "smooth_fc": smooth_fc,
+        "narrow_probe_fc": narrow_probe_fc,
     }
 
 
@@ -470,23 +386,130 @@ def prepare_attributes(files: dict) -> tuple[str]:
     return in_water_field, narrow_field
 
 
-def is_narrow(pnt_fc: str, area_fc: str, narrow_field: str) -> None:
+def _opposite_boundary_distances(
+    centers: np.ndarray,
+    directions: np.ndarray,
+    boundary: SegmentSet,
+    min_distance: np.ndarray,
+    max_distance: float,
+) -> np.ndarray:
+    """
+    Casts a ray from every center along its unit direction and returns the
+    distance to the first boundary segment hit between min_distance and
+    max_distance, or inf where there is none.
+    """
+    best = np.full(len(centers), np.inf)
+    if len(boundary) == 0:
+        return best
+
+    for start in range(0, len(centers), BATCH_SIZE):
+        stop = min(start + BATCH_SIZE, len(centers))
+        seg, local = segments_near_points(boundary, centers[start:stop], max_distance)
+        if len(seg) == 0:
+            continue
+        point = local + start
+
+        ax, ay, bx, by = boundary.xy[seg].T
+        dx, dy = bx - ax, by - ay
+        ux, uy = directions[point, 0], directions[point, 1]
+        wx, wy = ax - centers[point, 0], ay - centers[point, 1]
+
+        denom = ux * dy - uy * dx
+        parallel = np.abs(denom) <= EPS * np.hypot(dx, dy)
+        denom = np.where(parallel, 1.0, denom)
+        along_ray = (wx * dy - wy * dx) / denom
+        along_segment = (wx * uy - wy * ux) / denom
+
+        hit = (
+            ~parallel
+            & (along_segment >= -EPS)
+            & (along_segment <= 1 + EPS)
+            & (along_ray > min_distance[point])
+            & (along_ray <= max_distance + EPS)
+        )
+        np.minimum.at(best, point[hit], along_ray[hit])
+    return best
+
+
+def _write_narrow_probes(
+    probe_fc: str,
+    spatial_reference: arcpy.SpatialReference,
+    oids: np.ndarray,
+    near_xy: np.ndarray,
+    centers: np.ndarray,
+    directions: np.ndarray,
+    near_dist: np.ndarray,
+    opposite_dist: np.ndarray,
+    narrow: np.ndarray,
+) -> None:
+    """
+    Writes every probe as a line from the nearest boundary point through the
+    road point and BUFFER_DIST on, with the distances it was classified by.
+    """
+    file_utilities.delete_feature(probe_fc)
+    arcpy.management.CreateFeatureclass(
+        out_path=os.path.dirname(probe_fc),
+        out_name=os.path.basename(probe_fc),
+        geometry_type="POLYLINE",
+        spatial_reference=spatial_reference,
+    )
+    arcpy.management.AddFields(
+        in_table=probe_fc,
+        field_description=[
+            ["POINT_OID", "LONG"],
+            ["NEAR_DIST", "DOUBLE"],
+            ["OPPOSITE_DIST", "DOUBLE"],
+            ["NARROW", "SHORT"],
+        ],
+    )
+
+    ends = centers + directions * BUFFER_DIST
+    with arcpy.da.InsertCursor(
+        probe_fc, ["SHAPE@", "POINT_OID", "NEAR_DIST", "OPPOSITE_DIST", "NARROW"]
+    ) as cursor:
+        for i in range(len(oids)):
+            line = arcpy.Polyline(
+                arcpy.Array(
+                    [
+                        arcpy.Point(*near_xy[i]),
+                        arcpy.Point(*centers[i]),
+                        arcpy.Point(*ends[i]),
+                    ]
+                ),
+                spatial_reference,
+            )
+            opposite = float(opposite_dist[i])
+            cursor.insertRow(
+                [
+                    line,
+                    int(oids[i]),
+                    float(near_dist[i]),
+                    opposite if np.isfinite(opposite) else None,
+                    int(narrow[i]),
+                ]
+            )
+
+
+def is_narrow(
+    pnt_fc: str, area_fc: str, narrow_field: str, probe_fc: str | None = None
+) -> None:
     """
     Calculates whether or not a point is located on a narrow part of the ground and
     updates the attribute from 0 (not) to 1 if it is located in a narrow area.
 
+    For every point, Near finds the closest area boundary. A probe is cast from the
+    point away from that boundary, and the point is narrow if the probe meets another
+    boundary within BUFFER_DIST and the two distances add up to less than
+    LENGTH_TOLERANCE. All probes are intersected with the boundary segments at once
+    in NumPy, through the segment grid in segment_crossings.
+
     Args:
         pnt_fc (str): Path to the featureclass with all the point data
         area_fc (str): Path to the featureclass with the bounding lines for ground area
         narrow_field (str): The field name of the attribute describing narrow areas or not
+        probe_fc (str, optional): If given, the probes are written here with their
+            distances, to inspect BUFFER_DIST and LENGTH_TOLERANCE
     """
-    area_items = []
-    with arcpy.da.SearchCursor(area_fc, ["SHAPE@"]) as sc:
-        for row in sc:
-            g = row[0]
-            env = g.extent
-            area_items.append((g, env.XMin, env.YMin, env.XMax, env.YMax))
-
     arcpy.analysis.Near(
         in_features=pnt_fc,
         near_features=area_fc,
@@ -495,91 +518,66 @@ def is_narrow(pnt_fc: str, area_fc: str, narrow_field: str) -> None:
         distance_unit="Meters",
     )
 
-    total = int(arcpy.management.GetCount(pnt_fc).getOutput(0))
-
-    with arcpy.da.UpdateCursor(
-        pnt_fc, ["SHAPE@", "NEAR_DIST", "NEAR_X", "NEAR_Y", narrow_field]
-    ) as update_cursor:
-        for geom, dist, x, y, _ in tqdm(
-            update_cursor,
-            total=total,
-            desc="Updating narrow attribute",
-            colour="yellow",
-            leave=False,
-        ):
-            if dist == -1:
-                continue
-            if dist > BUFFER_DIST * 1.5:
-                continue
-            if x == None or y == None:
+    oids, centers, near_xy, near_dist = [], [], [], []
+    with arcpy.da.SearchCursor(
+        pnt_fc, ["OID@", "SHAPE@XY", "NEAR_DIST", "NEAR_X", "NEAR_Y"]
+    ) as search_cursor:
+        for oid, xy, dist, x, y in search_cursor:
+            if dist is None or dist == -1 or dist > BUFFER_DIST * 1.5:
                 continue
-
-            cx, cy = geom.centroid.X, geom.centroid.Y
-            near_pt = arcpy.PointGeometry(arcpy.Point(x, y), geom.spatialReference)
-
-            vx = near_pt.centroid.X - cx
-            vy = near_pt.centroid.Y - cy
-            norm = np.hypot(vx, vy)
-
-            if norm < EPS:
+            if x is None or y is None:
                 continue
-
-            ux, uy = -vx / norm, -vy / norm
-
-            line_len = max(BUFFER_DIST * 1.5, norm * 2.0, 50.0)
-
-            p0 = arcpy.Point(cx - ux * line_len, cy - uy * line_len)
-            p1 = arcpy.Point(cx + ux * line_len, cy + uy * line_len)
-            line = arcpy.Polyline(arcpy.Array([p0, p1]), geom.spatialReference)
-
-            l_env = line.extent
-            margin = 0.000001
-            l_xmin, l_ymin, l_xmax, l_ymax = (
-                l_env.XMin - margin,
-                l_env.YMin - margin,
-                l_env.XMax + margin,
-                l_env.YMax + margin,
-            )
-
-            best_distance = np.inf
-            for area_geom, axmin, aymin, axmax, aymax in area_items:
-                if (
-                    (axmax < l_xmin)
-                    or (axmin > l_xmax)
-                    or (aymax < l_ymin)
-                    or (aymin > l_ymax)
-                ):
-                    continue
-
-                inter = line.intersect(area_geom, 1)  # 1 = point
-
-                if inter == None:
-                    continue
-
-                category = inter.type
-
-                if category.lower() == "multipoint":
-                    parts = list(inter)
-                elif category.lower() == "point":
-                    parts = [inter]
-                else:
-                    continue
-
-                for point in parts:
-                    if point == None:
-                        continue
-                    dx = point.X - cx
-                    dy = point.Y - cy
-                    dot = dx * vx + dy * vy
-
-                    if dot < -EPS:
-                        dist_ex = np.hypot(dx, dy)
-                        if dist_ex <= BUFFER_DIST + EPS:
-                            if dist + dist_ex < best_distance:
-                                best_distance = dist + dist_ex
-
-            if best_distance < LENGTH_TOLERANCE:
-                update_cursor.updateRow([geom, dist, x, y, 1])
+            oids.append(oid)
+            centers.append(xy)
+            near_xy.append((x, y))
+            near_dist.append(dist)
+
+    oids = np.asarray(oids, dtype=np.int64)
+    centers = np.asarray(centers, dtype=np.float64).reshape(-1, 2)
+    near_xy = np.asarray(near_xy, dtype=np.float64).reshape(-1, 2)
+    near_dist = np.asarray(near_dist, dtype=np.float64)
+
+    # Probes point away from the nearest boundary.
+    away = centers - near_xy
+    norm = np.hypot(away[:, 0], away[:, 1])
+    valid = norm >= EPS
+    oids, centers, near_xy, near_dist = (
+        oids[valid],
+        centers[valid],
+        near_xy[valid],
+        near_dist[valid],
+    )
+    norm = norm[valid]
+    directions = away[valid] / norm[:, None]
+
+    opposite_dist = _opposite_boundary_distances(
+        centers=centers,
+        directions=directions,
+        boundary=read_segments(area_fc),
+        min_distance=EPS / norm,
+        max_distance=BUFFER_DIST,
+    )
+    narrow = near_dist + opposite_dist < LENGTH_TOLERANCE
+    narrow_oids = set(oids[narrow].tolist())
+
+    if narrow_oids:
+        with arcpy.da.UpdateCursor(pnt_fc, ["OID@", narrow_field]) as update_cursor:
+            for oid, _ in update_cursor:
+                if oid in narrow_oids:
+                    update_cursor.updateRow([oid, 1])
+
+    if probe_fc is not None:
+        _write_narrow_probes(
+            probe_fc=probe_fc,
+            spatial_reference=arcpy.Describe(pnt_fc).spatialReference,
+            oids=oids,
+            near_xy=near_xy,
+            centers=centers,
+            directions=directions,
+            near_dist=near_dist,
+            opposite_dist=opposite_dist,
+            narrow=narrow,
+        )
 
 
 def estimate_attribute_values(
@@ -616,7 +614,7 @@ def estimate_attribute_values(
         in_features=files["area_line_fc"], out_layer=area_lyr
     )
 
-    is_narrow(point_lyr, area_lyr, narrow_field)
+    is_narrow(point_lyr, area_lyr, narrow_field, probe_fc=files["narrow_probe_fc"])
 
     arcpy.management.SelectLayerByAttribute(
         in_layer_or_view=point_lyr, selection_type="CLEAR_SELECTION"
@@ -701,51 +699,14 @@ def update_road_geometries(files: dict, road_oids: set, mapping: dict) -> None:
         road_oids (set): Set containing the OID for every road having a point that should be moved
         mapping (dict): Dictionary with the mapping between current and new coordinates
     """
-    roads_to_edit = r"roads_to_edit_lyr"
-    oids = ",".join(str(OID) for OID in road_oids)
-    sql = f"OBJECTID IN ({oids})"
-    arcpy.management.MakeFeatureLayer(
-        in_features=files["simplified_fc"], out_layer=roads_to_edit, where_clause=sql
-    )
-
-    total = int(arcpy.management.GetCount(roads_to_edit).getOutput(0))
-
-    with arcpy.da.UpdateCursor(roads_to_edit, ["OID@", "SHAPE@"]) as update_cursor:
-        for oid, geom in tqdm(
-            update_cursor,
-            total=total,
-            desc="Edit road geometries in water",
-            colour="yellow",
-            leave=False,
-        ):
-            parts = []
-            for part in tqdm(
-                geom, desc="Editing geometries", colour="yellow", leave=False
-            ):
-                points = []
-                prev_x, prev_y = None, None
-                for pt in part:
-                    if pt is None:
-                        continue
-                    px, py = pt.X, pt.Y
-                    mapped = mapping.get((round(px, 6), round(py, 6)))
-                    if mapped:
-                        nx, ny = mapped
-                        new_pt = arcpy.Point(nx, ny)
-                    else:
-                        new_pt = arcpy.Point(px, py)
-                    if prev_x is None or (
-                        abs(new_pt.X - prev_x) > EPS or abs(new_pt.Y - prev_y) > EPS
-                    ):
-                        points.append(new_pt)
-                        prev_x, prev_y = new_pt.X, new_pt.Y
-                if len(points) >= 2:
-                    parts.append(arcpy.Array(points))
-            if parts:
-                new_geom = arcpy.Polyline(
-                    arcpy.Array(parts), spatial_reference=geom.spatialReference
-                )
-                update_cursor.updateRow([oid, new_geom])
+    edited_oids = line_editing.remap_line_vertices(
+        feature_class=files["simplified_fc"],
+        mapping=mapping,
+        oids=road_oids,
+        decimals=6,
+    )
+
+    file_utilities.mark_geometries_written(files["simplified_fc"], edited_oids)
 
 
 def delete_feature_layers(layers: list) -> None:
@@ -17,23 +17,25 @@ from custom_tools.generalization_tools.road.collapse_road import collapse_road
 from custom_tools.generalization_tools.road.dissolve_with_intersections import (
     DissolveWithIntersections,
 )
+from custom_tools.generalization_tools.road.major_road_crossings import (
+    categories_major_road_crossings,
+)
 from custom_tools.generalization_tools.road.remove_road_triangles import (
     generalize_road_triangles,
 )
 from custom_tools.generalization_tools.road.resolve_road_conflicts import (
     ResolveRoadConflicts,
 )
+from custom_tools.generalization_tools.road.roundabout_collapse import (
+    generalize_roundabouts,
+)
 from custom_tools.generalization_tools.road.thin_road_network import ThinRoadNetwork
 from env_setup import environment_setup
 
 # Importing custom modules
 from file_manager.n250.file_manager_roads import Road_N250
 from generalization.n250.road.dam import generalize_dam
-from generalization.n250.road.major_road_crossings import (
-    categories_major_road_crossings,
-)
 from generalization.n250.road.ramps_point import MovePointsToCrossings, ramp_points
-from generalization.n250.road.roundabouts import generalize_roundabouts
 from generalization.n250.road.vegsperring import remove_roadblock
 
 # Importing custom input files modules
@@ -48,8 +50,8 @@ def main():
     environment_setup.main()
     arcpy.env.referenceScale = 250000
     data_selection_and_validation()
-    categories_major_road_crossings()
-    generalize_roundabouts()
+    categories_major_road_crossings(scale="n250")
+    generalize_roundabouts(scale="n250")
     remove_roadblock()
     trim_road_details()
     ramp_points()
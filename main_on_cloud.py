@@ -2,10 +2,10 @@ import argparse
 import os
 import sys
 import logging
-from typing import Callable, Dict, Tuple
+from typing import Callable, Dict, Optional, Tuple
 from pathlib import Path
-import shutil
-from google.cloud import storage
+
+from object_store import GcsObjectStore, download_prefix, upload_directory_as_zip
 
 logging.basicConfig(
     level=getattr(logging, os.getenv("LOG_LEVEL", "INFO").upper(), logging.INFO),
@@ -21,68 +21,44 @@ def upload_results_to_gcs(
     bucket_name: str,
     gcs_folder: str,
 ) -> None:
-    """ """
+    """
+    Zip a local .gdb directory into a GCS folder as <gdb name>.zip, streaming
+    the archive as a chunked upload instead of writing it to disk first.
+    """
     gdb_path = Path(gdb_path)
     if gcs_folder and not gcs_folder.endswith("/"):
         gcs_folder += "/"
 
-    zip_file = Path(
-        shutil.make_archive(
-            base_name=str(gdb_path),
-            format="zip",
-            root_dir=gdb_path.parent,
-            base_dir=gdb_path.name,
-        )
+    upload_directory_as_zip(
+        store=GcsObjectStore(bucket_name=bucket_name),
+        local_dir=str(gdb_path),
+        object_name=f"{gcs_folder}{gdb_path.name}.zip",
     )
 
-    client = storage.Client()
-    bucket = client.bucket(bucket_name)
-
-    blob_name = f"{gcs_folder}{zip_file.name}"
-    blob = bucket.blob(blob_name)
-    blob.upload_from_filename(str(zip_file))
-    logger.info(f"Uploaded {zip_file} -> gs://{bucket_name}/{blob_name}")
-
 
 def download_gcs_folder(
     bucket_name: str,
     gcs_folder: str,
     local_folder: str,
+    include: Optional[Callable[[str], bool]] = None,
 ) -> None:
     """
     Download all files from a GCS folder/prefix to a local folder.
+    Files already downloaded unchanged by an earlier run are skipped.
 
     Args:
         bucket_name: Name of the GCS bucket.
         gcs_folder: Folder/prefix inside the bucket, e.g. "data/input/"
         local_folder: Local destination folder, e.g. "/tmp/mydata"
+        include: Optional predicate on the path relative to the folder,
+                 restricting which files are downloaded.
     """
-
-    # Ensure prefix ends with /
-    if gcs_folder and not gcs_folder.endswith("/"):
-        gcs_folder += "/"
-
-    client = storage.Client()
-    bucket = client.bucket(bucket_name)
-
-    blobs = client.list_blobs(bucket_name, prefix=gcs_folder)
-
-    local_base = Path(local_folder)
-    local_base.mkdir(parents=True, exist_ok=True)
-
-    for blob in blobs:
-        # Skip "directory marker" objects
-        if blob.name.endswith("/"):
-            continue
-
-        # Preserve folder structure relative to gcs_folder
-        relative_path = blob.name[len(gcs_folder) :]
-        local_path = local_base / relative_path
-
-        local_path.parent.mkdir(parents=True, exist_ok=True)
-
-        blob.download_to_filename(str(local_path))
-        print(f"Downloaded gs://{bucket_name}/{blob.name} -> {local_path}")
+    download_prefix(
+        store=GcsObjectStore(bucket_name=bucket_name),
+        prefix=gcs_folder,
+        local_folder=local_folder,
+        include=include,
+    )
 
 
 def check_uid_gid():
@@ -164,11 +140,6 @@ def main():
     args = parse_args()
     check_uid_gid()
     check_read_only()
-    download_gcs_folder(
-        bucket_name=os.environ.get("GCS_BUCKET"),
-        gcs_folder="GIS_Files/",
-        local_folder="/tmp/GIS_Files",
-    )
 
     if not args.scale or not args.obj:
         logger.error("Error: --scale and --object required (or set SCALE/OBJECT env)")
@@ -182,7 +153,27 @@ def main():
         print_available()
         sys.exit()
 
+    from data_orchestrator.input_hydration import (
+        pipeline_input_filter,
+        preclip_to_study_area,
+    )
+
+    download_gcs_folder(
+        bucket_name=os.environ.get("GCS_BUCKET"),
+        gcs_folder="GIS_Files/",
+        local_folder="/tmp/GIS_Files",
+        include=pipeline_input_filter(args.scale, args.obj),
+    )
+
+    study_area = os.environ.get("PRECLIP_STUDY_AREA")
+    if study_area:
+        preclip_to_study_area(args.scale, args.obj, selecting_sql_expression=study_area)
+
+    from custom_tools.general_tools.run_profiler import RunProfiler
+
+    RunProfiler.configure(pipeline_name=f"{args.scale}_{args.obj}")
     handler(args)
+    RunProfiler.flush()
 
     upload_results_to_gcs(
         gdb_path="/tmp/GIS_Files/ag_outputs/n100/road.gdb/",
@@ -2,11 +2,16 @@ import argparse
 import os
 import sys
 import logging
-from typing import Callable, Dict, Tuple
+from typing import Callable, Dict, Optional, Tuple
 from pathlib import Path
-import shutil
 from minio import Minio
 
+from object_store import (
+    MinioObjectStore,
+    download_prefix,
+    upload_directory_as_zip,
+)
+
 logging.basicConfig(
     level=getattr(logging, os.getenv("LOG_LEVEL", "INFO").upper(), logging.INFO),
     format="%(asctime)s %(levelname)s: %(message)s",
@@ -32,89 +37,54 @@ def download_scality_folder(
     bucket_name: str,
     scality_folder: str,
     local_folder: str,
+    include: Optional[Callable[[str], bool]] = None,
 ) -> None:
     """
     Download all files from a Scality/S3 folder/prefix to a local folder.
+    Files already downloaded unchanged by an earlier run are skipped.
 
     Args:
         bucket_name: Name of the Scality bucket.
         scality_folder: Folder/prefix inside the bucket, e.g. "data/input/"
         local_folder: Local destination folder, e.g. "/tmp/mydata"
+        include: Optional predicate on the path relative to the folder,
+                 restricting which files are downloaded.
     """
-
-    # Ensure prefix ends with /
-    if scality_folder and not scality_folder.endswith("/"):
-        scality_folder += "/"
-
-    objects = client.list_objects(
-        bucket_name=bucket_name,
+    download_prefix(
+        store=MinioObjectStore(client=client, bucket_name=bucket_name),
         prefix=scality_folder,
-        recursive=True,
+        local_folder=local_folder,
+        include=include,
     )
 
-    local_base = Path(local_folder)
-    local_base.mkdir(parents=True, exist_ok=True)
-
-    for obj in objects:
-        # Skip "directory marker" objects
-        if obj.object_name.endswith("/"):
-            continue
-
-        # Preserve folder structure relative to scality_folder
-        relative_path = obj.object_name[len(scality_folder) :]
-        local_path = local_base / relative_path
-
-        local_path.parent.mkdir(parents=True, exist_ok=True)
-
-        client.fget_object(
-            bucket_name=bucket_name,
-            object_name=obj.object_name,
-            file_path=str(local_path),
-        )
-
-        print(f"Downloaded s3://{bucket_name}/{obj.object_name} -> {local_path}")
-
 
 def upload_results_to_scality(
-    client: Minio, bucket_name: str, local_path: str, object_name: str | None = None
+    client: Minio, bucket_name: str, local_path: Path, object_name: str
 ):
     """
-    Upload a local ZIP file to a Scality bucket.
+    Zip a local directory into a Scality bucket, streaming the archive
+    as a multipart upload instead of writing it to disk first.
 
     Args:
         client: MinIO client instance.
         bucket_name: Name of the Scality bucket.
-        local_zip_path: Path to local .zip file.
+        local_path: Directory to zip, e.g. a .gdb folder.
         object_name: Destination object name in the bucket.
-                     If None, the local filename is used.
 
     Example:
-        upload_zip_to_scality(
+        upload_results_to_scality(
             client,
             bucket_name="my-bucket",
-            local_zip_path="/tmp/archive.zip",
-            object_name="backups/archive.zip"
+            local_path=Path("/tmp/GIS_Files/ag_outputs/n100/road.gdb"),
+            object_name="outputs/n100_road/road.gdb.zip"
         )
     """
-
-    local_zip_path = shutil.make_archive(
-        base_name=str(local_path),
-        format="zip",
-        root_dir=local_path.parent,
-        base_dir=local_path.name,
-    )
-
-    print(f"Uploading {local_zip_path} -> s3://{bucket_name}/{object_name}")
-
-    client.fput_object(
-        bucket_name=bucket_name,
+    upload_directory_as_zip(
+        store=MinioObjectStore(client=client, bucket_name=bucket_name),
+        local_dir=str(local_path),
         object_name=object_name,
-        file_path=local_zip_path,
-        content_type="application/zip",
     )
 
-    print("ZIP upload completed.")
-
 
 def check_uid_gid():
     current_uid = os.getuid()
@@ -211,21 +181,35 @@ def main():
         secret_key=secret_key,
     )
 
+    key = (args.scale, args.obj)
+    handler = DISPATCH.get(key)
+    if handler is None:
+        logger.error(f"No pipeline for scale={args.scale} object={args.obj}")
+        print_available()
+        sys.exit()
+
+    from data_orchestrator.input_hydration import (
+        pipeline_input_filter,
+        preclip_to_study_area,
+    )
+
     download_scality_folder(
         client=s3,
         bucket_name=bucket_name,
         scality_folder="GIS_Files/",
         local_folder="/tmp/GIS_Files",
+        include=pipeline_input_filter(args.scale, args.obj),
     )
 
-    key = (args.scale, args.obj)
-    handler = DISPATCH.get(key)
-    if handler is None:
-        logger.error(f"No pipeline for scale={args.scale} object={args.obj}")
-        print_available()
-        sys.exit()
+    study_area = os.environ.get("PRECLIP_STUDY_AREA")
+    if study_area:
+        preclip_to_study_area(args.scale, args.obj, selecting_sql_expression=study_area)
+
+    from custom_tools.general_tools.run_profiler import RunProfiler
 
+    RunProfiler.configure(pipeline_name=f"{args.scale}_{args.obj}")
     handler(args)
+    RunProfiler.flush()
 
     upload_results_to_scality(
         client=s3,
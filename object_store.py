@@ -0,0 +1,486 @@
+"""
+Object-store transfer layer shared by main_on_cloud and main_on_prem.
+
+One ObjectStore interface covers GCS, Scality/MinIO and a local filesystem
+stand-in used for testing. Transfers run on a bounded thread pool, downloads
+are skipped when a local manifest shows the object is unchanged, and output
+directories are zipped straight into the upload stream.
+"""
+
+###########################
+# Libraries
+###########################
+
+import base64
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+import zipfile
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO, Callable, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILE_NAME = ".transfer_manifest.json"
+MODIFIED_FILE_NAME = ".transfer_modified.json"
+DEFAULT_MAX_WORKERS = int(os.getenv("TRANSFER_WORKERS", "8"))
+UPLOAD_PART_SIZE = 64 * 1024 * 1024
+HASH_BLOCK_SIZE = 1024 * 1024
+
+
+###########################
+# Object stores
+###########################
+
+
+@dataclass(frozen=True)
+class RemoteObject:
+    name: str
+    size: int
+    etag: str
+
+
+class ObjectStore(ABC):
+    """Interface for the object stores the dispatchers transfer data through."""
+
+    @abstractmethod
+    def list_objects(self, prefix: str) -> Iterator[RemoteObject]: ...
+
+    @abstractmethod
+    def download_file(self, name: str, local_path: Path) -> None: ...
+
+    @abstractmethod
+    def upload_file(self, local_path: Path, name: str) -> None: ...
+
+    @abstractmethod
+    def upload_stream(
+        self,
+        name: str,
+        write: Callable[[BinaryIO], None],
+        content_type: str = "application/octet-stream",
+    ) -> None:
+        """
+        Uploads the bytes `write` produces, without staging them on disk. If
+        `write` raises, nothing is left under name and the error is re-raised.
+        """
+
+    @abstractmethod
+    def remote_md5(self, name: str) -> Optional[str]:
+        """Hex MD5 of an object, or None if missing or not known for it."""
+
+    @abstractmethod
+    def uri(self, name: str) -> str: ...
+
+
+class GcsObjectStore(ObjectStore):
+    def __init__(self, bucket_name: str):
+        self.bucket_name = bucket_name
+        self._local = threading.local()
+
+    def _bucket(self):
+        # storage.Client is created per thread so pooled transfers do not share one.
+        if not hasattr(self._local, "bucket"):
+            from google.cloud import storage
+
+            self._local.bucket = storage.Client().bucket(self.bucket_name)
+        return self._local.bucket
+
+    def list_objects(self, prefix: str) -> Iterator[RemoteObject]:
+        for blob in self._bucket().client.list_blobs(self.bucket_name, prefix=prefix):
+            yield RemoteObject(name=blob.name, size=blob.size or 0, etag=blob.etag)
+
+    def download_file(self, name: str, local_path: Path) -> None:
+        self._bucket().blob(name).download_to_filename(str(local_path))
+
+    def upload_file(self, local_path: Path, name: str) -> None:
+        blob = self._bucket().blob(name, chunk_size=UPLOAD_PART_SIZE)
+        blob.upload_from_filename(str(local_path))
+
+    def upload_stream(
+        self,
+        name: str,
+        write: Callable[[BinaryIO], None],
+        content_type: str = "application/octet-stream",
+    ) -> None:
+        blob = self._bucket().blob(name, chunk_size=UPLOAD_PART_SIZE)
+        try:
+            with blob.open("wb", content_type=content_type) as stream:
+                write(stream)
+        except BaseException:
+            # Leaving the with block finalizes the upload, also on an error, so
+            # the truncated object is removed again.
+            try:
+                blob.delete()
+            except Exception:
+                pass
+            raise
+
+    def remote_md5(self, name: str) -> Optional[str]:
+        blob = self._bucket().get_blob(name)
+        if blob is None or not blob.md5_hash:
+            return None
+        return base64.b64decode(blob.md5_hash).hex()
+
+    def uri(self, name: str) -> str:
+        return f"gs://{self.bucket_name}/{name}"
+
+
+class MinioObjectStore(ObjectStore):
+    """Scality and other S3-compatible stores, through the MinIO client."""
+
+    def __init__(self, client, bucket_name: str):
+        self.client = client
+        self.bucket_name = bucket_name
+
+    def list_objects(self, prefix: str) -> Iterator[RemoteObject]:
+        for obj in self.client.list_objects(
+            bucket_name=self.bucket_name, prefix=prefix, recursive=True
+        ):
+            yield RemoteObject(
+                name=obj.object_name, size=obj.size or 0, etag=obj.etag or ""
+            )
+
+    def download_file(self, name: str, local_path: Path) -> None:
+        self.client.fget_object(
+            bucket_name=self.bucket_name, object_name=name, file_path=str(local_path)
+        )
+
+    def upload_file(self, local_path: Path, name: str) -> None:
+        self.client.fput_object(
+            bucket_name=self.bucket_name,
+            object_name=name,
+            file_path=str(local_path),
+            part_size=UPLOAD_PART_SIZE,
+        )
+
+    def upload_stream(
+        self,
+        name: str,
+        write: Callable[[BinaryIO], None],
+        content_type: str = "application/octet-stream",
+    ) -> None:
+        # put_object reads from a stream, so the writer fills a pipe on its own thread.
+        read_fd, write_fd = os.pipe()
+        errors: list[BaseException] = []
+
+        def _produce() -> None:
+            stream = os.fdopen(write_fd, "wb")
+            try:
+                write(stream)
+            except BaseException as e:
+                # Recorded before the pipe closes, so the reader sees it at EOF.
+                errors.append(e)
+            finally:
+                try:
+                    stream.close()
+                except OSError:
+                    pass
+
+        producer = threading.Thread(target=_produce, daemon=True)
+        producer.start()
+        try:
+            with os.fdopen(read_fd, "rb") as stream:
+                self.client.put_object(
+                    bucket_name=self.bucket_name,
+                    object_name=name,
+                    data=_FailingAtEof(stream, errors),
+                    length=-1,
+                    part_size=UPLOAD_PART_SIZE,
+                    content_type=content_type,
+                )
+        finally:
+            producer.join()
+        if errors:
+            raise errors[0]
+
+    def remote_md5(self, name: str) -> Optional[str]:
+        try:
+            etag = self.client.stat_object(self.bucket_name, name).etag
+        except Exception:
+            return None
+        # Multipart ETags ("<hash>-<parts>") are not an MD5 of the object.
+        if not etag or "-" in etag:
+            return None
+        return etag.strip('"')
+
+    def uri(self, name: str) -> str:
+        return f"s3://{self.bucket_name}/{name}"
+
+
+class _FailingAtEof:
+    """
+    Reads from stream, but raises the producer's error instead of returning EOF,
+    so put_object aborts the upload rather than committing a truncated object.
+    """
+
+    def __init__(self, stream: BinaryIO, errors: list[BaseException]):
+        self.stream = stream
+        self.errors = errors
+
+    def read(self, size: int = -1) -> bytes:
+        data = self.stream.read(size)
+        if not data and self.errors:
+            raise self.errors[0]
+        return data
+
+
+class FileSystemObjectStore(ObjectStore):
+    """A directory standing in for a bucket, for tests and local runs."""
+
+    def __init__(self, root: str):
+        self.root = Path(root)
+
+    def list_objects(self, prefix: str) -> Iterator[RemoteObject]:
+        for path in sorted(self.root.rglob("*")):
+            name = path.relative_to(self.root).as_posix()
+            if path.is_file() and name.startswith(prefix):
+                yield RemoteObject(
+                    name=name, size=path.stat().st_size, etag=file_md5(path)
+                )
+
+    def download_file(self, name: str, local_path: Path) -> None:
+        shutil.copyfile(self.root / name, local_path)
+
+    def upload_file(self, local_path: Path, name: str) -> None:
+        target = self.root / name
+        target.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(local_path, target)
+
+    def upload_stream(
+        self,
+        name: str,
+        write: Callable[[BinaryIO], None],
+        content_type: str = "application/octet-stream",
+    ) -> None:
+        target = self.root / name
+        target.parent.mkdir(parents=True, exist_ok=True)
+        partial = target.with_name(f"{target.name}.partial")
+        try:
+            with open(partial, "wb") as stream:
+                write(stream)
+        except BaseException:
+            partial.unlink(missing_ok=True)
+            raise
+        os.replace(partial, target)
+
+    def remote_md5(self, name: str) -> Optional[str]:
+        path = self.root / name
+        return file_md5(path) if path.is_file() else None
+
+    def uri(self, name: str) -> str:
+        return str(self.root / name)
+
+
+###########################
+# Transfers
+###########################
+
+
+def file_md5(path: Path) -> str:
+    digest = hashlib.md5()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _load_manifest(local_base: Path) -> dict[str, dict]:
+    manifest_path = local_base / MANIFEST_FILE_NAME
+    if not manifest_path.exists():
+        return {}
+    try:
+        return json.loads(manifest_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def mark_locally_modified(local_folder: str, relative_dir: str) -> None:
+    """
+    Records that a downloaded directory was edited in place. The next
+    download_prefix into local_folder deletes it and fetches it again, instead of
+    trusting the manifest for files whose size happens to be unchanged.
+    """
+    local_base = Path(local_folder)
+    relative_dir = Path(relative_dir).as_posix().strip("/")
+
+    manifest = _load_manifest(local_base)
+    kept = {
+        name: entry
+        for name, entry in manifest.items()
+        if f"/{relative_dir}/" not in f"/{name}"
+    }
+    (local_base / MANIFEST_FILE_NAME).write_text(
+        json.dumps(kept, indent=1), encoding="utf-8"
+    )
+
+    modified = _load_modified(local_base)
+    if relative_dir not in modified:
+        modified.append(relative_dir)
+    (local_base / MODIFIED_FILE_NAME).write_text(
+        json.dumps(modified, indent=1), encoding="utf-8"
+    )
+
+
+def _load_modified(local_base: Path) -> list[str]:
+    modified_path = local_base / MODIFIED_FILE_NAME
+    if not modified_path.exists():
+        return []
+    try:
+        return list(json.loads(modified_path.read_text(encoding="utf-8")))
+    except (OSError, ValueError, TypeError):
+        return []
+
+
+def _remove_modified(local_base: Path) -> None:
+    """Deletes the directories mark_locally_modified recorded under local_base."""
+    for relative_dir in _load_modified(local_base):
+        shutil.rmtree(local_base / relative_dir, ignore_errors=True)
+    (local_base / MODIFIED_FILE_NAME).unlink(missing_ok=True)
+
+
+def _is_unchanged(
+    local_path: Path, remote: RemoteObject, entry: Optional[dict]
+) -> bool:
+    if entry is None or not local_path.is_file():
+        return False
+    return (
+        entry.get("etag") == remote.etag
+        and entry.get("size") == remote.size
+        and local_path.stat().st_size == remote.size
+    )
+
+
+def download_prefix(
+    store: ObjectStore,
+    prefix: str,
+    local_folder: str,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    include: Optional[Callable[[str], bool]] = None,
+) -> None:
+    """
+    What:
+        Downloads every object under prefix to local_folder, preserving the
+        folder structure relative to the prefix.
+
+    How:
+        Objects whose size and ETag match the local manifest from an earlier
+        transfer, and whose local file still has that size, are skipped.
+        Directories marked with mark_locally_modified are deleted first, so
+        they are fetched whole. The rest are fetched on a bounded thread pool. `include` receives the
+        path relative to the prefix and can restrict which objects are fetched.
+    """
+    if prefix and not prefix.endswith("/"):
+        prefix += "/"
+
+    local_base = Path(local_folder)
+    local_base.mkdir(parents=True, exist_ok=True)
+    _remove_modified(local_base)
+    manifest = _load_manifest(local_base)
+
+    pending: list[tuple[RemoteObject, Path]] = []
+    skipped = 0
+
+    for remote in store.list_objects(prefix):
+        # Skip "directory marker" objects
+        if remote.name.endswith("/"):
+            continue
+
+        relative_path = remote.name[len(prefix) :]
+        if include is not None and not include(relative_path):
+            continue
+
+        local_path = local_base / relative_path
+        if _is_unchanged(local_path, remote, manifest.get(remote.name)):
+            skipped += 1
+            continue
+        pending.append((remote, local_path))
+
+    def _download(remote: RemoteObject, local_path: Path) -> RemoteObject:
+        local_path.parent.mkdir(parents=True, exist_ok=True)
+        store.download_file(remote.name, local_path)
+        return remote
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(_download, *item) for item in pending]
+        for future in as_completed(futures):
+            remote = future.result()
+            manifest[remote.name] = {"size": remote.size, "etag": remote.etag}
+
+    (local_base / MANIFEST_FILE_NAME).write_text(
+        json.dumps(manifest, indent=1), encoding="utf-8"
+    )
+    logger.info(
+        "Downloaded %s object(s), %s unchanged, from %s",
+        len(pending),
+        skipped,
+        store.uri(prefix),
+    )
+
+
+def upload_folder(
+    store: ObjectStore,
+    local_folder: str,
+    prefix: str,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+) -> None:
+    """
+    Uploads every file in local_folder under prefix on a bounded thread pool,
+    skipping files whose MD5 already matches the remote object.
+    """
+    if prefix and not prefix.endswith("/"):
+        prefix += "/"
+
+    local_base = Path(local_folder)
+    files = [
+        path
+        for path in local_base.rglob("*")
+        if path.is_file() and path.name != MANIFEST_FILE_NAME
+    ]
+
+    def _upload(path: Path) -> bool:
+        name = f"{prefix}{path.relative_to(local_base).as_posix()}"
+        if store.remote_md5(name) == file_md5(path):
+            return False
+        store.upload_file(path, name)
+        return True
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        uploaded = sum(executor.map(_upload, files))
+
+    logger.info(
+        "Uploaded %s file(s), %s unchanged, to %s",
+        uploaded,
+        len(files) - uploaded,
+        store.uri(prefix),
+    )
+
+
+def upload_directory_as_zip(
+    store: ObjectStore, local_dir: str, object_name: str
+) -> None:
+    """
+    Zips local_dir straight into the upload stream, so no archive is written
+    to disk. Entries are stored relative to the parent of local_dir, matching
+    shutil.make_archive(root_dir=parent, base_dir=name).
+    """
+    local_dir = Path(local_dir)
+    files = sorted(path for path in local_dir.rglob("*") if path.is_file())
+
+    def _write_zip(stream: BinaryIO) -> None:
+        with zipfile.ZipFile(stream, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+            for path in files:
+                archive.write(path, arcname=path.relative_to(local_dir.parent))
+
+    store.upload_stream(object_name, _write_zip, content_type="application/zip")
+    logger.info(
+        "Uploaded %s as zip (%s files) -> %s",
+        local_dir,
+        len(files),
+        store.uri(object_name),
+    )
@@ -0,0 +1,114 @@
+import unittest
+
+import numpy as np
+
+from custom_tools.generalization_tools.road.displacement_engine import (
+    DisplacementLines,
+    DisplacementResult,
+    _away_from_segments,
+    densify,
+    relax_displacement,
+)
+
+
+def distance_to_line(point: np.ndarray, line: np.ndarray) -> float:
+    segments = np.hstack((line[:-1], line[1:]))
+    _, distance = _away_from_segments(np.repeat([point], len(segments), 0), segments)
+    return float(distance.min())
+
+
+class test_displacement_engine(unittest.TestCase):
+
+    def test_parallel_lower_hierarchy_is_pushed_away(self) -> None:
+        lines = DisplacementLines.from_lines(
+            [
+                np.array([(0.0, 0.0), (1000.0, 0.0)]),
+                np.array([(0.0, 20.0), (1000.0, 20.0)]),
+            ],
+            half_widths=[15.0, 15.0],
+            hierarchies=[1, 2],
+        )
+        result = relax_displacement(lines)
+
+        main = result.lines.line_xy(0, result.xy)
+        minor = result.lines.line_xy(1, result.xy)
+        np.testing.assert_allclose(main, result.lines.line_xy(0))
+        self.assertEqual(result.remaining_conflicts, 0)
+        self.assertGreater(minor[len(minor) // 2, 1], 29.9)
+
+    def test_through_road_stays_on_t_junction(self) -> None:
+        # A main road pushed away from a parallel road of higher rank, with a
+        # branch ending on the middle of it.
+        lines = DisplacementLines.from_lines(
+            [
+                np.array([(0.0, 20.0), (1000.0, 20.0)]),
+                np.array([(0.0, 0.0), (1000.0, 0.0)]),
+                np.array([(500.0, 0.0), (500.0, -300.0)]),
+            ],
+            half_widths=[15.0, 15.0, 10.0],
+            hierarchies=[1, 2, 3],
+        )
+        result = relax_displacement(lines)
+
+        main = result.lines.line_xy(1, result.xy)
+        branch = result.lines.line_xy(2, result.xy)
+        np.testing.assert_allclose(branch[0], (500.0, 0.0))
+        self.assertLess(distance_to_line(branch[0], main), 1e-6)
+        # The rest of the main road still moves away.
+        self.assertLess(main[:, 1].min(), -5.0)
+
+    def test_locked_lines_do_not_move(self) -> None:
+        lines = DisplacementLines.from_lines(
+            [
+                np.array([(0.0, 0.0), (1000.0, 0.0)]),
+                np.array([(0.0, 20.0), (1000.0, 20.0)]),
+            ],
+            half_widths=[15.0, 15.0],
+            hierarchies=[0, 0],
+        )
+        result = relax_displacement(lines)
+
+        np.testing.assert_allclose(result.xy, result.lines.xy)
+        self.assertEqual(result.iterations, 0)
+
+    def test_line_output_keeps_originals_and_moved_with_interpolated_zm(
+        self,
+    ) -> None:
+        lines = DisplacementLines.from_lines(
+            [
+                np.array([(0.0, 0.0), (5.0, 0.0)]),
+                np.array([(0.0, 10.0), (4.0, 10.0), (8.0, 10.0)]),
+            ],
+            half_widths=[1.0, 1.0],
+            hierarchies=[1, 1],
+        )
+        zm = np.array(
+            [(0.0, np.nan), (5.0, np.nan), (10.0, 1.0), (14.0, 3.0), (np.nan, 5.0)]
+        )
+        dense = densify(lines, 2.0)
+        np.testing.assert_allclose(
+            dense.position, [0.0, 1 / 3, 2 / 3, 1.0, 2.0, 2.5, 3.0, 3.5, 4.0]
+        )
+
+        xy = dense.xy.copy()
+        xy[1, 1] += 1.0  # a densified vertex of the first line moves
+        xy[5, 1] += 0.001  # one on the second line stays within tolerance
+        result = DisplacementResult(dense, xy, 1, 0, 0.0)
+
+        first_xy, first_zm = result.line_output(0, 0.01, zm)
+        np.testing.assert_allclose(first_xy, [(0.0, 0.0), (5 / 3, 1.0), (5.0, 0.0)])
+        np.testing.assert_allclose(
+            first_zm, [(0.0, np.nan), (5 / 3, np.nan), (5.0, np.nan)]
+        )
+
+        second_xy, second_zm = result.line_output(1, 0.01, zm)
+        np.testing.assert_allclose(second_xy, lines.line_xy(1))
+        np.testing.assert_allclose(second_zm, zm[2:])
+
+        moved_xy, no_zm = result.line_output(0, 0.01)
+        self.assertIsNone(no_zm)
+        self.assertEqual(len(moved_xy), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
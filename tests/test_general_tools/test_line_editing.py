@@ -0,0 +1,64 @@
+import unittest
+
+import numpy as np
+
+from custom_tools.general_tools.line_editing import (
+    LineParts,
+    remap_vertices,
+    split_parts_at_interval,
+)
+
+
+def line(xy, zm=None) -> LineParts:
+    xy = np.asarray(xy, dtype=np.float64)
+    return LineParts(
+        oids=np.array([1]),
+        attributes=[()],
+        xy=xy,
+        offsets=np.array([0, len(xy)]),
+        part_row=np.array([0]),
+        zm=None if zm is None else np.asarray(zm, dtype=np.float64),
+        has_z=zm is not None,
+        has_m=zm is not None,
+    )
+
+
+class test_line_editing(unittest.TestCase):
+
+    def test_split_without_z_and_m(self) -> None:
+        pieces = split_parts_at_interval(line([(0.0, 0.0), (250.0, 0.0)]), 100.0)
+
+        self.assertEqual([len(xy) for _, xy, _ in pieces], [2, 2, 2])
+        self.assertTrue(all(zm is None for _, _, zm in pieces))
+        np.testing.assert_allclose(pieces[1][1], [(100.0, 0.0), (200.0, 0.0)])
+
+    def test_split_interpolates_z_and_m(self) -> None:
+        lines = line(
+            [(0.0, 0.0), (150.0, 0.0), (250.0, 0.0)],
+            [(0.0, 0.0), (15.0, 150.0), (25.0, 250.0)],
+        )
+        pieces = split_parts_at_interval(lines, 100.0)
+
+        np.testing.assert_allclose(
+            pieces[1][1], [(100.0, 0.0), (150.0, 0.0), (200.0, 0.0)]
+        )
+        np.testing.assert_allclose(
+            pieces[1][2], [(10.0, 100.0), (15.0, 150.0), (20.0, 200.0)]
+        )
+
+    def test_remap_keeps_z_and_m_of_vertices(self) -> None:
+        lines = line(
+            [(0.0, 0.0), (1.0, 0.0), (2.0, 0.0)],
+            [(5.0, 0.0), (6.0, 1.0), (7.0, 2.0)],
+        )
+        edited, changed = remap_vertices(
+            lines, np.array([(1.0, 0.0)]), np.array([(1.0, 0.5)])
+        )
+
+        self.assertTrue(changed[0])
+        np.testing.assert_allclose(edited.xy, [(0.0, 0.0), (1.0, 0.5), (2.0, 0.0)])
+        np.testing.assert_allclose(edited.zm, lines.zm)
+
+
+if __name__ == "__main__":
+    unittest.main()
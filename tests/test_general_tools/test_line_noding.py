@@ -0,0 +1,104 @@
+import unittest
+
+from custom_tools.general_tools.line_noding import node_lines
+
+
+def edge_set(edges) -> set:
+    """Edges as (key, sorted end points), independent of direction and order."""
+    return {
+        (key, tuple(sorted((vertices[0], vertices[-1])))) for key, vertices in edges
+    }
+
+
+class test_line_noding(unittest.TestCase):
+
+    def test_crossing_lines_are_split(self) -> None:
+        for keys in (("a", "a"), ("a", "b")):
+            edges = node_lines(
+                [
+                    ((keys[0],), [[(0.0, 0.0), (10.0, 0.0)]]),
+                    ((keys[1],), [[(5.0, -5.0), (5.0, 5.0)]]),
+                ]
+            )
+            self.assertEqual(
+                edge_set(edges),
+                {
+                    ((keys[0],), ((0.0, 0.0), (5.0, 0.0))),
+                    ((keys[0],), ((5.0, 0.0), (10.0, 0.0))),
+                    ((keys[1],), ((5.0, -5.0), (5.0, 0.0))),
+                    ((keys[1],), ((5.0, 0.0), (5.0, 5.0))),
+                },
+                msg=str(keys),
+            )
+
+    def test_t_junction_splits_through_line(self) -> None:
+        edges = node_lines(
+            [
+                (("a",), [[(0.0, 0.0), (10.0, 0.0)]]),
+                (("a",), [[(5.0, 0.0), (5.0, 5.0)]]),
+            ]
+        )
+        self.assertEqual(
+            edge_set(edges),
+            {
+                (("a",), ((0.0, 0.0), (5.0, 0.0))),
+                (("a",), ((5.0, 0.0), (10.0, 0.0))),
+                (("a",), ((5.0, 0.0), (5.0, 5.0))),
+            },
+        )
+
+    def test_lines_with_same_key_are_merged(self) -> None:
+        rows = [
+            (("a",), [[(0.0, 0.0), (5.0, 0.0)]]),
+            (("a",), [[(5.0, 0.0), (10.0, 0.0), (10.0, 5.0)]]),
+        ]
+        edges = node_lines(rows)
+        self.assertEqual(len(edges), 1)
+        self.assertEqual(edge_set(edges), {(("a",), ((0.0, 0.0), (10.0, 5.0)))})
+        self.assertEqual(len(edges[0][1]), 4)
+
+        # Lines with different keys meeting end to end stay apart.
+        edges = node_lines([(("a",), rows[0][1]), (("b",), rows[1][1])])
+        self.assertEqual(len(edges), 2)
+
+    def test_ring_becomes_one_closed_edge(self) -> None:
+        edges = node_lines(
+            [
+                (("a",), [[(0.0, 0.0), (10.0, 0.0), (10.0, 10.0)]]),
+                (("a",), [[(10.0, 10.0), (0.0, 10.0), (0.0, 0.0)]]),
+            ]
+        )
+        self.assertEqual(len(edges), 1)
+        vertices = edges[0][1]
+        self.assertEqual(vertices[0], vertices[-1])
+        self.assertEqual(len(vertices), 5)
+
+    def test_collinear_overlap_with_other_key_keeps_nodes(self) -> None:
+        edges = node_lines(
+            [
+                (("a",), [[(0.0, 0.0), (10.0, 0.0)]]),
+                (("b",), [[(5.0, 0.0), (15.0, 0.0)]]),
+            ]
+        )
+        self.assertEqual(
+            edge_set(edges),
+            {
+                (("a",), ((0.0, 0.0), (5.0, 0.0))),
+                # The shared piece is kept once, with the key of the first line.
+                (("a",), ((5.0, 0.0), (10.0, 0.0))),
+                (("b",), ((10.0, 0.0), (15.0, 0.0))),
+            },
+        )
+
+    def test_collinear_overlap_with_same_key_is_dissolved(self) -> None:
+        edges = node_lines(
+            [
+                (("a",), [[(0.0, 0.0), (10.0, 0.0)]]),
+                (("a",), [[(5.0, 0.0), (15.0, 0.0)]]),
+            ]
+        )
+        self.assertEqual(edge_set(edges), {(("a",), ((0.0, 0.0), (15.0, 0.0)))})
+
+
+if __name__ == "__main__":
+    unittest.main()
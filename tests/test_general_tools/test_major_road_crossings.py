@@ -0,0 +1,103 @@
+import math
+import unittest
+
+import numpy as np
+
+from custom_tools.general_tools.line_editing import LineParts
+from custom_tools.generalization_tools.road.major_road_crossings import (
+    classify_crossings,
+)
+
+
+def roads(*rows) -> LineParts:
+    """rows of (vertices, medium, vegkategori), one single-part road each."""
+    lines = [np.asarray(xy, dtype=np.float64) for xy, _, _ in rows]
+    return LineParts(
+        oids=np.arange(1, len(rows) + 1),
+        attributes=[(medium, category) for _, medium, category in rows],
+        xy=np.concatenate(lines),
+        offsets=np.cumsum([0] + [len(line) for line in lines]),
+        part_row=np.arange(len(rows)),
+    )
+
+
+E_ROAD = ([(-100.0, 0.0), (100.0, 0.0)], "T", "E")
+
+
+class test_major_road_crossings(unittest.TestCase):
+
+    def test_bridge_crossing_major_road(self) -> None:
+        lines = roads(E_ROAD, ([(0.0, -20.0), (0.0, 20.0)], "L", "F"))
+        categories, flagged = classify_crossings(lines)
+
+        np.testing.assert_array_equal(categories["bridge_cross_ER"], [False, True])
+        np.testing.assert_array_equal(categories["underpass_cross_ER"], [False, False])
+        # The E road has its midpoint under the bridge.
+        np.testing.assert_array_equal(flagged, [True, True])
+
+    def test_ramp_ending_on_major_road(self) -> None:
+        # The shrunk flat buffer of a bridge ending on the road reaches it only
+        # when the bridge leaves at less than 45 degrees.
+        for degrees in (90.0, 60.0, 46.0, 44.0, 30.0):
+            direction = np.array(
+                [math.cos(math.radians(degrees)), math.sin(math.radians(degrees))]
+            )
+            ramp = [(0.0, 0.0), tuple(40.0 * direction)]
+            lines = roads(E_ROAD, (ramp, "L", "F"))
+            categories, flagged = classify_crossings(lines)
+
+            crossing = degrees < 45.0
+            self.assertEqual(
+                bool(categories["bridge_cross_ER"][1]), crossing, msg=f"{degrees}"
+            )
+            self.assertEqual(bool(flagged[1]), crossing, msg=f"{degrees}")
+            self.assertFalse(flagged[0], msg=f"{degrees}")
+
+    def test_underpass_under_major_road(self) -> None:
+        lines = roads(E_ROAD, ([(10.0, -20.0), (10.0, 20.0)], "U", "K"))
+        categories, flagged = classify_crossings(lines)
+
+        np.testing.assert_array_equal(categories["underpass_cross_ER"], [False, True])
+        np.testing.assert_array_equal(categories["bridge_cross_ER"], [False, False])
+        np.testing.assert_array_equal(flagged, [False, True])
+
+    def test_surface_road_under_major_bridge(self) -> None:
+        lines = roads(
+            ([(-100.0, 0.0), (100.0, 0.0)], "L", "R"),
+            ([(0.0, -20.0), (0.0, 20.0)], "T", "K"),
+        )
+        categories, flagged = classify_crossings(lines)
+
+        np.testing.assert_array_equal(categories["surface_under_ER"], [False, True])
+        # Not a marking category, so nothing is flagged.
+        np.testing.assert_array_equal(flagged, [False, False])
+
+    def test_bridge_over_minor_road_is_ignored(self) -> None:
+        lines = roads(
+            ([(-100.0, 0.0), (100.0, 0.0)], "T", "K"),
+            ([(0.0, -20.0), (0.0, 20.0)], "L", "F"),
+        )
+        categories, flagged = classify_crossings(lines)
+
+        for name, in_category in categories.items():
+            self.assertFalse(in_category.any(), msg=name)
+        self.assertFalse(flagged.any())
+
+    def test_midpoints_in_kept_bridge_are_flagged(self) -> None:
+        lines = roads(
+            E_ROAD,
+            ([(0.0, -20.0), (0.0, 20.0)], "L", "F"),
+            # Midpoint (0.3, 5) inside the bridge rectangle.
+            ([(-0.7, 5.0), (1.3, 5.0)], "T", "P"),
+            # Midpoint (0.6, 5) beside it.
+            ([(-0.4, 5.0), (1.6, 5.0)], "T", "P"),
+            # Midpoint (0, 19.8) beyond the trimmed end of the bridge.
+            ([(-1.0, 19.8), (1.0, 19.8)], "T", "P"),
+        )
+        _, flagged = classify_crossings(lines)
+
+        np.testing.assert_array_equal(flagged, [True, True, True, False, False])
+
+
+if __name__ == "__main__":
+    unittest.main()
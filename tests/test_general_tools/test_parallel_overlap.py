@@ -0,0 +1,176 @@
+import math
+import unittest
+
+import numpy as np
+
+from custom_tools.general_tools.line_editing import LineParts
+from custom_tools.general_tools.parallel_overlap import (
+    cut_stretches,
+    max_crossing_angle,
+    parallel_overlaps,
+)
+
+BUFFER = 10.0
+AREA_LIMIT = 1200.0
+ANGLE = max_crossing_angle(BUFFER, AREA_LIMIT)
+
+
+def line_parts(*lines) -> LineParts:
+    xy = np.concatenate([np.asarray(line, dtype=np.float64) for line in lines])
+    return LineParts(
+        oids=np.arange(1, len(lines) + 1),
+        attributes=[()] * len(lines),
+        xy=xy,
+        offsets=np.cumsum([0] + [len(line) for line in lines]),
+        part_row=np.arange(len(lines)),
+    )
+
+
+def flat_buffer(start, end, distance) -> np.ndarray:
+    """Counter-clockwise corners of the flat-ended buffer of one segment."""
+    start, end = np.asarray(start, float), np.asarray(end, float)
+    direction = (end - start) / np.hypot(*(end - start))
+    normal = np.array([-direction[1], direction[0]]) * distance
+    return np.array([start - normal, end - normal, end + normal, start + normal])
+
+
+def clip(subject: np.ndarray, clipper: np.ndarray) -> np.ndarray:
+    """Sutherland-Hodgman intersection of two convex counter-clockwise polygons."""
+    output = list(subject)
+    for i in range(len(clipper)):
+        a, b = clipper[i], clipper[(i + 1) % len(clipper)]
+        inside = (
+            lambda p: (b[0] - a[0]) * (p[1] - a[1]) - (b[1] - a[1]) * (p[0] - a[0]) >= 0
+        )
+        points, output = output, []
+        for j in range(len(points)):
+            p, q = points[j], points[(j + 1) % len(points)]
+            if inside(q):
+                if not inside(p):
+                    output.append(intersection(p, q, a, b))
+                output.append(q)
+            elif inside(p):
+                output.append(intersection(p, q, a, b))
+        if not output:
+            break
+    return np.array(output)
+
+
+def intersection(p, q, a, b):
+    d1, d2 = q - p, b - a
+    t = ((a[0] - p[0]) * d2[1] - (a[1] - p[1]) * d2[0]) / (
+        d1[0] * d2[1] - d1[1] * d2[0]
+    )
+    return p + t * d1
+
+
+def area(polygon: np.ndarray) -> float:
+    if len(polygon) < 3:
+        return 0.0
+    x, y = polygon[:, 0], polygon[:, 1]
+    return 0.5 * abs(np.dot(x, np.roll(y, -1)) - np.dot(y, np.roll(x, -1)))
+
+
+def buffer_overlap_area(road, trail) -> float:
+    """Area the former Buffer + PairwiseIntersect gave for two single segments."""
+    return area(clip(flat_buffer(*road, BUFFER), flat_buffer(*trail, BUFFER)))
+
+
+class test_parallel_overlap(unittest.TestCase):
+
+    def test_angle_limit_matches_area_limit(self) -> None:
+        crossing_area = (2 * BUFFER) ** 2 / math.sin(math.radians(ANGLE))
+        self.assertAlmostEqual(crossing_area, AREA_LIMIT)
+
+    def test_parallel_area_matches_buffer_overlap(self) -> None:
+        road = [(0.0, 0.0), (300.0, 0.0)]
+        for offset in (0.0, 5.0, 9.0):
+            trail = [(-100.0, offset), (400.0, offset)]
+            stretches = parallel_overlaps(
+                line_parts(trail), line_parts(road), BUFFER, ANGLE
+            )
+            self.assertEqual(len(stretches), 1)
+            self.assertAlmostEqual(
+                float(stretches.area[0]), buffer_overlap_area(road, trail), places=6
+            )
+            self.assertAlmostEqual(float(stretches.start[0]), 100.0)
+            self.assertAlmostEqual(float(stretches.end[0]), 400.0)
+
+    def test_crossings_follow_angle_filter(self) -> None:
+        road = [(-500.0, 0.0), (500.0, 0.0)]
+        for degrees in (10.0, 15.0, 19.0, 20.0, 30.0, 60.0, 90.0):
+            direction = np.array(
+                [math.cos(math.radians(degrees)), math.sin(math.radians(degrees))]
+            )
+            trail = [tuple(-300.0 * direction), tuple(300.0 * direction)]
+            expected = buffer_overlap_area(road, trail)
+            stretches = parallel_overlaps(
+                line_parts(trail), line_parts(road), BUFFER, ANGLE
+            )
+
+            if degrees < ANGLE:
+                self.assertEqual(len(stretches), 1)
+                self.assertAlmostEqual(float(stretches.area[0]), expected, places=6)
+            else:
+                self.assertEqual(len(stretches), 0)
+            # The erase decision is the same as for the dissolved buffers.
+            erased = bool(len(stretches)) and float(stretches.area.max()) > AREA_LIMIT
+            self.assertEqual(erased, expected > AREA_LIMIT, msg=f"{degrees} degrees")
+
+    def test_cut_keeps_ends_outside_overlap(self) -> None:
+        road = line_parts([(0.0, 0.0), (300.0, 0.0)])
+        trail = line_parts([(-100.0, 5.0), (400.0, 5.0)])
+        stretches = parallel_overlaps(trail, road, BUFFER, ANGLE)
+        remaining, cut_points = cut_stretches(trail, stretches)
+
+        pieces = remaining[1]
+        self.assertEqual(len(pieces), 2)
+        np.testing.assert_allclose(pieces[0], [[-100.0, 5.0], [0.0, 5.0]])
+        np.testing.assert_allclose(pieces[1], [[300.0, 5.0], [400.0, 5.0]])
+        np.testing.assert_allclose(cut_points, [[0.0, 5.0], [300.0, 5.0]])
+
+    def test_trail_inside_overlap_is_removed_whole(self) -> None:
+        road = line_parts([(0.0, 0.0), (300.0, 0.0)])
+        trail = line_parts([(50.0, 5.0), (250.0, 5.0)])
+        stretches = parallel_overlaps(trail, road, BUFFER, ANGLE)
+        remaining, cut_points = cut_stretches(trail, stretches)
+
+        self.assertEqual(remaining, {1: []})
+        self.assertEqual(len(cut_points), 0)
+
+    def test_keys_pair_only_same_medium(self) -> None:
+        road = line_parts([(0.0, 0.0), (300.0, 0.0)])
+        trail = line_parts([(-100.0, 5.0), (400.0, 5.0)])
+        same = parallel_overlaps(
+            trail, road, BUFFER, ANGLE, np.array([0]), np.array([0])
+        )
+        other = parallel_overlaps(
+            trail, road, BUFFER, ANGLE, np.array([0]), np.array([1])
+        )
+        self.assertEqual(len(same), 1)
+        self.assertEqual(len(other), 0)
+
+    def test_coincident_roads_are_measured_once(self) -> None:
+        road = [(0.0, 0.0), (300.0, 0.0)]
+        trail = line_parts([(-100.0, 5.0), (400.0, 5.0)])
+        single = parallel_overlaps(trail, line_parts(road), BUFFER, ANGLE)
+        for duplicate in (road, road[::-1]):
+            stretches = parallel_overlaps(
+                trail, line_parts(road, duplicate), BUFFER, ANGLE
+            )
+            self.assertEqual(len(stretches), 1)
+            self.assertAlmostEqual(float(stretches.area[0]), float(single.area[0]))
+            self.assertAlmostEqual(float(stretches.start[0]), 100.0)
+            self.assertAlmostEqual(float(stretches.end[0]), 400.0)
+
+    def test_area_is_capped_at_stretch_length_times_buffer_width(self) -> None:
+        # Overlapping but not coincident roads still share one buffer.
+        roads = line_parts([(0.0, 0.0), (300.0, 0.0)], [(0.0, 0.0), (200.0, 0.0)])
+        trail = line_parts([(0.0, 0.0), (300.0, 0.0)])
+        stretches = parallel_overlaps(trail, roads, BUFFER, ANGLE)
+        self.assertEqual(len(stretches), 1)
+        self.assertAlmostEqual(float(stretches.area[0]), 300.0 * 2 * BUFFER)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,105 @@
+import unittest
+
+import numpy as np
+
+from custom_tools.general_tools.line_editing import LineParts
+from custom_tools.generalization_tools.road.roundabout_collapse import (
+    build_road_graph,
+    collapse_roundabouts,
+)
+
+RING = ("rundkjøring", "T", 100, "VegSenterlinje")
+ROAD = ("enkelBilveg", "T", 200, "VegSenterlinje")
+
+
+def roads(*rows) -> LineParts:
+    """rows of (vertices, attributes), one single-part road each."""
+    lines = [np.asarray(xy, dtype=np.float64) for xy, _ in rows]
+    return LineParts(
+        oids=np.arange(1, len(rows) + 1),
+        attributes=[attributes for _, attributes in rows],
+        xy=np.concatenate(lines),
+        offsets=np.cumsum([0] + [len(line) for line in lines]),
+        part_row=np.arange(len(rows)),
+    )
+
+
+def circle(start: float, stop: float, vertices: int = 9) -> list:
+    angles = np.radians(np.linspace(start, stop, vertices))
+    return list(zip(10 * np.cos(angles), 10 * np.sin(angles)))
+
+
+def collapse(lines: LineParts):
+    return collapse_roundabouts(build_road_graph(lines))
+
+
+class test_roundabout_collapse(unittest.TestCase):
+
+    def test_ring_of_arcs(self) -> None:
+        lines = roads(
+            (circle(0, 180), RING),
+            (circle(180, 360), RING),
+            ([(10.0, 0.0), (100.0, 0.0)], ROAD),
+            ([(-100.0, 0.0), (-10.0, 0.0)], ROAD),
+        )
+        edits = collapse(lines)
+
+        self.assertEqual(len(edits.centres), 1)
+        np.testing.assert_array_equal(edits.deleted, [True, True, False, False])
+        np.testing.assert_array_equal(edits.new_start, [-1, -1, 0, -1])
+        np.testing.assert_array_equal(edits.new_end, [-1, -1, -1, 0])
+
+    def test_ring_drawn_as_one_closed_line(self) -> None:
+        # The entries end on interior vertices of the ring.
+        lines = roads(
+            (circle(90, 450, 13), RING),
+            ([(10.0, 0.0), (100.0, 0.0)], ROAD),
+            ([(-100.0, 0.0), (-10.0, 0.0)], ROAD),
+            ([(0.0, -100.0), (0.0, -10.0)], ROAD),
+        )
+        edits = collapse(lines)
+
+        self.assertEqual(len(edits.centres), 1)
+        np.testing.assert_array_equal(edits.deleted, [True, False, False, False])
+        np.testing.assert_array_equal(edits.new_start, [-1, 0, -1, -1])
+        np.testing.assert_array_equal(edits.new_end, [-1, -1, 0, 0])
+
+    def test_ring_ends_millimetres_apart(self) -> None:
+        # The arc ends straddle a border of the 0.1 m grid.
+        first = circle(0, 180)
+        second = circle(180, 360)
+        first[0] = (10.049, 0.0)
+        second[-1] = (10.051, 0.0)
+        lines = roads(
+            (first, RING),
+            (second, RING),
+            ([(10.05, 0.0), (100.0, 0.0)], ROAD),
+        )
+        edits = collapse(lines)
+
+        self.assertEqual(len(edits.centres), 1)
+        np.testing.assert_array_equal(edits.deleted, [True, True, False])
+        np.testing.assert_array_equal(edits.new_start, [-1, -1, 0])
+
+    def test_open_arc_is_left_alone(self) -> None:
+        lines = roads(
+            (circle(0, 180), RING),
+            ([(10.0, 0.0), (100.0, 0.0)], ROAD),
+        )
+        edits = collapse(lines)
+
+        self.assertEqual(len(edits.centres), 0)
+        self.assertFalse(edits.changed.any())
+
+    def test_shortcut_between_ring_points_is_deleted(self) -> None:
+        lines = roads(
+            (circle(90, 450, 13), RING),
+            ([(10.0, 0.0), (-10.0, 0.0)], ROAD),
+        )
+        edits = collapse(lines)
+
+        np.testing.assert_array_equal(edits.deleted, [True, True])
+
+
+if __name__ == "__main__":
+    unittest.main()
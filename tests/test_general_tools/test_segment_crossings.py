@@ -0,0 +1,133 @@
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from custom_tools.general_tools import segment_crossings
+from custom_tools.general_tools.segment_crossings import (
+    SegmentSet,
+    find_crossing_owner_pairs,
+    segments_from_parts,
+    segments_near_points,
+)
+
+
+def crossings(a_rows, b_rows, **kwargs) -> dict:
+    return find_crossing_owner_pairs(
+        segments_from_parts(a_rows), segments_from_parts(b_rows), **kwargs
+    )
+
+
+class test_segment_crossings(unittest.TestCase):
+
+    def test_interiors_crossing(self) -> None:
+        result = crossings(
+            [(1, [[(0.0, 0.0), (10.0, 10.0)]])],
+            [(2, [[(0.0, 10.0), (10.0, 0.0)]])],
+        )
+        self.assertEqual(result, {1: {2}})
+
+    def test_crossing_at_shared_interior_vertex(self) -> None:
+        result = crossings(
+            [(1, [[(0.0, 0.0), (5.0, 5.0), (10.0, 10.0)]])],
+            [(2, [[(0.0, 10.0), (5.0, 5.0), (10.0, 0.0)]])],
+        )
+        self.assertEqual(result, {1: {2}})
+
+    def test_touching_lines_do_not_cross(self) -> None:
+        through = (1, [[(0.0, 0.0), (10.0, 0.0)]])
+        for other in (
+            # T-junction, end point on the interior of the other line.
+            [(5.0, 0.0), (5.0, 5.0)],
+            # End to end.
+            [(10.0, 0.0), (20.0, 5.0)],
+            # Apart.
+            [(0.0, 1.0), (10.0, 1.0)],
+        ):
+            self.assertEqual(crossings([through], [(2, [other])]), {}, msg=other)
+
+    def test_collinear_overlap_does_not_cross(self) -> None:
+        result = crossings(
+            [(1, [[(0.0, 0.0), (10.0, 0.0), (20.0, 10.0)]])],
+            # Shares a stretch with line 1 and also crosses it further on.
+            [(2, [[(5.0, 0.0), (10.0, 0.0), (10.0, 5.0), (20.0, 5.0)]])],
+        )
+        self.assertEqual(result, {})
+
+    def test_end_within_xy_tolerance_touches(self) -> None:
+        # The end of line 2 stops half a millimetre past line 1.
+        rows = (
+            [(1, [[(0.0, 0.0), (10.0, 0.0)]])],
+            [(2, [[(5.0, 5.0), (5.0, -0.0005)]])],
+        )
+        self.assertEqual(crossings(*rows), {1: {2}})
+        self.assertEqual(crossings(*rows, tolerance=0.001), {})
+
+    def test_same_owner_is_excluded(self) -> None:
+        rows = [
+            (1, [[(0.0, 0.0), (10.0, 10.0)]]),
+            (2, [[(0.0, 10.0), (10.0, 0.0)]]),
+        ]
+        segments = segments_from_parts(rows)
+        result = find_crossing_owner_pairs(segments, segments, exclude_same_owner=True)
+        self.assertEqual(result, {1: {2}, 2: {1}})
+
+    def test_long_segments_match_brute_force(self) -> None:
+        rng = np.random.default_rng(7)
+        rows = []
+        for owner in range(200):
+            start = rng.uniform(0.0, 1000.0, 2)
+            end = start + rng.uniform(-2.0, 2.0, 2)
+            rows.append((owner, [[tuple(start), tuple(end)]]))
+        # Long lines across the short ones.
+        rows.append((1000, [[(0.0, 0.0), (1000.0, 1000.0)]]))
+        rows.append((1001, [[(0.0, 1000.0), (1000.0, 0.0)]]))
+        segments = segments_from_parts(rows)
+
+        expected: dict = {}
+        for i in range(len(rows)):
+            single = SegmentSet(
+                owner=segments.owner[i : i + 1],
+                xy=segments.xy[i : i + 1],
+                start_is_boundary=segments.start_is_boundary[i : i + 1],
+                end_is_boundary=segments.end_is_boundary[i : i + 1],
+            )
+            # One segment spans the whole grid, so every pair is a candidate.
+            for owner, others in find_crossing_owner_pairs(
+                single, segments, exclude_same_owner=True
+            ).items():
+                expected.setdefault(owner, set()).update(others)
+
+        result = find_crossing_owner_pairs(segments, segments, exclude_same_owner=True)
+        self.assertEqual(result, expected)
+        self.assertIn(1001, result[1000])
+
+    def test_grid_cells_are_bounded(self) -> None:
+        # Zero-extent segments make the median cell size collapse.
+        xy = np.array([(x, 0.0) for x in range(100)], dtype=np.float64)
+        points = SegmentSet(
+            owner=np.arange(len(xy)),
+            xy=np.hstack((xy, xy)),
+            start_is_boundary=np.ones(len(xy), bool),
+            end_is_boundary=np.ones(len(xy), bool),
+        )
+        entered = []
+
+        def expand_cells(*args):
+            keys, index = expand(*args)
+            entered.append(len(keys))
+            return keys, index
+
+        expand = segment_crossings._expand_cells
+        with mock.patch.object(segment_crossings, "_expand_cells", expand_cells):
+            ia, ib = segments_near_points(points, np.array([(50.2, 0.0)]), 1.0)
+
+        self.assertEqual(sorted(ia.tolist()), [50, 51])
+        np.testing.assert_array_equal(ib, [0, 0])
+        self.assertLessEqual(
+            sum(entered), segment_crossings.MAX_MEAN_CELLS_PER_BOX * (len(xy) + 1)
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
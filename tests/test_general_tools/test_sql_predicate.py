@@ -0,0 +1,101 @@
+import unittest
+
+from constants.n100_constants import N100_SQLResources
+from custom_tools.general_tools.sql_predicate import compile_where_clause
+
+
+def evaluate(clause: str, **row):
+    predicate, _ = compile_where_clause(clause)
+    return predicate(row)
+
+
+class test_sql_predicate(unittest.TestCase):
+
+    def test_and_or_not_follow_three_valued_logic(self) -> None:
+        clause = "a = 1 AND b = 2"
+        self.assertIs(evaluate(clause, a=1, b=2), True)
+        self.assertIsNone(evaluate(clause, a=1, b=None))
+        self.assertIs(evaluate(clause, a=0, b=None), False)
+
+        clause = "a = 1 OR b = 2"
+        self.assertIs(evaluate(clause, a=1, b=None), True)
+        self.assertIsNone(evaluate(clause, a=0, b=None))
+        self.assertIs(evaluate(clause, a=0, b=3), False)
+
+        self.assertIsNone(evaluate("NOT a = 1", a=None))
+        self.assertIs(evaluate("NOT (a = 1 OR b = 2)", a=0, b=3), True)
+        self.assertIs(evaluate("NOT a = 1 AND b = 2", a=0, b=2), True)
+
+    def test_is_null(self) -> None:
+        self.assertIs(evaluate("a IS NULL", a=None), True)
+        self.assertIs(evaluate("a IS NOT NULL", a=None), False)
+        self.assertIs(evaluate("a IS NOT NULL", a=0), True)
+
+    def test_in_and_not_in(self) -> None:
+        self.assertIs(evaluate("a IN (5, 6, 9)", a=6), True)
+        self.assertIs(evaluate("a IN (5, 6, 9)", a=7), False)
+        self.assertIs(evaluate("a NOT IN (5,6,9)", a=7), True)
+        self.assertIs(evaluate("a NOT IN (5,6,9)", a=9), False)
+        self.assertIsNone(evaluate("a IN (5, 6)", a=None))
+        self.assertIsNone(evaluate("a NOT IN (5, 6)", a=None))
+        self.assertIs(evaluate("a IN ('x', 'y')", a="y"), True)
+
+    def test_quote_escapes_and_comparisons(self) -> None:
+        self.assertIs(evaluate("name = 'O''Brien'", name="O'Brien"), True)
+        self.assertIs(evaluate("name = ''", name=""), True)
+        self.assertIs(evaluate("name <> 'x'", name="y"), True)
+        self.assertIs(evaluate("name != 'x'", name="x"), False)
+        self.assertIs(evaluate("a >= -1.5", a=-1.5), True)
+        self.assertIsNone(evaluate("a < 3", a=None))
+
+    def test_field_names_are_case_insensitive(self) -> None:
+        predicate, fields = compile_where_clause(
+            "SubTypeKode = 2 and MOTORVEGTYPE <> 'Motorveg'"
+        )
+        self.assertEqual(fields, {"subtypekode", "motorvegtype"})
+        self.assertIs(predicate({"subtypekode": 2, "motorvegtype": "Europaveg"}), True)
+
+    def test_unsupported_clauses_raise_value_error(self) -> None:
+        for clause in (
+            "name LIKE 'a%'",
+            "a BETWEEN 1 AND 2",
+            "a = b",
+            "name = 'open",
+            "(a = 1",
+            "a = 1 AND",
+            "a IN ()",
+            "a = 1 b = 2",
+        ):
+            with self.subTest(clause=clause):
+                with self.assertRaises(ValueError):
+                    compile_where_clause(clause)
+
+    def test_road_symbology_size_selection(self) -> None:
+        selections = [
+            (*compile_where_clause(clause), size)
+            for clause, size in (
+                N100_SQLResources.new_road_symbology_size_sql_selection.value.items()
+            )
+        ]
+
+        def sizes(subtypekode, motorvegtype) -> list:
+            row = {"subtypekode": subtypekode, "motorvegtype": motorvegtype}
+            return [
+                size
+                for predicate, fields, size in selections
+                if predicate({field: row[field] for field in fields})
+            ]
+
+        self.assertEqual(sizes(2, "Motorveg"), [47.5])
+        self.assertEqual(sizes(4, "Motorveg"), [47.5])
+        self.assertEqual(sizes(4, "Motortrafikkveg"), [32.5])
+        self.assertEqual(sizes(3, None), [32.5])
+        self.assertEqual(sizes(1, None), [30])
+        self.assertEqual(sizes(9, None), [25])
+        self.assertEqual(sizes(11, None), [7.5])
+        # motorvegtype <> 'Motorveg' is unknown for NULL, as in arcpy.
+        self.assertEqual(sizes(2, None), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,182 @@
+import io
+import tempfile
+import unittest
+import zipfile
+from pathlib import Path
+
+from object_store import (
+    FileSystemObjectStore,
+    MinioObjectStore,
+    download_prefix,
+    mark_locally_modified,
+    upload_directory_as_zip,
+    upload_folder,
+)
+
+
+class RecordingStore(FileSystemObjectStore):
+    """FileSystemObjectStore counting the objects it transfers."""
+
+    def __init__(self, root: str):
+        super().__init__(root)
+        self.downloaded: list[str] = []
+        self.uploaded: list[str] = []
+
+    def download_file(self, name: str, local_path: Path) -> None:
+        self.downloaded.append(name)
+        super().download_file(name, local_path)
+
+    def upload_file(self, local_path: Path, name: str) -> None:
+        self.uploaded.append(name)
+        super().upload_file(local_path, name)
+
+
+class FakeMinioClient:
+    """Reads put_object data to EOF like the MinIO client, keeping what completes."""
+
+    def __init__(self):
+        self.objects: dict[str, bytes] = {}
+
+    def put_object(self, bucket_name, object_name, data, length, **kwargs):
+        buffer = io.BytesIO()
+        for block in iter(lambda: data.read(1024), b""):
+            buffer.write(block)
+        self.objects[object_name] = buffer.getvalue()
+
+
+def failing_writer(stream) -> None:
+    stream.write(b"x" * 100_000)
+    raise RuntimeError("producer failed")
+
+
+class test_object_store(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.tmp = Path(self._tmp.name)
+        self.bucket = self.tmp / "bucket"
+        self.local = self.tmp / "local"
+        self.store = RecordingStore(str(self.bucket))
+
+    def put(self, name: str, data: bytes) -> None:
+        path = self.bucket / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
+
+    def download(self) -> None:
+        download_prefix(self.store, "GIS_Files", str(self.local), max_workers=2)
+
+    def test_download_skips_unchanged_objects(self) -> None:
+        self.put("GIS_Files/raw_data/road.gdb/a.gdbtable", b"roads")
+        self.put("GIS_Files/raw_data/road.gdb/b.gdbtable", b"more roads")
+        self.put("GIS_Files/raw_data/water.gdb/a.gdbtable", b"water")
+        self.download()
+        self.assertEqual(len(self.store.downloaded), 3)
+        self.assertEqual(
+            (self.local / "raw_data" / "road.gdb" / "b.gdbtable").read_bytes(),
+            b"more roads",
+        )
+
+        self.store.downloaded.clear()
+        self.put("GIS_Files/raw_data/road.gdb/a.gdbtable", b"new roads")
+        (self.local / "raw_data" / "water.gdb" / "a.gdbtable").unlink()
+        self.download()
+
+        # Changed remotely and missing locally are fetched, the rest skipped.
+        self.assertEqual(
+            sorted(self.store.downloaded),
+            [
+                "GIS_Files/raw_data/road.gdb/a.gdbtable",
+                "GIS_Files/raw_data/water.gdb/a.gdbtable",
+            ],
+        )
+        self.assertEqual(
+            (self.local / "raw_data" / "road.gdb" / "a.gdbtable").read_bytes(),
+            b"new roads",
+        )
+
+    def test_download_include_filter(self) -> None:
+        self.put("GIS_Files/raw_data/road.gdb/a.gdbtable", b"roads")
+        self.put("GIS_Files/raw_data/water.gdb/a.gdbtable", b"water")
+        download_prefix(
+            self.store,
+            "GIS_Files",
+            str(self.local),
+            include=lambda path: path.startswith("raw_data/road.gdb"),
+        )
+        self.assertEqual(
+            self.store.downloaded, ["GIS_Files/raw_data/road.gdb/a.gdbtable"]
+        )
+
+    def test_upload_folder_skips_matching_objects(self) -> None:
+        folder = self.tmp / "out"
+        (folder / "sub").mkdir(parents=True)
+        (folder / "a.txt").write_bytes(b"a")
+        (folder / "sub" / "b.txt").write_bytes(b"b")
+        upload_folder(self.store, str(folder), "results", max_workers=2)
+        self.assertEqual(
+            sorted(self.store.uploaded), ["results/a.txt", "results/sub/b.txt"]
+        )
+
+        self.store.uploaded.clear()
+        (folder / "a.txt").write_bytes(b"A")
+        upload_folder(self.store, str(folder), "results", max_workers=2)
+        self.assertEqual(self.store.uploaded, ["results/a.txt"])
+        self.assertEqual((self.bucket / "results" / "a.txt").read_bytes(), b"A")
+
+    def test_upload_directory_as_zip_round_trip(self) -> None:
+        gdb = self.tmp / "out" / "result.gdb"
+        (gdb / "sub").mkdir(parents=True)
+        (gdb / "a.gdbtable").write_bytes(b"a" * 10_000)
+        (gdb / "sub" / "b").write_bytes(b"b")
+
+        upload_directory_as_zip(self.store, str(gdb), "results/result.zip")
+
+        with zipfile.ZipFile(self.bucket / "results" / "result.zip") as archive:
+            self.assertEqual(
+                sorted(archive.namelist()),
+                ["result.gdb/a.gdbtable", "result.gdb/sub/b"],
+            )
+            self.assertEqual(archive.read("result.gdb/a.gdbtable"), b"a" * 10_000)
+
+    def test_failed_stream_leaves_no_object(self) -> None:
+        with self.assertRaises(RuntimeError):
+            self.store.upload_stream("results/result.zip", failing_writer)
+        self.assertEqual(list(self.bucket.rglob("*.zip*")), [])
+
+    def test_minio_failed_stream_is_not_committed(self) -> None:
+        client = FakeMinioClient()
+        store = MinioObjectStore(client=client, bucket_name="bucket")
+
+        store.upload_stream("ok.bin", lambda stream: stream.write(b"y" * 100_000))
+        self.assertEqual(client.objects["ok.bin"], b"y" * 100_000)
+
+        with self.assertRaisesRegex(RuntimeError, "producer failed"):
+            store.upload_stream("failed.bin", failing_writer)
+        self.assertNotIn("failed.bin", client.objects)
+
+    def test_locally_modified_directory_is_fetched_whole(self) -> None:
+        self.put("GIS_Files/raw_data/road.gdb/a.gdbtable", b"roads")
+        self.put("GIS_Files/raw_data/water.gdb/a.gdbtable", b"water")
+        self.download()
+
+        # Trimmed in place: same size, and a new internal file.
+        gdb = self.local / "raw_data" / "road.gdb"
+        (gdb / "a.gdbtable").write_bytes(b"trim!")
+        (gdb / "b.gdbtable").write_bytes(b"new")
+        (self.local / "raw_data" / "water.gdb" / "a.gdbtable").write_bytes(b"WATER")
+        mark_locally_modified(str(self.local), "raw_data/road.gdb")
+        self.download()
+
+        self.assertEqual((gdb / "a.gdbtable").read_bytes(), b"roads")
+        self.assertFalse((gdb / "b.gdbtable").exists())
+        # Not marked, so still trusted from the manifest.
+        self.assertEqual(
+            (self.local / "raw_data" / "water.gdb" / "a.gdbtable").read_bytes(),
+            b"WATER",
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()